@@ -1,11 +1,89 @@
-from hashlib import sha1, md5
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import md5, blake2b
 import json
+from typing import List, Optional
+
+import dotdict_parser
+import orjson
+
+from airembr.system.config.global_config import global_settings
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Modes, the default is global_settings.data_hash_mode (DATA_HASH_MODE).
+# compat: md5 of json.dumps(sort_keys=True), matches hashes already stored.
+# fast: 64 bit xxh3 (or blake2b-8) of the canonical orjson dump. Changes all hashes, so entity history ids change too.
+COMPAT = 'compat'
+FAST = 'fast'
+
+# Same encoder json.dumps(obj, sort_keys=True) builds on every call
+_compat_encoder = json.JSONEncoder(sort_keys=True)
+
+
+def canonical_dumps(obj) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+
+def fast_hash_64(data: bytes) -> str:
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return blake2b(data, digest_size=8).hexdigest()
+
 
 def hash_dict_64(obj, dump_schema=True):
+    # Despite the name it is a 128 bit md5. Kept as is, as these hashes are stored.
     if dump_schema:
-        obj_bytes = json.dumps(obj, sort_keys=True).encode('utf-8')
+        obj_bytes = _compat_encoder.encode(obj).encode('utf-8')
     else:
         obj_bytes = str(obj).encode('utf-8')
 
     return md5(obj_bytes).hexdigest()
 
+
+def hash_data(obj, mode: Optional[str] = None) -> str:
+    if (mode or global_settings.data_hash_mode) == FAST:
+        return fast_hash_64(canonical_dumps(obj))
+    return hash_dict_64(obj)
+
+
+@lru_cache(maxsize=65536)
+def _hash_field(field: str, dump_schema: bool, mode: str) -> str:
+    if mode == FAST:
+        return fast_hash_64(field.encode('utf-8'))
+    return hash_dict_64(field, dump_schema=dump_schema)
+
+
+def hash_fields(fields: List[str], dump_schema=True, mode: Optional[str] = None) -> List[str]:
+    # Field names repeat across entities, so their hashes are cached
+    mode = mode or global_settings.data_hash_mode
+    return [_hash_field(field, dump_schema, mode) for field in fields]
+
+
+@dataclass
+class TraitsHash:
+    data_hash: str
+    schema_hash: str
+    fields: List[str]
+    field_hashes: Optional[List[str]] = None
+
+
+def hash_traits(traits: dict, with_fields: bool = True, field_dump_schema: bool = True,
+                mode: Optional[str] = None) -> TraitsHash:
+    """
+    Computes data hash, schema hash and (optionally) per-field hashes of traits in one pass.
+    Traits are flattened once and fields are the sorted flat keys.
+    """
+
+    mode = mode or global_settings.data_hash_mode
+    fields = sorted(dotdict_parser.flatten(traits)) if traits else []
+
+    return TraitsHash(
+        data_hash=hash_data(traits, mode),
+        schema_hash=hash_data(fields, mode),
+        fields=fields,
+        field_hashes=hash_fields(fields, field_dump_schema, mode) if with_fields else None
+    )
@@ -1,12 +1,10 @@
 import hashlib
-import orjson
+
+from airembr.core.hash.data_hasher import canonical_dumps
+
 
 def dict_hash(d: dict) -> str:
-    encoded = orjson.dumps(
-        d,
-        option=orjson.OPT_SORT_KEYS
-    )
-    return hashlib.sha1(encoded).hexdigest()
+    return hashlib.sha1(canonical_dumps(d)).hexdigest()
 
 
 def md5(s: str) -> str:
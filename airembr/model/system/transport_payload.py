@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
@@ -20,6 +20,67 @@ class FactTransportPayload:
     def has_relation(self) -> bool:
         return bool(self.fact) and bool(self.relation)
 
+
+@dataclass
+class FactRecord:
+    fact: dict
+    relation: dict
+    entities: List[int]  # Indexes of context entities in ObservationFactsTransportPayload.entities
+    timer: Optional[dict] = None
+
+    def has_relation(self) -> bool:
+        return bool(self.fact) and bool(self.relation)
+
+
+@dataclass
+class ObservationFactsTransportPayload:
+    """
+    Observation level transport envelope. Observation, entities and gids are sent once
+    and facts point to their context entities by index.
+    """
+    source_id: str
+    observation: dict
+    entities: List[DotDict | dict]
+    gids: List[DotDict | dict]
+    facts: List[FactRecord | dict] = field(default_factory=list)
+    trace_id: Optional[str] = None
+    session: Optional[dict] = None
+
+    def __post_init__(self):
+        # After deserialization facts are dicts
+        self.facts = [FactRecord(**fact) if isinstance(fact, dict) else fact for fact in self.facts]
+
+    @staticmethod
+    def is_envelope(payload: dict) -> bool:
+        return 'facts' in payload and 'fact' not in payload
+
+    @staticmethod
+    def from_fact_payload(payload: FactTransportPayload) -> 'ObservationFactsTransportPayload':
+        # Legacy payloads still in the queue are converted to single fact envelopes
+        entities = payload.entities or []
+        facts = [FactRecord(
+            fact=payload.fact,
+            relation=payload.relation,
+            entities=list(range(len(entities))),
+            timer=payload.timer
+        )] if payload.has_relation() or payload.timer else []
+
+        return ObservationFactsTransportPayload(
+            source_id=payload.source_id,
+            observation=payload.observation,
+            entities=entities,
+            gids=payload.gids,
+            facts=facts,
+            trace_id=payload.trace_id,
+            session=payload.session
+        )
+
+    def add_fact(self, fact: dict, relation: dict, entities: List[int], timer: Optional[dict] = None):
+        self.facts.append(FactRecord(fact=fact, relation=relation, entities=entities, timer=timer))
+
+    def fact_entities(self, fact: FactRecord) -> List[DotDict | dict]:
+        return [self.entities[index] for index in fact.entities]
+
 @dataclass
 class ObsTransportPayload:
     id: str
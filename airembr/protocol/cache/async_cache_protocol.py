@@ -0,0 +1,52 @@
+from typing import Protocol, List, Dict, Optional
+
+
+class AsyncCacheProtocol(Protocol):
+
+    async def get(self, key: str):
+        pass
+
+    async def set(self, key, value, ex=None, nx: bool = None):
+        pass
+
+    async def mget(self, keys: List[str]) -> list:
+        pass
+
+    async def mset(self, mapping: dict, ex: Optional[int] = None):
+        pass
+
+    async def delete(self, key, skip_tenant: bool = False):
+        pass
+
+    async def exists(self, key: str):
+        pass
+
+    async def exists_many(self, keys: List[str]) -> Dict[str, bool]:
+        pass
+
+    async def expire(self, key, ttl):
+        pass
+
+    async def incr(self, key: str):
+        pass
+
+    async def ttl(self, key: str):
+        pass
+
+    async def persist(self, key: str):
+        pass
+
+    async def ping(self):
+        pass
+
+    async def set_msgpack(self, key, value, ex=None):
+        pass
+
+    async def get_msgpack(self, key: str):
+        pass
+
+    def scan(self, match=None, count=None):
+        pass
+
+    def pipeline(self):
+        pass
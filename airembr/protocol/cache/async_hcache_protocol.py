@@ -0,0 +1,15 @@
+from typing import Protocol, List
+
+
+class AsyncHCacheProtocol(Protocol):
+    async def hexists(self, name, key):
+        pass
+
+    async def hset(self, name, key, value):
+        pass
+
+    async def hget(self, name, key):
+        pass
+
+    async def hdel(self, name: str, *keys: List):
+        pass
@@ -0,0 +1,10 @@
+from typing import Protocol
+
+
+class AsyncPubSubProtocol(Protocol):
+
+    async def publish(self, channel, payload):
+        pass
+
+    def subscribe(self, channel):
+        pass
@@ -2,6 +2,7 @@ import os
 
 embedding_host = os.environ.get("EMBEDDING_HOST", None)
 embedding_api_key = os.environ.get("EMBEDDING_API_KEY", None)
+embedding_model = os.environ.get("EMBEDDING_MODEL", "intfloat/multilingual-e5-base")
 
 LLM_ENTITY_EXTRACTION_MODEL = 'minimax/minimax-m2.5'
 # LLM_ENTITY_EXTRACTION_MODEL = 'minimax/minimax-m2.7'
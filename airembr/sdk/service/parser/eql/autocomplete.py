@@ -23,7 +23,7 @@ class EQLCompletion(BaseModel):
 
 class EQLAutocomplete(metaclass=Singleton):
     def __init__(self):
-        self.parser = Lark(eql_grammar, parser="lalr")
+        self.parser = Lark(eql_grammar, parser="lalr", cache=True)
 
     def next_token(self, text: str) -> EQLNextToken:
         """
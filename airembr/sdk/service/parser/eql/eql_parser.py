@@ -8,7 +8,7 @@ from airembr.sdk.service.parser.eql.grammar.eql_grammar import eql_grammar
 
 class EQLParser(metaclass=Singleton):
     def __init__(self):
-        self.parser = Lark(eql_grammar, parser="earley")
+        self.parser = Lark(eql_grammar, parser="lalr", cache=True)
         self.transformer = EQLTransformer()
 
     def ast(self, query):
@@ -2,14 +2,15 @@ import asyncio
 
 from airembr.core.singleton import Singleton
 from airembr.sdk.service.dot_accessor import DotAccessor
-from airembr.sdk.service.parser.tql.parser import Parser
-from airembr.sdk.service.parser.tql.transformer.expr_transformer import ExprTransformer
+from airembr.sdk.service.parser.tql.condition_compiler import ConditionCompiler, CompiledCondition
+from airembr.sdk.service.parser.tql.parser import LalrParser
 
 
 class Condition(metaclass=Singleton):
 
     def __init__(self):
-        self.parser = Parser(Parser.read('grammar/uql_expr.lark'), start='expr')
+        self.parser = LalrParser('grammar/uql_expr_lalr.lark', 'grammar/uql_expr.lark', start='expr')
+        self.compiler = ConditionCompiler(self.parse)
 
     def parse(self, condition: str):
         try:
@@ -17,9 +18,13 @@ class Condition(metaclass=Singleton):
         except Exception as e:
             raise ValueError(f"Could not parse condition {condition}, details: {str(e)}")
 
+    def compile(self, condition: str) -> CompiledCondition:
+        # Parsed once per condition text
+        return self.compiler.compile(condition)
+
     async def evaluate(self, condition: str, dot: DotAccessor):
-        # todo cache tree
-        tree = self.parse(condition)
+        if not isinstance(dot, DotAccessor):
+            raise ValueError("Data passed to condition must be type of DotAccessor.")
+        compiled = self.compile(condition)
         await asyncio.sleep(0)
-        return ExprTransformer(dot=dot).transform(tree)
-
+        return compiled(dot)
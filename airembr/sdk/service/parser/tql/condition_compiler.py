@@ -0,0 +1,170 @@
+from collections import OrderedDict
+from typing import Any, Callable, List
+
+from lark import Token, Tree
+
+from airembr.sdk.service.dot_accessor import DotAccessor
+from airembr.sdk.service.parser.tql.domain.field import Field
+from airembr.sdk.service.parser.tql.domain.missing_value import MissingValue
+from airembr.sdk.service.parser.tql.transformer.expr_transformer import ExprTransformer
+
+CompiledCondition = Callable[[DotAccessor], Any]
+
+# Rules and terminals of ExprTransformer that do not read its dot are shared by all compiled conditions.
+# Field reads from the dot it was created with, so rules that need data get it through their Field args.
+_rules = ExprTransformer(dot=DotAccessor())
+
+
+def _constant(value) -> CompiledCondition:
+    def _value(dot):
+        return value
+
+    return _value
+
+
+def _compile_token(token: Token) -> CompiledCondition:
+    if token.type == 'OP_FIELD':
+        label = token.value
+
+        def _field(dot):
+            return Field(label, dot)
+
+        return _field
+
+    try:
+        callback = getattr(_rules, token.type)
+    except AttributeError:
+        return _constant(token)
+    return _constant(callback(token))
+
+
+def _compile_and(children: List[CompiledCondition]) -> CompiledCondition:
+    left, _, right = children
+
+    def _and(dot):
+        value1 = left(dot)
+        if isinstance(value1, ValueError) or isinstance(value1, MissingValue):
+            return value1
+        if value1 is False:
+            return False
+        return value1 and right(dot)
+
+    return _and
+
+
+def _compile_or(children: List[CompiledCondition]) -> CompiledCondition:
+    left, _, right = children
+
+    def _or(dot):
+        value1 = left(dot)
+        if value1 is True:
+            return True
+        return value1 or right(dot)
+
+    return _or
+
+
+def _is_empty(field: Field) -> bool:
+    return field.label not in field.dot or field.value is None or (
+            isinstance(field.value, (str, list, dict)) and len(field.value) == 0
+    )
+
+
+def _op_exists(args):
+    return args[0].label in args[0].dot
+
+
+def _op_not_exists(args):
+    return args[0].label not in args[0].dot
+
+
+def _op_empty(args):
+    return _is_empty(args[0])
+
+
+def _op_not_empty(args):
+    try:
+        return not _is_empty(args[0])
+    except AttributeError:
+        return True
+
+
+# ExprTransformer reads these from its own dot
+_dot_rules = {
+    'op_exists': _op_exists,
+    'op_not_exists': _op_not_exists,
+    'op_empty': _op_empty,
+    'op_not_empty': _op_not_empty,
+}
+
+
+def _compile_rule(name: str, children: List[CompiledCondition]) -> CompiledCondition:
+    if name == 'and_expr':
+        return _compile_and(children)
+    if name == 'or_expr':
+        return _compile_or(children)
+
+    rule = _dot_rules.get(name, None)
+    if rule is None:
+        try:
+            rule = getattr(_rules, name)
+        except AttributeError:
+            # No callback, the transformer would keep the node
+            def _tree(dot):
+                return Tree(name, [child(dot) for child in children])
+
+            return _tree
+
+    if len(children) == 1:
+        child = children[0]
+
+        def _rule1(dot):
+            return rule([child(dot)])
+
+        return _rule1
+
+    def _rule(dot):
+        return rule([child(dot) for child in children])
+
+    return _rule
+
+
+def compile_tree(tree) -> CompiledCondition:
+    """
+    Turns a tree of the `uql_expr` grammar into closures that compute what ExprTransformer computes for the
+    tree, without walking the tree. AND and OR stop at the left value when it decides the result, so errors
+    of the right side are not raised then.
+    """
+    if isinstance(tree, Tree):
+        children = [compile_tree(child) for child in tree.children]
+        return _compile_rule(str(tree.data), children)
+    if isinstance(tree, Token):
+        return _compile_token(tree)
+    return _constant(tree)
+
+
+class ConditionCompiler:
+    """ Compiled conditions by condition text, the least recently used are dropped above `max_size`. """
+
+    def __init__(self, parse: Callable[[str], Tree], max_size: int = 1024):
+        self._parse = parse
+        self._max_size = max_size
+        self._cache: OrderedDict[str, CompiledCondition] = OrderedDict()
+
+    def compile(self, condition: str) -> CompiledCondition:
+        compiled = self._cache.get(condition, None)
+        if compiled is not None:
+            self._cache.move_to_end(condition)
+            return compiled
+
+        compiled = compile_tree(self._parse(condition))
+        self._cache[condition] = compiled
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
@@ -1,12 +1,18 @@
 from srd.domain.record_mapping import EntityToTableMapping
-from airembr.sdk.service.parser.tql.parser import Parser
+from airembr.sdk.service.parser.tql.parser import LalrParser
 from airembr.sdk.service.parser.tql.transformer.starrocks_transformer import StarrocksTransformer
+from airembr.system.decorator.run_once import run_once
+
+
+@run_once
+def filter_condition_parser() -> LalrParser:
+    return LalrParser('grammar/filter_condition_lalr.lark', 'grammar/filter_condition.lark', start='expr')
 
 
 class FilterCondition:
 
     def __init__(self, mapping: EntityToTableMapping):
-        self.parser = Parser(Parser.read('grammar/filter_condition.lark'), start='expr')
+        self.parser = filter_condition_parser()
         self.prop_2_col_mapping = mapping.get_property_to_column()
 
     def parse(self, condition):
@@ -1,12 +1,14 @@
 import os
-from lark import Lark
+from typing import Optional
+
+from lark import Lark, UnexpectedInput
 
 _local_dir = os.path.dirname(__file__)
 
 
 class Parser:
 
-    def __init__(self, grammar, start, parser='earley', transformer=None):
+    def __init__(self, grammar, start, parser='earley', transformer=None, cache=False):
         import_paths = [
             os.path.join(_local_dir, 'grammar')
         ]
@@ -15,7 +17,8 @@ class Parser:
                                 start=start,
                                 parser=parser,
                                 transformer=self.transformer,
-                                import_paths=import_paths)
+                                import_paths=import_paths,
+                                cache=cache)
 
     @staticmethod
     def read(file):
@@ -25,6 +28,32 @@ class Parser:
     def parse(self, query: str):
         return self.base_parser.parse(query)
 
+
+class LalrParser:
+    """
+    Parses with the LALR variant of a grammar, and with the Earley grammar the input the variant does not
+    accept. Both grammars build the same tree. LALR tables are cached in a file, so a new process loads them
+    instead of compiling the grammar. The Earley parser is built for the first input that needs it.
+    """
+
+    def __init__(self, lalr_grammar: str, grammar: str, start: str):
+        self.lalr = Parser(Parser.read(lalr_grammar), start=start, parser='lalr', cache=True)
+        self._grammar = grammar
+        self._start = start
+        self._earley: Optional[Parser] = None
+
+    @property
+    def earley(self) -> Parser:
+        if self._earley is None:
+            self._earley = Parser(Parser.read(self._grammar), start=self._start)
+        return self._earley
+
+    def parse(self, query: str):
+        try:
+            return self.lalr.parse(query)
+        except UnexpectedInput:
+            return self.earley.parse(query)
+
     # def next(self, query):
     #     interactive = self.base_parser.parse_interactive(query)
     #
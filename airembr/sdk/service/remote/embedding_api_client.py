@@ -1,3 +1,5 @@
+import asyncio
+import aiohttp
 import requests
 from typing import List, Dict, Optional, Union, Generator, Tuple
 
@@ -76,3 +78,57 @@ class EmbeddingApiClient:
 
             return embedding_response
         return None
+
+
+class AsyncEmbeddingApiClient:
+    """
+    Non-blocking counterpart of EmbeddingApiClient. One keep-alive session is shared by all calls,
+    so concurrent calls reuse connections. Close it with `close()` when done.
+    """
+
+    def __init__(self, embedder_api: str, embedder_api_key: str, timeout: int = 60):
+        self.embedder_api = embedder_api
+        self.headers = {
+            "Authorization": f"Bearer {embedder_api_key}",
+            "Content-Type": "application/json"
+        }
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # A session is bound to the loop it was created in, the one of a previous loop is closed
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            await self.close()
+            self._session = aiohttp.ClientSession(headers=self.headers, timeout=self._timeout)
+            self._loop = loop
+        return self._session
+
+    async def call(self, texts: Dict[str, str],
+                   normalize: bool = False,
+                   add_bm25: bool = False) -> EmbeddingResponse:
+        _embedder_api = f"{self.embedder_api}/embeddings/?normalize={'true' if normalize else 'false'}&bm25={'true' if add_bm25 else 'false'}"
+
+        standardized_texts = {key: value for key, value in yield_encode_data_keys(texts)}
+        session = await self._get_session()
+        async with session.post(_embedder_api, json=standardized_texts) as response:
+            if not response.ok:
+                raise ConnectionError(f"Error calling embedding API: {await response.text()}")
+            data = await response.json()
+
+        if not data:
+            raise ValueError("Error calling embedding API: empty response.")
+
+        embedding_response = EmbeddingResponse(**data)
+        embedding_response.dense = {key: value for key, value in yield_decoded_data_keys(embedding_response.dense)}
+        return embedding_response
+
+    async def close(self):
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            try:
+                await session.close()
+            except Exception as e:
+                # Session of a closed loop
+                logger.debug(f"Could not close embedding api session: {repr(e)}")
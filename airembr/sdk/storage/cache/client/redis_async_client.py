@@ -0,0 +1,239 @@
+import asyncio
+from typing import Optional, List, Dict, Iterable, Set
+
+import redis.asyncio as aioredis
+
+from airembr.model.system.context import get_context
+from airembr.core.singleton import Singleton
+from airembr.sdk.storage.cache.client.redis_connection_pool import get_async_redis_connection_pool
+from airembr.sdk.storage.cache.config import redis_config
+from airembr.system.process.logging.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+
+def get_tenant_prefix(name, skip_tenant=False):
+    if skip_tenant:
+        return name
+    return f"{get_context().tenant}:{name}"
+
+
+class AsyncRedisPipeline:
+    """
+    Queues commands and sends them in one round trip on execute(). Keys are tenant prefixed like in the client.
+    Not transactional by default. Results of execute() are in the order the commands were queued.
+    """
+
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+
+    def __len__(self):
+        return len(self._pipeline)
+
+    def get(self, name):
+        self._pipeline.get(get_tenant_prefix(name))
+        return self
+
+    def set(self, name, value, ex=None, nx: bool = False):
+        self._pipeline.set(get_tenant_prefix(name), value, ex=ex, nx=nx)
+        return self
+
+    def mget(self, names: Iterable[str]):
+        self._pipeline.mget([get_tenant_prefix(name) for name in names])
+        return self
+
+    def mset(self, mapping: dict):
+        self._pipeline.mset({get_tenant_prefix(name): value for name, value in mapping.items()})
+        return self
+
+    def exists(self, name):
+        self._pipeline.exists(get_tenant_prefix(name))
+        return self
+
+    def delete(self, *names, skip_tenant: bool = False):
+        self._pipeline.delete(*[get_tenant_prefix(name, skip_tenant) for name in names])
+        return self
+
+    def expire(self, name, time):
+        self._pipeline.expire(get_tenant_prefix(name), time)
+        return self
+
+    def ttl(self, name):
+        self._pipeline.ttl(get_tenant_prefix(name))
+        return self
+
+    def incr(self, name, amount: int = 1):
+        self._pipeline.incr(get_tenant_prefix(name), amount)
+        return self
+
+    def hget(self, name, key):
+        self._pipeline.hget(get_tenant_prefix(name), key)
+        return self
+
+    def hset(self, name, key=None, value=None, mapping: Optional[dict] = None):
+        self._pipeline.hset(get_tenant_prefix(name), key, value, mapping)
+        return self
+
+    def hdel(self, name, *keys):
+        self._pipeline.hdel(get_tenant_prefix(name), *keys)
+        return self
+
+    def lpush(self, name, *values):
+        self._pipeline.lpush(get_tenant_prefix(name), *values)
+        return self
+
+    def rpush(self, name, *values):
+        self._pipeline.rpush(get_tenant_prefix(name), *values)
+        return self
+
+    def lrange(self, name, start: int = 0, end: int = -1):
+        self._pipeline.lrange(get_tenant_prefix(name), start, end)
+        return self
+
+    def ltrim(self, name, start: int, end: int):
+        self._pipeline.ltrim(get_tenant_prefix(name), start, end)
+        return self
+
+    async def execute(self) -> list:
+        return await self._pipeline.execute()
+
+
+class AsyncRedisClient(metaclass=Singleton):
+    """
+    redis.asyncio counterpart of RedisClient. Commands do not block the event loop.
+    Connections belong to the event loop, so there is one client and pool per running loop. When the loop
+    changes, the client and pool of the previous loop are closed.
+    """
+
+    def __init__(self):
+        self._client: Optional[aioredis.Redis] = None
+        self._loop = None
+        self._closing: Set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> aioredis.Redis:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            previous, self._client = self._client, None
+            if previous is not None:
+                task = loop.create_task(self._close_client(previous))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            self._loop = loop
+            self._client = aioredis.Redis(connection_pool=get_async_redis_connection_pool(redis_config))
+        return self._client
+
+    @staticmethod
+    async def _close_client(client: aioredis.Redis):
+        try:
+            # The pool is passed to the client, so the client does not close it by default
+            await client.aclose(close_connection_pool=True)
+        except Exception as e:
+            # Connections of a closed loop
+            logger.debug(f"Could not close async redis client: {repr(e)}")
+
+    async def close(self):
+        client, self._client = self._client, None
+        self._loop = None
+        if client is not None:
+            await self._close_client(client)
+
+    @staticmethod
+    def get_tenant_prefix(name, skip_tenant=False):
+        return get_tenant_prefix(name, skip_tenant)
+
+    def pipeline(self, transaction: bool = False) -> AsyncRedisPipeline:
+        return AsyncRedisPipeline(self.client.pipeline(transaction=transaction))
+
+    async def hexists(self, name: str, key: str) -> bool:
+        return await self.client.hexists(self.get_tenant_prefix(name), key)
+
+    async def hget(self, name: str, key: str):
+        return await self.client.hget(self.get_tenant_prefix(name), key)
+
+    async def hset(self,
+                   name: str,
+                   key: Optional[str] = None,
+                   value: Optional[str] = None,
+                   mapping: Optional[dict] = None,
+                   items: Optional[list] = None) -> int:
+        return await self.client.hset(self.get_tenant_prefix(name), key, value, mapping, items)
+
+    async def hdel(self, name: str, *keys: List) -> int:
+        return await self.client.hdel(self.get_tenant_prefix(name), *keys)
+
+    async def sadd(self, name: str, *values) -> int:
+        return await self.client.sadd(self.get_tenant_prefix(name), *values)
+
+    async def smembers(self, name: str) -> set:
+        return await self.client.smembers(self.get_tenant_prefix(name))
+
+    async def ttl(self, name):
+        return await self.client.ttl(self.get_tenant_prefix(name))
+
+    async def exists(self, *names) -> int:
+        return await self.client.exists(*[self.get_tenant_prefix(name) for name in names])
+
+    async def get(self, name):
+        return await self.client.get(self.get_tenant_prefix(name))
+
+    async def mget(self, names: List[str]) -> list:
+        if not names:
+            return []
+        return await self.client.mget([self.get_tenant_prefix(name) for name in names])
+
+    async def set(self, name, value, ex=None, px=None, nx: bool = False, xx: bool = False, keepttl: bool = False):
+        return await self.client.set(self.get_tenant_prefix(name), value, ex=ex, px=px, nx=nx, xx=xx,
+                                     keepttl=keepttl)
+
+    async def mset(self, mapping: Dict[str, bytes]):
+        return await self.client.mset({self.get_tenant_prefix(name): value for name, value in mapping.items()})
+
+    async def delete(self, name, skip_tenant: bool = False):
+        if isinstance(name, list):
+            if not name:
+                return 0
+            return await self.client.delete(*[self.get_tenant_prefix(item, skip_tenant) for item in name])
+        return await self.client.delete(self.get_tenant_prefix(name, skip_tenant))
+
+    async def incr(self, name: str, amount: int = 1):
+        return await self.client.incr(self.get_tenant_prefix(name), amount)
+
+    async def expire(self, name, time, nx: bool = False, xx: bool = False, gt: bool = False, lt: bool = False):
+        return await self.client.expire(self.get_tenant_prefix(name), time, nx, xx, gt, lt)
+
+    async def persist(self, name):
+        return await self.client.persist(self.get_tenant_prefix(name))
+
+    async def ping(self, **kwargs):
+        return await self.client.ping(**kwargs)
+
+    def pubsub(self, **kwargs):
+        return self.client.pubsub(**kwargs)
+
+    async def publish(self, channel, message):
+        return await self.client.publish(channel, message)
+
+    async def scan(self, match=None, count=None):
+        async for key in self.client.scan_iter(self.get_tenant_prefix(match), count):
+            yield key
+
+    # ------------------- List methods -------------------
+
+    async def lpush(self, name: str, *values):
+        return await self.client.lpush(self.get_tenant_prefix(name), *values)
+
+    async def rpush(self, name: str, *values):
+        return await self.client.rpush(self.get_tenant_prefix(name), *values)
+
+    async def lrange(self, name: str, start: int = 0, end: int = -1):
+        return await self.client.lrange(self.get_tenant_prefix(name), start, end)
+
+    async def lindex(self, name: str, index: int):
+        return await self.client.lindex(self.get_tenant_prefix(name), index)
+
+    async def lset(self, name: str, index: int, value):
+        return await self.client.lset(self.get_tenant_prefix(name), index, value)
+
+    async def ltrim(self, name: str, start: int, end: int):
+        return await self.client.ltrim(self.get_tenant_prefix(name), start, end)
@@ -1,4 +1,5 @@
 from redis import ConnectionPool
+from redis.asyncio import ConnectionPool as AsyncConnectionPool
 
 from airembr.system.process.logging.log_handler import get_logger
 from airembr.sdk.storage.cache.config import RedisConfig
@@ -15,3 +16,13 @@ def get_redis_connection_pool(redis_config: RedisConfig) -> ConnectionPool:
         health_check_interval=30,
     )
 
+
+
+def get_async_redis_connection_pool(redis_config: RedisConfig) -> AsyncConnectionPool:
+    uri = redis_config.recreate_redis_uri()
+    logger.info(f"Connecting async redis via pool at {uri}")
+    return AsyncConnectionPool.from_url(
+        uri,
+        max_connections=redis_config.redis_async_max_connections,
+        health_check_interval=30,
+    )
@@ -23,6 +23,7 @@ class RedisConfig:
         self.redis_host = c['host'] if 'host' in c else 'localhost:6379'
         self.redis_port = c['port'] if 'port' in c else self.port
         self.redis_db = c['db'] if 'db' in c else self.database
+        self.redis_async_max_connections = get_env_as_int('REDIS_ASYNC_MAX_CONNECTIONS', 50)
 
     def recreate_redis_uri(self, database=None):
         if self.redis_user and self.redis_password:
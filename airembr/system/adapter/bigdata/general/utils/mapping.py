@@ -92,6 +92,10 @@ def entity_property() -> EntityToTableMapping:
 def sys_ent_property_state() -> EntityToTableMapping:
     return _read_mapping_records(os.path.join(_local_dir,f'{_schema_dir}/sys_ent_property_state.json'))
 
+@run_once
+def sys_ent_property_latest() -> EntityToTableMapping:
+    return _read_mapping_records(os.path.join(_local_dir,f'{_schema_dir}/sys_ent_property_latest.json'))
+
 @run_once
 def sys_ent_2_obs() -> EntityToTableMapping:
     return _read_mapping_records(os.path.join(_local_dir,f'{_schema_dir}/sys_ent_2_obs.json'))
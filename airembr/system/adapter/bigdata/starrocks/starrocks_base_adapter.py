@@ -1,5 +1,11 @@
-import json
-from typing import Optional, Union
+import asyncio
+import inspect
+import os
+from time import perf_counter
+from typing import Optional, Union, Iterable
+
+import aiohttp
+import orjson
 
 from airembr.core.singleton import Singleton
 # from srd.domain.column import Count
@@ -13,12 +19,51 @@ from srd.driver import StarrocksDriver
 # from durable_dot_dict.dotdict import DotDict
 
 from airembr.system.adapter.bigdata.env.bigdata_context import current_bd_database_name
+from airembr.model.system.context import get_context
+from airembr.system.adapter.bigdata.tool.stream_load_client import StreamLoadClient
+from airembr.system.adapter.bigdata.tool.stream_load_splitter import StreamLoadSplitter, StreamLoadSplit, \
+    StreamLoadResult
+from airembr.system.adapter.bigdata.tool.stream_load_retry import LoadBackpressure, retry_delays, is_busy, \
+    PUBLISH_TIMEOUT, LABEL_ALREADY_EXISTS
+from airembr.system.config.global_config import global_settings
+from airembr.system.process.logging.log_handler import get_logger
+from airembr.system.process.monitoring.metrics.metrics import STREAM_LOAD_LATENCY, STREAM_LOAD_ROWS, \
+    STREAM_LOAD_FAILURES, STREAM_LOAD_BACKPRESSURE
+from airembr.system.process.monitoring.metrics.stage_timer import observe_batch
+
+logger = get_logger(__name__)
+
+_TRANSIENT_ERRORS = (asyncio.TimeoutError, aiohttp.ClientError, ConnectionError)
+# The load did not reach StarRocks, so it is safe to retry without a label
+_NOT_SENT_ERRORS = (aiohttp.ClientConnectorError, ConnectionRefusedError)
+
+
+def _stream_load_client(config) -> StreamLoadClient:
+    env = os.environ
+    return StreamLoadClient(
+        host=config.starrocks_host,
+        port=global_settings.starrocks_http_port,
+        user=config.starrocks_username,
+        password=getattr(config, 'starrocks_password', env.get('STARROCKS_PASSWORD', '')),
+        be_host=getattr(config, 'starrocks_force_be_host', env.get('STARROCKS_FORCE_BE_HOST', None))
+    )
 
 
 class StarrocksBaseAdapter(metaclass=Singleton):
 
     def __init__(self):
         self._client = StarrocksDriver()
+        self._backpressure = LoadBackpressure(max_delay=global_settings.stream_load_max_backpressure / 1000)
+        # Labels make retries idempotent, but only clients that accept them send the label header
+        self._driver_accepts_label = 'label' in inspect.signature(self._client.stream).parameters
+        self._label_client = _stream_load_client(self._client.client.config) \
+            if global_settings.stream_load_label_client else None
+        self._merge_client: Optional[StreamLoadClient] = None
+
+    @property
+    def sends_labels(self) -> bool:
+        """ True if labelled loads are deduplicated by StarRocks, so a batch can be loaded again. """
+        return self._label_client is not None or self._driver_accepts_label
 
     @property
     def client(self):
@@ -34,30 +79,141 @@ class StarrocksBaseAdapter(metaclass=Singleton):
 
         return await self._client.exec(sql)
 
-    async def stream(self, rows: list, mapping: EntityToTableMapping, timeout: Optional[int] = 10):
-        if rows:
-
-            mapping.database = current_bd_database_name()
-            result = await self._client.stream(
-                current_bd_database_name(),
-                mapping.table,
-                rows,
-                timeout
-            )
-            text = await result.text()
-            response = json.loads(text)
-
-            if response.get("Status", None) == "Fail":
-                print(mapping.table, response)
-                return "Fail", 0, 0, response.get("Message", None)
-
-            return (
-                response.get("Status", None),
-                response.get('NumberTotalRows', None),
-                response.get('NumberLoadedRows', None),
-                response.get('Message', None)
-            )
-        return None, None, None, None
+    def _is_labelled(self, split: StreamLoadSplit, merge_condition: Optional[str] = None) -> bool:
+        # Conditional loads go through the http client, which sends the label
+        return split.label is not None and (self.sends_labels or merge_condition is not None)
+
+    def _http_client(self, labelled: bool, merge_condition: Optional[str]) -> Optional[StreamLoadClient]:
+        if self._label_client is not None and (labelled or merge_condition is not None):
+            return self._label_client
+        if merge_condition is None:
+            return None
+        # The driver can not send the merge_condition header
+        if self._merge_client is None:
+            self._merge_client = _stream_load_client(self._client.client.config)
+        return self._merge_client
+
+    async def _load_split(self, database: str, table: str, split: StreamLoadSplit, timeout: Optional[int],
+                          merge_condition: Optional[str] = None) -> dict:
+        http_client = self._http_client(split.label is not None, merge_condition)
+        if http_client is not None:
+            return await http_client.stream(database, table, split.body if split.body is not None else split.rows,
+                                            timeout, label=split.label, merge_condition=merge_condition)
+        if split.label is not None and self._driver_accepts_label:
+            result = await self._client.stream(database, table, split.rows, timeout, label=split.label)
+        else:
+            result = await self._client.stream(database, table, split.rows, timeout)
+        return orjson.loads(await result.text())
+
+    async def _stream_split(self, database: str, mapping: EntityToTableMapping, split: StreamLoadSplit,
+                            timeout: Optional[int], merge_condition: Optional[str] = None) -> tuple:
+        table = mapping.table
+        labelled = self._is_labelled(split, merge_condition)
+        status, message, response = None, None, {}
+        delays = retry_delays(global_settings.stream_load_retries,
+                              backoff=global_settings.stream_load_retry_backoff / 1000,
+                              max_backoff=global_settings.stream_load_retry_max_backoff / 1000)
+
+        while True:
+            await self._backpressure.wait()
+            start = perf_counter()
+            try:
+                response = await self._load_split(database, table, split, timeout, merge_condition)
+                status = response.get("Status", None)
+                message = response.get("Message", None)
+                error = None
+            except _TRANSIENT_ERRORS as e:
+                status, message, response, error = "Fail", repr(e), {}, e
+
+            if global_settings.enable_prometheus:
+                STREAM_LOAD_LATENCY.labels(table=table).observe(perf_counter() - start)
+
+            # Labels are digests of the batch content (see batch_label), so a finished load under the label is
+            # this split loaded before by a retry or replay of the same batch
+            if status == LABEL_ALREADY_EXISTS and response.get("ExistingJobStatus", None) == "FINISHED":
+                logger.info(f"Stream load `{split.label}` to `{table}` was already loaded, it is skipped.")
+                status = "Success"
+
+            busy = error is not None or is_busy(status, message)
+            if busy:
+                self._backpressure.on_busy()
+            elif status != "Fail":
+                self._backpressure.on_success()
+
+            if global_settings.enable_prometheus:
+                STREAM_LOAD_BACKPRESSURE.set(self._backpressure.delay)
+
+            # Publish Timeout means the load is committed, only not visible yet. A load that timed out or lost
+            # its connection may be committed too. Retry these only if the label makes it idempotent,
+            # otherwise rows would be loaded twice.
+            if not labelled:
+                if status == PUBLISH_TIMEOUT:
+                    break
+                if error is not None and not isinstance(error, _NOT_SENT_ERRORS):
+                    logger.error(f"Stream load to `{table}` is not retried, it has no label and may be loaded. "
+                                 f"Rows={split.count}, Error={message}")
+                    break
+
+            if not busy:
+                break
+
+            delay = next(delays, None)
+            if delay is None:
+                break
+
+            if global_settings.enable_prometheus:
+                STREAM_LOAD_FAILURES.labels(table=table, reason='retry').inc()
+
+            logger.warning(f"Stream load `{split.label}` to `{table}` is retried in {delay:.2f}s. "
+                           f"Status={status}, Message={message}")
+            await asyncio.sleep(delay)
+
+        if status == "Fail":
+            if global_settings.enable_prometheus:
+                STREAM_LOAD_FAILURES.labels(table=table, reason='fail').inc()
+                STREAM_LOAD_ROWS.labels(table=table, result='failed').inc(split.count)
+            logger.error(f"Stream load `{split.label}` to `{table}` failed. "
+                         f"Rows={split.count}, Response={response or message}")
+            return "Fail", 0, 0, message
+
+        saved_rows = response.get('NumberLoadedRows', None)
+        if global_settings.enable_prometheus and saved_rows is not None:
+            STREAM_LOAD_ROWS.labels(table=table, result='loaded').inc(saved_rows)
+
+        return (
+            status,
+            response.get('NumberTotalRows', None),
+            saved_rows,
+            message
+        )
+
+    async def stream(self, rows: Iterable[dict], mapping: EntityToTableMapping, timeout: Optional[int] = 10,
+                     label: Optional[str] = None, merge_condition: Optional[str] = None):
+        """
+        Loads rows (list or generator) in splits bounded by STREAM_LOAD_MAX_ROWS and STREAM_LOAD_MAX_BYTES.
+        With `merge_condition` (a column of a primary key table) rows older than the stored ones are not
+        loaded. Returns (status, total_rows, saved_rows, message) summed over all splits.
+        """
+
+        if rows is None:
+            return None, None, None, None
+
+        database = current_bd_database_name()
+        mapping.database = database
+
+        splitter = StreamLoadSplitter(mapping.table,
+                                      max_rows=global_settings.stream_load_max_rows,
+                                      max_bytes=global_settings.stream_load_max_bytes,
+                                      label=label,
+                                      # Splits for the http client are encoded once, as its body
+                                      encode=self._http_client(bool(label), merge_condition) is not None)
+        tenant = get_context().tenant
+        result = StreamLoadResult()
+        for split in splitter.split(rows):
+            observe_batch('stream_load', tenant, split.count, split.size, table=mapping.table)
+            result.add(*await self._stream_split(database, mapping, split, timeout, merge_condition))
+
+        return result.to_tuple()
 
     async def query(self, sql: Union[Statement, TableStatement], params=None) -> Result:
         # Set tenant context
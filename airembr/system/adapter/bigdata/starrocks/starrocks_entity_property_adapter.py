@@ -1,4 +1,3 @@
-import asyncio
 import hashlib
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict, AsyncGenerator
@@ -22,10 +21,14 @@ from airembr.system.adapter.bigdata.starrocks.utils.sql_text import (
     search_observations_full_text_sql, similar_observations_sql1,
 )
 from airembr.system.adapter.bigdata.env.bigdata_context import current_bd_database_name
-from airembr.system.adapter.bigdata.general.utils.mapping import entity_property
+from airembr.system.adapter.bigdata.general.utils.mapping import entity_property, sys_text_vector_mapping, \
+    sys_ent_property_state, sys_ent_property_latest
+from airembr.system.adapter.bigdata.tool.vector_rows import vector_rows
 from airembr.model.bigdata.flat_ent_property import FlatEntityProperty
-from airembr.sdk.service.remote.embedding_api_client import EmbeddingApiClient
+from airembr.model.bigdata.flat_ent_property_state import FlatEntityPropertyState
+from airembr.system.process.ai.embedding.embedding_cache import embedding_cache
 from airembr.sdk.ai.config import embedding_host, embedding_api_key
+from airembr.system.config.global_config import global_settings
 
 
 class StarrocksEntityPropertyAdapter(BdEntityHistoryAdapter):
@@ -138,18 +141,36 @@ class StarrocksEntityPropertyAdapter(BdEntityHistoryAdapter):
         result = await self.adapter.exec(sql)
         return result >> sys_ent_property
 
-    async def update_property_embeddings(self, data: Dict[str, List[float]]):
+    async def update_property_embeddings(self, data: Dict[str, List[float]], model: str):
+        """
+        Writes {property_value_id: vector} to sys_text_vector in stream loads. The table has primary key
+        text_id, so a load upserts the vectors; there is no per-row UPDATE and no merge afterward.
+        Returns (status, total_rows, saved_rows, message).
+        """
+        if not data:
+            return None, None, None, None
+        return await self.adapter.stream(vector_rows(data, model), sys_text_vector_mapping())
 
-        # TODO slow implementation
-        sys_ent_property = entity_property()
+    async def rebuild_property_latest(self):
+        """
+        Fills sys_ent_property_latest from sys_ent_property_state. Needed once for data written before the
+        property worker kept the rollup; newer writes keep it current.
+        """
         database = current_bd_database_name()
-
-        for id, vector in data.items():
-            sql = Sql(f"UPDATE {database}.{sys_ent_property} ")
-            sql += f"SET {sys_ent_property | FlatEntityProperty.VECTOR} = {list(vector)} "
-            sql += f"WHERE {sys_ent_property | FlatEntityProperty.PROPERTY_ID} = :id"
-            sql += Param({"id": id})
-            await self.adapter.exec(sql)
+        state = sys_ent_property_state()
+        latest = sys_ent_property_latest()
+        sql = (
+                Sql()
+                + f"INSERT INTO {database}.{latest}"
+                + "  (entity_pk, entity_type, property_name, property_value, property_value_id, ts)"
+                + "SELECT entity_pk, entity_type, property_name,"
+                + "  MAX_BY(property_value, ts),"
+                + f"  MAX_BY({state | FlatEntityPropertyState.VALUE_ID}, ts),"
+                + "  MAX(ts)"
+                + f"FROM {database}.{state}"
+                + "GROUP BY entity_pk, entity_type, property_name"
+        )
+        return await self.adapter.exec(sql)
 
     async def _prepare_embeddings(self, entities) -> Optional[EmbeddingMap]:
         """Embed all ~ property values and return an EmbeddingMap for the SQL builder.
@@ -175,13 +196,12 @@ class StarrocksEntityPropertyAdapter(BdEntityHistoryAdapter):
         if not texts:
             return None
 
-        client = EmbeddingApiClient(embedding_host, embedding_api_key)
-        emb = await asyncio.to_thread(lambda: client.call(texts).get_mapped_embeddings())
-        if not emb or not emb.dense:
+        vectors = await embedding_cache().embed(texts)
+        if not vectors:
             return None
 
         result: EmbeddingMap = {}
-        for md5_key, vector in emb.dense.items():
+        for md5_key, vector in vectors.items():
             tup = key_map.get(md5_key)
             if tup is not None:
                 result[tup] = vector
@@ -197,7 +217,8 @@ class StarrocksEntityPropertyAdapter(BdEntityHistoryAdapter):
                                                          unmatched_traits,
                                                          start_date=start_date,
                                                          end_date=end_date,
-                                                         embeddings=embeddings)
+                                                         embeddings=embeddings,
+                                                         property_rollup=global_settings.eql_property_rollup)
 
         result = await self.adapter.exec(sql)
         if not result:
@@ -219,7 +240,8 @@ class StarrocksEntityPropertyAdapter(BdEntityHistoryAdapter):
             start_date=start_date,
             end_date=end_date,
             embeddings=embeddings,
-            traits_source=traits_source)
+            traits_source=traits_source,
+            property_rollup=global_settings.eql_property_rollup)
         return await self.adapter.exec(sql)
 
     async def load_observations_with_eql(self, eql_object, unmatched_entities: int = 0, unmatched_traits: int = 0,
@@ -229,7 +251,8 @@ class StarrocksEntityPropertyAdapter(BdEntityHistoryAdapter):
         embeddings = await self._prepare_embeddings(eql_object)
         sql = build_select_observations_with_eql1(eql_object, unmatched_entities, unmatched_traits,
                                                   start_date=start_date, end_date=end_date,
-                                                  embeddings=embeddings, limit=limit)
+                                                  embeddings=embeddings, limit=limit,
+                                                  property_rollup=global_settings.eql_property_rollup)
         # print(1, sql.literal())
 
         return await self.adapter.exec(sql)
@@ -239,7 +262,8 @@ class StarrocksEntityPropertyAdapter(BdEntityHistoryAdapter):
         embeddings = await self._prepare_embeddings(eql_object)
         sql = build_select_entity_types_from_observations(eql_object, unmatched_entities, unmatched_traits,
                                                           start_date=start_date, end_date=end_date,
-                                                          embeddings=embeddings)
+                                                          embeddings=embeddings,
+                                                          property_rollup=global_settings.eql_property_rollup)
 
         return await self.adapter.exec(sql)
 
@@ -248,14 +272,14 @@ class StarrocksEntityPropertyAdapter(BdEntityHistoryAdapter):
         result = await self.adapter.exec(sql)
         return result.first().column(0) if result else 0
 
-    async def load_not_embedded_property_values(self):
-        sql = load_not_embedded_property_values_sql()
+    async def load_not_embedded_property_values(self, after_id: Optional[str] = None, limit: Optional[int] = None):
+        sql = load_not_embedded_property_values_sql(after_id, limit)
         return await self.adapter.exec(sql)
 
     async def semantic_search(self, query: str, limit: int = 10, similarity=.7) -> List[dict]:
-        emb_client = EmbeddingApiClient(embedding_host, embedding_api_key)
-        response = await asyncio.to_thread(lambda: emb_client.call({"query": query}).get_mapped_embeddings())
-        query_vector = response.dense["query"]
+        query_vector = await embedding_cache().embed_one(query)
+        if query_vector is None:
+            return []
 
         sql = similar_observations_sql1(query_vector, limit, similarity)
         result = await self.adapter.exec(sql)
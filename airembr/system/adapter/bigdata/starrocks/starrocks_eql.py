@@ -86,7 +86,7 @@ from airembr.model.bigdata.flat_ent_property_state import FlatEntityPropertyStat
 from airembr.model.bigdata.flat_obs import FlatObs
 from airembr.model.bigdata.flat_text_vector import FlatTextVector
 from airembr.system.adapter.bigdata.general.utils.mapping import (
-    sys_ent_2_obs, sys_ent_property_state, sys_ent_state,
+    sys_ent_2_obs, sys_ent_property_state, sys_ent_property_latest, sys_ent_state,
     sys_obs_mapping, sys_text_vector_mapping,
 )
 from airembr.system.adapter.bigdata.env.bigdata_context import current_bd_database_name
@@ -378,6 +378,7 @@ def _build_last_property_values_cte(
     entity_types: Tuple[str, ...],
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    property_rollup: bool = False,
 ) -> Sql:
     """Build the ``last_property_values`` deduplication CTE.
 
@@ -412,8 +413,37 @@ def _build_last_property_values_cte(
       indexed lookup via StarRocks's BITMAP index on ``entity_type``.
     • ``start_date`` / ``end_date`` filter which property writes are considered:
       only writes in the time window contribute to the MAX_BY aggregation.
+    • With ``property_rollup`` the CTE reads ``sys_ent_property_latest``, which
+      the property worker keeps at one row per ``(entity_pk, entity_type,
+      property_name)``.  Its cost follows the number of entities of the
+      requested types, not the number of property writes:
+
+      .. code-block:: sql
+
+          last_property_values AS (
+            SELECT entity_pk, entity_type, property_name,
+                   property_value, property_value_id
+            FROM testdb.sys_ent_property_latest
+            WHERE entity_type IN ('location', 'person')
+          )
+
+      The rollup holds only the latest value, so a time window always uses
+      the MAX_BY plan.
     """
     database = current_bd_database_name()
+
+    if property_rollup and not start_date and not end_date:
+        latest_map = sys_ent_property_latest()
+        return (
+            Sql()
+            + f"{view} AS ("
+            + "SELECT entity_pk, entity_type, property_name, property_value,"
+            + f"  {latest_map | FlatEntityPropertyState.VALUE_ID} AS property_value_id"
+            + f"FROM {database}.{latest_map}"
+            + "WHERE entity_type IN :lpv_filter)"
+            + Param({"lpv_filter": entity_types})
+        )
+
     table_map = sys_ent_property_state()
     value_id_col = table_map | FlatEntityPropertyState.VALUE_ID
 
@@ -886,6 +916,7 @@ def _build_eql_preamble(
     embeddings: Optional[EmbeddingMap],
     min_similarity: float = DEFAULT_MIN_VECTOR_SIMILARITY,
     top_k: int = DEFAULT_TOP_K,
+    property_rollup: bool = False,
 ) -> Sql:
     """Build the shared CTE chain that all four ``build_select_*`` functions start with.
 
@@ -933,7 +964,8 @@ def _build_eql_preamble(
     for part in [
         _build_traits_conditions_cte(plan),
         _build_entity_conditions_cte(plan),
-        _build_last_property_values_cte("last_property_values", entity_types, start_date, end_date),
+        _build_last_property_values_cte("last_property_values", entity_types, start_date, end_date,
+                                        property_rollup),
         traits_chain,           # may be None → filtered out
         no_traits_cte,          # may be None → filtered out
         entities_cte,
@@ -1006,6 +1038,7 @@ def build_select_observation_will_all_entities(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     embeddings: Optional[EmbeddingMap] = None,
+    property_rollup: bool = False,
 ) -> Sql:
     """Return a query that finds qualifying observations and their matched entity_pks.
 
@@ -1046,10 +1079,14 @@ def build_select_observation_will_all_entities(
     embeddings:
         Pre-computed query embeddings for ``~`` properties.  Build with
         ``StarrocksEntityPropertyAdapter._prepare_embeddings``.
+    property_rollup:
+        Read the latest property values from ``sys_ent_property_latest``
+        instead of aggregating ``sys_ent_property_state``.  Ignored when a
+        time window is given.
     """
     plan = QueryPlan.from_entities(entities, unmatched_traits)
     no_of_entities = max(0, len(plan.all_groups) - unmatched_entities)
-    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings)
+    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings, property_rollup=property_rollup)
     return (
         preamble
         + "SELECT em.observation_id,"
@@ -1073,6 +1110,7 @@ def build_select_observations_with_eql(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     embeddings: Optional[EmbeddingMap] = None,
+    property_rollup: bool = False,
 ) -> Sql:
     """Return a query that yields full observation records matching the EQL query.
 
@@ -1106,7 +1144,7 @@ def build_select_observations_with_eql(
     """
     plan = QueryPlan.from_entities(entities, unmatched_traits)
     no_of_entities = max(0, len(plan.all_groups) - unmatched_entities)
-    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings)
+    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings, property_rollup=property_rollup)
 
     database = current_bd_database_name()
     sys_obs = sys_obs_mapping()
@@ -1149,6 +1187,7 @@ def build_select_observations_with_eql1(
     end_date: Optional[datetime] = None,
     embeddings: Optional[EmbeddingMap] = None,
     limit: Optional[int] = None,
+    property_rollup: bool = False,
 ) -> Sql:
     """Return a query that yields full observation records matching the EQL query.
 
@@ -1182,7 +1221,7 @@ def build_select_observations_with_eql1(
     """
     plan = QueryPlan.from_entities(entities, unmatched_traits)
     no_of_entities = max(0, len(plan.all_groups) - unmatched_entities)
-    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings)
+    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings, property_rollup=property_rollup)
 
     database = current_bd_database_name()
     sys_obs = sys_obs_mapping()
@@ -1227,6 +1266,7 @@ def build_select_expanded_entities_from_observations(
     end_date: Optional[datetime] = None,
     embeddings: Optional[EmbeddingMap] = None,
     traits_source: str = "ent_state",
+    property_rollup: bool = False,
 ) -> Sql:
     """Return a query that yields entity state rows for entities inside qualifying observations.
 
@@ -1257,7 +1297,7 @@ def build_select_expanded_entities_from_observations(
     """
     plan = QueryPlan.from_entities(entities, unmatched_traits)
     no_of_entities = max(0, len(plan.all_groups) - unmatched_entities)
-    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings)
+    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings, property_rollup=property_rollup)
 
     database = current_bd_database_name()
     qualifying_ctes = _build_qualifying_observations_ctes(no_of_entities)
@@ -1313,6 +1353,7 @@ def build_select_entity_types_from_observations(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     embeddings: Optional[EmbeddingMap] = None,
+    property_rollup: bool = False,
 ) -> Sql:
     """Return a query that counts distinct entity types across qualifying observations.
 
@@ -1339,7 +1380,7 @@ def build_select_entity_types_from_observations(
     """
     plan = QueryPlan.from_entities(entities, unmatched_traits)
     no_of_entities = max(0, len(plan.all_groups) - unmatched_entities)
-    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings)
+    preamble = _build_eql_preamble(plan, start_date, end_date, embeddings, property_rollup=property_rollup)
 
     return (
         preamble + ","
@@ -1,5 +1,4 @@
 import json
-import itertools
 from typing import List, Optional, Dict
 
 from pydantic import BaseModel
@@ -11,22 +10,10 @@ from airembr.model.system.meta_language.meta_lang_model import MetaLangEntityBas
 from airembr.core.time.timer import timer
 from airembr.system.adapter.bigdata.adapter_router import AdapterRouter
 from airembr.system.adapter.bigdata.starrocks.utils.sql_entity_search import sql_entity_by_properties
+from airembr.system.adapter.bigdata.tool.hyper_edge_match import hyper_edge_conditions, find_candidates
 from airembr.system.adapter.bigdata.env.bigdata_context import current_bd_database_name
 from airembr.system.adapter.bigdata.general.utils.mapping import observation_2_entity_mapping
-
-
-def cartesian_product_size(data: dict):
-    size = 0
-    for v in data.values():
-        if size == 0:
-            size = len(v)
-        else:
-            size *= len(v)
-    return size
-
-
-def cartesian_product_tuples(data: dict):
-    return list(itertools.product(*data.values()))
+from airembr.system.config.global_config import global_settings
 
 
 def all_entities(data: dict):
@@ -36,6 +23,37 @@ def all_entities(data: dict):
     return all
 
 
+def sql_hyper_edge_observations(candidates: List[List[str]], limit: int):
+    """
+    Observations that hold at least one entity of every candidate list. Candidates are joined with
+    sys_obs_2_entity and grouped by observation, so the plan grows with the candidate count, not with
+    the number of their combinations.
+    """
+    database = current_bd_database_name()
+    sys_obs_2_entity = observation_2_entity_mapping()
+    conditions, params = hyper_edge_conditions(candidates)
+
+    sql = (
+            Sql()
+            + "SELECT o.observation_id"
+            + f"FROM {database}.{sys_obs_2_entity} o"
+            + "WHERE o.entity_pk IN :entity_pks"
+            + Param(params)
+            + "GROUP BY o.observation_id"
+    )
+
+    for no, condition in enumerate(conditions):
+        sql += f"{'HAVING' if no == 0 else 'AND'} {condition}"
+
+    sql += (
+            Sql()
+            + "ORDER BY o.observation_id"
+            + "LIMIT :limit"
+            + Param({"limit": limit})
+    )
+    return sql
+
+
 def _parse_json_callable(i):
     try:
         return json.loads(i) if i is not None else None
@@ -103,107 +121,66 @@ class GraphResponse(BaseModel):
 
 class BdHyperEdgeAdapter(AdapterRouter):
 
+    async def _find_entity_pks(self, entity_properties, entity_type: str, observer_pk: Optional[str]) -> List[str]:
+        sql = sql_entity_by_properties(entity_properties, entity_type, observer_pk)
+        sql += Sql("SELECT DISTINCT entity_pk FROM queried_entity_properties")
+        records = await self.adapter.exec(sql)
+        return [record['entity_pk'] for record in records.list()]
+
     async def find_hyper_edge(self,
                               query: List[MetaLangEntityBase],
                               observer_pk: Optional[str] = None,
                               page: Optional[int] = 0) -> GraphResponse:
-        sys_obs_2_entity = observation_2_entity_mapping()
 
         database = current_bd_database_name()
         stats = TimeStats()
 
         with timer() as entity_search_timer:
-            entities_in_context = {}
-            distinct_entity_types = set()
-            found_entities_as_requested = 0  # Some entities may be requested with properties but can not be found
+            entity_types = [entity.type.lower() for entity in query]
+            distinct_entity_types = set(entity_types)
 
-            for no, entity in enumerate(query):
-                entity_type = entity.type.lower()
-                entity_properties = entity.properties
-                sql = sql_entity_by_properties(entity_properties, entity_type, observer_pk)
-                sql += Sql("SELECT DISTINCT entity_pk FROM queried_entity_properties")
+            # Each entity is resolved by its own query, all at once
+            found = await find_candidates(
+                [(entity.properties, entity_type) for entity, entity_type in zip(query, entity_types)],
+                lambda properties, entity_type: self._find_entity_pks(properties, entity_type, observer_pk)
+            )
 
-                print(1, sql.literal())
-
-                records = await self.adapter.exec(sql)
-                record_pks = [record['entity_pk'] for record in records.list()]
-
-                if len(record_pks) == 0:
-                    # No entities found with full search (entity_type + entity_properties)
-                    if entity_properties:
-                        # There were properties so lets try a search without them.
-                        if found_entities_as_requested > 0:
-                            # But only if there is at least one entity that was found as requested.
-                            # Lets make broader search ONLY for entity type without properties.
-                            sql = sql_entity_by_properties([], entity_type, observer_pk)
-                            sql += Sql("SELECT DISTINCT entity_pk FROM queried_entity_properties")
-                            print(2, sql.literal())
-
-                            records = await self.adapter.exec(sql)
-                            record_pks = [record['entity_pk'] for record in records.list()]
-                else:
-                    found_entities_as_requested += 1
-
-                entities_in_context[(entity_type, no)] = record_pks
-
-                print(entities_in_context)
-
-                distinct_entity_types.add(entity_type)
-
-            number_of_edges = cartesian_product_size(entities_in_context)
-            if number_of_edges > 100:
-                return GraphResponse(
-                    status=GraphResponseStatusEnum.TOO_MANY_FACTS,
-                    reason=f"You need to be more precise I have memorized over {number_of_edges} facts that could answer your question.",
-                    observations=[],
-                    facts=[],
-                    stats=stats
-                )
+            entities_in_context = {(entity_type, no): record_pks
+                                   for no, (entity_type, record_pks) in enumerate(zip(entity_types, found))}
 
         stats.entity_search = entity_search_timer.elapsed
 
-        with timer() as hyper_edge_timer:
-            mix_of_entities_to_search = cartesian_product_tuples(entities_in_context)
-
-            if not mix_of_entities_to_search:
-                # No entities in the same context.
-
-                # We have 2 options:
-                # - Search by each entity one by one. There may be not related.
-                # - Or say I do not recall this. (This is what we currently do)
-                return GraphResponse(
-                    status=GraphResponseStatusEnum.NOT_FOUND,
-                    reason=f"I can not recall this. I have not found {' AND '.join(distinct_entity_types)} in one observation.",
-                    observations=[],
-                    facts=[],
-                    stats=stats
-                )
+        if not entities_in_context or not all(entities_in_context.values()):
+            # No entities in the same context.
 
-            x = []
-            for one_set in mix_of_entities_to_search:
-                if len(one_set) == 1:
-                    x.append(f"o.entity_id = '{one_set[0]}'")
-                else:
-                    x.append(f"o.entity_id IN {one_set}")
-
-            sql_where_inject = " OR ".join(x)
-
-            # Context - Hyper edge
-            sql = (
-                    Sql()
-                    + f"SELECT o.observation_id "
-                    + f"FROM {database}.{sys_obs_2_entity} o "
-                    + f"WHERE {sql_where_inject} "
-                    + f"GROUP BY o.observation_id HAVING COUNT(DISTINCT o.entity_type) = :entity_types_cardinality"
-                    + Param({"entity_types_cardinality": len(distinct_entity_types)})
+            # We have 2 options:
+            # - Search by each entity one by one. There may be not related.
+            # - Or say I do not recall this. (This is what we currently do)
+            return GraphResponse(
+                status=GraphResponseStatusEnum.NOT_FOUND,
+                reason=f"I can not recall this. I have not found {' AND '.join(distinct_entity_types)} in one observation.",
+                observations=[],
+                facts=[],
+                stats=stats
             )
 
+        with timer() as hyper_edge_timer:
+            max_observations = global_settings.hyper_edge_max_observations
+            sql = sql_hyper_edge_observations(list(entities_in_context.values()), limit=max_observations + 1)
             records = await self.adapter.exec(sql)
-
             observation_ids = [record['observation_id'] for record in records.list()]
 
         stats.hyper_edge_search = hyper_edge_timer.elapsed
 
+        if len(observation_ids) > max_observations:
+            return GraphResponse(
+                status=GraphResponseStatusEnum.TOO_MANY_FACTS,
+                reason=f"You need to be more precise I have memorized over {max_observations} observations that could answer your question.",
+                observations=[],
+                facts=[],
+                stats=stats
+            )
+
         if not observation_ids:
             # No observations in the same context.
             return GraphResponse(
@@ -284,7 +261,6 @@ class BdHyperEdgeAdapter(AdapterRouter):
                 + Param({"entity_pks": tuple(entity_pks)})
         )
 
-        print(sql.literal())
         return await self.adapter.exec(sql)
 
     async def get_entities_in_realation_edge(self, entity_pks: List[str], entity_types: List[str] = None):
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from airembr.system.adapter.bigdata.adapter_router import AdapterRouter
 from airembr.system.adapter.bigdata.general.utils.mapping import sys_text_mapping
@@ -30,8 +30,8 @@ class StarrocksTextAdapter(AdapterRouter):
         result = await self.adapter.exec(sql)
         return result.first().column(0)
 
-    async def load_not_embedded_tests(self):
-        sql = load_not_embedded_texts_sql()
+    async def load_not_embedded_tests(self, after_id: Optional[str] = None, limit: Optional[int] = None):
+        sql = load_not_embedded_texts_sql(after_id, limit)
         return await self.adapter.exec(sql)
 
     async def load_not_summarized_tests(self):
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from airembr.model.bigdata.flat_text_vector import FlatTextVector
 from srd.domain.sql import Sql, Param
@@ -33,7 +33,8 @@ def count_not_embedded_texts_sql():
     )
 
 
-def load_not_embedded_texts_sql():
+def load_not_embedded_texts_sql(after_id: Optional[str] = None, limit: Optional[int] = None):
+    """ With `limit`, returns one keyset page ordered by id, starting after `after_id`. """
     database = current_bd_database_name()
     sys_text = sys_text_mapping()
     sys_text_vector = sys_text_vector_mapping()
@@ -43,6 +44,8 @@ def load_not_embedded_texts_sql():
             + f"  FROM {database}.{sys_text}"
             + f"  LEFT JOIN {database}.{sys_text_vector} v ON {sys_text | FlatText.ID} = {sys_text_vector | FlatTextVector.TEXT_ID}"
             + f"  WHERE v.{sys_text_vector | FlatTextVector.VECTOR} IS NULL"
+            + (after_id is not None, f"  AND {sys_text | FlatText.ID} > :after_id", Param({"after_id": after_id}))
+            + (limit is not None, f"  ORDER BY {sys_text | FlatText.ID} LIMIT :limit", Param({"limit": limit}))
     )
 
 
@@ -193,6 +196,20 @@ def update_required_ner_texts_sql(text_id: str, model: str):
     )
 
 
+def load_text_vectors_sql(text_ids: List[str], model: str):
+    database = current_bd_database_name()
+    sys_text_vector = sys_text_vector_mapping()
+    return (
+            Sql()
+            + f"  SELECT {sys_text_vector | FlatTextVector.TEXT_ID} AS text_id, {sys_text_vector | FlatTextVector.VECTOR} AS vector"
+            + f"  FROM {database}.{sys_text_vector}"
+            + f"  WHERE {sys_text_vector | FlatTextVector.TEXT_ID} IN :text_ids"
+            + Param({"text_ids": tuple(text_ids)})
+            + f"  AND {sys_text_vector | FlatTextVector.MODEL} = :model"
+            + Param({"model": model})
+    )
+
+
 def similar_texts_sql(query_vector: List[float], limit: int = 10):
     database = current_bd_database_name()
     sys_text = sys_text_mapping()
@@ -273,7 +290,8 @@ def count_not_embedded_property_values_sql():
     )
 
 
-def load_not_embedded_property_values_sql():
+def load_not_embedded_property_values_sql(after_id: Optional[str] = None, limit: Optional[int] = None):
+    """ With `limit`, returns one keyset page ordered by property value id, starting after `after_id`. """
     database = current_bd_database_name()
     sys_ent_property = entity_property()
     sys_text_vector = sys_text_vector_mapping()
@@ -284,6 +302,8 @@ def load_not_embedded_property_values_sql():
             + f"  LEFT JOIN {database}.{sys_text_vector} v ON p.property_value_id = v.{sys_text_vector | FlatTextVector.TEXT_ID}"
             + "  WHERE p.property_value_id IS NOT NULL"
             + f"  AND v.{sys_text_vector | FlatTextVector.VECTOR} IS NULL"
+            + (after_id is not None, "  AND p.property_value_id > :after_id", Param({"after_id": after_id}))
+            + (limit is not None, "  ORDER BY p.property_value_id LIMIT :limit", Param({"limit": limit}))
     )
 
 
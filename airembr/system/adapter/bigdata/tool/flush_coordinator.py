@@ -0,0 +1,85 @@
+import asyncio
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Optional, List, Callable, Awaitable, Tuple, Any, Dict
+
+from airembr.system.process.logging.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TableFlushResult:
+    table: str
+    status: Optional[str] = None
+    total_rows: Optional[int] = None
+    saved_rows: Optional[int] = None
+    message: Optional[str] = None
+    duration: float = 0
+    error: Optional[Exception] = None
+
+    def is_failed(self) -> bool:
+        return self.error is not None or self.status == 'Fail'
+
+
+@dataclass
+class FlushResult:
+    tables: Dict[str, TableFlushResult] = field(default_factory=dict)
+    duration: float = 0
+
+    def failed(self) -> List[TableFlushResult]:
+        return [result for result in self.tables.values() if result.is_failed()]
+
+    def is_partial_failure(self) -> bool:
+        return bool(self.failed())
+
+    def __getitem__(self, table: str) -> TableFlushResult:
+        return self.tables[table]
+
+
+class FlushCoordinator:
+    """
+    Runs independent table loads concurrently. At most `concurrency` loads are in flight at once.
+    A failing load does not cancel the others; its error is kept in the per-table result.
+    """
+
+    def __init__(self, concurrency: int = 8):
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._jobs: List[Tuple[str, Callable[..., Awaitable[Any]], tuple]] = []
+
+    def add(self, table: str, func: Callable[..., Awaitable[Any]], *args) -> 'FlushCoordinator':
+        self._jobs.append((table, func, args))
+        return self
+
+    async def _run(self, table: str, func: Callable[..., Awaitable[Any]], args: tuple) -> TableFlushResult:
+        async with self._semaphore:
+            start = perf_counter()
+            result = TableFlushResult(table=table)
+            try:
+                status = await func(*args)
+                # Stream loads return (status, total_rows, saved_rows, message)
+                if isinstance(status, tuple) and len(status) == 4:
+                    result.status, result.total_rows, result.saved_rows, result.message = status
+            except Exception as e:
+                result.error = e
+            result.duration = perf_counter() - start
+            return result
+
+    async def flush(self) -> FlushResult:
+        start = perf_counter()
+        jobs, self._jobs = self._jobs, []
+        results = await asyncio.gather(*[self._run(table, func, args) for table, func, args in jobs])
+
+        flush_result = FlushResult(
+            tables={result.table: result for result in results},
+            duration=perf_counter() - start
+        )
+
+        for failed in flush_result.failed():
+            logger.error(
+                f"Table `{failed.table}` load failed. Status={failed.status}, "
+                f"Message={failed.message if failed.error is None else str(failed.error)}",
+                exc_info=failed.error
+            )
+
+        return flush_result
@@ -0,0 +1,35 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+FindEntityPks = Callable[[Any, str], Awaitable[List[str]]]
+
+
+def hyper_edge_conditions(candidates: Sequence[Sequence[str]]) -> Tuple[List[str], Dict[str, tuple]]:
+    """
+    HAVING conditions of observations grouped from sys_obs_2_entity `o`, and their params. An observation
+    matches if it holds at least one entity of every candidate list. `entity_pks` are all candidates, for
+    the WHERE clause. Params are sorted, so the same candidates make the same query.
+    """
+    params = {"entity_pks": tuple(sorted({entity_pk for entity_pks in candidates for entity_pk in entity_pks}))}
+    conditions = []
+    for no, entity_pks in enumerate(candidates):
+        conditions.append(f"SUM(CASE WHEN o.entity_pk IN :entity_pks_{no} THEN 1 ELSE 0 END) > 0")
+        params[f"entity_pks_{no}"] = tuple(sorted(set(entity_pks)))
+    return conditions, params
+
+
+async def find_candidates(entities: Sequence[Tuple[Any, str]], find: FindEntityPks) -> List[List[str]]:
+    """
+    Entity pks of every (properties, entity type), resolved concurrently by `find`. Entities requested with
+    properties but not found are searched by type only, but only if at least one entity was found as
+    requested.
+    """
+    found = list(await asyncio.gather(*[find(properties, entity_type) for properties, entity_type in entities]))
+
+    if any(found):
+        broader = [no for no, (properties, _) in enumerate(entities) if not found[no] and properties]
+        broader_found = await asyncio.gather(*[find([], entities[no][1]) for no in broader])
+        for no, entity_pks in zip(broader, broader_found):
+            found[no] = entity_pks
+
+    return found
@@ -0,0 +1,21 @@
+from typing import Iterable, List, Sequence
+
+
+def keep_latest(rows: Iterable[dict], key_columns: Sequence[str], ts_column: str = 'ts') -> List[dict]:
+    """
+    Keeps one row per key, the one with the greatest `ts_column`. On equal ts the later row wins, as it would
+    in a primary-key table load. Rows without ts lose to any row with ts.
+    """
+    latest = {}
+    for row in rows:
+        key = tuple(row.get(column, None) for column in key_columns)
+        current = latest.get(key, None)
+        if current is None:
+            latest[key] = row
+            continue
+
+        ts, current_ts = row.get(ts_column, None), current.get(ts_column, None)
+        if current_ts is None or (ts is not None and ts >= current_ts):
+            latest[key] = row
+
+    return list(latest.values())
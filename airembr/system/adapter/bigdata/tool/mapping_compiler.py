@@ -0,0 +1,192 @@
+from collections import OrderedDict
+from typing import Callable, Any, Optional, Tuple
+
+from durable_dot_dict.dotdict import DotDict
+
+_MISSING = object()
+
+Converter = Optional[Callable[[Any], Any]]
+
+
+def _compile_getter(path: str) -> Callable[[dict], Any]:
+    keys = tuple(path.split('.'))
+
+    if len(keys) == 1:
+        def _get(root: dict):
+            return root.get(path, _MISSING)
+
+        return _get
+
+    def _get_path(root: dict):
+        # Flat rows may hold dotted keys literally, e.g. {"entity.pk": ...}
+        value = root.get(path, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        node = root
+        for key in keys:
+            if type(node) is not dict:
+                if isinstance(node, DotDict):
+                    # Not a copy. DotDict wraps the dict it was created with.
+                    node = node.to_dict()
+                elif not isinstance(node, dict):
+                    return _MISSING
+            node = node.get(key, _MISSING)
+            if node is _MISSING:
+                return _MISSING
+        return node
+
+    return _get_path
+
+
+_STRING_TYPES = ('varchar', 'char', 'string', 'text')
+_INTEGER_TYPES = ('tinyint', 'smallint', 'int', 'bigint', 'largeint')
+_FLOAT_TYPES = ('float', 'double', 'decimal')
+
+_TRUE = {'1', 'true', 'yes', 'on'}
+_FALSE = {'0', 'false', 'no', 'off'}
+
+
+def _to_str(value) -> str:
+    return value if type(value) is str else str(value)
+
+
+def _to_int(value) -> int:
+    return value if type(value) is int else int(value)
+
+
+def _to_float(value) -> float:
+    return value if type(value) is float else float(value)
+
+
+def _to_bool(value) -> bool:
+    if type(value) is bool:
+        return value
+    if isinstance(value, str):
+        lower_value = value.strip().lower()
+        if lower_value in _TRUE:
+            return True
+        if lower_value in _FALSE:
+            return False
+        raise ValueError(f"Invalid boolean value `{value}`.")
+    return bool(value)
+
+
+def _to_list(value) -> list:
+    if type(value) is list:
+        return value
+    if isinstance(value, (tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+def _is_literal(value: str) -> bool:
+    if value.lower() in _TRUE or value.lower() in _FALSE:
+        return True
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def compile_converter(column_type: Optional[str]) -> Converter:
+    """
+    Conversion of values of `column_type`, or None if values are stored as they are: json (with
+    json_as_string=False), datetime and date values are serialized by the stream load client.
+    """
+    column_type = str(column_type or '').strip().lower()
+    if column_type.startswith('array'):
+        return _to_list
+    if column_type.startswith(_STRING_TYPES):
+        return _to_str
+    if column_type.startswith('bool'):
+        return _to_bool
+    if column_type.startswith(_INTEGER_TYPES):
+        return _to_int
+    if column_type.startswith(_FLOAT_TYPES):
+        return _to_float
+    return None
+
+
+def compile_default(default_value: Optional[str], convert: Converter) -> Any:
+    """
+    Value of a missing column, converted once. Default values are DDL literals, e.g. `'1'` or `0`.
+    SQL expressions, e.g. CURRENT_TIMESTAMP, are left to the database: the column is not sent.
+    """
+    if default_value is None:
+        return _MISSING
+
+    if isinstance(default_value, str):
+        literal = default_value.strip()
+        if len(literal) >= 2 and literal[0] == literal[-1] and literal[0] in "'\"":
+            literal = literal[1:-1]
+        elif literal.upper() == 'NULL' or not _is_literal(literal):
+            return _MISSING
+        default_value = literal
+
+    return convert(default_value) if convert is not None else default_value
+
+
+class CompiledMapping:
+    """
+    Row projection for one EntityToTableMapping. Property paths, type conversions and defaults are compiled
+    once per mapping, not resolved per row and column.
+
+    A column gets the converted row value, or its default if the value is missing or None. Columns without
+    a value and without a default are not set.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self._columns: Tuple[Tuple[str, Callable, Converter, Any], ...] = tuple(
+            self._compile_column(column_mapping) for column_mapping in mapping.columns
+        )
+
+    @staticmethod
+    def _compile_column(column_mapping) -> Tuple[str, Callable, Converter, Any]:
+        convert = compile_converter(getattr(column_mapping, 'column_type', None))
+        try:
+            default = compile_default(getattr(column_mapping, 'default_value', None), convert)
+        except ValueError as e:
+            raise ValueError(f"Invalid default of column `{column_mapping.column}`. Details: {str(e)}")
+        return column_mapping.column, _compile_getter(column_mapping.property), convert, default
+
+    def __call__(self, row) -> dict:
+        root = row.to_dict() if isinstance(row, DotDict) else row
+        table_values = {}
+        for column, getter, convert, default in self._columns:
+            value = getter(root)
+            if value is _MISSING or value is None:
+                if default is not _MISSING:
+                    table_values[column] = default
+            elif convert is None:
+                table_values[column] = value
+            else:
+                table_values[column] = convert(value)
+        return table_values
+
+
+class MappingCompiler:
+
+    def __init__(self, max_size: int = 256):
+        self._max_size = max_size
+        self._cache: OrderedDict[int, CompiledMapping] = OrderedDict()
+
+    def compile(self, mapping) -> CompiledMapping:
+        key = id(mapping)
+        compiled = self._cache.get(key, None)
+
+        # Compiled mapping holds a reference to its mapping, so the id can not be reused while cached
+        if compiled is not None and compiled.mapping is mapping:
+            self._cache.move_to_end(key)
+            return compiled
+
+        compiled = CompiledMapping(mapping)
+        self._cache[key] = compiled
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def clear(self):
+        self._cache.clear()
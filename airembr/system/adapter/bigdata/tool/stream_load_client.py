@@ -0,0 +1,103 @@
+import asyncio
+import base64
+from datetime import datetime, timezone
+from typing import List, Optional, Union
+from urllib.parse import urlsplit, urlunsplit
+
+import aiohttp
+import orjson
+
+from airembr.system.process.logging.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 3
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        # DATETIME columns take naive UTC
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=' ')
+    return str(value)
+
+
+def encode_rows(rows: List[dict]) -> bytes:
+    return orjson.dumps(rows, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+def encode_row(row: dict) -> bytes:
+    return orjson.dumps(row, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class StreamLoadClient:
+    """
+    StarRocks stream load over HTTP that sends the `label` header, so a load retried or replayed with the same
+    label is rejected with "Label Already Exists" instead of inserting the rows twice. With `merge_condition`
+    a row updates a primary key table only if its value of that column is not older than the stored one.
+
+    The FE answers with a redirect to a BE. It is followed here, not by aiohttp, so credentials are sent to the
+    BE too. `be_host` replaces the BE host from the redirect, for BEs that advertise an address unreachable
+    from the client (e.g. inside docker).
+    """
+
+    def __init__(self, host: str, port: int, user: str, password: str = '', be_host: Optional[str] = None):
+        self.url = f"http://{host}:{port}"
+        self.be_host = be_host
+        credentials = base64.b64encode(f"{user}:{password or ''}".encode()).decode()
+        self._authorization = f"Basic {credentials}"
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            await self.close()
+            self._session = aiohttp.ClientSession()
+            self._loop = loop
+        return self._session
+
+    def _be_url(self, location: str) -> str:
+        if not self.be_host:
+            return location
+        parts = urlsplit(location)
+        netloc = f"{self.be_host}:{parts.port}" if parts.port else self.be_host
+        return urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
+
+    async def stream(self, database: str, table: str, rows: Union[List[dict], bytes, bytearray],
+                     timeout: Optional[int] = 10, label: Optional[str] = None,
+                     merge_condition: Optional[str] = None) -> dict:
+        """ Loads rows, or a body of rows already encoded as a JSON array (see StreamLoadSplitter). """
+        session = await self._get_session()
+        body = rows if isinstance(rows, (bytes, bytearray)) else encode_rows(rows)
+        headers = {
+            "format": "json",
+            "strip_outer_array": "true",
+            "Authorization": self._authorization,
+        }
+        if label:
+            headers["label"] = label
+        if merge_condition:
+            headers["merge_condition"] = merge_condition
+
+        url = f"{self.url}/api/{database}/{table}/_stream_load"
+        for _ in range(_MAX_REDIRECTS):
+            async with session.put(url, data=body, headers=headers, allow_redirects=False, expect100=True,
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status in _REDIRECTS:
+                    url = self._be_url(response.headers["Location"])
+                    continue
+                return orjson.loads(await response.read())
+
+        raise aiohttp.ClientError(f"Too many redirects of stream load to `{table}`.")
+
+    async def close(self):
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            try:
+                await session.close()
+            except Exception as e:
+                # Session of a closed loop
+                logger.debug(f"Could not close stream load session: {repr(e)}")
@@ -0,0 +1,63 @@
+import asyncio
+import random
+from typing import Optional
+
+# Load committed, but not yet visible. Safe to retry only with the same label.
+PUBLISH_TIMEOUT = 'Publish Timeout'
+LABEL_ALREADY_EXISTS = 'Label Already Exists'
+
+_BUSY_MARKERS = (
+    'busy',
+    'too many',
+    'timeout',
+    'timed out',
+    'overload',
+    'try again',
+    'memory exceed',
+    'service unavailable'
+)
+
+
+class StreamLoadError(Exception):
+    pass
+
+
+def is_busy(status: Optional[str], message: Optional[str]) -> bool:
+    if status == PUBLISH_TIMEOUT:
+        return True
+    if status != 'Fail' or not message:
+        return False
+    message = message.lower()
+    return any(marker in message for marker in _BUSY_MARKERS)
+
+
+def retry_delays(retries: int, backoff: float, max_backoff: float):
+    """ Exponential backoff with full jitter. """
+    for attempt in range(retries):
+        yield random.uniform(0, min(max_backoff, backoff * (2 ** attempt)))
+
+
+class LoadBackpressure:
+    """
+    Adaptive delay applied before each stream load. It doubles every time StarRocks reports it is busy and halves
+    on each successful load. Awaiting it slows down the consumer that runs the load, so the queue batcher
+    backs off instead of sending more loads to an overloaded FE.
+    """
+
+    def __init__(self, initial_delay: float = 0.1, max_delay: float = 30.0):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+
+    def on_busy(self):
+        self.delay = min(self.max_delay, max(self.initial_delay, self.delay * 2))
+
+    def on_success(self):
+        self.delay = self.delay / 2 if self.delay > self.initial_delay else 0.0
+
+    def is_active(self) -> bool:
+        return self.delay > 0
+
+    async def wait(self):
+        if self.delay > 0:
+            await asyncio.sleep(self.delay)
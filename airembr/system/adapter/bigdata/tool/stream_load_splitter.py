@@ -0,0 +1,127 @@
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Iterable, Generator, List, Optional, Tuple
+
+import orjson
+
+from airembr.system.adapter.bigdata.tool.stream_load_client import encode_row
+
+
+def batch_label(payloads: Iterable) -> str:
+    """
+    Label of a batch by the content of its queue payloads, in order. A replay of the batch gets the same
+    label. Ids alone are not enough: they come from the client, and a batch that resends or corrects
+    observations with the same ids must not be taken for a replay. Payloads hold no worker insert times,
+    those are added to the rows after.
+    """
+    digest = blake2b(digest_size=16)
+    for payload in payloads:
+        digest.update(orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+@dataclass
+class StreamLoadSplit:
+    label: Optional[str]
+    index: int
+    rows: List[dict] = field(default_factory=list)
+    size: int = 0
+    count: int = 0
+    # JSON array of the rows, as sent in the stream load body. Only if the splitter encodes.
+    body: Optional[bytearray] = None
+
+
+@dataclass
+class StreamLoadResult:
+    status: Optional[str] = None
+    total_rows: Optional[int] = None
+    saved_rows: Optional[int] = None
+    message: Optional[str] = None
+    splits: int = 0
+
+    def add(self, status: Optional[str], total_rows: Optional[int], saved_rows: Optional[int],
+            message: Optional[str]):
+        self.splits += 1
+
+        # One failed split fails the whole load
+        if self.status != 'Fail':
+            self.status = status
+            self.message = message
+
+        if total_rows is not None:
+            self.total_rows = (self.total_rows or 0) + total_rows
+        if saved_rows is not None:
+            self.saved_rows = (self.saved_rows or 0) + saved_rows
+
+    def to_tuple(self) -> Tuple[Optional[str], Optional[int], Optional[int], Optional[str]]:
+        return self.status, self.total_rows, self.saved_rows, self.message
+
+
+class StreamLoadSplitter:
+    """
+    Cuts a row iterable into stream loads of at most `max_rows` rows and about `max_bytes` of JSON lines.
+    Rows are pulled lazily, so only one split is held in memory.
+
+    Every row is encoded once, to measure it. With `encode` the encoded rows are appended to the split body
+    and the rows are not kept, so a client that sends the body does not encode them again. Without it
+    splits keep the rows, for clients that encode them themselves.
+
+    With a `label` of the batch, split n is labelled `<table>_<label>_<n>`, so a replay of the same batch reuses
+    the labels and StarRocks rejects the splits that were loaded. The label must identify the batch content as
+    received (see batch_label), not the rows: rows carry insert times that change on replay. Without a label
+    splits are not labelled.
+    """
+
+    def __init__(self, table: str, max_rows: int = 100000, max_bytes: int = 32 * 1024 * 1024,
+                 label: Optional[str] = None, encode: bool = False):
+        self.table = table
+        self.max_rows = max(1, max_rows)
+        self.max_bytes = max(1, max_bytes)
+        self.label = label
+        self.encode = encode
+
+    def _get_label(self, index: int) -> Optional[str]:
+        if self.label:
+            return f"{self.table}_{self.label}_{index}"
+        return None
+
+    def _split(self, index: int, rows: List[dict], body: bytearray, count: int, size: int) -> StreamLoadSplit:
+        if self.encode:
+            body += b"]"
+            return StreamLoadSplit(label=self._get_label(index), index=index, size=len(body), count=count,
+                                   body=body)
+        return StreamLoadSplit(label=self._get_label(index), index=index, rows=rows, size=size, count=count)
+
+    def split(self, rows: Iterable[dict]) -> Generator[StreamLoadSplit, None, None]:
+        index = 0
+        current: List[dict] = []
+        body = bytearray(b"[")
+        count = 0
+        size = 0
+
+        for row in rows:
+            # One JSON line, as sent in the stream load body
+            line = encode_row(row)
+            line_size = len(line) + 1
+
+            # A single row larger than max_bytes still goes out, alone
+            if count and (count >= self.max_rows or size + line_size > self.max_bytes):
+                yield self._split(index, current, body, count, size)
+                index += 1
+                current = []
+                body = bytearray(b"[")
+                count = 0
+                size = 0
+
+            if self.encode:
+                if count:
+                    body += b","
+                body += line
+            else:
+                current.append(row)
+            count += 1
+            size += line_size
+
+        if count:
+            yield self._split(index, current, body, count, size)
@@ -0,0 +1,28 @@
+from array import array
+from typing import Dict, Generator, Iterable
+
+# ARRAY<FLOAT> keeps float32. 9 significant digits round trip every float32 exactly, more digits are only
+# sent and parsed to be thrown away.
+FLOAT32_DIGITS = 9
+
+
+def compact_vector(vector: Iterable[float], digits: int = FLOAT32_DIGITS) -> list:
+    """
+    Converts the vector to float32, as StarRocks does, and writes it with `digits` significant digits, so it
+    is serialized as `0.012345679` rather than `0.012345678901234567`. The stored float32 values are the
+    same, the stream load body of a typical embedding is almost halved.
+    """
+    return [float(f"{value:.{digits}g}") for value in array('f', vector)]
+
+
+def vector_rows(vectors: Dict[str, Iterable[float]], model: str) -> Generator[dict, None, None]:
+    """
+    Yields sys_text_vector rows for {text_id: vector}. Rows are made lazily, so the stream load
+    splitter holds only one split of encoded vectors in memory.
+    """
+    for text_id, vector in vectors.items():
+        yield {
+            'text_id': text_id,
+            'model': model,
+            'vector': compact_vector(vector)
+        }
@@ -1,5 +1,8 @@
 from airembr.system.config.sys_config import sys_config
 from airembr.protocol.cache.cache_protocol import CacheProtocol
+from airembr.protocol.cache.async_cache_protocol import AsyncCacheProtocol
+from airembr.protocol.cache.async_hcache_protocol import AsyncHCacheProtocol
+from airembr.protocol.cache.async_pubsub_protocol import AsyncPubSubProtocol
 from airembr.protocol.cache.hcache_protocol import HCacheProtocol
 from airembr.protocol.cache.member_cache_protocol import MemberCacheProtocol
 from airembr.protocol.cache.pubsub_protocol import PubSubProtocol
@@ -13,6 +16,10 @@ if _cache_adapter_var == 'redis':
     from airembr.system.adapter.cache.redis.hcache import RedisHCacheAdapter
     from airembr.system.adapter.cache.redis.members import RedisMembersCacheAdapter
     from airembr.system.adapter.cache.redis.pubsub import RedisPubSubAdapter
+    from airembr.system.adapter.cache.redis.async_cache import AsyncRedisCacheAdapter
+    from airembr.system.adapter.cache.redis.async_hcache import AsyncRedisHCacheAdapter
+    from airembr.system.adapter.cache.redis.async_lcache import AsyncRedisListCacheAdapter
+    from airembr.system.adapter.cache.redis.async_pubsub import AsyncRedisPubSubAdapter
 
 
 @run_once
@@ -61,4 +68,46 @@ def list_cache_adapter(prefix: str = None) -> RedisListCacheAdapter:
     else:
         raise ValueError(f"Unknown list cache adapter `{_cache_adapter_var}`")
 
-    return _rcache_adapter
\ No newline at end of file
+    return _rcache_adapter
+
+
+# Asyncio adapters. They do not block the event loop and support pipelines.
+
+@run_once
+def async_cache_adapter() -> AsyncCacheProtocol:
+    if _cache_adapter_var.lower() == 'redis':
+        _rcache_adapter = AsyncRedisCacheAdapter()
+    else:
+        raise ValueError(f"Unknown async cache adapter `{_cache_adapter_var}`")
+
+    return _rcache_adapter
+
+
+@run_once
+def async_hcache_adapter() -> AsyncHCacheProtocol:
+    if _cache_adapter_var.lower() == 'redis':
+        _hcache_adapter = AsyncRedisHCacheAdapter()
+    else:
+        raise ValueError(f"Unknown async hcache adapter `{_cache_adapter_var}`")
+
+    return _hcache_adapter
+
+
+@run_once
+def async_pubsub_adapter() -> AsyncPubSubProtocol:
+    if _cache_adapter_var.lower() == 'redis':
+        _ps_cache_adapter = AsyncRedisPubSubAdapter()
+    else:
+        raise ValueError(f"Unknown async pubsub adapter `{_cache_adapter_var}`")
+
+    return _ps_cache_adapter
+
+
+@run_once
+def async_list_cache_adapter(prefix: str = None) -> AsyncRedisListCacheAdapter:
+    if _cache_adapter_var.lower() == 'redis':
+        _rcache_adapter = AsyncRedisListCacheAdapter(prefix)
+    else:
+        raise ValueError(f"Unknown async list cache adapter `{_cache_adapter_var}`")
+
+    return _rcache_adapter
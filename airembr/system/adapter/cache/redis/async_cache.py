@@ -0,0 +1,89 @@
+from typing import List, Dict, Optional
+
+import msgpack
+
+from airembr.protocol.cache.async_cache_protocol import AsyncCacheProtocol
+from airembr.sdk.storage.cache.client.redis_async_client import AsyncRedisClient, AsyncRedisPipeline
+
+
+class AsyncRedisCacheAdapter(AsyncCacheProtocol):
+
+    def __init__(self):
+        self._client = AsyncRedisClient()
+
+    def pipeline(self, transaction: bool = False) -> AsyncRedisPipeline:
+        return self._client.pipeline(transaction)
+
+    async def get(self, key: str):
+        return await self._client.get(key)
+
+    async def get_msgpack(self, key: str):
+        value = await self._client.get(key)
+        if value is None:
+            return None
+
+        return msgpack.unpackb(value)
+
+    async def mget(self, keys: List[str]) -> list:
+        return await self._client.mget(keys)
+
+    async def set(self, key: str, value, ex=None, nx: bool = None):
+        return await self._client.set(
+            name=key,
+            value=value,
+            ex=ex,
+            nx=nx
+        )
+
+    async def set_msgpack(self, key, value, ex=None):
+        return await self._client.set(
+            name=key,
+            value=msgpack.packb(value, default=str),
+            ex=ex
+        )
+
+    async def mset(self, mapping: dict, ex: Optional[int] = None):
+        if not mapping:
+            return True
+
+        if ex is None:
+            return await self._client.mset(mapping)
+
+        # MSET has no expiry, so SET EX for every key in one round trip
+        pipeline = self._client.pipeline()
+        for key, value in mapping.items():
+            pipeline.set(key, value, ex=ex)
+        return all(await pipeline.execute())
+
+    async def delete(self, key, skip_tenant: bool = False):
+        return await self._client.delete(key, skip_tenant)
+
+    async def exists(self, key: str):
+        return await self._client.exists(key)
+
+    async def exists_many(self, keys: List[str]) -> Dict[str, bool]:
+        # EXISTS with many keys returns only a count, so one EXISTS per key, pipelined
+        if not keys:
+            return {}
+        pipeline = self._client.pipeline()
+        for key in keys:
+            pipeline.exists(key)
+        return {key: bool(found) for key, found in zip(keys, await pipeline.execute())}
+
+    async def expire(self, key, ttl):
+        return await self._client.expire(key, ttl)
+
+    async def incr(self, key: str):
+        return await self._client.incr(key)
+
+    async def ttl(self, key: str):
+        return await self._client.ttl(key)
+
+    async def persist(self, key):
+        return await self._client.persist(key)
+
+    async def ping(self):
+        return await self._client.ping()
+
+    def scan(self, match=None, count=None):
+        return self._client.scan(match, count)
@@ -0,0 +1,21 @@
+from typing import List
+
+from airembr.protocol.cache.async_hcache_protocol import AsyncHCacheProtocol
+from airembr.sdk.storage.cache.client.redis_async_client import AsyncRedisClient
+
+
+class AsyncRedisHCacheAdapter(AsyncHCacheProtocol):
+    def __init__(self):
+        self._client = AsyncRedisClient()
+
+    async def hexists(self, name, key):
+        return await self._client.hexists(name, key)
+
+    async def hset(self, name, key, value):
+        return await self._client.hset(name, key, value)
+
+    async def hget(self, name, key):
+        return await self._client.hget(name, key)
+
+    async def hdel(self, name: str, *keys: List):
+        return await self._client.hdel(name, *keys)
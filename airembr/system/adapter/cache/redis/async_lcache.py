@@ -0,0 +1,93 @@
+from typing import List, Tuple, Optional
+
+import msgpack
+
+from airembr.sdk.storage.cache.client.redis_async_client import AsyncRedisClient, AsyncRedisPipeline
+
+
+class AsyncRedisListCacheAdapter:
+
+    def __init__(self, prefix: str = None):
+        self.prefix = prefix
+        self._client = AsyncRedisClient()
+
+    def full_key(self, key: str) -> str:
+        if self.prefix:
+            return f"{self.prefix}:{key}"
+        return key
+
+    def pipeline(self, transaction: bool = False) -> AsyncRedisPipeline:
+        """ Pipeline for batching. Keys passed to it must be made with full_key. """
+        return self._client.pipeline(transaction)
+
+    # ----------------- List operations -----------------
+
+    async def set(self, key, value, ex=None, nx: bool = None):
+        return await self._client.set(self.full_key(key), value, ex=ex, nx=nx)
+
+    async def get(self, key: str):
+        return await self._client.get(self.full_key(key))
+
+    async def mget(self, keys: List[str]) -> list:
+        return await self._client.mget([self.full_key(key) for key in keys])
+
+    async def rpush(self, key: str, *value):
+        """Append value to the end of the list"""
+        return await self._client.rpush(self.full_key(key), *value)
+
+    async def lpush(self, key: str, *value):
+        """Push value to the start of the list"""
+        return await self._client.lpush(self.full_key(key), *value)
+
+    async def lrange(self, key: str, start: int = 0, end: int = -1):
+        """Get a range of elements from the list"""
+        return await self._client.lrange(self.full_key(key), start, end)
+
+    async def lrange_with_ttl(self, keys: List[str], start: int = 0, end: int = -1) -> List[
+        Tuple[list, Optional[int]]]:
+        """LRANGE and TTL of many lists in one round trip. Returns (items, ttl) per key, in order."""
+        if not keys:
+            return []
+
+        pipeline = self._client.pipeline()
+        for key in keys:
+            full_key = self.full_key(key)
+            pipeline.lrange(full_key, start, end)
+            pipeline.ttl(full_key)
+
+        result = await pipeline.execute()
+        return [(result[i], result[i + 1]) for i in range(0, len(result), 2)]
+
+    async def ltrim(self, key: str, start: int, end: int):
+        """Keep only the given range of the list"""
+        return await self._client.ltrim(self.full_key(key), start, end)
+
+    async def lindex(self, key: str, index: int):
+        """Get an element by index"""
+        return await self._client.lindex(self.full_key(key), index)
+
+    async def lset(self, key: str, index: int, value):
+        """Set an element at a specific index"""
+        return await self._client.lset(self.full_key(key), index, value)
+
+    async def expire(self, key: str, ttl: int):
+        """Set TTL on the list"""
+        return await self._client.expire(self.full_key(key), ttl)
+
+    async def ttl(self, key: str):
+        """Get TTL of the list"""
+        return await self._client.ttl(self.full_key(key))
+
+    async def delete(self, key: str):
+        """Delete the list"""
+        return await self._client.delete(self.full_key(key))
+
+    # ----------------- Optional msgpack helpers -----------------
+
+    async def rpush_msgpack(self, key: str, value):
+        packed = msgpack.packb(value, default=str)
+        return await self.rpush(key, packed)
+
+    async def lrange_msgpack(self, key: str, start: int = 0, end: int = -1):
+        items = await self.lrange(key, start, end)
+        return [msgpack.unpackb(item) for item in items if item is not None]
@@ -0,0 +1,23 @@
+from typing import AsyncGenerator
+
+from airembr.protocol.cache.async_pubsub_protocol import AsyncPubSubProtocol
+from airembr.sdk.storage.cache.client.redis_async_client import AsyncRedisClient
+
+
+class AsyncRedisPubSubAdapter(AsyncPubSubProtocol):
+
+    def __init__(self):
+        self._client = AsyncRedisClient()
+
+    async def subscribe(self, channel) -> AsyncGenerator:
+        subscriber = self._client.pubsub()
+        await subscriber.subscribe(channel)
+        try:
+            async for message in subscriber.listen():
+                yield message
+        finally:
+            await subscriber.unsubscribe(channel)
+            await subscriber.aclose()
+
+    async def publish(self, channel, payload):
+        return await self._client.publish(channel, payload)
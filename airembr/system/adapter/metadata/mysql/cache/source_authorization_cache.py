@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Optional, Tuple, FrozenSet, Dict, Iterable
+
+from airembr.model.metadata.sys_source import EventSource
+from airembr.system.config.memory_cache_config import memory_cache_config
+
+# (tenant, production, allowed bridges, source id)
+AuthorizationKey = Tuple[Optional[str], bool, FrozenSet[str], str]
+
+
+@dataclass
+class SourceAuthorization:
+    source: Optional[EventSource]
+    error: Optional[str] = None
+
+    def is_allowed(self) -> bool:
+        return self.error is None
+
+
+class SourceAuthorizationCache:
+    """
+    Keeps the outcome of event source checks for `ttl` seconds. Rejections, e.g. source not found, are kept
+    for `negative_ttl` seconds only, so a source created or enabled elsewhere is accepted soon.
+    Entries of a tenant are dropped when its event sources are changed by EventSourceService.
+    """
+
+    def __init__(self, ttl: float = 60, max_size: int = 10000, negative_ttl: float = 5):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._items: OrderedDict[AuthorizationKey, Tuple[SourceAuthorization, float]] = OrderedDict()
+
+    @staticmethod
+    def key(tenant: Optional[str], production: bool, allowed_bridges: Iterable[str],
+            source_id: str) -> AuthorizationKey:
+        return tenant, bool(production), frozenset(allowed_bridges), source_id
+
+    def get(self, key: AuthorizationKey) -> Optional[SourceAuthorization]:
+        item = self._items.get(key, None)
+        if item is None:
+            return None
+
+        authorization, expires_at = item
+        if expires_at < monotonic():
+            del self._items[key]
+            return None
+
+        self._items.move_to_end(key)
+        return authorization
+
+    def get_many(self, keys: Iterable[AuthorizationKey]) -> Dict[AuthorizationKey, SourceAuthorization]:
+        result = {}
+        for key in keys:
+            authorization = self.get(key)
+            if authorization is not None:
+                result[key] = authorization
+        return result
+
+    def set(self, key: AuthorizationKey, authorization: SourceAuthorization):
+        ttl = self.ttl if authorization.is_allowed() else min(self.ttl, self.negative_ttl)
+        self._items[key] = (authorization, monotonic() + ttl)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, tenant: Optional[str] = None):
+        if tenant is None:
+            self._items.clear()
+            return
+
+        for key in [key for key in self._items if key[0] == tenant]:
+            del self._items[key]
+
+    def __len__(self):
+        return len(self._items)
+
+
+source_authorization_cache = SourceAuthorizationCache(ttl=memory_cache_config.source_ttl,
+                                                      negative_ttl=memory_cache_config.negative_cache_ttl)
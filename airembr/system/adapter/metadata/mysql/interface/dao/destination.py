@@ -1,10 +1,9 @@
 import json
 from typing import List, Tuple, Optional, Callable, Generator
 
-from airembr.system.decorator.proxy.proxy_decorator import invalidate_cache_proxy
+from airembr.system.decorator.proxy.proxy_decorator import invalidate_cache_proxy, singleflight_cache
 from airembr.system.adapter.metadata.mysql.mapping.resource_mapping import map_to_resource_from_dict
 from airembr.model.metadata.sys_destination import Destination, DestinationConfig
-from airembr.system.process.locking.async_locking import async_lock
 from airembr.db.preconfig.preconfigured_metadata import pc_destinations
 from airembr.system.adapter.metadata.mysql.cache.cache_tags import DESTINATION_TAG
 from airembr.system.adapter.metadata.mysql.mapping.destination_mapping import map_to_destination
@@ -89,18 +88,16 @@ async def load_destinations_for_event_type(event_type: str, source_id: str) -> T
 
 # Cache
 
-# @cache_proxy(**DESTINATION_TAG)
+@singleflight_cache(**DESTINATION_TAG)
 async def load_enabled_destinations(trigger_type: str, event_type: str = None) -> List[Destination]:
-    async with async_lock('mysql-query'):
-        destination, total = await _load_enabled_destinations(trigger_type, event_type)
-        return destination
+    destination, total = await _load_enabled_destinations(trigger_type, event_type)
+    return destination
 
 
-# @cache_proxy(**DESTINATION_TAG)
+@singleflight_cache(**DESTINATION_TAG)
 async def load_event_destinations(event_type, source_id) -> List[Destination]:
-    async with async_lock('mysql-query'):
-        destination, total = await load_destinations_for_event_type(event_type, source_id)
-        return destination
+    destination, total = await load_destinations_for_event_type(event_type, source_id)
+    return destination
 
 
 @invalidate_cache_proxy(names=[DESTINATION_TAG['name']])
@@ -1,7 +1,6 @@
 from typing import Tuple, Optional, List, Callable
 
-from airembr.system.decorator.proxy.proxy_decorator import cache_proxy, invalidate_cache_proxy
-from airembr.system.process.locking.async_locking import async_lock
+from airembr.system.decorator.proxy.proxy_decorator import singleflight_cache, invalidate_cache_proxy
 from airembr.db.preconfig.preconfigured_metadata import pc_event_mapping
 from airembr.model.metadata.sys_event_mapping import EventTypeMetadata
 from airembr.system.adapter.metadata.mysql.cache.cache_tags import EVENT_MAPPING_TAG
@@ -78,13 +77,12 @@ async def load_by_event_type_id(event_type_id: str, only_enabled: bool = True) -
 #             allow_null_values=True,
 #             return_cache_on_error=True
 #             )
-@cache_proxy(**EVENT_MAPPING_TAG, cache_key_func=lambda args, kwargs: kwargs['event_type_id'])
+@singleflight_cache(**EVENT_MAPPING_TAG, cache_key_func=lambda args, kwargs: kwargs['event_type_id'])
 async def load_event_mapping(event_type_id: str) -> Optional[EventTypeMetadata]:
-    async with async_lock('mysql-query'):
-        mappings = await load_by_event_type_id(event_type_id, only_enabled=True)
-        if not mappings:
-            return None
-        return mappings
+    mappings = await load_by_event_type_id(event_type_id, only_enabled=True)
+    if not mappings:
+        return None
+    return mappings
 
 
 @invalidate_cache_proxy(names=[EVENT_MAPPING_TAG['name']])
@@ -1,7 +1,6 @@
 from typing import Optional, Tuple, Callable, List
 
-from airembr.system.decorator.proxy.proxy_decorator import cache_proxy, invalidate_cache_proxy
-from airembr.system.process.locking.async_locking import async_lock
+from airembr.system.decorator.proxy.proxy_decorator import singleflight_cache, invalidate_cache_proxy
 from airembr.system.adapter.metadata.mysql.cache.cache_tags import EVENT_RESHAPING_TAG
 from airembr.db.preconfig.preconfigured_metadata import pc_event_reshaping
 from airembr.model.metadata.sys_evt_reshaping import EventReshapingSchema
@@ -62,13 +61,12 @@ async def load_event_reshaping_by_event_type(event_type: str, only_enabled: bool
 
 # Cache
 
-@cache_proxy(**EVENT_RESHAPING_TAG, cache_key_func=lambda args, kwargs: args[0])
+@singleflight_cache(**EVENT_RESHAPING_TAG, cache_key_func=lambda args, kwargs: args[0])
 async def load_and_convert_reshaping(event_type: str) -> Optional[List[EventReshapingSchema]]:
-    async with async_lock('mysql-query'):
-        reshape_schemas, total = await load_event_reshaping_by_event_type(event_type)
-        if reshape_schemas:
-            return reshape_schemas
-        return None
+    reshape_schemas, total = await load_event_reshaping_by_event_type(event_type)
+    if reshape_schemas:
+        return reshape_schemas
+    return None
 
 
 @invalidate_cache_proxy(names=[EVENT_RESHAPING_TAG['name']])
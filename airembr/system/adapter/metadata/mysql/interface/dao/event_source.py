@@ -1,7 +1,7 @@
 from typing import List, Tuple, Optional, Dict, Callable
 
-from airembr.system.decorator.proxy.proxy_decorator import invalidate_cache_proxy
-from airembr.system.process.locking.async_locking import async_lock
+from airembr.system.decorator.proxy.proxy_decorator import invalidate_cache_proxy, singleflight_cache, \
+    singleflight_cache_many
 from airembr.system.adapter.metadata.mysql.cache.cache_tags import EVENT_SOURCE_TAG
 from airembr.db.preconfig.preconfigured_metadata import pc_event_sources
 from airembr.model.metadata.sys_source import EventSource
@@ -58,6 +58,26 @@ async def load_event_source_by_id(source_id) -> Optional[EventSource]:
     return record.map_to_object(map_to_event_source)
 
 
+async def load_event_sources_by_ids(source_ids: List[str]) -> Dict[str, EventSource]:
+    # One query for all sources of a request
+    event_sources = {}
+    missing = []
+    for source_id in source_ids:
+        event_source = pc_event_sources.get_by_id(source_id, EventSource)
+        if event_source:
+            event_sources[source_id] = event_source
+        else:
+            missing.append(source_id)
+
+    if missing:
+        records = await ess.load_by_ids_in_deployment_mode(missing)
+        if records.exists():
+            for event_source in records.map_to_objects(map_to_event_source):
+                event_sources.setdefault(event_source.id, event_source)
+
+    return event_sources
+
+
 async def load_all_event_sources(query, limit) -> Tuple[List[EventSource], int]:
     records = await ess.load_all_in_deployment_mode(query, limit=limit)
     return _append_pre_config_records(records, map_to_event_source)
@@ -93,11 +113,14 @@ async def load_event_source_entities(type: Optional[str] = None) -> Tuple[
 
 # Cache
 
-# @cache_proxy(**EVENT_SOURCE_TAG,
-#              cache_key_func=lambda args, kwargs: args[0])
+@singleflight_cache(**EVENT_SOURCE_TAG, cache_key_func=lambda args, kwargs: args[0])
 async def load_event_source_via_cache(source_id) -> Optional[EventSource]:
-    async with async_lock('mysql-query'):
-        return await load_event_source_by_id(source_id)
+    return await load_event_source_by_id(source_id)
+
+
+@singleflight_cache_many(**EVENT_SOURCE_TAG)
+async def load_event_sources_via_cache(source_ids: List[str]) -> Dict[str, EventSource]:
+    return await load_event_sources_by_ids(source_ids)
 
 
 @invalidate_cache_proxy(names=[EVENT_SOURCE_TAG['name']])
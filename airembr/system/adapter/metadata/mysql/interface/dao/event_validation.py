@@ -1,7 +1,6 @@
 from typing import Optional, Tuple, List, Callable
 
-from airembr.system.decorator.proxy.proxy_decorator import cache_proxy, invalidate_cache_proxy
-from airembr.system.process.locking.async_locking import async_lock
+from airembr.system.decorator.proxy.proxy_decorator import singleflight_cache, invalidate_cache_proxy
 from airembr.db.preconfig.preconfigured_metadata import pc_event_validation
 from airembr.model.metadata.sys_evt_validation import EventValidator
 from airembr.system.adapter.metadata.mysql.cache.cache_tags import EVENT_VALIDATION_TAG
@@ -61,11 +60,10 @@ async def load_by_event_type(event_type: str, only_enabled: bool = True):
 #             max_one_cache_fill_every=memory_cache.max_one_cache_fill_every,
 #             return_cache_on_error=True
 #             )
-@cache_proxy(**EVENT_VALIDATION_TAG, cache_key_func=lambda args, kwargs: args[0])
+@singleflight_cache(**EVENT_VALIDATION_TAG, cache_key_func=lambda args, kwargs: args[0])
 async def load_event_validation(event_type: str) -> List[EventValidator]:
-    async with async_lock('mysql-query'):
-        records, _ = await load_by_event_type(event_type, only_enabled=True)
-        return records
+    records, _ = await load_by_event_type(event_type, only_enabled=True)
+    return records
 
 
 @invalidate_cache_proxy(names=[EVENT_VALIDATION_TAG['name']])
@@ -1,8 +1,10 @@
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List
 
 from sqlalchemy import desc
 
 from airembr.model.metadata.sys_source import EventSource
+from airembr.model.system.context import get_context
+from airembr.system.adapter.metadata.mysql.cache.source_authorization_cache import source_authorization_cache
 from airembr.system.adapter.metadata.mysql.mapping.event_source_mapping import map_to_event_source_table, map_to_event_source
 from airembr.system.adapter.metadata.mysql.schema.table import EventSourceTable
 from airembr.sdk.storage.metadata.proxy.table_service_proxy import TableServiceProxy
@@ -10,6 +12,10 @@ from airembr.sdk.storage.metadata.query.table_filtering import where_tenant_and_
 from airembr.sdk.storage.metadata.query.select_result import SelectResult
 
 
+def _invalidate_authorizations():
+    source_authorization_cache.invalidate(get_context().tenant)
+
+
 class EventSourceService:
 
     def __init__(self):
@@ -25,13 +31,21 @@ class EventSourceService:
             primary_id=source_id
         )
 
+    async def load_by_ids_in_deployment_mode(self, source_ids: List[str]) -> SelectResult:
+        return await self.proxy.select_in_deployment_mode(
+            EventSourceTable,
+            where=where_tenant_and_mode_context(EventSourceTable, EventSourceTable.id.in_(source_ids))
+        )
+
     async def delete_by_id_in_deployment_mode(self, source_id: str) -> Tuple[
         bool, Optional[EventSource]]:
-        return await self.proxy.delete_by_id_in_deployment_mode(
+        result = await self.proxy.delete_by_id_in_deployment_mode(
             EventSourceTable,
             map_to_event_source,
             primary_id=source_id
         )
+        _invalidate_authorizations()
+        return result
 
     async def load_by_type_in_deployment_mode(self, type: str) -> SelectResult:
         where = where_tenant_and_mode_context(EventSourceTable, EventSourceTable.type == type)
@@ -75,11 +89,13 @@ class EventSourceService:
         )
 
     async def insert(self, event_source: EventSource):
-        return await self.proxy.replace(EventSourceTable, map_to_event_source_table(event_source))
+        result = await self.proxy.replace(EventSourceTable, map_to_event_source_table(event_source))
+        _invalidate_authorizations()
+        return result
 
     async def lock_by_bridge_id(self, bridge_id: str, lock):
         # It is PRODUCTION CONTEXT-LESS
-        return await self.proxy.update_query(
+        result = await self.proxy.update_query(
             EventSourceTable,
             where=(
                 where_tenant_and_mode_context(
@@ -91,6 +107,8 @@ class EventSourceService:
                 'locked': lock
             }
         )
+        _invalidate_authorizations()
+        return result
 
     @staticmethod
     def event_source_types():
@@ -126,6 +144,8 @@ class EventSourceService:
     async def save(self, event_source: EventSource):
         types = self.event_source_types()
         if event_source.is_allowed(types):
-            return await self.proxy.replace(EventSourceTable, map_to_event_source_table(event_source))
+            result = await self.proxy.replace(EventSourceTable, map_to_event_source_table(event_source))
+            _invalidate_authorizations()
+            return result
         else:
             raise ValueError(f"Unknown event source types {event_source.type}. Available {types}.")
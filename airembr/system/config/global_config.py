@@ -28,8 +28,50 @@ class Settings:
 
         self.enable_prometheus = get_env_as_bool('ENABLE_PROMETHEUS', 'no')
         self.prometheus_gateway = env.get('PROMETHEUS_GATEWAY', None)
+        # Ingest logs one in n batches, stage timings are in prometheus
+        self.ingest_log_sample_every = get_env_as_int('INGEST_LOG_SAMPLE_EVERY', 100)
 
         self.entity_cache_ttl = get_env_as_int('ENTITY_CACHE_TTL', 60 * 60)  # 1h
+        self.storage_flush_concurrency = get_env_as_int('STORAGE_FLUSH_CONCURRENCY', 8)  # Parallel table loads
+        self.stream_load_max_rows = get_env_as_int('STREAM_LOAD_MAX_ROWS', 100000)  # Rows per stream load
+        self.stream_load_max_bytes = get_env_as_int('STREAM_LOAD_MAX_BYTES', 32 * 1024 * 1024)  # 32MB
+        self.stream_load_retries = get_env_as_int('STREAM_LOAD_RETRIES', 4)
+        self.stream_load_retry_backoff = get_env_as_int('STREAM_LOAD_RETRY_BACKOFF', 500)  # ms, doubles per retry
+        self.stream_load_retry_max_backoff = get_env_as_int('STREAM_LOAD_RETRY_MAX_BACKOFF', 10000)  # ms
+        self.stream_load_max_backpressure = get_env_as_int('STREAM_LOAD_MAX_BACKPRESSURE', 30000)  # ms
+        # Stream loads through an HTTP client that sends labels. Without labels, loads that may have been
+        # committed are not retried and failed storage batches are not replayed.
+        self.stream_load_label_client = get_env_as_bool('STREAM_LOAD_LABEL_CLIENT', 'no')
+        self.starrocks_http_port = get_env_as_int('STARROCKS_HTTP_PORT', 8030)  # FE http port for stream loads
+
+        self.observation_compute_pool_threshold = get_env_as_int('OBSERVATION_COMPUTE_POOL_THRESHOLD', 50)
+        self.observation_compute_workers = get_env_as_int('OBSERVATION_COMPUTE_WORKERS', 4)
+        self.trigger_concurrency = get_env_as_int('TRIGGER_CONCURRENCY', 16)
+        self.trigger_timeout = get_env_as_int('TRIGGER_TIMEOUT', 30)  # seconds
+        # Newest passages kept per chat between summarizations, 0 keeps all
+        self.conversation_max_passages = get_env_as_int('CONVERSATION_MAX_PASSAGES', 1000)
+        self.destination_http_pool_limit = get_env_as_int('DESTINATION_HTTP_POOL_LIMIT', 100)  # Per session
+        self.destination_http_pool_limit_per_host = get_env_as_int('DESTINATION_HTTP_POOL_LIMIT_PER_HOST', 10)
+        self.destination_circuit_failures = get_env_as_int('DESTINATION_CIRCUIT_FAILURES', 5)  # In a row
+        self.destination_circuit_reset = get_env_as_int('DESTINATION_CIRCUIT_RESET', 30)  # seconds
+        self.embedding_batch_size = get_env_as_int('EMBEDDING_BATCH_SIZE', 500)  # Texts per request
+        self.embedding_concurrency = get_env_as_int('EMBEDDING_CONCURRENCY', 4)  # Requests in flight
+        self.embedding_cache_size = get_env_as_int('EMBEDDING_CACHE_SIZE', 10000)  # Vectors in process memory
+        self.embedding_cache_ttl = get_env_as_int('EMBEDDING_CACHE_TTL', 7 * 24 * 60 * 60)  # seconds, in redis
+        # Also keep vectors in sys_text_vector under their content hash
+        self.embedding_cache_persistent = get_env_as_bool('EMBEDDING_CACHE_PERSISTENT', 'no')
+        self.hyper_edge_max_observations = get_env_as_int('HYPER_EDGE_MAX_OBSERVATIONS', 1000)
+        # compat or fast, see airembr.core.hash.data_hasher. Fast changes all stored hashes.
+        self.data_hash_mode = env.get('DATA_HASH_MODE', 'compat')
+        # Keep sys_ent_property_latest up to date and let EQL read the latest properties from it. Off by default:
+        # tenants installed before the table existed need it created and filled with rebuild_property_latest()
+        # before the writer, and then the reader (EQL_PROPERTY_ROLLUP), are turned on.
+        self.property_latest_rollup = get_env_as_bool('PROPERTY_LATEST_ROLLUP', 'no')
+        self.eql_property_rollup = get_env_as_bool('EQL_PROPERTY_ROLLUP', 'no')
+
+        self.property_dedup_max_size = get_env_as_int('PROPERTY_DEDUP_MAX_SIZE', 100000)  # Per tenant
+        self.property_dedup_ttl = get_env_as_int('PROPERTY_DEDUP_TTL', 60 * 60)  # 1h
+        self.property_dedup_redis_spill = get_env_as_bool('PROPERTY_DEDUP_REDIS_SPILL', 'no')
 
         if self.pulsar_host and not self.pulsar_host.startswith('pulsar://'):
             raise ValueError("PULSAR_HOST should start with pulsar://")
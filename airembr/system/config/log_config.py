@@ -10,5 +10,10 @@ class LoggingConfig(metaclass=Singleton):
         self.log_stack_trace_as = env.get('LOG_STACK_TRACE_AS', 'json')
         self.log_stack_trace_for = env.get('LOG_STACK_TRACE_AS', 'CRITICAL,ERROR,WARNING,INFO').split(',')
         self.log_bulk_size = get_env_as_int('LOG_BULK_SIZE', 1)
+        # Logs waiting to be saved. When full, new logs are dropped (drop) or every n-th replaces the oldest (sample)
+        self.log_buffer_size = get_env_as_int('LOG_BUFFER_SIZE', 10000)
+        self.log_overflow = env.get('LOG_OVERFLOW', 'sample')
+        self.log_sample_every = get_env_as_int('LOG_SAMPLE_EVERY', 10)
+        self.log_drain_size = get_env_as_int('LOG_DRAIN_SIZE', 1000)
 
 logging_config = LoggingConfig()
\ No newline at end of file
@@ -30,6 +30,11 @@ class MemoryCacheConfig:
         self.identification_points_cache_ttl = _get_random_value(
             get_env_as_int('IDENTIFICATION_POINTS_CACHE_TTL', self.default_ttl))
         self.resource_load_cache_ttl = _get_random_value(get_env_as_int('RESOURCE_LOAD_CACHE_TTL', self.default_ttl))
+        # Not found metadata is cached this long
+        self.negative_cache_ttl = get_env_as_int('NEGATIVE_CACHE_TTL', 5)
+        self.metadata_cache_size = get_env_as_int('METADATA_CACHE_SIZE', 10000)
+        # Parallel metadata queries of different keys
+        self.metadata_load_concurrency = get_env_as_int('METADATA_LOAD_CONCURRENCY', 8)
 
 
 memory_cache_config = MemoryCacheConfig()
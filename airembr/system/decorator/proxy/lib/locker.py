@@ -1,5 +1,6 @@
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 from airembr.protocol.cache.cache_protocol import CacheProtocol
+from airembr.protocol.cache.async_cache_protocol import AsyncCacheProtocol
 
 
 @contextmanager
@@ -20,3 +21,18 @@ def distributed_lock(redis_adapter: CacheProtocol, key: str, expires: int):
     else:
         # Could not acquire the lock. It already exists and will be released by other process or expires
         yield False
+
+
+@asynccontextmanager
+async def async_distributed_lock(redis_adapter: AsyncCacheProtocol, key: str, expires: int):
+    lock_key = f"cache:proxy:lock:{key}"
+
+    is_locked = await redis_adapter.set(lock_key, "", nx=True, ex=expires)
+
+    if is_locked:
+        try:
+            yield True
+        finally:
+            await redis_adapter.delete(lock_key)
+    else:
+        yield False
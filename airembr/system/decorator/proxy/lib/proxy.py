@@ -2,16 +2,17 @@ import pickle
 from random import randint
 
 from time import time
-from typing import Optional, List, Awaitable, Any, Callable
+from typing import Optional, List, Awaitable, Any, Callable, Tuple
 
 from airembr.system.process.logging.log_handler import get_logger
 from airembr.system.decorator.proxy.lib.status import Status
 from airembr.system.decorator.proxy.lib.throttle import Throttler
-from airembr.system.decorator.proxy.lib.locker import distributed_lock
+from airembr.system.decorator.proxy.lib.locker import async_distributed_lock
 
-from airembr.system.adapter.cache.cache_adaper_selector import cache_adapter
+from airembr.system.adapter.cache.cache_adaper_selector import cache_adapter, async_cache_adapter
 
 _cache = cache_adapter()
+_async_cache = async_cache_adapter()
 _week = 60 * 60 * 24 * 7
 logger = get_logger(__name__)
 
@@ -28,6 +29,11 @@ class CacheProxy:
     def __init__(self, namespace: str, lock_expires: int = 60):
         self.lock_expires = lock_expires
         self.namespace = namespace
+        self._invalidation_hooks: List[Callable[[List[str]], None]] = []
+
+    def on_invalidate(self, hook: Callable[[List[str]], None]):
+        """ Registers a hook called with cache names after they are invalidated. """
+        self._invalidation_hooks.append(hook)
 
     def _namespace(self, key: str, suffix: str = None) -> str:
         if suffix:
@@ -45,13 +51,12 @@ class CacheProxy:
         return pickle.loads(value)
 
     @staticmethod
-    def delete_keys(prefix: str):
+    async def delete_keys(prefix: str):
         # Use scan_iter to find keys with the specified prefix
         pattern = f"{prefix}:*"
-        # pattern = f"*"
-        keys_to_delete = list(_cache.scan(pattern))
+        keys_to_delete = [key async for key in _async_cache.scan(pattern)]
         if keys_to_delete:
-            _cache.delete(keys_to_delete, skip_tenant=True)  # Bulk delete keys
+            await _async_cache.delete(keys_to_delete, skip_tenant=True)  # Bulk delete keys
 
     async def invalidate(self, names: List[str],
                          func: Callable[..., Awaitable[Any]],
@@ -59,23 +64,30 @@ class CacheProxy:
                          kwargs: dict):
         result = await func(*args, **kwargs)
         for name in names:
-            self.delete_keys(prefix=self._namespace(name))
+            await self.delete_keys(prefix=self._namespace(name))
+        for hook in self._invalidation_hooks:
+            hook(names)
         return result
 
-    def _delete(self, key, suffix: str = None):
-        _cache.delete(self._namespace(key, suffix))
+    async def _get_async(self, key: str, suffix: str = None):
+        value = await _async_cache.get(self._namespace(key, suffix))
+        return self._deserialize(value)
 
-    def _exists(self, key, suffix) -> bool:
-        return _cache.exists(self._namespace(key, suffix))
+    async def _set_async(self, *items: Tuple[str, Optional[str], Any, Optional[int]]):
+        # (key, suffix, value, ttl) items are set in one round trip. Ttl 0 means do not cache.
+        pipeline = _async_cache.pipeline()
+        for key, suffix, value, ttl in items:
+            if ttl != 0:
+                pipeline.set(self._namespace(key, suffix), self._serialize(value), ex=ttl)
+        if len(pipeline) > 0:
+            await pipeline.execute()
 
-    def _get(self, key: str, suffix: str = None):
-        value = _cache.get(self._namespace(key, suffix))
-        return self._deserialize(value)
+    async def get_value(self, name: str, key: str) -> Optional[tuple]:
+        """ Returns (value,) stored by set_value or None. The tuple tells a cached None from a miss. """
+        return await self._get_async(f"{name}:{key}", 'db')
 
-    def _set(self, key, value, suffix=None, ttl=None):
-        if ttl != 0:
-            value = self._serialize(value)
-            _cache.set(self._namespace(key, suffix), value, ex=ttl)
+    async def set_value(self, name: str, key: str, value, ttl: int):
+        await self._set_async((f"{name}:{key}", 'db', (value,), ttl))
 
     async def _load_and_update(self,
                                key,
@@ -89,11 +101,11 @@ class CacheProxy:
 
         current_time = time()
 
-        # Get cached data
-        cached_data_exists = self._exists(key, 'db')
+        # Get cached data. Values are pickled, so a cached None is not an empty reply and one GET is enough.
+        cached_data = await _async_cache.get(self._namespace(key, 'db'))
 
         # Cache exists
-        if cached_data_exists > 0:
+        if cached_data is not None:
             status.cache = (
                 ("global-cache", "available"),
                 ("executed | NO  | UNLOCKED", "global-cache-not-filled"),
@@ -101,13 +113,16 @@ class CacheProxy:
             )
             status.global_cache_time = time() - current_time
             # Data exists, return it immediately from global cache
-            return self._get(key, 'db')
+            return self._deserialize(cached_data)
 
-        with distributed_lock(_cache, self._namespace(key), expires=self.lock_expires) as locked:
+        async with async_distributed_lock(_async_cache, self._namespace(key), expires=self.lock_expires) as locked:
             if locked:
                 fresh_data = await func(*args, **kwargs)
-                self._set(key, fresh_data, ttl=global_cache_ttl)  # Update global cache
-                self._set(key, fresh_data, ttl=_week, suffix='last')  # Update global cache
+                # Update global cache and the last known value in one round trip
+                await self._set_async(
+                    (key, 'db', fresh_data, global_cache_ttl),
+                    (key, 'last', fresh_data, _week)
+                )
                 status.cache = (
                     ("no-global-cache", "expired"),
                     ("executed | YES | UNLOCKED", "global-cache-filled"),
@@ -116,7 +131,7 @@ class CacheProxy:
                 return fresh_data
             else:
                 # Return from global
-                result = self._get(key, suffix='last')
+                result = await self._get_async(key, suffix='last')
                 status.cache = (
                     ("no-global-cache", "expired"),
                     ("executed | NO  | LOCKED  ", "global-cache-not-filled"),
@@ -179,7 +194,8 @@ class CacheProxy:
 
         except Exception as e:
 
-            if not self._exists(key, suffix="last"):
+            last = await _async_cache.get(self._namespace(key, 'last'))
+            if last is None:
                 raise e
 
             logger.error(str(e))
@@ -191,6 +207,6 @@ class CacheProxy:
 
             # Return last if error when running cache update
 
-            result = self._get(key, suffix='last')
+            result = self._deserialize(last)
             status.local_cache_time = time() - t
             return result, status
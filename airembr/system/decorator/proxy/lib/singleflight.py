@@ -0,0 +1,261 @@
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Marks a cached "nothing found" result. None and empty collections are cached with the negative ttl.
+_MISSING = object()
+
+
+def is_empty(value) -> bool:
+    return value is None or (isinstance(value, (list, tuple, dict, set)) and not value)
+
+
+class MemoryTier:
+    """
+    Bounded LRU of loaded values with per-entry expiry. Keys start with the cache name, so a name can be
+    invalidated at once.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._items: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: Hashable):
+        item = self._items.get(key, None)
+        if item is None:
+            return _MISSING
+
+        value, expires_at = item
+        if expires_at < monotonic():
+            del self._items[key]
+            return _MISSING
+
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value, ttl: float):
+        if ttl <= 0:
+            return
+        self._items[key] = (value, monotonic() + ttl)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, name: str):
+        for key in [key for key in self._items if key[0] == name]:
+            del self._items[key]
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SingleFlight:
+    """
+    Runs one load per key at a time. Callers asking for a key that is already loading wait for that load
+    instead of starting another one. Loads of different keys run in parallel, at most `concurrency` at once.
+    """
+
+    def __init__(self, concurrency: int = 8):
+        self.concurrency = max(1, concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def _bind_loop(self):
+        # Semaphore and futures belong to the loop they were created in
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._in_flight = {}
+        return loop
+
+    def bounded(self) -> asyncio.Semaphore:
+        self._bind_loop()
+        return self._semaphore
+
+    def get(self, key: Hashable) -> Optional[asyncio.Future]:
+        self._bind_loop()
+        future = self._in_flight.get(key, None)
+        # Done callbacks run on the next loop iteration, so a finished future may still be registered
+        if future is None or future.done():
+            return None
+        return future
+
+    def share(self, key: Hashable, future: asyncio.Future):
+        """ Registers a future that resolves the key. It is dropped when done. """
+
+        self._bind_loop()
+        self._in_flight[key] = future
+
+        def _done(_):
+            if self._in_flight.get(key, None) is future:
+                del self._in_flight[key]
+
+        future.add_done_callback(_done)
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs):
+        future = self.get(key)
+        if future is not None:
+            # Shielded, so a cancelled waiter does not cancel the load of other waiters
+            return await asyncio.shield(future)
+
+        future = self._loop.create_future()
+        self.share(key, future)
+        try:
+            async with self._semaphore:
+                result = await func(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved when nobody else waits for it
+            future.exception()
+            raise
+
+
+class SingleFlightLoader:
+    """
+    Metadata loader with two cache tiers. Values are looked up in process memory first, then in the global
+    (redis) cache, and only then loaded from the database. Concurrent misses of the same key share one load.
+    Not found values are cached too, but for `negative_ttl` seconds only.
+
+    `global_tier` is an object with async get_value(name, key) -> Optional[tuple] and
+    set_value(name, key, value, ttl).
+    """
+
+    def __init__(self,
+                 global_tier=None,
+                 concurrency: int = 8,
+                 max_size: int = 10000,
+                 negative_ttl: float = 5):
+        self.global_tier = global_tier
+        self.negative_ttl = negative_ttl
+        self.memory = MemoryTier(max_size)
+        self.flight = SingleFlight(concurrency)
+        # Bumped on invalidation. Loads started before it do not fill the cache.
+        self._generations: Dict[str, int] = {}
+
+    def _ttl(self, value, ttl: float) -> float:
+        return min(ttl, self.negative_ttl) if is_empty(value) else ttl
+
+    def invalidate(self, names: Iterable[str]):
+        for name in names:
+            self._generations[name] = self._generations.get(name, 0) + 1
+            self.memory.invalidate(name)
+
+    def clear(self):
+        self._generations.clear()
+        self.memory.clear()
+
+    async def _load(self, name: str, key: Hashable, in_memory_ttl: float, global_ttl: Optional[float],
+                    func: Callable[..., Awaitable[Any]], args: tuple, kwargs: dict):
+        generation = self._generations.get(name, 0)
+
+        if self.global_tier is not None and global_ttl:
+            cached = await self.global_tier.get_value(name, key)
+            if cached is not None:
+                value, = cached
+                self.memory.set((name, key), value, self._ttl(value, in_memory_ttl))
+                return value
+
+        value = await func(*args, **kwargs)
+
+        if self._generations.get(name, 0) == generation:
+            self.memory.set((name, key), value, self._ttl(value, in_memory_ttl))
+            if self.global_tier is not None and global_ttl:
+                await self.global_tier.set_value(name, key, value, int(self._ttl(value, global_ttl)))
+
+        return value
+
+    async def load(self,
+                   name: str,
+                   key: Hashable,
+                   func: Callable[..., Awaitable[Any]],
+                   args: tuple = (),
+                   kwargs: Optional[dict] = None,
+                   in_memory_ttl: float = 60,
+                   global_ttl: Optional[float] = None):
+        value = self.memory.get((name, key))
+        if value is not _MISSING:
+            return value
+
+        return await self.flight.do((name, key), self._load,
+                                    name, key, in_memory_ttl, global_ttl, func, args, kwargs or {})
+
+    async def load_many(self,
+                        name: str,
+                        keys: Dict[Hashable, Any],
+                        func: Callable[[List[Any]], Awaitable[Dict[Any, Any]]],
+                        in_memory_ttl: float = 60) -> Dict[Any, Any]:
+        """
+        Loads many values with one call of `func`. `keys` maps a cache key to the id passed to `func`, which
+        returns {id: value} and leaves out ids it did not find. Those are cached as not found. Keys that are
+        already loading are awaited, not loaded again. Only the memory tier is used.
+        """
+
+        result = {}
+        waiting = []
+        missing = {}
+
+        for key, item_id in keys.items():
+            value = self.memory.get((name, key))
+            if value is not _MISSING:
+                if value is not None:
+                    result[item_id] = value
+                continue
+
+            future = self.flight.get((name, key))
+            if future is not None:
+                waiting.append((item_id, future))
+            else:
+                missing[key] = item_id
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {}
+            for key, item_id in missing.items():
+                futures[key] = loop.create_future()
+                self.flight.share((name, key), futures[key])
+                waiting.append((item_id, futures[key]))
+
+            await self._load_batch(name, missing, futures, func, in_memory_ttl)
+
+        for item_id, future in waiting:
+            value = await asyncio.shield(future)
+            if value is not None:
+                result[item_id] = value
+
+        return result
+
+    async def _load_batch(self, name: str, missing: Dict[Hashable, Any], futures: Dict[Hashable, asyncio.Future],
+                          func, in_memory_ttl: float):
+        generation = self._generations.get(name, 0)
+        try:
+            async with self.flight.bounded():
+                values = await func(list(missing.values()))
+        except BaseException as e:
+            for future in futures.values():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()
+            raise
+
+        fill = self._generations.get(name, 0) == generation
+        for key, item_id in missing.items():
+            value = values.get(item_id, None)
+            if fill:
+                self.memory.set((name, key), value, self._ttl(value, in_memory_ttl))
+            futures[key].set_result(value)
@@ -1,11 +1,31 @@
 import functools
 from typing import Optional, List, Callable, Type, Union, Tuple
 
+from airembr.model.system.context import get_context
+from airembr.system.config.memory_cache_config import memory_cache_config
 from airembr.system.decorator.proxy.lib.proxy import CacheProxy
+from airembr.system.decorator.proxy.lib.singleflight import SingleFlightLoader
 from airembr.system.decorator.proxy.lib.throttle import Throttler
 
 _cache_proxy = CacheProxy(namespace="cache:proxy")
 _throttler = Throttler()
+_loader = SingleFlightLoader(
+    global_tier=_cache_proxy,
+    concurrency=memory_cache_config.metadata_load_concurrency,
+    max_size=memory_cache_config.metadata_cache_size,
+    negative_ttl=memory_cache_config.negative_cache_ttl
+)
+_cache_proxy.on_invalidate(_loader.invalidate)
+
+
+def _loader_key(func, cache_key_func, args, kwargs) -> str:
+    context = get_context()
+    if cache_key_func:
+        key = cache_key_func(args, kwargs)
+    else:
+        key = (*args, *sorted(kwargs.items()))
+    # Redis keys are prefixed with tenant, memory keys are not
+    return f"{context.tenant}:{context.production}:{func.__name__}:{key}"
 
 
 def cache_proxy(name: str,
@@ -54,6 +74,61 @@ def cache_proxy(name: str,
     return decorator
 
 
+def singleflight_cache(name: str,
+                       in_memory_cache_ttl: Optional[int],
+                       max_no_exec_time: Optional[float] = None,
+                       global_cache_ttl: Optional[int] = 60 * 60 * 24,  # 1d
+                       cache_key_func: Optional[Callable[[tuple, dict], str]] = None):
+    """
+    Caches metadata in process memory and in the global cache. Concurrent calls with the same key share one
+    query, calls with different keys query in parallel (up to METADATA_LOAD_CONCURRENCY). None and empty
+    results are cached for NEGATIVE_CACHE_TTL seconds. Cleared by invalidate_cache_proxy of the same name.
+
+    max_no_exec_time is accepted so cache tags can be passed as they are. It is not used.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await _loader.load(
+                name,
+                _loader_key(func, cache_key_func, args, kwargs),
+                func,
+                args,
+                kwargs,
+                in_memory_ttl=in_memory_cache_ttl or 0,
+                global_ttl=global_cache_ttl)
+
+        return wrapper
+
+    return decorator
+
+
+def singleflight_cache_many(name: str,
+                            in_memory_cache_ttl: Optional[int],
+                            max_no_exec_time: Optional[float] = None,
+                            global_cache_ttl: Optional[int] = None):
+    """
+    Like singleflight_cache, for functions that take a list of ids and return {id: value}. Cached and
+    loading ids are not queried again, the rest is loaded with one call. Memory tier only.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(ids):
+            keys = {_loader_key(func, None, (item_id,), {}): item_id for item_id in ids}
+            return await _loader.load_many(name, keys, func, in_memory_ttl=in_memory_cache_ttl or 0)
+
+        return wrapper
+
+    return decorator
+
+
+def on_cache_invalidate(hook: Callable[[List[str]], None]):
+    """ Calls hook with cache names invalidated by invalidate_cache_proxy. """
+    _cache_proxy.on_invalidate(hook)
+
+
 def invalidate_cache_proxy(names: List[str]):
     def decorator(func):
         @functools.wraps(func)
@@ -15,8 +15,8 @@ from airembr.sdk.ai.config import LLM_PROVIDER, LLM_PROVIDER_API_KEY, LLM_ENTITY
     SECOND_LLM_ENTITY_EXTRACTION_MODEL
 from airembr.core.hash.hash import md5
 from airembr.model.bigdata.flat_text import FlatText
-from airembr.sdk.ai.config import embedding_host, embedding_api_key
-from airembr.sdk.service.remote.embedding_api_client import EmbeddingApiClient
+from airembr.sdk.ai.config import embedding_host, embedding_model
+from airembr.system.process.ai.embedding.embedding_cache import EmbeddingCache, embedding_cache
 from airembr.system.adapter.bigdata.big_data_adapter import bd_text_adapter, bd_text_vector_adapter
 from airembr_sdk.client.airembr_chat import AiRembrChatClient
 from airembr_sdk.core.date import now_in_utc
@@ -65,7 +65,7 @@ def _collect_all_chunks(data, chunker, model: str, now) -> Tuple[Dict[str, dict]
     return chunk_map, original_ids
 
 
-async def _embed_in_batches(chunk_map: Dict[str, dict], emb_client: EmbeddingApiClient,
+async def _embed_in_batches(chunk_map: Dict[str, dict], emb_cache: EmbeddingCache,
                       batch_size: int = BULK_SIZE) -> Optional[Dict[str, List[float]]]:
     context = get_context()
     async with background_log("Embedding Chunks Worker", f"Embedding in {context}") as (bts, task_id):
@@ -75,14 +75,14 @@ async def _embed_in_batches(chunk_map: Dict[str, dict], emb_client: EmbeddingApi
         for i in range(0, no_of_items, batch_size):
             batch = {chunk_id: entry['text'] for chunk_id, entry in items[i:i + batch_size]}
             try:
-                result = emb_client.call(batch).get_mapped_embeddings()
+                result = await emb_cache.embed(batch)
             except Exception as e:
                 if not embedding_host:
                     logger.error(f"Missing embedding API. Error in {context} {e}")
                 else:
                     logger.error(f"Unavailable embedding API ({embedding_host}). Error in {context} {e}")
                 return None
-            embeddings.update(result.dense)
+            embeddings.update(result)
             percent = (i + len(batch))/no_of_items
             await bts.task_progress(task_id, percent * 100)
             logger.info(f"Embeddings: Processed {i + len(batch)}/{no_of_items} ({percent}%)")
@@ -153,14 +153,13 @@ async def chunk_texts(context):
 
         data = await bd_text_adapter.load_texts_to_chunk()
         chunker = get_text_chunker(512)
-        emb_client = EmbeddingApiClient(embedding_host, embedding_api_key)
-        model = 'intfloat/multilingual-e5-base'
+        model = embedding_model
 
         chunk_map, original_ids = _collect_all_chunks(data, chunker, model, now_in_utc())
         logger.info(f"Produced {len(chunk_map)} chunks from {len(original_ids)} texts")
 
         await bts.task_progress(task_id, 10)
-        embeddings = await _embed_in_batches(chunk_map, emb_client)
+        embeddings = await _embed_in_batches(chunk_map, embedding_cache())
         if not embeddings:
             logger.warning("No embeddings returned. Skipping...")
             return
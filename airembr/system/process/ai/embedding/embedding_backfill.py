@@ -0,0 +1,247 @@
+import asyncio
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from airembr.system.adapter.cache.cache_adaper_selector import async_cache_adapter
+from airembr.system.config.global_config import global_settings
+from airembr.system.process.logging.log_handler import get_logger
+from airembr.system.process.monitoring.metrics.metrics import EMBEDDING_TEXTS, EMBEDDING_THROUGHPUT, \
+    EMBEDDING_QUEUE_DEPTH
+
+logger = get_logger(__name__)
+
+LoadPage = Callable[[Optional[str], int], Awaitable[list]]
+Embed = Callable[[Dict[str, str]], Awaitable[Dict[str, List[float]]]]
+Write = Callable[[Dict[str, List[float]]], Awaitable]
+
+
+def dedup_texts(rows) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    Returns ({key: text}, {key: [row ids]}). Each distinct text is sent once, under the id of its first row,
+    and its vector is written to all rows with that text.
+    """
+    texts: Dict[str, str] = {}
+    ids: Dict[str, List[str]] = {}
+    key_by_text: Dict[str, str] = {}
+
+    for row in rows:
+        row_id, text = row['id'], row['text_string']
+        if row_id is None or text is None:
+            continue
+
+        key = key_by_text.get(text, None)
+        if key is None:
+            key_by_text[text] = row_id
+            texts[row_id] = text
+            ids[row_id] = [row_id]
+        else:
+            ids[key].append(row_id)
+
+    return texts, ids
+
+
+class EmbeddingCheckpoint:
+    """ Last row id of the backfill that is embedded with all rows before it. Kept in redis, per tenant. """
+
+    def __init__(self, name: str, ttl: int = 30 * 24 * 60 * 60):
+        self.key = f"embedding-checkpoint:{name}"
+        self.ttl = ttl
+        self._cache = async_cache_adapter()
+
+    async def load(self) -> Optional[str]:
+        value = await self._cache.get(self.key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def save(self, after_id: str):
+        await self._cache.set(self.key, after_id, ex=self.ttl)
+
+    async def clear(self):
+        await self._cache.delete(self.key)
+
+
+@dataclass
+class _Batch:
+    page: int
+    texts: Dict[str, str]
+    ids: Dict[str, List[str]]
+
+
+@dataclass
+class _Page:
+    last_id: str
+    pending: int
+    failed: bool = False
+
+
+@dataclass
+class EmbeddingBackfillStats:
+    rows: int = 0
+    embedded: int = 0
+    deduplicated: int = 0
+    failed: int = 0
+    seconds: float = 0.
+    completed: bool = False
+
+    @property
+    def texts_per_second(self) -> float:
+        return self.embedded / self.seconds if self.seconds > 0 else 0.
+
+
+@dataclass
+class _PageTracker:
+    """ Moves the checkpoint over pages in order, only past pages whose batches have all succeeded. """
+    checkpoint: EmbeddingCheckpoint
+    pages: Dict[int, _Page] = field(default_factory=dict)
+    next_page: int = 0
+    stalled: bool = False
+
+    def add(self, page: int, last_id: str, batches: int):
+        self.pages[page] = _Page(last_id=last_id, pending=batches)
+
+    async def done(self, page: int, ok: bool):
+        state = self.pages[page]
+        state.pending -= 1
+        state.failed = state.failed or not ok
+        await self.advance()
+
+    async def advance(self):
+        last_id = None
+        while not self.stalled and self.next_page in self.pages and self.pages[self.next_page].pending <= 0:
+            state = self.pages.pop(self.next_page)
+            if state.failed:
+                # Rows of this page are embedded again after restart
+                self.stalled = True
+                break
+            last_id = state.last_id
+            self.next_page += 1
+
+        if last_id is not None:
+            await self.checkpoint.save(last_id)
+
+
+class EmbeddingBackfill:
+    """
+    Embeds rows of `load_page(after_id, limit)` with up to `concurrency` requests in flight.
+
+    Pages are read with a keyset cursor, so memory holds only the queued pages. Identical texts of a page are
+    sent once. The checkpoint moves after each page is written, so a restarted backfill continues after the
+    last written page. When all rows are done the checkpoint is cleared, so the next run starts over and finds
+    rows added in between.
+    """
+
+    def __init__(self, name: str, load_page: LoadPage, embed: Embed, write: Write,
+                 checkpoint: Optional[EmbeddingCheckpoint] = None,
+                 batch_size: Optional[int] = None,
+                 concurrency: Optional[int] = None):
+        self.name = name
+        self.load_page = load_page
+        self.embed = embed
+        self.write = write
+        self.checkpoint = checkpoint or EmbeddingCheckpoint(name)
+        self.batch_size = max(1, batch_size or global_settings.embedding_batch_size)
+        self.concurrency = max(1, concurrency or global_settings.embedding_concurrency)
+        self.page_size = self.batch_size * self.concurrency
+        self.stats = EmbeddingBackfillStats()
+        self._start = 0.
+
+    def _count(self, result: str, value: int):
+        if global_settings.enable_prometheus and value:
+            EMBEDDING_TEXTS.labels(kind=self.name, result=result).inc(value)
+
+    def _report(self, queue: asyncio.Queue):
+        self.stats.seconds = perf_counter() - self._start
+        if global_settings.enable_prometheus:
+            EMBEDDING_QUEUE_DEPTH.labels(kind=self.name).set(queue.qsize())
+            EMBEDDING_THROUGHPUT.labels(kind=self.name).set(self.stats.texts_per_second)
+
+    def _batches(self, page: int, rows: list) -> List[_Batch]:
+        texts, ids = dedup_texts(rows)
+        self.stats.rows += len(rows)
+        self.stats.deduplicated += len(rows) - len(texts)
+        self._count('deduplicated', len(rows) - len(texts))
+
+        keys = list(texts)
+        return [
+            _Batch(page=page,
+                   texts={key: texts[key] for key in keys[start:start + self.batch_size]},
+                   ids={key: ids[key] for key in keys[start:start + self.batch_size]})
+            for start in range(0, len(keys), self.batch_size)
+        ]
+
+    async def _produce(self, queue: asyncio.Queue, tracker: _PageTracker, after_id: Optional[str]) -> bool:
+        page = 0
+        while not tracker.stalled:
+            rows = list(await self.load_page(after_id, self.page_size))
+            if not rows:
+                return True
+
+            batches = self._batches(page, rows)
+            after_id = rows[-1]['id']
+            tracker.add(page, after_id, len(batches))
+            if not batches:
+                await tracker.advance()
+
+            for batch in batches:
+                await queue.put(batch)
+                self._report(queue)
+
+            page += 1
+        return False
+
+    async def _consume(self, queue: asyncio.Queue, tracker: _PageTracker):
+        while True:
+            batch = await queue.get()
+            try:
+                if batch is None:
+                    return
+
+                ok = False
+                try:
+                    embedded = await self.embed(batch.texts)
+                    vectors = {row_id: vector
+                               for key, vector in embedded.items()
+                               for row_id in batch.ids.get(key, [])}
+                    await self.write(vectors)
+                    self.stats.embedded += len(batch.texts)
+                    self._count('embedded', len(batch.texts))
+                    ok = True
+                except Exception as e:
+                    self.stats.failed += len(batch.texts)
+                    self._count('failed', len(batch.texts))
+                    logger.error(f"Embedding backfill `{self.name}` failed for {len(batch.texts)} texts: {repr(e)}")
+
+                await tracker.done(batch.page, ok)
+                self._report(queue)
+            finally:
+                queue.task_done()
+
+    async def run(self) -> EmbeddingBackfillStats:
+        self._start = perf_counter()
+        self.stats = EmbeddingBackfillStats()
+        tracker = _PageTracker(self.checkpoint)
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        after_id = await self.checkpoint.load()
+        if after_id is not None:
+            logger.info(f"Embedding backfill `{self.name}` resumes after `{after_id}`.")
+
+        consumers = [asyncio.create_task(self._consume(queue, tracker)) for _ in range(self.concurrency)]
+        try:
+            exhausted = await self._produce(queue, tracker, after_id)
+            for _ in consumers:
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+
+        self.stats.completed = exhausted and not tracker.stalled
+        if self.stats.completed:
+            await self.checkpoint.clear()
+
+        self._report(queue)
+        logger.info(f"Embedding backfill `{self.name}`: {self.stats.embedded} texts embedded, "
+                    f"{self.stats.deduplicated} duplicates skipped, {self.stats.failed} failed "
+                    f"in {self.stats.seconds:.2f}s ({self.stats.texts_per_second:.1f} texts/s).")
+        return self.stats
@@ -0,0 +1,156 @@
+import unicodedata
+from array import array
+from hashlib import blake2b
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from airembr.sdk.ai.config import embedding_host, embedding_api_key, embedding_model
+from airembr.sdk.service.remote.embedding_api_client import AsyncEmbeddingApiClient
+from airembr.system.adapter.cache.cache_adaper_selector import async_cache_adapter
+from airembr.system.config.global_config import global_settings
+from airembr.system.decorator.proxy.lib.singleflight import SingleFlightLoader
+from airembr.system.decorator.run_once import run_once
+from airembr.system.process.logging.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+Embed = Callable[[Dict[str, str]], Awaitable[Dict[str, List[float]]]]
+
+
+def normalize_text(text: str) -> str:
+    """ Texts that differ only in unicode form or whitespace get one vector. """
+    return unicodedata.normalize('NFC', ' '.join(str(text).split()))
+
+
+def embedding_key(model: str, text: str) -> str:
+    """ Content address of the text for the model. 32 hex chars, the size of a sys_text_vector text_id. """
+    return blake2b(f"{model}\n{text}".encode(), digest_size=16).hexdigest()
+
+
+def pack_vector(vector: List[float]) -> bytes:
+    return array('f', vector).tobytes()
+
+
+def unpack_vector(data: bytes) -> List[float]:
+    vector = array('f')
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+class RedisVectorTier:
+    """ Vectors as packed float32, shared by all workers of the tenant. """
+
+    name = 'redis'
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._cache = async_cache_adapter()
+
+    async def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        values = await self._cache.mget([f"emb:{key}" for key in keys])
+        return {key: unpack_vector(value) for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, vectors: Dict[str, List[float]]):
+        await self._cache.mset({f"emb:{key}": pack_vector(vector) for key, vector in vectors.items()}, ex=self.ttl)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embeddings. A text is looked up by hash of (model, normalized text) in process memory,
+    then in each tier in order, and only the misses are sent to the embedding API. Vectors found in a later
+    tier are copied to the earlier ones. Concurrent requests for the same text share one lookup.
+
+    Tier errors are logged and treated as misses, the API is the source of truth.
+
+    Process memory keeps vectors packed as float32 bytes, 4 bytes per dimension instead of a list of
+    python floats, and unpacks them on read.
+    """
+
+    def __init__(self, embed: Embed, model: str, tiers: Optional[list] = None,
+                 memory_size: int = 10000, memory_ttl: float = 24 * 60 * 60, concurrency: int = 8):
+        self._embed = embed
+        self.model = model
+        self.tiers = tiers or []
+        self.memory_ttl = memory_ttl
+        # Texts the API did not embed are not cached
+        self._loader = SingleFlightLoader(concurrency=concurrency, max_size=memory_size, negative_ttl=0)
+
+    async def embed(self, texts: Dict[Hashable, str]) -> Dict[Hashable, List[float]]:
+        """ Returns {key: vector} for {key: text}. Keys that could not be embedded are left out. """
+
+        callers: Dict[str, List[Hashable]] = {}
+        items: Dict[str, Tuple[str, str]] = {}
+        for caller_key, text in texts.items():
+            text = normalize_text(text)
+            key = embedding_key(self.model, text)
+            if key not in items:
+                items[key] = (key, text)
+                callers[key] = []
+            callers[key].append(caller_key)
+
+        if not items:
+            return {}
+
+        packed = await self._loader.load_many(self.model, items, self._load, in_memory_ttl=self.memory_ttl)
+
+        vectors = {}
+        for key, item in items.items():
+            if item in packed:
+                vector = unpack_vector(packed[item])
+                for caller_key in callers[key]:
+                    vectors[caller_key] = vector
+        return vectors
+
+    async def embed_one(self, text: str) -> Optional[List[float]]:
+        return (await self.embed({0: text})).get(0, None)
+
+    async def _get(self, tier, keys: List[str]) -> Dict[str, List[float]]:
+        try:
+            return await tier.get_many(keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache tier `{tier.name}` is unavailable: {repr(e)}")
+            return {}
+
+    async def _set(self, tiers: list, vectors: Dict[str, List[float]]):
+        for tier in tiers:
+            try:
+                await tier.set_many(vectors)
+            except Exception as e:
+                logger.warning(f"Embedding cache tier `{tier.name}` is not updated: {repr(e)}")
+
+    async def _load(self, items: List[Tuple[str, str]]) -> Dict[Tuple[str, str], bytes]:
+        texts = dict(items)
+        found: Dict[str, List[float]] = {}
+
+        for position, tier in enumerate(self.tiers):
+            missing = [key for key in texts if key not in found]
+            if not missing:
+                break
+            hits = await self._get(tier, missing)
+            if hits:
+                await self._set(self.tiers[:position], hits)
+                found.update(hits)
+
+        missing = {key: text for key, text in texts.items() if key not in found}
+        if missing:
+            embedded = await self._embed(missing)
+            await self._set(self.tiers, embedded)
+            found.update(embedded)
+
+        return {(key, text): pack_vector(found[key]) for key, text in texts.items() if key in found}
+
+
+@run_once
+def embedding_cache() -> EmbeddingCache:
+    client = AsyncEmbeddingApiClient(embedding_host, embedding_api_key)
+
+    async def _embed(texts: Dict[str, str]) -> Dict[str, List[float]]:
+        return (await client.call(texts)).dense
+
+    tiers = [RedisVectorTier(global_settings.embedding_cache_ttl)]
+    if global_settings.embedding_cache_persistent:
+        from airembr.system.process.ai.embedding.text_vector_tier import SysTextVectorTier
+        tiers.append(SysTextVectorTier(embedding_model))
+
+    return EmbeddingCache(_embed, embedding_model, tiers,
+                          memory_size=global_settings.embedding_cache_size,
+                          concurrency=global_settings.embedding_concurrency)
@@ -0,0 +1,30 @@
+from typing import Dict, List
+
+import orjson
+
+from airembr.system.adapter.bigdata.adapter_router import AdapterRouter
+from airembr.system.adapter.bigdata.general.utils.mapping import sys_text_vector_mapping
+from airembr.system.adapter.bigdata.starrocks.utils.sql_text import load_text_vectors_sql
+from airembr.system.adapter.bigdata.tool.vector_rows import vector_rows
+
+
+class SysTextVectorTier(AdapterRouter):
+    """ Vectors stored in sys_text_vector under their content address, so they outlive redis. """
+
+    name = 'sys_text_vector'
+
+    def __init__(self, model: str):
+        super().__init__()
+        self.model = model
+
+    async def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        result = await self.adapter.exec(load_text_vectors_sql(keys, self.model))
+        if not result:
+            return {}
+        return {
+            row['text_id']: orjson.loads(row['vector']) if isinstance(row['vector'], (str, bytes)) else row['vector']
+            for row in result
+        }
+
+    async def set_many(self, vectors: Dict[str, List[float]]):
+        await self.adapter.stream(vector_rows(vectors, self.model), sys_text_vector_mapping())
@@ -1,4 +1,7 @@
-from airembr.system.adapter.cache.cache_adaper_selector import list_cache_adapter
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Dict, Tuple
+
+from airembr.system.adapter.cache.cache_adaper_selector import list_cache_adapter, async_list_cache_adapter
 
 
 class ConversationMemoryFacade:
@@ -7,18 +10,34 @@ class ConversationMemoryFacade:
         self.conversation_id = conversation_id
         self._summary_adapter = list_cache_adapter(f"summary")
         self._chat_adapter = list_cache_adapter(f"chat")
+        self._pushed_adapter = list_cache_adapter(f"chat_pushed")
         self._context_adapter = list_cache_adapter(f"context")
 
     def chat_memorize(self, *values: str):
         return self._chat_adapter.rpush(self.conversation_id, *values)
 
-    def chat_replace(self, value: str):
+    def chat_replace(self, *values: str):
         self._chat_adapter.delete(self.conversation_id)
-        return self._chat_adapter.rpush(self.conversation_id, value)
+        return self._chat_adapter.rpush(self.conversation_id, *values)
 
     def chat_recall(self, start: int = 0, end: int = -1):
         return [item.decode() for item in self._chat_adapter.lrange(self.conversation_id, start, end)]
 
+    def chat_pushed(self) -> int:
+        """ Number of passages ever pushed to the chat by ConversationMemoryStore.memorize. Trimming keeps it. """
+        pushed = self._pushed_adapter.get(self.conversation_id)
+        return int(pushed) if pushed else 0
+
+    def chat_recall_after(self, pushed: int) -> List[str]:
+        """
+        Passages pushed after the chat had `pushed` passages in total. Counted from the tail, so the chat
+        being trimmed at the head in the meantime does not shift them.
+        """
+        newer = self.chat_pushed() - pushed
+        if newer <= 0:
+            return []
+        return self.chat_recall(-newer, -1)
+
     def chat_forget(self, ttl):
         return self._chat_adapter.expire(self.conversation_id, ttl)
 
@@ -53,3 +72,79 @@ class ConversationMemoryFacade:
 
     def summary_forget(self, ttl):
         return self._summary_adapter.expire(self.conversation_id, ttl)
+
+
+@dataclass
+class ChatMemory:
+    passages: List[str]
+    ttl: int  # 0 when the chat has no ttl
+    summary: Optional[str] = None
+
+
+class ConversationMemoryStore:
+    """
+    Conversation memory of many chats at once. Every call is one redis round trip, no matter how many
+    chats it covers. Uses the same keys as ConversationMemoryFacade.
+    """
+
+    def __init__(self):
+        self._chat_adapter = async_list_cache_adapter("chat")
+        self._pushed_adapter = async_list_cache_adapter("chat_pushed")
+        self._summary_adapter = async_list_cache_adapter("summary")
+
+    async def recall(self, chat_ids: Iterable[str]) -> Dict[str, ChatMemory]:
+        """ Passages, ttl and summary of every chat. """
+
+        chat_ids = list(chat_ids)
+        if not chat_ids:
+            return {}
+
+        pipeline = self._chat_adapter.pipeline()
+        for chat_id in chat_ids:
+            chat_key = self._chat_adapter.full_key(chat_id)
+            pipeline.lrange(chat_key, 0, -1)
+            pipeline.ttl(chat_key)
+            pipeline.get(self._summary_adapter.full_key(chat_id))
+
+        replies = await pipeline.execute()
+
+        memories = {}
+        for position, chat_id in enumerate(chat_ids):
+            passages, ttl, summary = replies[position * 3: position * 3 + 3]
+            memories[chat_id] = ChatMemory(
+                passages=[item.decode() for item in passages],
+                ttl=ttl if ttl > 0 else 0,
+                summary=summary.decode() if summary else None
+            )
+        return memories
+
+    async def memorize(self, chats: Iterable[Tuple[str, List[str], int]], max_passages: int = 0) -> Dict[str, int]:
+        """
+        Appends passages to chats given as (chat_id, passages, ttl) and sets their ttl. With max_passages > 0
+        only the newest max_passages passages are kept. Returns the number of passages ever pushed to each chat.
+        Unlike the chat length it does not change when the chat is trimmed, so the summarizer can tell which
+        passages came after its snapshot.
+        """
+
+        pipeline = self._chat_adapter.pipeline()
+        pushed = []
+        for chat_id, passages, ttl in chats:
+            if not passages:
+                continue
+
+            chat_key = self._chat_adapter.full_key(chat_id)
+            pushed_key = self._pushed_adapter.full_key(chat_id)
+            pipeline.rpush(chat_key, *passages)
+            pushed.append((chat_id, len(pipeline)))
+            pipeline.incr(pushed_key, len(passages))
+            if max_passages > 0:
+                pipeline.ltrim(chat_key, -max_passages, -1)
+            if ttl > 0:
+                pipeline.expire(chat_key, ttl)
+                pipeline.expire(pushed_key, ttl)
+
+        if not pushed:
+            return {}
+
+        replies = await pipeline.execute()
+        return {chat_id: replies[position] for chat_id, position in pushed}
@@ -13,4 +13,4 @@ class SummaryOutput(BaseModel):
 
 class SummaryPayload(SummaryOutput):
     ttl: int
-    no_of_passages: int
\ No newline at end of file
+    pushed: int  # Passages ever pushed to the chat, when it was summarized
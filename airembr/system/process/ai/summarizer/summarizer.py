@@ -9,10 +9,15 @@ from airembr.model.api.response.conversation_memory import ConversationMemory
 
 
 # This is expensive
-async def get_summaries(conversation_memory: Dict[str, ConversationMemory], compression_sizes: Dict[str, int]) -> Dict[str, SummaryPayload]:
+async def get_summaries(conversation_memory: Dict[str, ConversationMemory], compression_sizes: Dict[str, int],
+                        pushed: Dict[str, int]) -> Dict[str, SummaryPayload]:
     summaries = {}
     for session_id, memory in conversation_memory.items():  # type: str, ConversationMemory
 
+        # Chats not written now are summarized with their next write
+        if session_id not in pushed:
+            continue
+
         max_length = int(compression_sizes.get(session_id, 102400))
 
         if memory.size() > max_length:
@@ -31,7 +36,7 @@ async def get_summaries(conversation_memory: Dict[str, ConversationMemory], comp
                     summaries=summary.summaries,
                     topics=summary.topics,
                     ttl=memory.ttl,
-                    no_of_passages=len(memory.passages)
+                    pushed=pushed[session_id]
                 )
                 summaries[session_id] = summary
 
@@ -40,10 +45,11 @@ async def get_summaries(conversation_memory: Dict[str, ConversationMemory], comp
     return summaries
 
 
-async def summary_job(context: Context, conversation_memory: Dict[str, ConversationMemory], ttls, compression_sizes: Dict[str, int]):
+async def summary_job(context: Context, conversation_memory: Dict[str, ConversationMemory], ttls, compression_sizes: Dict[str, int],
+                      pushed: Dict[str, int]):
     with ServerContext(context):
         if conversation_memory:
-            _summaries: Dict[str, SummaryPayload] = await get_summaries(conversation_memory, compression_sizes)
+            _summaries: Dict[str, SummaryPayload] = await get_summaries(conversation_memory, compression_sizes, pushed)
 
             if _summaries:
                 for chat_id, summary_payload in _summaries.items():  # type: str, SummaryPayload
@@ -53,12 +59,13 @@ async def summary_job(context: Context, conversation_memory: Dict[str, Conversat
                         summarized_text = summary_payload.summaries_as_text()
                         memory.summary_memorize(summarized_text, expire=summary_payload.ttl if summary_payload.ttl>0 else ttls.get(chat_id, 86400))
 
-                        # Delete chat history
-                        new_passages = memory.chat_recall(summary_payload.no_of_passages)
+                        # Delete chat history. Keeps passages pushed while summarizing.
+                        new_passages = memory.chat_recall_after(summary_payload.pushed)
                         if not new_passages:
                             memory.delete_chat()
                         else:
                             memory.chat_replace(*new_passages)
 
-async def summary_worker(conversation_memory: Dict[str, ConversationMemory], ttls: Dict[str, int], compression_sizes: Dict[str, int]):
-    asyncio.create_task(summary_job(get_context(), conversation_memory, ttls, compression_sizes))
+async def summary_worker(conversation_memory: Dict[str, ConversationMemory], ttls: Dict[str, int], compression_sizes: Dict[str, int],
+                         pushed: Dict[str, int]):
+    asyncio.create_task(summary_job(get_context(), conversation_memory, ttls, compression_sizes, pushed))
@@ -9,6 +9,7 @@ from airembr.system.process.logging.log_handler import get_logger
 from airembr.system.config.global_config import global_settings
 from airembr.system.adapter.queue.queue_adapter import queue_adapter
 from airembr.system.adapter.settings.global_settings_service import GlobalSettingsBroadcaster
+from airembr.system.process.dispatching.http_delivery import close_http_delivery
 
 logger = get_logger(__name__)
 
@@ -17,12 +18,16 @@ async def worker():
     consumer_adapter = os.environ.get("CONSUMER_TYPE", None)
     _adapter = queue_adapter(consumer_adapter)
     prefix = f"airembr_{_adapter.name.replace('.', '_')}"
-    await WorkManager().start_worker(
-        inactivity_time_out=1000,
-        log_processor=logging,
-        adapter=_adapter,
-        metrics=MetricsAdapter(prefix)
-    )
+    try:
+        await WorkManager().start_worker(
+            inactivity_time_out=1000,
+            log_processor=logging,
+            adapter=_adapter,
+            metrics=MetricsAdapter(prefix)
+        )
+    finally:
+        # Pending destination batches are sent before the pooled connections close
+        await close_http_delivery()
 
 
 print(
@@ -5,7 +5,7 @@ from durable_dot_dict.dotdict import DotDict
 
 from airembr_sdk.core.entity.identification import generate_hid
 from airembr.model.api.request.observation import Observation, ObservationEntity
-from airembr.core.hash.data_hasher import hash_dict_64
+from airembr.core.hash.data_hasher import hash_traits
 from airembr.system.utils.text.formaters import _stringify_dict
 from airembr_sdk.core.date import now_in_utc
 from airembr.model.bigdata.flat_ent_property import FlatEntityProperty
@@ -56,11 +56,10 @@ def compute_data_hashes(indexed_entities: Dict[str, DotDict]) -> Dict[str, DotDi
 
         else:
 
-            entity[FlatObsEntity.DATA_HASH] = hash_dict_64(traits, dump_schema=True)
-            fields = sorted(DotDict(traits).flat())
-            entity[FlatObsEntity.SCHEMA_HASH] = hash_dict_64(fields)
-            entity[FlatObsEntity.FIELD_HASH] = [hash_dict_64(field, dump_schema=False) for field in
-                                                fields] if fields else None
+            traits_hash = hash_traits(traits, field_dump_schema=False)
+            entity[FlatObsEntity.DATA_HASH] = traits_hash.data_hash
+            entity[FlatObsEntity.SCHEMA_HASH] = traits_hash.schema_hash
+            entity[FlatObsEntity.FIELD_HASH] = traits_hash.field_hashes if traits_hash.fields else None
             entity[FlatObsEntity.ENTITY_TRAITS_TEXT] = _stringify_dict(traits)
 
         # Now we can add History ID:
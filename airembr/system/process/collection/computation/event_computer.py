@@ -1,5 +1,5 @@
 import time
-from typing import Tuple, List, Optional, Dict, AsyncGenerator, Any
+from typing import Tuple, List, Optional, Dict, Any
 from uuid import uuid4
 
 from durable_dot_dict.dotdict import DotDict
@@ -9,8 +9,8 @@ from airembr.system.process.collection.computation.entity_service import index_e
 from airembr.model.bigdata.flat_sys_timer import FlatSysTimer
 from airembr.core.data.resolver import resolve_dot_dict_values
 from airembr.system.process.logging.log_handler import get_logger
-from airembr.model.system.transport_payload import FactTransportPayload
-from airembr.core.hash.data_hasher import hash_dict_64
+from airembr.model.system.transport_payload import ObservationFactsTransportPayload
+from airembr.core.hash.data_hasher import hash_traits
 from airembr.core.hash.hash import md5
 from airembr.system.utils.text.formaters import _stringify_dict
 from airembr_sdk.core.date import now_in_utc
@@ -80,13 +80,12 @@ def _get_rel(observation: Observation, relation: ObservationRelation, now) -> Fl
         traits['$label'] = relation.label
 
     entity_type = 'event'
-    data_hash = hash_dict_64(traits)
+    traits_hash = hash_traits(traits, with_fields=False)
     flat_relation[FlatRelation.ENTITY_TRAITS] = traits
     flat_relation[FlatRelation.ENTITY_TRAITS_TEXT] = _stringify_dict(traits)
-    flat_relation[FlatRelation.DATA_HASH] = data_hash
-    fields = sorted(DotDict(traits).flat())
-    flat_relation[FlatRelation.SCHEMA_HASH] = hash_dict_64(fields)
-    # flat_relation[FlatRelation.FIELD_HASH] = [hash_dict_64(field) for field in fields]
+    flat_relation[FlatRelation.DATA_HASH] = traits_hash.data_hash
+    flat_relation[FlatRelation.SCHEMA_HASH] = traits_hash.schema_hash
+    # flat_relation[FlatRelation.FIELD_HASH] = hash_fields(traits_hash.fields)
 
     flat_relation[FlatRelation.REL_TYPE] = relation.type
     flat_relation[FlatRelation.REL_LABEL] = relation.label
@@ -326,8 +325,12 @@ def _yield_object_ids(_entities_by_ref: Dict[str, DotDict], relation: Observatio
                 if object_pk:
                     yield object_pk
 
-async def compute_events(observation: Observation, headers: Headers) -> AsyncGenerator[
-    FactTransportPayload, None]:
+def _get_entity_refs(entity_index: Dict[int, int], storage_context_entities: List[DotDict]) -> List[int]:
+    return [entity_index[id(entity)] for entity in storage_context_entities if id(entity) in entity_index]
+
+
+def compute_observation_facts(observation: Observation, headers: Headers) -> Optional[ObservationFactsTransportPayload]:
+    # No I/O here, so it can run in a worker thread
     # Get Entities, each has data_hash
     _entities_by_ref = index_entities(observation)
 
@@ -347,127 +350,88 @@ async def compute_events(observation: Observation, headers: Headers) -> AsyncGen
     if not observer:  # no observer in entities
         logger.error(
             f"Observer `{observer_link}` not available in entities for {observation.id}. This should not be possible if observation validation is in place.")
+        return None
 
-    else:
-        now = now_in_utc()
-
-        if not observation.relation:
-            # No facts
-            for ent in _entities_by_ref.values():
-                ent[FlatEntityHistory.CONTEXT] = 'observation'
-
-            yield FactTransportPayload(
-                source_id=observation.source.id,
-                observation={
-                    "id": observation.id,
-                    "observer": observer.get_or_none(FlatEntityHistory.ENTITY_PK),
-                    "text": {
-                        "summary": observation.text.summary,
-                        "description": observation.text.description,
-                        "ner": observation.text.ner
-                    },
-                    "label": observation.label,
-                    "traits": observation.traits
-                },
-                fact={},
-                relation={},
-                entities=list(_entities_by_ref.values()),
-                timer=None,
-                gids=_entity_gids,
-                trace_id=headers.get_trace_id(),
-                session=observation.session.model_dump(exclude_none=True)
+    now = now_in_utc()
+
+    # Observation, entities and gids are sent once. Facts reference entities by index.
+    entities = list(_entities_by_ref.values())
+    entity_index = {id(entity): index for index, entity in enumerate(entities)}
+
+    payload = ObservationFactsTransportPayload(
+        source_id=observation.source.id,
+        observation={
+            "id": observation.id,
+            "observer": observer.get_or_none(FlatEntityHistory.ENTITY_PK),
+            "text": {
+                "summary": observation.text.summary,
+                "description": observation.text.description,
+                "ner": observation.text.ner
+            },
+            "label": observation.label,
+            "traits": observation.traits
+        },
+        entities=entities,
+        gids=_entity_gids,
+        trace_id=headers.get_trace_id(),
+        session=observation.session.model_dump(exclude_none=True)
+    )
+
+    if not observation.relation:
+        # No facts
+        for ent in entities:
+            ent[FlatEntityHistory.CONTEXT] = 'observation'
+
+        return payload
+
+    # Get relation
+    for relation in observation.relation:
+
+        # Get actor
+        actor_link = relation.get_actor()
+        actor = _get_actor_in_entities(_entities_by_ref, actor_link)
+
+        # Get objects
+        object_ids = list(_yield_object_ids(_entities_by_ref, relation))
+
+        # Get relation
+        flat_relation: FlatRelation = _get_rel(observation, relation, now)
+        # Set rel ID and PK
+        flat_relation: FlatRelation = _set_rel_id_pk(flat_relation, actor, object_ids)
+        relation_dict = flat_relation.to_dict()
+
+        # Get all entities (appends event)
+        storage_context_entities = append_relation_to_context_entities(_entities_by_ref, relation)
+        entity_refs = _get_entity_refs(entity_index, storage_context_entities)
+
+        # Get objects, no objects means one fact without object
+        object_links = list(relation.get_objects()) or [None]
+        for object_link in object_links:
+            object = _entities_by_ref.get(object_link.link, None) if object_link else None
+
+            # Get fact
+            flat_fact = _create_fact(observation,
+                                     relation,
+                                     observer,
+                                     observer_link,
+                                     actor,
+                                     actor_link,
+                                     object,
+                                     object_link,
+                                     flat_relation,
+                                     storage_context_entities)
+
+            timer = _create_timer(observation, actor, object, relation, flat_fact, now)
+
+            payload.add_fact(
+                fact=flat_fact.to_dict(),
+                relation=relation_dict,
+                entities=entity_refs,
+                timer=timer.to_dict() if timer else None
             )
-        else:
-            # Get relation
-            for relation in observation.relation:
-
-                # Get actor
-                actor_link = relation.get_actor()
-                actor = _get_actor_in_entities(_entities_by_ref, actor_link)
-
-                # Get objects
-                object_ids = list(_yield_object_ids(_entities_by_ref, relation))
-
-                # Get relation
-                flat_relation: FlatRelation = _get_rel(observation, relation, now)
-                # Set rel ID and PK
-                flat_relation: FlatRelation = _set_rel_id_pk(flat_relation, actor, object_ids)
-
-                # Get all entities (appends event)
-                storage_context_entities = append_relation_to_context_entities(_entities_by_ref, relation)
-
-                # Get objects
-                object_links = list(relation.get_objects())
-                if object_links:
-                    for object_link in object_links:
-                        object = _entities_by_ref.get(object_link.link, None)
-
-                        # Get fact
-                        flat_fact = _create_fact(observation,
-                                                 relation,
-                                                 observer,
-                                                 observer_link,
-                                                 actor,
-                                                 actor_link,
-                                                 object,
-                                                 object_link,
-                                                 flat_relation,
-                                                 storage_context_entities)
-
-                        timer = _create_timer(observation, actor, object, relation, flat_fact, now)
-
-                        yield FactTransportPayload(
-                            source_id=observation.source.id,
-                            observation={
-                                "id": observation.id,
-                                "observer": observer.get_or_none(FlatEntityHistory.ENTITY_PK),
-                                "text": {
-                                    "summary": observation.text.summary,
-                                    "description": observation.text.description,
-                                    "ner": observation.text.ner
-                                },
-                                "label": observation.label,
-                                "traits": observation.traits
-                            },
-                            fact=flat_fact.to_dict(),
-                            relation=flat_relation.to_dict(),
-                            entities=storage_context_entities,
-                            timer=timer.to_dict() if timer else None,
-                            gids=_entity_gids,
-                            trace_id=headers.get_trace_id(),
-                            session=observation.session.model_dump(exclude_none=True)
-                        )
-                else:
-                    flat_fact = _create_fact(observation,
-                                             relation,
-                                             observer,
-                                             observer_link,
-                                             actor,
-                                             actor_link,
-                                             None,
-                                             None,
-                                             flat_relation,
-                                             storage_context_entities)
-
-                    timer = _create_timer(observation, actor, None, relation, flat_fact, now)
-
-                    yield FactTransportPayload(
-                        source_id=observation.source.id,
-                        observation={
-                            "id": observation.id,
-                            "observer": observer.get_or_none(FlatEntityHistory.ENTITY_PK),
-                            "text": {
-                                "summary": observation.text.summary,
-                                "description": observation.text.description,
-                                "ner": observation.text.ner
-                            },                            "label": observation.label,
-                            "traits": observation.traits
-                        },
-                        fact=flat_fact.to_dict(),
-                        relation=flat_relation.to_dict(),
-                        entities=storage_context_entities,
-                        timer=timer.to_dict() if timer else None,
-                        gids=_entity_gids,
-                        trace_id=headers.get_trace_id(),
-                        session=observation.session.model_dump(exclude_none=True)
-                    )
+
+    return payload
+
+
+async def compute_events(observation: Observation, headers: Headers) -> Optional[ObservationFactsTransportPayload]:
+    return compute_observation_facts(observation, headers)
@@ -1,36 +1,213 @@
-class PropertyDeduper:
+from collections import OrderedDict
+from datetime import datetime
+from time import monotonic
+from typing import Optional, Dict, Tuple, List, Iterable, Any
+
+import orjson
+
+from airembr.core.hash.hash import md5
+from airembr.sdk.storage.cache.client.redis_async_client import AsyncRedisClient
+
+DEFAULT_TENANT = '__default__'
+
+DedupKey = Tuple[Any, Any, Any]
+
+
+def _get_key(record: dict) -> DedupKey:
+    return (
+        record["entity.pk"],
+        record["property.name"],
+        record["property.value"],
+    )
+
+
+def _comparable_ts(ts):
+    # Records that went through the queue (or spill) carry ts as ISO string
+    if isinstance(ts, str):
+        try:
+            return datetime.fromisoformat(ts)
+        except ValueError:
+            return ts
+    return ts
+
+
+def _is_newer(ts, other_ts) -> bool:
+    ts, other_ts = _comparable_ts(ts), _comparable_ts(other_ts)
+    try:
+        return ts > other_ts
+    except TypeError:
+        return str(ts) > str(other_ts)
+
+
+class DedupMetrics:
     def __init__(self):
-        self.latest = {}
+        self.hits = 0
+        self.misses = 0
+        self.spill_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "spill_hits": self.spill_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hit_ratio()
+        }
+
+
+class DedupResult:
+    """ Records touched by one process() call, and its own lookup counts. """
+
+    def __init__(self, records: List[dict], hits: int = 0, misses: int = 0):
+        self.records = records
+        self.hits = hits
+        self.misses = misses
+
+
+class RedisDedupSpill:
+    """
+    Shares dedup state between workers. Records are read with one MGET and written with one pipeline per batch.
+    Uses the asyncio redis client, so lookups do not block the event loop. Keys carry the tenant already and
+    are sent as they are.
+    """
+
+    def __init__(self, client: AsyncRedisClient, ttl: Optional[int] = 3600, prefix: str = 'property-dedup'):
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
 
-    def process(self, changes):
-        changed_keys = set()
+    def _get_redis_key(self, tenant: str, key: DedupKey) -> str:
+        return f"{tenant}:{self._prefix}:{md5(orjson.dumps(key, default=str).decode())}"
 
-        for record in changes:
-            key = (
-                record["entity.pk"],
-                record["property.name"],
-                record["property.value"],
-            )
+    async def load(self, tenant: str, keys: Iterable[DedupKey]) -> Dict[DedupKey, dict]:
+        keys = list(keys)
+        if not keys:
+            return {}
 
-            ts = record["ts"]
+        values = await self._client.client.mget([self._get_redis_key(tenant, key) for key in keys])
+        return {key: orjson.loads(value) for key, value in zip(keys, values) if value is not None}
 
-            if key not in self.latest:
+    async def save(self, tenant: str, records: Dict[DedupKey, dict]):
+        if not records:
+            return
+
+        pipeline = self._client.client.pipeline(transaction=False)
+        for key, record in records.items():
+            pipeline.set(self._get_redis_key(tenant, key), orjson.dumps(record, default=str), ex=self._ttl)
+        await pipeline.execute()
+
+
+class PropertyDeduper:
+    """
+    Keeps the latest record per (entity.pk, property.name, property.value) and counts how many times it was seen.
+
+    State is partitioned per tenant. Each partition is an LRU bounded by `max_size` and entries expire after
+    `ttl` seconds. At most `max_tenants` partitions are kept. Optional `spill` shares state between workers.
+    """
+
+    def __init__(self,
+                 max_size: int = 100000,
+                 ttl: Optional[float] = 3600,
+                 max_tenants: int = 1000,
+                 spill: Optional[RedisDedupSpill] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_tenants = max_tenants
+        self._spill = spill
+        self._partitions: OrderedDict[str, OrderedDict[DedupKey, Tuple[dict, Optional[float]]]] = OrderedDict()
+        self.metrics = DedupMetrics()
+
+    def _partition(self, tenant: str) -> OrderedDict:
+        partition = self._partitions.get(tenant, None)
+        if partition is None:
+            partition = OrderedDict()
+            self._partitions[tenant] = partition
+            while len(self._partitions) > self.max_tenants:
+                _, evicted = self._partitions.popitem(last=False)
+                self.metrics.evictions += len(evicted)
+        else:
+            self._partitions.move_to_end(tenant)
+        return partition
+
+    def _get(self, partition: OrderedDict, key: DedupKey, now: float) -> Optional[dict]:
+        item = partition.get(key, None)
+        if item is None:
+            return None
+
+        record, expires_at = item
+        if expires_at is not None and expires_at < now:
+            del partition[key]
+            self.metrics.expirations += 1
+            return None
+
+        partition.move_to_end(key)
+        return record
+
+    def _put(self, partition: OrderedDict, key: DedupKey, record: dict, now: float):
+        partition[key] = (record, now + self.ttl if self.ttl else None)
+        partition.move_to_end(key)
+        while len(partition) > self.max_size:
+            partition.popitem(last=False)
+            self.metrics.evictions += 1
+
+    def size(self, tenant: Optional[str] = None) -> int:
+        if tenant is not None:
+            return len(self._partitions.get(tenant, {}))
+        return sum(len(partition) for partition in self._partitions.values())
+
+    async def process(self, changes, tenant: Optional[str] = None) -> DedupResult:
+        tenant = tenant or DEFAULT_TENANT
+        partition = self._partition(tenant)
+        now = monotonic()
+
+        changes = list(changes)
+        keys = [_get_key(record) for record in changes]
+
+        spilled = {}
+        if self._spill is not None:
+            missing = {key for key in keys if self._get(partition, key, now) is None}
+            spilled = await self._spill.load(tenant, missing)
+
+        # Records touched in this batch. Checked first so a batch larger than max_size still dedups.
+        changed: Dict[DedupKey, dict] = {}
+        hits = misses = 0
+
+        for key, record in zip(keys, changes):
+            existing = changed.get(key, None) or self._get(partition, key, now)
+            if existing is None and key in spilled:
+                existing = spilled.pop(key)
+                self.metrics.spill_hits += 1
+
+            if existing is None:
+                misses += 1
                 rec = record.copy()
                 rec["count"] = 1
-                self.latest[key] = rec
-                changed_keys.add(key)
             else:
-                existing = self.latest[key]
-                existing["count"] += 1
+                hits += 1
+                # Mark as changed even if ts is older
+                if _is_newer(record["ts"], existing["ts"]):
+                    rec = record.copy()
+                    rec["count"] = existing["count"] + 1
+                else:
+                    existing["count"] += 1
+                    rec = existing
 
-                # mark as changed even if ts is older
-                changed_keys.add(key)
+            self._put(partition, key, rec, now)
+            changed[key] = rec
 
-                if ts > existing["ts"]:
-                    count = existing["count"]
-                    rec = record.copy()
-                    rec["count"] = count
-                    self.latest[key] = rec
+        # Counted before the await, so concurrent calls do not mix their counts
+        self.metrics.hits += hits
+        self.metrics.misses += misses
+
+        if self._spill is not None:
+            await self._spill.save(tenant, changed)
 
-        # ✅ only return records touched in this batch
-        return [self.latest[k] for k in changed_keys]
+        # Only return records touched in this batch
+        return DedupResult(list(changed.values()), hits=hits, misses=misses)
@@ -15,9 +15,16 @@ from airembr.model.system.job_tags import ENTITY_PROPERTY_TAG
 from airembr.model.system.context import ServerContext, Context
 from airembr.model.bigdata.flat_ent_state import FlatEntityState
 from airembr.system.process.logging.log_handler import get_logger
-from airembr.system.adapter.bigdata.general.utils.mapping import entity_property, sys_ent_property_state
-from airembr.system.process.collection.deduplication.entity_prop_dedup import PropertyDeduper
+from airembr.system.adapter.bigdata.general.utils.mapping import entity_property, sys_ent_property_state, \
+    sys_ent_property_latest
+from airembr.system.process.collection.deduplication.entity_prop_dedup import PropertyDeduper, RedisDedupSpill
+from airembr.system.process.monitoring.metrics.metrics import PROPERTY_DEDUP_LOOKUPS, PROPERTY_DEDUP_SIZE
+from airembr.system.process.monitoring.metrics.stage_timer import StageTimer, observe_batch
+from airembr.system.config.global_config import global_settings
+from airembr.sdk.storage.cache.client.redis_async_client import AsyncRedisClient
 from airembr.system.adapter.bigdata.tool.column_mapper import map_to_table_columns
+from airembr.system.adapter.bigdata.tool.latest_rows import keep_latest
+from airembr.system.adapter.bigdata.tool.stream_load_splitter import StreamLoadResult
 from airembr.system.adapter.bigdata.big_data_adapter import *
 from airembr.system.adapter.queue.queue_adapter import queue_adapter
 
@@ -25,7 +32,20 @@ from airembr.system.adapter.queue.queue_adapter import queue_adapter
 logger = get_logger(__name__)
 _ent_property_mapping = entity_property()
 _ent_property_state_mapping = sys_ent_property_state()
-dedup = PropertyDeduper()
+_ent_property_latest_mapping = sys_ent_property_latest()
+
+
+def _get_dedup_spill() -> Optional[RedisDedupSpill]:
+    if not global_settings.property_dedup_redis_spill:
+        return None
+    return RedisDedupSpill(AsyncRedisClient(), ttl=global_settings.property_dedup_ttl)
+
+
+dedup = PropertyDeduper(
+    max_size=global_settings.property_dedup_max_size,
+    ttl=global_settings.property_dedup_ttl,
+    spill=_get_dedup_spill()
+)
 
 
 def _convert_to_rows(merged_entities):
@@ -43,47 +63,80 @@ def _convert_to_rows(merged_entities):
         yield row
 
 
-async def save_entity_properties(property_rows):
-    _property_column_rows = list(map_to_table_columns(property_rows,
-                                                      mapping=_ent_property_mapping))
+async def save_entity_properties(property_rows, label: Optional[str] = None):
+    _property_column_rows = map_to_table_columns(property_rows,
+                                                 mapping=_ent_property_mapping)
 
     return await bd_event_adapter.adapter.stream(_property_column_rows,
-                                                 _ent_property_mapping)
+                                                 _ent_property_mapping,
+                                                 label=label)
+
 
+async def _save_entity_property_states(property_rows, label: Optional[str] = None):
+    _property_column_rows = map_to_table_columns(property_rows,
+                                                 mapping=_ent_property_state_mapping)
 
-async def _save_entity_property_states(property_rows):
-    _property_column_rows = list(
-        map_to_table_columns(property_rows,
-                             mapping=_ent_property_state_mapping)
+    return await bd_event_adapter.adapter.stream(_property_column_rows,
+                                                 _ent_property_state_mapping,
+                                                 label=label)
+
+
+async def _save_entity_property_latest(property_rows, label: Optional[str] = None):
+    # One row per entity property, the newest of the batch. Keeps the rollup read by EQL current.
+    _property_column_rows = keep_latest(
+        map_to_table_columns(property_rows, mapping=_ent_property_latest_mapping),
+        key_columns=('entity_pk', 'entity_type', 'property_name')
     )
 
+    # Conditional update: a batch that arrives late does not overwrite newer values of other batches
     return await bd_event_adapter.adapter.stream(_property_column_rows,
-                                                 _ent_property_state_mapping)
+                                                 _ent_property_latest_mapping,
+                                                 label=label,
+                                                 merge_condition='ts')
+
+
+def _chunk_label(label: Optional[str], chunk: int) -> Optional[str]:
+    return f"{label}-{chunk}" if label else None
 
 
 async def _save_entity_property_states_batch(transport_context: TransportContext,
                                              batch: List[dict],  # Is a batch
-                                             metadata: Optional[dict] = None):
+                                             metadata: Optional[dict] = None,
+                                             label: Optional[str] = None) -> StreamLoadResult:
     if metadata:
         for trace_id in set(metadata):
             logger.q_info(f"Acquired property states message [{trace_id}] from bulk [{transport_context.trace_id}]")
 
+    result = StreamLoadResult()
+
     # Start
     with ServerContext(Context(**transport_context.as_context())):
         start_time = time()
 
         # Saves properties
-        status, total_rows, saved_rows, message = await _save_entity_property_states(batch)
+        status, total_rows, saved_rows, message = await _save_entity_property_states(batch, label)
+        result.add(status, total_rows, saved_rows, message)
 
         end_time = time()
         logger.stat(
             f"Entity Property States: Saved {saved_rows}, "
             f"Saving={end_time - start_time}, Context={transport_context.tenant}/{transport_context.production}")
 
+        if global_settings.property_latest_rollup:
+            start_time = time()
+            status, total_rows, saved_rows, message = await _save_entity_property_latest(batch, label)
+            result.add(status, total_rows, saved_rows, message)
+            logger.stat(
+                f"Entity Property Latest: Saved {saved_rows}, "
+                f"Saving={time() - start_time}, Context={transport_context.tenant}/{transport_context.production}")
+
+    return result
+
 
 async def _save_entity_property_history_batch(transport_context: TransportContext,
                                               batch: List[dict],
-                                              metadata: Optional[dict] = None):
+                                              metadata: Optional[dict] = None,
+                                              label: Optional[str] = None) -> StreamLoadResult:
     # Make batch unique ad count duplicates
     property_rows = batch
 
@@ -91,40 +144,51 @@ async def _save_entity_property_history_batch(transport_context: TransportContex
         for trace_id in set(metadata):
             logger.q_info(f"Acquired properties message [{trace_id}] from bulk [{transport_context.trace_id}]")
 
+    result = StreamLoadResult()
+
     # Start
     with ServerContext(Context(**transport_context.as_context())):
         start_time = time()
         # Saves properties
-        status, total_rows, saved_rows, message = await save_entity_properties(property_rows)
+        status, total_rows, saved_rows, message = await save_entity_properties(property_rows, label)
+        result.add(status, total_rows, saved_rows, message)
 
         end_time = time()
         logger.stat(
             f"Entity Property History: Saved {saved_rows}, "
             f"Saving={end_time - start_time}, Context={transport_context.tenant}/{transport_context.production}")
 
+    return result
+
 
-async def _save_property_changes_job(transport_context: TransportContext, property_rows: List[DotDict]):
+async def _save_property_changes_job(transport_context: TransportContext, property_rows: List[DotDict],
+                                     label: Optional[str] = None) -> StreamLoadResult:
     max_prop_size = 1000
     props_size = len(property_rows)
     if props_size > max_prop_size:
         chunk_size: int = (props_size // max_prop_size) + 1
         logger.dev_info(
             f"Splitting entity properties in queue into {chunk_size} batches of {max_prop_size}. This is protection against too big queue payloads.")
-        for chunked_props in chunk_generator(property_rows, max_prop_size, True):
+        result = StreamLoadResult()
+        for chunk, chunked_props in enumerate(chunk_generator(property_rows, max_prop_size, True)):
             chunked_props = list(chunked_props)
-            await _save_entity_property_history_batch(
+            chunk_result = await _save_entity_property_history_batch(
                 transport_context,
-                batch=chunked_props
+                batch=chunked_props,
+                label=_chunk_label(label, chunk)
             )
-        return None
+            result.add(*chunk_result.to_tuple())
+        return result
     else:
         return await _save_entity_property_history_batch(
             transport_context,
-            batch=property_rows
+            batch=property_rows,
+            label=label
         )
 
 
-async def _save_property_states_job(transport_context: TransportContext, property_rows: List[DotDict]):
+async def _save_property_states_job(transport_context: TransportContext, property_rows: List[DotDict],
+                                    label: Optional[str] = None) -> StreamLoadResult:
     # Saves property state
     max_prop_size = 1000
     props_size = len(property_rows)
@@ -132,34 +196,54 @@ async def _save_property_states_job(transport_context: TransportContext, propert
         chunk_size: int = (props_size // max_prop_size) + 1
         logger.dev_info(
             f"Splitting entity property states in queue into {chunk_size} batches of {max_prop_size}. This is protection against too big queue payloads.")
-        for chunked_props in chunk_generator(property_rows, max_prop_size, True):
+        result = StreamLoadResult()
+        for chunk, chunked_props in enumerate(chunk_generator(property_rows, max_prop_size, True)):
             chunked_props = list(chunked_props)
-            await _save_entity_property_states_batch(
+            chunk_result = await _save_entity_property_states_batch(
                 transport_context,
-                batch=chunked_props
+                batch=chunked_props,
+                label=_chunk_label(label, chunk)
             )
-        return None
+            result.add(*chunk_result.to_tuple())
+        return result
     else:
         return await _save_entity_property_states_batch(
             transport_context,
-            batch=property_rows
+            batch=property_rows,
+            label=label
         )
 
 
 async def save_properties_batch(transport_context: TransportContext,
                                 batch: List[dict],
-                                metadata: Optional[dict] = None):
+                                metadata: Optional[dict] = None,
+                                label: Optional[str] = None) -> tuple:
+    """ Returns (status, total_rows, saved_rows, message) of all property loads. Status is Fail if any failed. """
     # Saves traits changes
-    await _save_property_changes_job(transport_context, batch)
+    result = await _save_property_changes_job(transport_context, batch, label)
 
     # Saves traits states
     # property_row_without_rel = [item for item in batch if not item.get(FlatEntityProperty._IS_RELATION, False)]
-    await _save_property_states_job(transport_context, batch)
+    states = await _save_property_states_job(transport_context, batch, label)
+    result.add(*states.to_tuple())
+
+    return result.to_tuple()
 
 
 async def save_entity_properties_job(transport_context: TransportContext, property_rows: List[DotDict],
                                      queue: bool = True):
-    return BulkedResult(dedup.process(property_rows))
+    tenant = transport_context.tenant
+
+    with StageTimer('property_dedup', tenant):
+        deduped = await dedup.process(property_rows, tenant=tenant)
+    observe_batch('property_dedup', tenant, len(property_rows))
+
+    if global_settings.enable_prometheus:
+        PROPERTY_DEDUP_LOOKUPS.labels(tenant=tenant, result='hit').inc(deduped.hits)
+        PROPERTY_DEDUP_LOOKUPS.labels(tenant=tenant, result='miss').inc(deduped.misses)
+        PROPERTY_DEDUP_SIZE.labels(tenant=tenant).set(dedup.size(tenant))
+
+    return BulkedResult(deduped.records)
 
 
 async def entity_properties_worker(transport_context: TransportContext, property_rows: List[DotDict]):
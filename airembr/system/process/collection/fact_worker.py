@@ -1,4 +1,4 @@
-from time import time
+from time import perf_counter
 
 from typing import List, Optional, Dict, Tuple, Set
 
@@ -13,14 +13,14 @@ from pararun_adapter import queue_type
 
 from airembr_sdk.core.entity.identification import generate_pk, generate_hid
 from airembr.core.hash.hash import md5
-from airembr.core.time.profiler import time_profiler
 from airembr.core.data.bigint import bigint_to_unsigned_hex
-from airembr.core.hash.data_hasher import hash_dict_64
+from airembr.core.hash.data_hasher import hash_traits
 from airembr.system.utils.text.formaters import _stringify_dict
-from airembr.system.service.bigdata.entity_transformer import compute_entity_property_from_entities
+from airembr.system.service.bigdata.entity_transformer import compute_entity_property_rows
 from airembr.system.service.bigdata.observation_converter import get_obs_2_entity_object, get_rel_2_entity_object
 from airembr.system.process.logging.log_handler import get_logger, log_handler
-from airembr.model.system.transport_payload import FactTransportPayload
+from airembr.model.system.transport_payload import FactTransportPayload, ObservationFactsTransportPayload
+from airembr.model.bigdata.flat_ent_2_gid import FlatEntity2Gid
 from airembr.model.bigdata.flat_ent_2_obs import FlatEntity2Observation
 from airembr.model.bigdata.flat_obs_2_entity import FlatObs2Entity
 from airembr.model.bigdata.flat_text import FlatText
@@ -35,6 +35,11 @@ from airembr.system.adapter.bigdata.general.utils.mapping import event_mapping,
     sys_ent_2_gid, sys_text_mapping, sys_ent_2_text_mapping
 from airembr.system.config.global_config import global_settings
 from airembr.system.adapter.bigdata.tool.column_mapper import map_to_table_columns
+from airembr.system.adapter.bigdata.tool.flush_coordinator import FlushCoordinator, FlushResult
+from airembr.system.adapter.bigdata.tool.stream_load_retry import StreamLoadError
+from airembr.system.adapter.bigdata.tool.stream_load_splitter import batch_label
+from airembr.system.process.monitoring.metrics.metrics import QUEUE_PHASE_LATENCY
+from airembr.system.process.monitoring.metrics.stage_timer import observe_stage, LogSampler
 from airembr.system.process.logging import extra_info
 from airembr.system.adapter.bigdata.big_data_adapter import *
 from airembr.system.config.sys_config import sys_config
@@ -55,6 +60,7 @@ _sys_ent_2_obs_map = sys_ent_2_obs()
 _sys_ent_2_gid_map = sys_ent_2_gid()
 _sys_text_mapping = sys_text_mapping()
 _sys_ent_2_text_mapping = sys_ent_2_text_mapping()
+_log_sampler = LogSampler(global_settings.ingest_log_sample_every)
 
 CACHE_PREFIX = "entity"
 
@@ -139,11 +145,12 @@ async def _validate_fact(flat_fact: FlatFact) -> FlatFact:
     return flat_fact
 
 
-async def _save_properties(transport_context: TransportContext, storage_context_entities, queue: bool):
-    property_rows = list(compute_entity_property_from_entities(storage_context_entities))
+async def _save_properties(transport_context: TransportContext, storage_context_entities, queue: bool,
+                           label: Optional[str] = None):
+    property_rows = compute_entity_property_rows(storage_context_entities)
 
     if not queue:
-        await save_properties_batch(transport_context, property_rows)
+        return await save_properties_batch(transport_context, property_rows, label=label)
 
     else:
         status = await entity_properties_worker(transport_context, property_rows)
@@ -154,49 +161,41 @@ async def _save_properties(transport_context: TransportContext, storage_context_
             raise status.error
 
 
-async def _save_entity_gids(context, entity_gids):
+async def _save_entity_gids(context, entity_gids, label: Optional[str] = None) -> Optional[tuple]:
     if entity_gids:
-        start = time()
-
         # Convert to rows
         gid_rows = map_to_table_columns(entity_gids,
                                         mapping=_sys_ent_2_gid_map)
 
         # Save
-        status, total_rows, saved_rows, message = await bd_event_adapter.adapter.stream(gid_rows,
-                                                                                        _sys_ent_2_gid_map)
-
-        end_time = time()
-        logger.info(
-            f"Entity Global Identifiers: Saved {saved_rows}, "
-            f"Time={end_time - start}, "
-            f"Context={context.tenant}/{context.production}")
+        return await bd_event_adapter.adapter.stream(gid_rows, _sys_ent_2_gid_map, label=label)
+    return None
 
 
-async def _save_facts(transport_context, storage_facts):
+async def _save_facts(transport_context, storage_facts, label: Optional[str] = None) -> Optional[tuple]:
     if storage_facts:
-        start_time = time()
-
         # Save events
         _event_rows = map_to_table_columns(storage_facts, mapping=_evt_mapping)
 
-        status, total_rows, saved_rows, message = await bd_event_adapter.adapter.stream(_event_rows,
-                                                                                        _evt_mapping)
+        return await bd_event_adapter.adapter.stream(_event_rows, _evt_mapping, label=label)
+    return None
 
-        end_time = time()
 
-        logger.stat(
-            f"Events: Saved {saved_rows}, "
-            f"Time={end_time - start_time} (Saving={end_time - start_time}), Context={transport_context.tenant}/{transport_context.production}")
+# (text, origin, ner, observation_id, entity_pk). Origin: 1 observation, 2 fact, 3 entity
+TextRecord = Tuple[str, int, bool, str, str]
 
 
-async def _save_texts(context,
-                      texts: Set[Tuple[str, str, bool]],
-                      source_id: str):
-    if texts:
-        start = time()
-        now = now_in_utc()
+def _sorted_texts(texts: Set[TextRecord]) -> List[TextRecord]:
+    # Sets iterate in a different order in each process, rows of a replayed batch must keep their splits
+    return sorted(texts, key=lambda item: (item[0], item[1], str(item[3]), str(item[4])))
 
+
+async def _save_ent_2_texts(context,
+                            texts: Set[TextRecord],
+                            source_id: str,
+                            now,
+                            label: Optional[str] = None) -> Optional[tuple]:
+    if texts:
         # Entity -> Text
         sys_ent_2_text = [{
             FlatEnt2Text.SOURCE_ID: source_id,
@@ -204,20 +203,20 @@ async def _save_texts(context,
             FlatEnt2Text.ORIGIN: origin,
             FlatEnt2Text.TEXT_ID: md5(text),
             FlatEnt2Text.TS: now
-        } for text, origin, ner, observation_id, entity_pk in texts]
+        } for text, origin, ner, observation_id, entity_pk in _sorted_texts(texts)]
 
         ent_2_text_rows = map_to_table_columns(sys_ent_2_text, mapping=_sys_ent_2_text_mapping)
 
         # Save
-        status, total_rows, saved_rows, message = await bd_event_adapter.adapter.stream(ent_2_text_rows,
-                                                                                       _sys_ent_2_text_mapping)
-        end_time = time()
-        logger.stat(
-            f"Entity -> Text: Saved {saved_rows}, "
-            f"Time={end_time - start}, "
-            f"Context={context.tenant}/{context.production}")
-
-        start = time()
+        return await bd_event_adapter.adapter.stream(ent_2_text_rows, _sys_ent_2_text_mapping, label=label)
+    return None
+
+
+async def _save_texts(context,
+                      texts: Set[TextRecord],
+                      now,
+                      label: Optional[str] = None) -> Optional[tuple]:
+    if texts:
         sys_text = [{
             FlatText.ID: md5(text),
             FlatText.TEXT: text,
@@ -227,59 +226,39 @@ async def _save_texts(context,
             FlatText.ORIGIN: origin,
             FlatText.OBSERVATION_ID: observation_id,
             FlatText.TS: now
-        } for text, origin, ner, observation_id, entity_pk in texts]
+        } for text, origin, ner, observation_id, entity_pk in _sorted_texts(texts)]
 
         text_rows = map_to_table_columns(sys_text, mapping=_sys_text_mapping)
 
         # Save
-        status, total_rows, saved_rows, message = await bd_event_adapter.adapter.stream(text_rows,
-                                                                                        _sys_text_mapping)
-        end_time = time()
-        logger.stat(
-            f"Texts: Saved {saved_rows}, "
-            f"Time={end_time - start}, "
-            f"Context={context.tenant}/{context.production}")
+        return await bd_event_adapter.adapter.stream(text_rows, _sys_text_mapping, label=label)
+    return None
 
 
-async def _save_entity_history(context, storage_context_entities):
+async def _save_entity_history(context, storage_context_entities, label: Optional[str] = None) -> tuple:
     # Save Entity History
-    start_time = time()
-
     context_entity_rows = map_to_table_columns(storage_context_entities,
                                                mapping=_ent_history_mapping)
 
-    status, total_rows, saved_rows, message = await bd_event_adapter.adapter.stream(context_entity_rows,
-                                                                                    _ent_history_mapping)
-
-    end_time = time()
-
-    logger.stat(
-        f"Entity History: Saved {saved_rows}, "
-        f"Saving={end_time - start_time}, Context={context.tenant}/{context.production}")
+    return await bd_event_adapter.adapter.stream(context_entity_rows, _ent_history_mapping, label=label)
 
 
-async def _save_ent_2_obs(row_objects) -> tuple:
-    obs_2_entity_rows = list(map_to_table_columns(row_objects, mapping=_sys_ent_2_obs_map))
+async def _save_ent_2_obs(row_objects, label: Optional[str] = None) -> tuple:
+    obs_2_entity_rows = map_to_table_columns(row_objects, mapping=_sys_ent_2_obs_map)
     # Return status, total_rows, saved_rows, message
-    return await bd_event_adapter.adapter.stream(obs_2_entity_rows, _sys_ent_2_obs_map)
+    return await bd_event_adapter.adapter.stream(obs_2_entity_rows, _sys_ent_2_obs_map, label=label)
 
 
-async def _save_obs_2_entity(row_objects) -> tuple:
-    obs_2_entity_rows = list(map_to_table_columns(row_objects, mapping=_sys_obs_2_entity_mapping))
+async def _save_obs_2_entity(row_objects, label: Optional[str] = None) -> tuple:
+    obs_2_entity_rows = map_to_table_columns(row_objects, mapping=_sys_obs_2_entity_mapping)
     # Return status, total_rows, saved_rows, message
-    return await bd_event_adapter.adapter.stream(obs_2_entity_rows, _sys_obs_2_entity_mapping)
+    return await bd_event_adapter.adapter.stream(obs_2_entity_rows, _sys_obs_2_entity_mapping, label=label)
 
 
-async def _save_timers(context, storage_timers):
-    start_time = time()
+async def _save_timers(context, storage_timers, label: Optional[str] = None) -> tuple:
     timer_rows = map_to_table_columns(storage_timers, mapping=_sys_timer_mapping)
 
-    status, total_rows, saved_rows, message = await bd_event_adapter.adapter.stream(timer_rows,
-                                                                                    _sys_timer_mapping)
-    end_time = time()
-    logger.info(
-        f"Timers: Saved {saved_rows}, "
-        f"Saving={end_time - start_time}, Context={context.tenant}/{context.production}")
+    return await bd_event_adapter.adapter.stream(timer_rows, _sys_timer_mapping, label=label)
 
 
 def _get_key(entity_type, entity_id, entity_hash) -> str:
@@ -344,7 +323,7 @@ def _yield_not_saved_entities(storage_context_entities):
                 yield entity
 
 
-async def _store_ent_2_obs(transport_context, obs_2_entity):
+async def _store_ent_2_obs(transport_context, obs_2_entity, label: Optional[str] = None) -> Optional[tuple]:
     if obs_2_entity:
         # This mapping may not be needed
         ent_2_obs_rows = [
@@ -356,40 +335,87 @@ async def _store_ent_2_obs(transport_context, obs_2_entity):
             for item in obs_2_entity
         ]
 
-        with time_profiler() as timer:
-            status, total_rows, saved_rows, message = await _save_ent_2_obs(ent_2_obs_rows)
+        return await _save_ent_2_obs(ent_2_obs_rows, label)
+    return None
 
-        logger.stat(
-            f"Entities To Observation: {saved_rows}, "
-            f"Saving={timer.duration}, Context={transport_context.tenant}/{transport_context.production}")
 
-
-async def _store_obs_2_entity(transport_context, obs_2_entity):
+async def _store_obs_2_entity(transport_context, obs_2_entity, label: Optional[str] = None) -> Optional[tuple]:
     if obs_2_entity:
-        with time_profiler() as timer:
-            status, total_rows, saved_rows, message = await _save_obs_2_entity(obs_2_entity)
-        logger.stat(
-            f"Observation to Entity Changes: {saved_rows}, "
-            f"Saving={timer.duration}, Context={transport_context.tenant}/{transport_context.production}")
+        return await _save_obs_2_entity(obs_2_entity, label)
+    return None
 
 
-def _get_entities(storage_payload):
+def _get_entities(storage_payload: ObservationFactsTransportPayload):
     if storage_payload.entities:
         return [ObservationEntity(item) for item in storage_payload.entities]
     return []
 
 
-def _get_relation(storage_payload, session_id) -> FlatRelation:
-    flat_relation = FlatRelation(storage_payload.relation)
+def _get_relation(relation: dict, session_id) -> FlatRelation:
+    flat_relation = FlatRelation(relation)
     flat_relation[FlatRelation.ENTITY_CLASSIFICATION] = 'entity > occurrent'
     flat_relation[FlatRelation.SESSION_ID] = session_id
     return flat_relation
 
 
+def _load_transport_payload(payload: dict) -> Optional[ObservationFactsTransportPayload]:
+    if not isinstance(payload, dict):
+        raise ValueError(
+            f"Incorrect payload {payload}. Expected dict in schema of ObservationFactsTransportPayload type, got `{type(payload)}`.")
+
+    # Recreate from dict
+    try:
+        if ObservationFactsTransportPayload.is_envelope(payload):
+            return ObservationFactsTransportPayload(**payload)
+
+        # Payloads queued before the observation envelope was introduced
+        return ObservationFactsTransportPayload.from_fact_payload(FactTransportPayload(**payload))
+    except TypeError as e:
+        logger.warning(
+            f"Skipping incompatible Kafka message — schema mismatch: {e}. "
+            f"Payload keys: {list(payload.keys())}")
+        return None
+
+
+def _get_observation_entity(observation: dict, session_id, now) -> DotDict:
+    observation_id = observation.get('id')
+    observer_pk = observation.get('observer', None)
+    observation_traits = observation.get('traits', {})
+    observation_hash = hash_traits(observation_traits)
+    observation_entity_type = 'observation'
+    observation_label = observation.get('label', None)
+    observation_data_hash = observation_hash.data_hash
+    observation_pk = generate_pk(observation_entity_type, observation_id)
+    observation_entity = {
+        FlatEntityHistory.OBS_ID: observation_id,
+        FlatEntityHistory.SESSION_ID: session_id,
+        FlatEntityHistory.OBSERVER_PK: observer_pk,
+        FlatEntityHistory.ENTITY_ID: observation_id,
+        FlatEntityHistory.ENTITY_HID: generate_hid(observation_pk, observation_data_hash),
+        FlatEntityHistory.ENTITY_PK: observation_pk,
+        FlatEntityHistory.ENTITY_TYPE: observation_entity_type,
+        FlatEntityHistory.ENTITY_CLASSIFICATION: 'entity > occurrent',
+        FlatEntityHistory.ENTITY_LABEL: observation_label,
+        FlatEntityHistory.ENTITY_TRAITS: observation_traits,
+        FlatEntityHistory.ENTITY_TRAITS_TEXT: _stringify_dict(observation_traits),
+        FlatEntityHistory.DATA_HASH: observation_data_hash,
+        FlatEntityHistory.SCHEMA_HASH: observation_hash.schema_hash,
+        FlatEntityHistory.FIELD_HASH: observation_hash.field_hashes,
+        FlatEntityHistory.REL_TYPE: 'observation',
+        FlatEntityHistory.REL_LABEL: observation_label.lower().replace(' ',
+                                                                       '-') if observation_label else 'observation',
+        FlatEntityHistory.TIME_CREATE: now,
+
+        FlatEntityHistory.TS: now,
+        FlatEntityHistory.CONTEXT: observation_entity_type,
+    }
+    return DotDict() << observation_entity
+
+
 async def save_events_in_queue(transport_context: TransportContext,
                                batch: List[dict],
                                metadata: Optional[List[dict]] = None,
-                               queue=True):
+                               queue=True) -> Optional[FlushResult]:
     # Batch has the same type as none batched data but has all rows
     logger.debug(f"Triggered batched processing with {len(batch)} events")
 
@@ -404,81 +430,70 @@ async def save_events_in_queue(transport_context: TransportContext,
             indexed_entities_by_id: Dict[tuple, DotDict | FlatRelation] = {}
             storage_timers = []
             obs_2_entity = []
-            sys_texts = set()
+            sys_texts: Set[TextRecord] = set()
 
-            for fact_transport_payload in batch:
+            gids = {}
+            source_id = None
 
-                if not isinstance(fact_transport_payload, dict):
-                    raise ValueError(
-                        f"Incorrect payload {fact_transport_payload}. Expected dict in schema of FactTransportPayload type, got `{type(fact_transport_payload)}`.")
+            index_start = perf_counter()
+            for transport_payload in batch:
 
-                # Recreate from dict
-                try:
-                    fact_transport_payload = FactTransportPayload(**fact_transport_payload)
-                except TypeError as e:
-                    logger.warning(
-                        f"Skipping incompatible Kafka message — schema mismatch: {e}. "
-                        f"Payload keys: {list(fact_transport_payload.keys())}")
+                observation_payload = _load_transport_payload(transport_payload)
+                if observation_payload is None:
                     continue
 
-
-                if fact_transport_payload.trace_id:
+                if observation_payload.trace_id:
                     logger.q_info(
-                        f"Acquired storage message [{fact_transport_payload.trace_id}] in bulk [{server_context.context.trace_id}]")
-
-                session_id = fact_transport_payload.session.get('id', None) if fact_transport_payload.session else None
-
-                # Index observation
-                with time_profiler("Observation indexing"):
-                    observation_id = fact_transport_payload.observation.get('id')
-                    observer_pk = fact_transport_payload.observation.get('observer', None)
-                    observation_traits = fact_transport_payload.observation.get('traits', {})
-                    observation_fields = sorted(DotDict(observation_traits).flat())
-                    observation_entity_type = 'observation'
-                    observation_label = fact_transport_payload.observation.get('label', None)
-                    observation_data_hash = hash_dict_64(observation_traits)
-                    observation_pk = generate_pk(observation_entity_type, observation_id)
-                    observation_entity = {
-                        FlatEntityHistory.OBS_ID: observation_id,
-                        FlatEntityHistory.SESSION_ID: session_id,
-                        FlatEntityHistory.OBSERVER_PK: observer_pk,
-                        FlatEntityHistory.ENTITY_ID: observation_id,
-                        FlatEntityHistory.ENTITY_HID: generate_hid(observation_pk, observation_data_hash),
-                        FlatEntityHistory.ENTITY_PK: observation_pk,
-                        FlatEntityHistory.ENTITY_TYPE: observation_entity_type,
-                        FlatEntityHistory.ENTITY_CLASSIFICATION: 'entity > occurrent',
-                        FlatEntityHistory.ENTITY_LABEL: observation_label,
-                        FlatEntityHistory.ENTITY_TRAITS: observation_traits,
-                        FlatEntityHistory.ENTITY_TRAITS_TEXT: _stringify_dict(observation_traits),
-                        FlatEntityHistory.DATA_HASH: observation_data_hash,
-                        FlatEntityHistory.SCHEMA_HASH: hash_dict_64(observation_fields),
-                        FlatEntityHistory.FIELD_HASH: [hash_dict_64(field) for field in observation_fields],
-                        FlatEntityHistory.REL_TYPE: 'observation',
-                        FlatEntityHistory.REL_LABEL: observation_label.lower().replace(' ',
-                                                                                       '-') if observation_label else 'observation',
-                        FlatEntityHistory.TIME_CREATE: now,
-
-                        FlatEntityHistory.TS: now,
-                        FlatEntityHistory.CONTEXT: observation_entity_type,
-                    }
-                    observation_entity = DotDict() << observation_entity
-                    indexed_entities_by_id[(observation_id, observation_data_hash)] = observation_entity
-
-                    # Include observatio as an entity in obs_2_ent
-                    obs_2_entity.append(get_obs_2_entity_object(
+                        f"Acquired storage message [{observation_payload.trace_id}] in bulk [{server_context.context.trace_id}]")
+
+                source_id = observation_payload.source_id
+                session_id = observation_payload.session.get('id', None) if observation_payload.session else None
+
+                # Index observation (once per observation, not per fact)
+                observation_id = observation_payload.observation.get('id')
+                observation_entity = _get_observation_entity(observation_payload.observation, session_id, now)
+                observation_data_hash = observation_entity[FlatEntityHistory.DATA_HASH]
+                indexed_entities_by_id[(observation_id, observation_data_hash)] = observation_entity
+
+                # Include observatio as an entity in obs_2_ent
+                obs_2_entity.append(get_obs_2_entity_object(
+                    observation_id,
+                    observation_entity,
+                    session_id=session_id
+                ))
+
+                # Add observation text + origin to sys_text
+                obs_dotdict = DotDict(observation_payload.observation) if observation_payload.observation else DotDict()
+                obs_txt_ner = obs_dotdict.get('text.ner', False)
+                obs_txt_summary = obs_dotdict.get('text.summary', None)
+                obs_txt_description = obs_dotdict.get('text.description', None)
+                if obs_txt_summary: sys_texts.add(
+                    (
+                        obs_txt_summary,
+                        1, #'observation'
+                        obs_txt_ner,
                         observation_id,
-                        observation_entity,
-                        session_id=session_id
-                    ))
+                        observation_id  # Entity_PK
+                    )
+                )
+                if obs_txt_description: sys_texts.add(
+                    (
+                        obs_txt_description,
+                        1, # 'observation'
+                        obs_txt_ner,
+                        observation_id,
+                        observation_id  # Entity_PK
+                    )
+                )
+
+                for fact_record in observation_payload.facts:
 
-                with time_profiler("Timer indexing"):
                     # Timer
-                    if fact_transport_payload.timer:
-                        flat_timer = DotDict(fact_transport_payload.timer)
+                    if fact_record.timer:
+                        flat_timer = DotDict(fact_record.timer)
                         storage_timers.append(flat_timer)
 
-                with time_profiler("Text indexing"):
-                    fact_dotdict = DotDict(fact_transport_payload.fact) if fact_transport_payload.relation else DotDict()
+                    fact_dotdict = DotDict(fact_record.fact) if fact_record.relation else DotDict()
                     rel_pk = fact_dotdict.get(FlatFact.REL_PK, None)
 
                     # Add fact text + origon to sys_text
@@ -510,39 +525,12 @@ async def save_events_in_queue(transport_context: TransportContext,
                             )
                         )
 
-                    # Add observation text + origin to sys_text
-                    obs_dotdict = DotDict(fact_transport_payload.observation) if fact_transport_payload.observation else DotDict()
-                    obs_txt_ner = obs_dotdict.get('text.ner', False)
-                    obs_txt_summary = obs_dotdict.get('text.summary', None)
-                    obs_txt_description = obs_dotdict.get('text.description', None)
-                    if obs_txt_summary: sys_texts.add(
-                        (
-                            obs_txt_summary,
-                            1, #'observation'
-                            obs_txt_ner,
-                            observation_id,
-                            observation_id  # Entity_PK
-                        )
-                    )
-                    if obs_txt_description: sys_texts.add(
-                        (
-                            obs_txt_description,
-                            1, # 'observation'
-                            obs_txt_ner,
-                            observation_id,
-                            observation_id  # Entity_PK
-                        )
-                    )
-
-                with time_profiler("Fact indexing"):
-                    flat_relation = None
-
                     # Reconstruct fact from storage payload
                     # Add to fact storage list
                     # Add relation to context entities
-                    if fact_transport_payload.has_relation():
+                    if fact_record.has_relation():
 
-                        _flat_fact = FlatFact(fact_transport_payload.fact)
+                        _flat_fact = FlatFact(fact_record.fact)
                         _flat_fact[FlatFact.METADATA_TIME_INSERT] = now
 
                         # Validate fact
@@ -551,82 +539,98 @@ async def save_events_in_queue(transport_context: TransportContext,
                         # Add fact to storage
                         storage_facts.append(_flat_fact)
 
-                        # If has fact should have relation
-                        if fact_transport_payload.relation:
-                            # Reconstruct relation from storage payload NOT  NONE)
-                            flat_relation: FlatRelation = _get_relation(fact_transport_payload, session_id)
+                        # Reconstruct relation from storage payload NOT  NONE)
+                        flat_relation: FlatRelation = _get_relation(fact_record.relation, session_id)
 
+                        # Relation is shared by all facts of the same relation (one per object)
+                        relation_data_hash = flat_relation[FlatRelation.DATA_HASH]
+                        rel_pk = flat_relation[FlatRelation.ENTITY_PK]
+                        index_key = (rel_pk, relation_data_hash)
+
+                        if index_key not in indexed_entities_by_id:
                             # Validate
                             flat_relation = await _validate_relation(_flat_fact, flat_relation)
 
                             # Add to context entities
-                            relation_data_hash = flat_relation[FlatRelation.DATA_HASH]
-                            rel_pk = flat_relation[FlatRelation.ENTITY_PK]
-
-                            index_key = (rel_pk, relation_data_hash)
                             indexed_entities_by_id[index_key] = flat_relation
 
-                            # Include relation as an entity in obs_2_ent
-                            obs_2_entity.append(get_rel_2_entity_object(
-                                observation_id,
-                                flat_relation,
-                                session_id=session_id
-                            ))
+                        # Include relation as an entity in obs_2_ent
+                        obs_2_entity.append(get_rel_2_entity_object(
+                            observation_id,
+                            flat_relation,
+                            session_id=session_id
+                        ))
 
-                with time_profiler("Entity indexing"):
-                    # Reconstruct Context Entities from storage payload
-                    flat_entities = _get_entities(fact_transport_payload)
-                    for _entity in flat_entities:
+                # Reconstruct Context Entities from storage payload. Entities are sent once per observation.
+                flat_entities = _get_entities(observation_payload)
+                for _entity in flat_entities:
 
-                        if _entity.get(FlatEntityHistory.ENTITY_ID, None) is None:
-                            # DO NOT save abstract entities
-                            continue
+                    if _entity.get(FlatEntityHistory.ENTITY_ID, None) is None:
+                        # DO NOT save abstract entities
+                        continue
 
-                        ent_pk = _entity[FlatEntityHistory.ENTITY_PK]
-                        ent_data_hash = _entity.get(FlatEntityHistory.DATA_HASH, None)
+                    ent_pk = _entity[FlatEntityHistory.ENTITY_PK]
+                    ent_data_hash = _entity.get(FlatEntityHistory.DATA_HASH, None)
 
-                        # Must index by id and data_hash as there can be multiple entities with same id but different data_hash
-                        index_key = (ent_pk, ent_data_hash)
-                        indexed_entities_by_id[index_key] = _entity
+                    # Must index by id and data_hash as there can be multiple entities with same id but different data_hash
+                    index_key = (ent_pk, ent_data_hash)
+                    indexed_entities_by_id[index_key] = _entity
 
-                        # Get context entities in observation
-                        obs_2_entity.append(get_obs_2_entity_object(
-                            observation_id,
-                            _entity,
-                            session_id=session_id
-                        ))
+                    # Get context entities in observation
+                    obs_2_entity.append(get_obs_2_entity_object(
+                        observation_id,
+                        _entity,
+                        session_id=session_id
+                    ))
 
-                        # Add entity text
-                        txt_ner = _entity.get(FlatEntityHistory.TEXT_NER, False)
-                        txt_description = _entity.get(FlatEntityHistory.TEXT_DESCRIPTION, None)
-                        txt_summary = _entity.get(FlatEntityHistory.TEXT_SUMMARY, None)
-
-                        if txt_description:
-                            sys_texts.add(
-                                (
-                                    txt_description,
-                                    3, # 'entity'
-                                    txt_ner,
-                                    observation_id,
-                                    ent_pk  # Entity_PK
-                                )
+                    # Add entity text
+                    txt_ner = _entity.get(FlatEntityHistory.TEXT_NER, False)
+                    txt_description = _entity.get(FlatEntityHistory.TEXT_DESCRIPTION, None)
+                    txt_summary = _entity.get(FlatEntityHistory.TEXT_SUMMARY, None)
+
+                    if txt_description:
+                        sys_texts.add(
+                            (
+                                txt_description,
+                                3, # 'entity'
+                                txt_ner,
+                                observation_id,
+                                ent_pk  # Entity_PK
                             )
-                        if txt_summary:
-                            sys_texts.add(
-                                (
-                                    txt_summary,
-                                    3, # 'entity'
-                                    txt_ner,
-                                    observation_id,
-                                    ent_pk  # Entity_PK
-                                )
+                        )
+                    if txt_summary:
+                        sys_texts.add(
+                            (
+                                txt_summary,
+                                3, # 'entity'
+                                txt_ner,
+                                observation_id,
+                                ent_pk  # Entity_PK
                             )
+                        )
+
+                # Global identifiers of all observations in batch
+                for gid in observation_payload.gids or []:
+                    gids[(gid.get(FlatEntity2Gid.ENTITY_PK), gid.get(FlatEntity2Gid.ENTITY_GID))] = gid
+
+            index_duration = perf_counter() - index_start
+            observe_stage('index', transport_context.tenant, index_duration)
+
+            # All loads below go to different tables and are independent of each other,
+            # so they are flushed concurrently.
+            flush = FlushCoordinator(concurrency=global_settings.storage_flush_concurrency)
+
+            # Loads of a replayed batch get the same labels, so StarRocks skips tables that were loaded.
+            # The label is made of the payloads, so a new batch with the same observation ids is loaded.
+            label = batch_label(batch)
 
             # Save facts
-            await _save_facts(transport_context, storage_facts)
+            flush.add(_evt_mapping.table, _save_facts, transport_context, storage_facts, label)
 
             # Save texts
-            await _save_texts(transport_context, sys_texts, fact_transport_payload.source_id)
+            flush.add(_sys_ent_2_text_mapping.table, _save_ent_2_texts, transport_context, sys_texts,
+                      source_id, now, label)
+            flush.add(_sys_text_mapping.table, _save_texts, transport_context, sys_texts, now, label)
 
             # Get entities to store
             storage_context_entities = list(indexed_entities_by_id.values())
@@ -634,7 +638,8 @@ async def save_events_in_queue(transport_context: TransportContext,
             if storage_context_entities:
 
                 # Save entity global identifiers
-                await _save_entity_gids(transport_context, fact_transport_payload.gids)
+                flush.add(_sys_ent_2_gid_map.table, _save_entity_gids, transport_context, list(gids.values()),
+                          label)
 
                 # Get changed entities
                 entities_to_save = list(_yield_not_saved_entities(storage_context_entities))
@@ -645,19 +650,22 @@ async def save_events_in_queue(transport_context: TransportContext,
                 if entities_to_save:
 
                     # Save Context Entities
-                    await _save_entity_history(transport_context, entities_to_save)
+                    flush.add(_ent_history_mapping.table, _save_entity_history, transport_context, entities_to_save,
+                              label)
 
                     # Save Entities Last Properties
                     # WARNING: It overrides old properties and keeps the newest. This is by design.
                     # WARNING: IT is used by System 1 memory for quick search.
-                    await _save_properties(transport_context, entities_to_save, queue=False)
+                    flush.add(_ent_property_mapping.table, _save_properties, transport_context, entities_to_save, False,
+                              label)
 
                     # Save entity in observation.
-                    await _store_ent_2_obs(transport_context, obs_2_entity)
+                    flush.add(_sys_ent_2_obs_map.table, _store_ent_2_obs, transport_context, obs_2_entity, label)
 
                     # Save entity relation to observation - ALERT THIS MAYBE DUPLICATE
                     # BUT IT SAVES entity per each change
-                    await _store_obs_2_entity(transport_context, obs_2_entity)
+                    flush.add(_sys_obs_2_entity_mapping.table, _store_obs_2_entity, transport_context, obs_2_entity,
+                              label)
 
                     # DISABLED: Save in cache for 1h if no traits change
                     if False and global_settings.entity_cache_ttl > 0:
@@ -668,7 +676,38 @@ async def save_events_in_queue(transport_context: TransportContext,
 
             if storage_timers:
                 # Save Timers
-                await _save_timers(transport_context, storage_timers)
+                flush.add(_sys_timer_mapping.table, _save_timers, transport_context, storage_timers, label)
+
+            flush_result = await flush.flush()
+
+            tenant = transport_context.tenant
+            for result in flush_result.tables.values():
+                observe_stage('stream_load', tenant, result.duration, result.table)
+
+            if _log_sampler():
+                saved = {result.table: result.saved_rows for result in flush_result.tables.values()}
+                logger.stat(
+                    f"Storage flush: {len(batch)} payloads indexed in {index_duration:.3f}s, Saved={saved}, "
+                    f"Failed={[result.table for result in flush_result.failed()]}, "
+                    f"Time={flush_result.duration:.3f}s, Context={tenant}/{transport_context.production}")
+
+            if global_settings.enable_prometheus:
+                QUEUE_PHASE_LATENCY.labels(phase='storage').observe(flush_result.duration)
+
+            if flush_result.is_partial_failure():
+                failed = [result.table for result in flush_result.failed()]
+                message = (f"Storage of {len(batch)} payloads failed for tables {failed}. "
+                           f"Context={transport_context.tenant}/{transport_context.production}")
+
+                # Do not acknowledge a batch that was not stored, if its replay can not load tables twice.
+                # Without labels tables that were loaded would get the rows again, so the failure is only logged.
+                if bd_event_adapter.adapter.sends_labels:
+                    raise StreamLoadError(message)
+                logger.error(f"{message} The batch is not replayed, stream loads have no labels.")
+
+            return flush_result
+
+    return None
 
 
 def save_event_in_queue(context: TransportContext,
@@ -678,7 +717,7 @@ def save_event_in_queue(context: TransportContext,
     return BulkedResult(bulk_storage_payload)  # we need one by one
 
 
-async def event_storage_worker(fact_transport_payload_list: List[FactTransportPayload]):
+async def event_storage_worker(fact_transport_payload_list: List[ObservationFactsTransportPayload]):
     if fact_transport_payload_list:
         with deferred_execution() as defer:
             status = await defer(save_event_in_queue)(fact_transport_payload_list).push(
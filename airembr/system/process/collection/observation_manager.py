@@ -1,23 +1,29 @@
+import asyncio
+import contextvars
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from uuid import uuid4
-from durable_dot_dict.dotdict import DotDict
 from typing import List, Tuple, Optional, AsyncGenerator
 
 from pydantic import ValidationError
 
 from airembr.system.config.sys_config import sys_config
+from airembr.system.config.global_config import global_settings
 from airembr_sdk.core.date import now_in_utc
 from pararun.model.transport_context import TransportContext
 from pararun_adapter import queue_type
 
-from airembr.model.system.transport_payload import FactTransportPayload, ObsTransportPayload
+from airembr.model.system.transport_payload import ObservationFactsTransportPayload, ObsTransportPayload
 from airembr.model.system.headers import Headers
 from airembr.model.api.request.observation import Observation
-from airembr.model.system.context import ServerContext, Context
+from airembr.model.system.context import ServerContext, Context, get_context
 from airembr.system.process.logging.log_handler import get_logger
 from airembr.system.adapter.queue.queue_adapter import queue_adapter
 from airembr.system.process.dispatching.trigger_manager import run_triggers
-from airembr.system.process.collection.computation.event_computer import compute_events
+from airembr.system.process.dispatching.trigger_runner import TriggerRunner
+from airembr.system.process.monitoring.metrics.stage_timer import StageTimer
+from airembr.system.process.collection.computation.event_computer import compute_observation_facts
 from airembr.system.process.sourcing.source_validation import valid_sources
 from airembr.model.bigdata.flat_log_payload import FlatLogPayload
 from airembr.system.adapter.bigdata.big_data_adapter import bd_log_payload_adapter
@@ -25,6 +31,7 @@ from airembr.system.process.collection.fact_worker import save_events_in_queue,
 from airembr.system.process.collection.observation_worker import obs_storage_worker, save_obs_in_queue
 
 logger = get_logger(__name__)
+_compute_pool: Optional[ThreadPoolExecutor] = None
 
 
 def _get_valid_observation(observations) -> List[Observation]:
@@ -37,6 +44,20 @@ def _get_valid_observation(observations) -> List[Observation]:
     return _observations
 
 
+@lru_cache(maxsize=128)
+def _get_allowed_bridges(x_bridge: str) -> List[str]:
+    return x_bridge.split(',')
+
+
+def _set_trait(traits: dict, key: str, sub_key: str, value):
+    # Same as DotDict(traits)[f"{key}.{sub_key}"] = value, without wrapping traits
+    node = traits.get(key, None)
+    if not isinstance(node, dict):
+        node = {}
+        traits[key] = node
+    node[sub_key] = value
+
+
 async def valid_observations(headers: Headers,
                              observations: List[dict]):
     observations: List[Observation] = _get_valid_observation(observations)
@@ -45,10 +66,10 @@ async def valid_observations(headers: Headers,
     sources = {observation.source.id for observation in observations}
 
     # Fetch allowed bridges from header x-bridge
-    allowed_bridge = headers.get('x-bridge', 'rest')
-    allowed_bridge = allowed_bridge.split(',')
+    allowed_bridge = _get_allowed_bridges(headers.get('x-bridge', 'rest'))
 
-    valid_source_ids = [id async for id in valid_sources(headers, sources, allowed_bridges=allowed_bridge)]
+    # All sources of the request are checked in one lookup
+    valid_source_ids = {id async for id in valid_sources(headers, sources, allowed_bridges=allowed_bridge)}
     for observation in observations:
         if observation.source.id not in valid_source_ids:
             logger.warning(
@@ -59,13 +80,11 @@ async def valid_observations(headers: Headers,
         if observation.traits is None:
             observation.traits = {}
 
-        observation_traits = DotDict(observation.traits)
-        observation_traits['source.id'] = observation.source.id
+        _set_trait(observation.traits, 'source', 'id', observation.source.id)
         # TODO add source name
         # Valid observation will have session_id in traits
         if observation.has_session():
-            observation_traits['session.id'] = observation.session.id
-        observation.traits = observation_traits.to_dict()
+            _set_trait(observation.traits, 'session', 'id', observation.session.id)
 
         yield observation
 
@@ -109,7 +128,7 @@ async def _store_observations(context,
 
 async def _store_facts(context,
                        headers: Headers,
-                       fact_transport_list: List[FactTransportPayload]):
+                       fact_transport_list: List[ObservationFactsTransportPayload]):
     # Background worker?
     if headers.should_process(service='store'):
         # Should be queued
@@ -131,15 +150,42 @@ async def _store_facts(context,
             await save_events_in_queue(transport_context, batch=fact_transport_list, queue=False)
 
 
+def _get_compute_pool() -> ThreadPoolExecutor:
+    global _compute_pool
+    if _compute_pool is None:
+        _compute_pool = ThreadPoolExecutor(max_workers=max(1, global_settings.observation_compute_workers),
+                                           thread_name_prefix='observation-compute')
+    return _compute_pool
+
+
+async def _compute_facts(observations: List[Observation], headers: Headers) -> List[
+    Optional[ObservationFactsTransportPayload]]:
+    with StageTimer('compute_events', get_context().tenant):
+        # Small batches are cheaper to compute inline
+        if len(observations) < global_settings.observation_compute_pool_threshold:
+            return [compute_observation_facts(observation, headers) for observation in observations]
+
+        # Facts are computed in the pool so the event loop keeps serving triggers and requests.
+        # Each job runs in a copy of the current context (tenant, production). Results keep observation order.
+        loop = asyncio.get_running_loop()
+        pool = _get_compute_pool()
+        return await asyncio.gather(*[
+            loop.run_in_executor(pool, contextvars.copy_context().run, compute_observation_facts, observation, headers)
+            for observation in observations
+        ])
+
+
 async def _yield_valid_observation(headers, observations: List[dict]) -> AsyncGenerator[
     Tuple[
         Observation,
-        List[FactTransportPayload]
+        Optional[ObservationFactsTransportPayload]
     ]
     , None]:
-    async for observation in valid_observations(headers, observations):
-        # Observation, flat_fact, flat_relation, storage_context_entities, timer
-        yield observation, [item async for item in compute_events(observation, headers)]
+    _observations = [observation async for observation in valid_observations(headers, observations)]
+
+    # Observation with its facts, entities and gids
+    for observation, storage_payload in zip(_observations, await _compute_facts(_observations, headers)):
+        yield observation, storage_payload
 
 def _unpack_observations(observations: List[dict], headers: Headers):
     _headers = json.dumps(dict(headers))
@@ -164,16 +210,21 @@ async def compute_and_save_events(context,
                                   observations: List[dict],
                                   headers: Headers):
     sent_records = 0
-    single_storage_payload_list: List[FactTransportPayload] = []
+    single_storage_payload_list: List[ObservationFactsTransportPayload] = []
     single_observation_list: List[ObsTransportPayload] = []
 
+    # Triggers run concurrently, next to storage
+    triggers = TriggerRunner(concurrency=global_settings.trigger_concurrency,
+                             timeout=global_settings.trigger_timeout)
+
     # Observations are sent (via request) in bulks. Process each observation individually
-    async for observation, storage_payload_list in _yield_valid_observation(headers, observations):
-        # storage_payload has [{observation, flat_fact, flat_relation, storage_context_entities, timer}]
+    async for observation, storage_payload in _yield_valid_observation(headers, observations):
+        # storage_payload has {observation, entities, gids, facts: [{fact, relation, timer, entities}]}
         sent_records += 1
 
         # Bulk all storage payloads from a list of observations
-        single_storage_payload_list.extend(storage_payload_list)
+        if storage_payload is not None:
+            single_storage_payload_list.append(storage_payload)
 
         # Add observation transport payload
         single_observation_list.append(ObsTransportPayload(
@@ -190,13 +241,16 @@ async def compute_and_save_events(context,
         ))
 
         # Triggers per observation
-        await run_triggers(headers, observation)
+        triggers.add(observation.id, run_triggers(headers, observation))
 
-    # Store observations
-    await _store_observations(context, headers, single_observation_list)
+    try:
+        # Store observations
+        await _store_observations(context, headers, single_observation_list)
 
-    # Store facts
-    await _store_facts(context, headers, single_storage_payload_list)
+        # Store facts
+        await _store_facts(context, headers, single_storage_payload_list)
+    finally:
+        await triggers.wait()
 
     # Store api calls
     if sys_config.backup_api_calls:
@@ -9,10 +9,10 @@ from airembr.model.process_status import ProcessStatus
 from airembr.core.exception.exception import EventValidationException
 from airembr.model.metadata.sys_evt_validation import EventValidator
 from airembr.system.adapter.metadata.mysql.interface import event_validation_dao
-from airembr.sdk.service.parser.tql.parser import Parser
+from airembr.sdk.service.parser.tql.condition import Condition
 from airembr.sdk.service.parser.tql.transformer.expr_transformer import ExprTransformer
 
-parser = Parser(Parser.read('grammar/uql_expr.lark'), start='expr')
+parser = Condition().parser
 
 
 def _validate(validator: EventValidator, dot: DotAccessor) -> Tuple[bool, Optional[str]]:
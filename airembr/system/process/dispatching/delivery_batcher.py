@@ -0,0 +1,122 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class DeliveryBatcher:
+    """
+    Groups items added by concurrent callers and sends them with one call of `send`. A batch is sent when it
+    has `max_size` items or `max_wait` seconds after its first item. Each caller waits until its batch is
+    delivered and gets the error if the delivery fails.
+    """
+
+    def __init__(self, send: Callable[[List[Any]], Awaitable[Any]], max_size: int = 100, max_wait: float = 0.5):
+        self.send = send
+        self.max_size = max(1, max_size)
+        self.max_wait = max_wait
+        self._items: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def add(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append((item, future))
+
+        if len(self._items) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        items, self._items = self._items, []
+        if items:
+            task = asyncio.ensure_future(self._deliver(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, items: List[Tuple[Any, asyncio.Future]]):
+        try:
+            result = await self.send([item for item, _ in items])
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, future in items:
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self):
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class DeliveryBatchers:
+    """
+    Batchers by key. Tuple keys with the same first item (destination id) replace each other, so a changed
+    destination gets a new batcher. Replaced and cleared batchers send their pending items first.
+    """
+
+    def __init__(self):
+        self._batchers: Dict[Hashable, DeliveryBatcher] = {}
+        self._keys: Dict[Hashable, Hashable] = {}
+        self._draining: Set[asyncio.Future] = set()
+        self._loop = None
+
+    @staticmethod
+    def _resource(key: Hashable) -> Hashable:
+        return key[0] if isinstance(key, tuple) and key else key
+
+    def _retire(self, batcher: DeliveryBatcher):
+        batcher._flush()
+        for task in batcher._tasks:
+            self._draining.add(task)
+            task.add_done_callback(self._draining.discard)
+
+    def get(self, key: Hashable, send: Callable[[List[Any]], Awaitable[Any]], max_size: int,
+            max_wait: float) -> DeliveryBatcher:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._batchers, self._keys, self._draining = {}, {}, set()
+
+        resource = self._resource(key)
+        previous_key = self._keys.get(resource, None)
+        if previous_key is not None and previous_key != key:
+            previous = self._batchers.pop(previous_key, None)
+            if previous is not None:
+                self._retire(previous)
+        self._keys[resource] = key
+
+        batcher = self._batchers.get(key, None)
+        if batcher is None:
+            batcher = DeliveryBatcher(send, max_size, max_wait)
+            self._batchers[key] = batcher
+        return batcher
+
+    def clear(self):
+        """ Drops all batchers, e.g. when destinations changed. Pending items are sent. """
+        batchers, self._batchers, self._keys = self._batchers, {}, {}
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        # Batchers of another loop can not send from here
+        if loop is not None and loop is self._loop:
+            for batcher in batchers.values():
+                self._retire(batcher)
+
+    async def close(self):
+        batchers, self._batchers, self._keys = self._batchers, {}, {}
+        for batcher in batchers.values():
+            await batcher.close()
+        draining, self._draining = self._draining, set()
+        if draining:
+            await asyncio.gather(*draining, return_exceptions=True)
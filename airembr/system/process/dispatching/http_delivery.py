@@ -0,0 +1,84 @@
+from json import JSONDecodeError
+from typing import Any, Hashable, List, Tuple
+
+import aiohttp
+from aiohttp import ContentTypeError
+
+from airembr.system.adapter.metadata.mysql.cache.cache_tags import DESTINATION_TAG, RESOURCE_TAG
+from airembr.system.config.global_config import global_settings
+from airembr.system.decorator.proxy.proxy_decorator import on_cache_invalidate
+from airembr.system.process.dispatching.circuit_breaker import CircuitBreakers, CircuitOpenError
+from airembr.system.process.dispatching.delivery_batcher import DeliveryBatchers
+from airembr.system.process.dispatching.http_session_pool import HttpSessionPool
+from airembr.system.process.logging.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+http_session_pool = HttpSessionPool(
+    limit=global_settings.destination_http_pool_limit,
+    limit_per_host=global_settings.destination_http_pool_limit_per_host
+)
+circuit_breakers = CircuitBreakers(
+    failure_threshold=global_settings.destination_circuit_failures,
+    reset_timeout=global_settings.destination_circuit_reset
+)
+delivery_batchers = DeliveryBatchers()
+
+
+def _invalidate(names: List[str]):
+    # Changed destinations or resources get new batchers and closed circuits
+    if DESTINATION_TAG['name'] in names or RESOURCE_TAG['name'] in names:
+        delivery_batchers.clear()
+        circuit_breakers.clear()
+
+
+on_cache_invalidate(_invalidate)
+
+
+async def _read_content(response: aiohttp.ClientResponse):
+    try:
+        return await response.json(content_type=None)
+
+    except JSONDecodeError:
+        return await response.text()
+
+    except ContentTypeError:
+        return await response.json(content_type='text/html')
+
+
+async def send_request(key: Hashable, method: str, url: str, timeout: float, **kwargs) -> Tuple[int, Any]:
+    """
+    Sends a request with the pooled session of `key` behind its circuit breaker. Connection errors, timeouts,
+    5xx responses and any other exception count as failures. Raises CircuitOpenError while the destination
+    is paused.
+    """
+
+    breaker = circuit_breakers.get(key)
+    if not breaker.allow():
+        raise CircuitOpenError(f"Destination {url} failed {breaker.failures} times. "
+                               f"Requests are paused for {breaker.reset_timeout}s.")
+
+    healthy = False
+    try:
+        session = http_session_pool.get(key)
+        async with session.request(method=method, url=url, timeout=aiohttp.ClientTimeout(total=timeout),
+                                   **kwargs) as response:
+            content = await _read_content(response)
+        healthy = response.status < 500
+        if not healthy:
+            logger.warning(f"Destination {url} responded with {response.status}.")
+    finally:
+        # Any other outcome, cancellation and decoding errors too, is a failure. This always releases
+        # the half-open trial.
+        if healthy:
+            breaker.on_success()
+        else:
+            breaker.on_failure()
+
+    return response.status, content
+
+
+async def close_http_delivery():
+    # Sends pending batches, then closes pooled connections
+    await delivery_batchers.close()
+    await http_session_pool.close()
@@ -0,0 +1,108 @@
+import asyncio
+from hashlib import blake2b
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import aiohttp
+import orjson
+
+from airembr.system.process.logging.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+
+def session_key(resource_id: str, credentials: Optional[dict]) -> Tuple[str, str]:
+    # Changed credentials get a new session, the pool closes the old one
+    digest = blake2b(orjson.dumps(credentials or {}, option=orjson.OPT_SORT_KEYS, default=str),
+                     digest_size=8).hexdigest()
+    return resource_id, digest
+
+
+class HttpSessionPool:
+    """
+    Shared aiohttp sessions, one per key (resource id and credentials). Requests to the same destination reuse
+    keep-alive connections instead of a new TCP/TLS handshake per observation. Connections are limited
+    per session and per host. Sessions belong to the event loop they were made in.
+
+    Tuple keys with the same first item (resource id) replace each other. The replaced session is closed
+    after `keepalive_timeout`, so requests in flight can finish. Sessions of a previous event loop are closed
+    when the loop changes.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._sessions: Dict[Hashable, aiohttp.ClientSession] = {}
+        self._keys: Dict[Hashable, Hashable] = {}
+        self._retired: List[aiohttp.ClientSession] = []
+        self._closing: Set[asyncio.Task] = set()
+        self._loop = None
+
+    @staticmethod
+    def _resource(key: Hashable) -> Hashable:
+        return key[0] if isinstance(key, tuple) and key else key
+
+    def _retire(self, sessions: List[aiohttp.ClientSession], delay: float = 0):
+        if not sessions:
+            return
+        self._retired.extend(sessions)
+        task = asyncio.get_running_loop().create_task(self._close_sessions(sessions, delay))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_sessions(self, sessions: List[aiohttp.ClientSession], delay: float = 0):
+        if delay:
+            await asyncio.sleep(delay)
+        for session in sessions:
+            if session in self._retired:
+                self._retired.remove(session)
+            if session.closed:
+                continue
+            try:
+                await session.close()
+            except Exception as e:
+                # Session of a closed loop
+                logger.debug(f"Could not close http session: {repr(e)}")
+
+    def get(self, key: Hashable) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions of the previous loop can not be used here
+            stale = [*self._sessions.values(), *self._retired]
+            self._loop = loop
+            self._sessions, self._keys, self._retired, self._closing = {}, {}, [], set()
+            self._retire(stale)
+
+        resource = self._resource(key)
+        previous_key = self._keys.get(resource, None)
+        if previous_key is not None and previous_key != key:
+            previous = self._sessions.pop(previous_key, None)
+            if previous is not None:
+                logger.debug(f"Credentials of {resource} changed, closing its previous http session.")
+                self._retire([previous], delay=self.keepalive_timeout)
+        self._keys[resource] = key
+
+        session = self._sessions.get(key, None)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            # Timeouts are set per request, as destinations of one resource may differ
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[key] = session
+            logger.debug(f"Opened http session for {key}.")
+        return session
+
+    async def close(self):
+        sessions = [*self._sessions.values(), *self._retired]
+        self._sessions, self._keys, self._retired = {}, {}, []
+        closing, self._closing = self._closing, set()
+        for task in closing:
+            task.cancel()
+        await self._close_sessions(sessions)
+
+    def __len__(self):
+        return len(self._sessions)
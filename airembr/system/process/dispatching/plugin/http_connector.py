@@ -1,19 +1,21 @@
 import asyncio
 import json
-import aiohttp
+from hashlib import blake2b
 from datetime import datetime
 from enum import Enum
-from json import JSONDecodeError
 from pydantic import BaseModel
-from aiohttp import ClientConnectorError, BasicAuth, ContentTypeError
+from aiohttp import ClientConnectorError, BasicAuth
+import orjson
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from airembr.model.api.request.observation import Observation
 from airembr.sdk.service.parser.tql.utils.dictonary import flatten
 
 from airembr.system.process.logging.log_handler import get_logger
 from airembr.system.process.dispatching.trigger_interface import TriggerInterface
+from airembr.system.process.dispatching.http_delivery import send_request, delivery_batchers
+from airembr.system.process.dispatching.http_session_pool import session_key
 
 logger = get_logger(__name__)
 
@@ -43,6 +45,11 @@ class HttpConfiguration(BaseModel):
     headers: Optional[dict] = {}
     cookies: Optional[dict] = {}
     ssl_check: bool = True
+    # Batched delivery: observations are sent as a json list of at most batch_max_size items,
+    # at the latest batch_max_wait seconds after the first one.
+    batch: bool = False
+    batch_max_size: int = 100
+    batch_max_wait: float = 0.5
 
     @staticmethod
     def _convert_params(param):
@@ -84,59 +91,55 @@ class HttpConnector(TriggerInterface):
                     "{} values must be strings, `{}` given for {} `{}`".format(label, type(value), label.lower(),
                                                                                name))
 
-    async def _dispatch(self, type: str, data):
-        try:
-            resource_setup = self.resource.credentials.test if self.debug is True else self.resource.credentials.production
-            resource_setup = HttpCredentials(**resource_setup)
-            self._validate_key_value(resource_setup.headers, "Header")
-
-            init = self.destination.destination.init
+    def _get_setup(self) -> Tuple[HttpCredentials, HttpConfiguration]:
+        resource_setup = HttpCredentials(**self._get_credentials())
+        self._validate_key_value(resource_setup.headers, "Header")
 
-            config = HttpConfiguration(**init)
-            config.method = resource_setup.method
-            config.headers = resource_setup.headers
+        init = self.destination.destination.init
 
-            self._validate_key_value(config.cookies, "Cookie")
+        config = HttpConfiguration(**init)
+        config.method = resource_setup.method
+        config.headers = resource_setup.headers
 
-            timeout = aiohttp.ClientTimeout(total=config.timeout)
-            url = str(resource_setup.url)
-
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                params = config.get_params(data)
+        self._validate_key_value(config.cookies, "Cookie")
 
-                headers = dict(config.headers)
-                headers['x-dispatch-type'] = type
+        return resource_setup, config
 
-                logger.debug(f"Destination request to {url}, headers: {headers}, method: {config.method}")
+    def _session_key(self):
+        return session_key(self.resource.id, self._get_credentials())
 
-                async with session.request(
-                        method=config.method,
-                        url=url,
-                        headers=headers,
-                        cookies=config.cookies,
-                        ssl=config.ssl_check,
-                        auth=BasicAuth(resource_setup.username,
-                                       resource_setup.password) if resource_setup.has_basic_auth() else None,
-                        **params
-                ) as response:
+    def _batcher_key(self):
+        # A batcher sends with the connector that made it, so a changed destination needs a new batcher
+        digest = blake2b(orjson.dumps(self.destination.model_dump(mode="json"), option=orjson.OPT_SORT_KEYS,
+                                      default=str), digest_size=8).hexdigest()
+        return self.destination.id, *self._session_key(), digest
 
-                    try:
-                        content = await response.json(content_type=None)
+    async def _dispatch(self, type: str, data):
+        try:
+            resource_setup, config = self._get_setup()
+            url = str(resource_setup.url)
 
-                    except JSONDecodeError:
-                        content = await response.text()
+            params = config.get_params(data)
 
-                    except ContentTypeError:
-                        content = await response.json(content_type='text/html')
+            headers = dict(config.headers)
+            headers['x-dispatch-type'] = type
 
-                    # result = {
-                    #     "status": response.status,
-                    #     "content": content
-                    # }
+            logger.debug(f"Destination request to {url}, headers: {headers}, method: {config.method}")
 
-                    logger.debug(f"Destination response from {url}, status: {response.status}, content: {content}")
+            status, content = await send_request(
+                self._session_key(),
+                method=config.method,
+                url=url,
+                timeout=config.timeout,
+                headers=headers,
+                cookies=config.cookies,
+                ssl=config.ssl_check,
+                auth=BasicAuth(resource_setup.username,
+                               resource_setup.password) if resource_setup.has_basic_auth() else None,
+                **params
+            )
 
-                    # todo log
+            logger.debug(f"Destination response from {url}, status: {status}, content: {content}")
 
         except ClientConnectorError as e:
             logger.error(str(e), e, exc_info=True)
@@ -146,6 +149,20 @@ class HttpConnector(TriggerInterface):
             logger.error(str(e), e, exc_info=True)
             raise e
 
-    async def dispatch(self,  observations: List[Observation], job_name: str = None):
+    async def _dispatch_batch(self, observations: List[dict]):
+        await self._dispatch("events", observations)
+
+    async def dispatch(self, observations: List[Observation], job_name: str = None):
+        _, config = self._get_setup()
+
+        if config.batch and config.method.lower() != 'get':
+            # Observations of concurrent dispatches to this destination go out as one json list
+            batcher = delivery_batchers.get(self._batcher_key(),
+                                            self._dispatch_batch,
+                                            max_size=config.batch_max_size,
+                                            max_wait=config.batch_max_wait)
+            await asyncio.gather(*[batcher.add(observation.model_dump(mode="json")) for observation in observations])
+            return
+
         for observation in observations:
             await self._dispatch("event", observation.model_dump(mode="json"))
@@ -1,17 +1,17 @@
 import asyncio
 from collections import defaultdict
 
-import aiohttp
 from typing import Optional, List, Any, Dict, Tuple
-from json import JSONDecodeError
 from pydantic import BaseModel
-from aiohttp import ClientConnectorError, BasicAuth, ContentTypeError
+from aiohttp import ClientConnectorError, BasicAuth
 
 from airembr_sdk.core.entity.identification import generate_pk
 from airembr.model.api.request.observation import Observation
 
 from airembr.system.process.logging.log_handler import get_logger
 from airembr.system.process.dispatching.trigger_interface import TriggerInterface
+from airembr.system.process.dispatching.http_delivery import send_request
+from airembr.system.process.dispatching.http_session_pool import session_key
 
 logger = get_logger(__name__)
 
@@ -54,41 +54,27 @@ class SemanticApiConnector(TriggerInterface):
 
     async def _dispatch(self, observation_id, observer_pk, observation_as_text: str):
         try:
-
-            init = self.destination.destination.init
-
-            resource_setup = self.resource.credentials.test if self.debug is True else self.resource.credentials.production
+            resource_setup = self._get_credentials()
             config = SemanticApiConfiguration(**resource_setup)
 
-            timeout = aiohttp.ClientTimeout(total=config.timeout)
-
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-
-                headers = dict(config.headers)
-                headers['content-type'] = 'text/plain'
-
-                logger.debug(f"Destination request to {config.url}, headers: {headers}, method: POST")
-
-                async with session.request(
-                        method='post',
-                        url=f"{config.url.rstrip('/')}/v2/entity/extraction/{observation_id}/{observer_pk}",
-                        headers=headers,
-                        ssl=config.ssl_check,
-                        auth=BasicAuth(config.username,
-                                       config.password) if config.has_basic_auth() else None,
-                        data=observation_as_text
-                ) as response:
-
-                    try:
-                        content = await response.json(content_type=None)
+            headers = dict(config.headers)
+            headers['content-type'] = 'text/plain'
 
-                    except JSONDecodeError:
-                        content = await response.text()
+            logger.debug(f"Destination request to {config.url}, headers: {headers}, method: POST")
 
-                    except ContentTypeError:
-                        content = await response.json(content_type='text/html')
+            status, content = await send_request(
+                session_key(self.resource.id, resource_setup),
+                method='post',
+                url=f"{config.url.rstrip('/')}/v2/entity/extraction/{observation_id}/{observer_pk}",
+                timeout=config.timeout,
+                headers=headers,
+                ssl=config.ssl_check,
+                auth=BasicAuth(config.username,
+                               config.password) if config.has_basic_auth() else None,
+                data=observation_as_text
+            )
 
-                    print(content)
+            logger.debug(f"Destination response from {config.url}, status: {status}, content: {content}")
 
         except ClientConnectorError as e:
             logger.error(str(e), e, exc_info=True)
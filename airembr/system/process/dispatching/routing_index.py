@@ -0,0 +1,74 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from airembr.model.metadata.sys_destination import Destination
+from airembr.model.system.context import get_context
+from airembr.system.adapter.metadata.mysql.cache.cache_tags import DESTINATION_TAG
+from airembr.system.decorator.proxy.proxy_decorator import on_cache_invalidate
+
+# (event type, source id), None matches any
+RouteKey = Tuple[Optional[str], Optional[str]]
+
+
+def _get_id(config: dict, key: str) -> Optional[str]:
+    value = config.get(key, None)
+    if isinstance(value, dict):
+        return value.get('id', None)
+    return None
+
+
+class TriggerRoutingIndex:
+    """
+    Destinations indexed by the event type and source id of their trigger config. A missing event type or
+    source id is a wildcard. Matching is four dict lookups, so it costs O(matches) and not O(destinations).
+    """
+
+    def __init__(self, destinations: List[Destination]):
+        self.destinations = destinations
+        self._routes: Dict[RouteKey, List[Tuple[int, Destination]]] = defaultdict(list)
+        for position, destination in enumerate(destinations):
+            config = destination.trigger.config or {}
+            key = (_get_id(config, 'event_type'), _get_id(config, 'source'))
+            self._routes[key].append((position, destination))
+        self._routes = dict(self._routes)
+
+    def match(self, event_type: str, source_id: str) -> List[Destination]:
+        routes = self._routes
+        matches = []
+        for key in ((event_type, source_id), (event_type, None), (None, source_id), (None, None)):
+            found = routes.get(key, None)
+            if found:
+                matches.extend(found)
+
+        # Keep the order of loaded destinations
+        if len(matches) > 1:
+            matches.sort(key=lambda item: item[0])
+        return [destination for _, destination in matches]
+
+
+# (tenant, production, trigger type) -> index
+_indexes: Dict[Tuple, TriggerRoutingIndex] = {}
+
+
+def get_routing_index(destinations: List[Destination], trigger_type: str) -> TriggerRoutingIndex:
+    """
+    Returns the index of cached destinations. Destination loads are cached, so the same list comes back until
+    the cache expires or is invalidated. A different list means the destinations were reloaded and the index
+    is rebuilt.
+    """
+
+    context = get_context()
+    key = (context.tenant, context.production, trigger_type)
+    index = _indexes.get(key, None)
+    if index is None or index.destinations is not destinations:
+        index = TriggerRoutingIndex(destinations)
+        _indexes[key] = index
+    return index
+
+
+def _invalidate(names: List[str]):
+    if DESTINATION_TAG['name'] in names:
+        _indexes.clear()
+
+
+on_cache_invalidate(_invalidate)
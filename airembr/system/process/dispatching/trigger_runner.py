@@ -0,0 +1,36 @@
+import asyncio
+from typing import Awaitable, List, Optional
+
+from airembr.system.process.logging.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+
+class TriggerRunner:
+    """
+    Starts triggers as soon as they are added and runs them concurrently. At most `concurrency` triggers run at once
+    and each one is cancelled after `timeout` seconds. A failing or timed out trigger is logged and does not stop
+    the others.
+    """
+
+    def __init__(self, concurrency: int = 16, timeout: Optional[float] = 30):
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._timeout = timeout
+        self._tasks: List[asyncio.Task] = []
+
+    async def _run(self, name: str, trigger: Awaitable):
+        async with self._semaphore:
+            try:
+                await asyncio.wait_for(trigger, timeout=self._timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Trigger for {name} timed out after {self._timeout}s.", exc_info=False)
+            except Exception as e:
+                logger.error(f"Trigger for {name} failed. Details: {repr(e)}")
+
+    def add(self, name: str, trigger: Awaitable):
+        self._tasks.append(asyncio.create_task(self._run(name, trigger)))
+
+    async def wait(self):
+        tasks, self._tasks = self._tasks, []
+        if tasks:
+            await asyncio.gather(*tasks)
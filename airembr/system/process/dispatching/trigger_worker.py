@@ -14,6 +14,7 @@ from airembr.model.system.context import get_context
 from airembr.system.adapter.queue.queue_adapter import queue_adapter
 from airembr.model.system.context import ServerContext, Context
 from airembr.system.process.dispatching.dispatchers import yield_event_destination_work_package
+from airembr.system.process.monitoring.metrics.stage_timer import StageTimer
 
 logger = get_logger(__name__)
 
@@ -22,7 +23,7 @@ async def trigger_dispatch_in_queue(context: TransportContext,
                                     observation: dict,
                                     debug):
     # Run in Context
-    with (ServerContext(Context(**context.as_context()))):
+    with (ServerContext(Context(**context.as_context()))), StageTimer('trigger_dispatch', context.tenant):
         # Reconstruct observation
         observation = Observation(**observation)
 
@@ -9,6 +9,11 @@ from airembr.system.process.logging.log_handler import SystemLogHandler
 @asynccontextmanager
 async def log_controller(log_handler: SystemLogHandler, min_size=1) -> AsyncGenerator[Optional[list], None]:
     if logging_config.save_logs and log_handler.has_logs(min_log_size=min_size):
+        if isinstance(log_handler, SystemLogHandler):
+            # Logs are taken out of the buffer, one batch at a time
+            yield log_handler.drain(logging_config.log_drain_size)
+            return
+
         try:
             # Check global settings
             yield log_handler.collection
@@ -4,10 +4,12 @@ import logging
 import traceback
 import sys
 
+from collections import deque
+from datetime import datetime, timezone
 from logging import Handler, LogRecord
 from time import time
+from typing import Optional
 
-from airembr_sdk.core.date import now_in_utc
 from airembr.model.system.context import get_context, ContextError
 from airembr.system.config.log_config import logging_config
 from airembr.system.process.logging.log_level import get_logging_level, Q_INFO_LEVEL, DEV_INFO_LEVEL, Q_STAT_LEVEL
@@ -21,18 +23,23 @@ logging.addLevelName(DEV_INFO_LEVEL, "DEV_INFO")
 logging.addLevelName(Q_STAT_LEVEL, "STAT")
 
 
-def stack_trace(level):
+def _capture_stack(level):
+    """
+    Frames of the current exception, or of the caller when there is none. Source lines are not read here,
+    they are read when the log is saved, see _format_stack.
+    """
     if level not in logging_config.log_stack_trace_for:
-        return {}
+        return None
 
-    # Extract the traceback object
     tb = sys.exc_info()[2]
-
-    # Convert the traceback to a list of structured frames
-    stack = traceback.extract_tb(tb)
+    if tb is not None:
+        stack = traceback.StackSummary.extract(traceback.walk_tb(tb), lookup_lines=False)
+    else:
+        stack = None
 
     if not stack:
-        stack = traceback.extract_stack()
+        stack = traceback.StackSummary.extract(traceback.walk_stack(None), lookup_lines=False)
+        stack.reverse()
 
     try:
         context = get_context()
@@ -40,6 +47,11 @@ def stack_trace(level):
     except ContextError:
         metadata = {}
 
+    return metadata, stack
+
+
+def _format_stack(captured) -> dict:
+    metadata, stack = captured
     # Format the stack trace as a list of dictionaries
     return {
         "context": metadata,
@@ -54,6 +66,11 @@ def stack_trace(level):
         ]}
 
 
+def stack_trace(level):
+    captured = _capture_stack(level)
+    return _format_stack(captured) if captured else {}
+
+
 class StackInfoLogger(logging.Logger):
     def error(self, msg, *args, **kwargs):
         kwargs['stack_info'] = True
@@ -92,6 +109,17 @@ logging.basicConfig(level=logging.INFO)
 _log_format_adapter = log_format_adapter()
 
 
+# One console handler for all loggers
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(_log_format_adapter)
+
+
+def _add_handler(logger, handler):
+    # get_logger is called for the same name by many modules
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+
+
 def get_logger(name, level=None):
     # Replace the default logger class with your custom class
     logger = logging.getLogger(name)
@@ -100,13 +128,11 @@ def get_logger(name, level=None):
 
     # System log formatter
 
-    logger.addHandler(log_handler)
+    _add_handler(logger, log_handler)
 
     # Console log handler
 
-    clh = logging.StreamHandler()
-    clh.setFormatter(_log_format_adapter)
-    logger.addHandler(clh)
+    _add_handler(logger, _console_handler)
 
     return logger
 
@@ -119,48 +145,71 @@ def get_installation_logger(name, level=None):
 
     # Console log handler
 
-    clh = logging.StreamHandler()
-    clh.setFormatter(_log_format_adapter)
-    logger.addHandler(clh)
+    _add_handler(logger, _console_handler)
 
     return logger
 
 
 class SystemLogHandler(Handler):
+    """
+    Keeps logs until they are saved in a ring buffer of `capacity` logs. Emitting only copies record fields
+    and the frames of the stack, dates and stack traces are formatted when the logs are drained.
+
+    When the buffer is full the `drop` policy drops new logs, the `sample` policy keeps every
+    `sample_every`-th new log in place of the oldest one. Dropped and sampled logs are counted.
+    """
 
-    def __init__(self, level=0, collection=None):
+    def __init__(self, level=0, capacity: Optional[int] = None, overflow: Optional[str] = None,
+                 sample_every: Optional[int] = None):
         super().__init__(level)
-        if collection is None:
-            collection = []
-        self.collection = collection
+        self.capacity = max(1, capacity or logging_config.log_buffer_size)
+        self.overflow = overflow or logging_config.log_overflow
+        self.sample_every = max(1, sample_every or logging_config.log_sample_every)
+        self._buffer: deque = deque(maxlen=self.capacity)
+        self._overflow_count = 0
+        self.counters = {'dropped': 0, 'sampled': 0}
         self.last_save = time()
 
     def _get(self, record, value, default_value):
         return record.__dict__.get(value, default_value)
 
+    def _admit(self) -> bool:
+        """ Applies the overflow policy before a log is built, so logs that are dropped cost only a counter. """
+        with self.lock:
+            if len(self._buffer) < self.capacity:
+                return True
+            self._overflow_count += 1
+            # A sampled log pushes out the oldest one
+            self.counters['dropped'] += 1
+            if self.overflow != 'sample' or self._overflow_count % self.sample_every != 0:
+                return False
+            self.counters['sampled'] += 1
+            return True
+
+    def _put(self, log):
+        with self.lock:
+            # The deque drops the oldest log when it is full
+            self._buffer.append(log)
+
     def emit(self, record: LogRecord):
 
         # Skip info and debug.
-        if record.levelno <= logging.INFO:
+        if record.levelno <= logging.INFO or not self._admit():
             return
 
-        _trace = stack_trace(record.levelname)
         if logging_config.log_stack_trace_as == 'json':
-            if _trace:
-                stack_trace_str = f"JSON:{json.dumps(_trace)}"
-            else:
-                stack_trace_str = None
+            stack = _capture_stack(record.levelname)
         else:
-            stack_trace_str = record.stack_info
+            stack = record.stack_info
 
         log = {  # Maps to tracardi-log index
-            "date": now_in_utc(),
+            "date": record.created,
             "message": record.msg,
             "logger": record.name,
             "file": record.filename,
             "line": record.lineno,
             "level": record.levelname,
-            "stack_info": stack_trace_str,
+            "stack_info": stack,
             # "exc_info": record.exc_info  # Can not save this to TrackerPayload
             "module": self._get(record, "package", record.module),
             "class_name": self._get(record, "class_name", record.funcName),
@@ -174,21 +223,70 @@ class SystemLogHandler(Handler):
             "error_number": self._get(record, "error_number", None),
         }
 
-        self.collection.append(log)
+        self._put(log)
+
+    @staticmethod
+    def _format(log: dict) -> dict:
+        date = log['date']
+        if isinstance(date, float):
+            log['date'] = datetime.fromtimestamp(date, tz=timezone.utc)
+
+        stack = log['stack_info']
+        if isinstance(stack, tuple):
+            log['stack_info'] = f"JSON:{json.dumps(_format_stack(stack), default=str)}"
+
+        return log
+
+    def __len__(self):
+        return len(self._buffer)
 
     def has_logs(self, min_log_size=None):
         if min_log_size is None:
             min_log_size = logging_config.log_bulk_size
-        if not isinstance(self.collection, list):
-            return False
-        return len(self.collection) >= min_log_size or (time() - self.last_save) > 60
+        return len(self._buffer) >= min_log_size or (time() - self.last_save) > 60
+
+    def drain(self, max_size: Optional[int] = None) -> list:
+        """ Takes up to `max_size` of the oldest logs out of the buffer and formats them. """
+        if max_size is None:
+            max_size = logging_config.log_drain_size
+
+        with self.lock:
+            size = min(max_size, len(self._buffer))
+            logs = [self._buffer.popleft() for _ in range(size)]
+            self.last_save = time()
+
+        return [self._format(log) for log in logs]
+
+    def drain_batches(self, max_size: Optional[int] = None):
+        """ Drains the logs that are in the buffer now, `max_size` at a time. """
+        batches = -(-len(self._buffer) // max(1, max_size or logging_config.log_drain_size))
+        for _ in range(batches):
+            logs = self.drain(max_size)
+            if not logs:
+                return
+            yield logs
+
+    def pop_counters(self) -> dict:
+        with self.lock:
+            counters, self.counters = self.counters, {'dropped': 0, 'sampled': 0}
+        return counters
+
+    @property
+    def collection(self) -> list:
+        """ Formatted logs, without taking them out of the buffer. """
+        with self.lock:
+            logs = list(self._buffer)
+        return [self._format(dict(log)) for log in logs]
 
     def reset(self):
-        self.collection = []
-        self.last_save = time()
+        with self.lock:
+            self._buffer.clear()
+            self.last_save = time()
 
     def add(self, logs: list):
-        self.collection.extend(logs)
+        for log in logs:
+            if self._admit():
+                self._put(log)
 
 
 log_handler = SystemLogHandler()
@@ -1,6 +1,8 @@
-from airembr.system.process.logging.log_controller import log_controller
+from airembr.system.config.global_config import global_settings
+from airembr.system.config.log_config import logging_config
 from airembr.system.process.logging.log_handler import log_handler, get_installation_logger
 from airembr.system.process.logging.log_saver import log_saver_worker
+from airembr.system.process.monitoring.metrics.metrics import LOG_RECORDS
 
 logger = get_installation_logger(__name__)
 
@@ -9,9 +11,22 @@ def logger_guard(logs):
     return bool(logs)
 
 
+def _count_logs(saved: int):
+    if global_settings.enable_prometheus:
+        counters = log_handler.pop_counters()
+        counters['saved'] = saved
+        for result, value in counters.items():
+            if value:
+                LOG_RECORDS.labels(result=result).inc(value)
+
+
 async def save_logs():
-    async with log_controller(log_handler, min_size=None) as logs:
-        if logs:
-            # Runs only if there are logs (see logger_guard) and it is deferred.
-            return await log_saver_worker(logs)
-        return None
+    saved = 0
+    try:
+        if logging_config.save_logs and log_handler.has_logs(min_log_size=None):
+            # Drains only the logs that are buffered now, so logs added while saving wait for the next call.
+            for logs in log_handler.drain_batches(logging_config.log_drain_size):
+                await log_saver_worker(logs)
+                saved += len(logs)
+    finally:
+        _count_logs(saved)
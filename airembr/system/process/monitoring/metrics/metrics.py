@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Histogram, Gauge
 
 prefix = "airembr"
 
@@ -18,4 +18,83 @@ QUEUE_PHASE_LATENCY = Histogram(
     f"{prefix}_queue_duration_seconds",
     "Data to queue latency",
     ["phase"],
-)
\ No newline at end of file
+)
+
+PROPERTY_DEDUP_LOOKUPS = Counter(
+    f"{prefix}_property_dedup_lookups_total",
+    "Property dedup lookups",
+    ["tenant", "result"],
+)
+
+PROPERTY_DEDUP_SIZE = Gauge(
+    f"{prefix}_property_dedup_size",
+    "Number of keys held by property dedup",
+    ["tenant"],
+)
+
+STREAM_LOAD_LATENCY = Histogram(
+    f"{prefix}_stream_load_duration_seconds",
+    "StarRocks stream load latency",
+    ["table"],
+)
+
+STREAM_LOAD_ROWS = Counter(
+    f"{prefix}_stream_load_rows_total",
+    "Rows sent in StarRocks stream loads",
+    ["table", "result"],
+)
+
+STREAM_LOAD_FAILURES = Counter(
+    f"{prefix}_stream_load_failures_total",
+    "Failed StarRocks stream load attempts",
+    ["table", "reason"],
+)
+
+STREAM_LOAD_BACKPRESSURE = Gauge(
+    f"{prefix}_stream_load_backpressure_seconds",
+    "Delay applied before StarRocks stream loads",
+)
+
+EMBEDDING_TEXTS = Counter(
+    f"{prefix}_embedding_texts_total",
+    "Texts handled by the embedding backfill",
+    ["kind", "result"],
+)
+
+EMBEDDING_THROUGHPUT = Gauge(
+    f"{prefix}_embedding_texts_per_second",
+    "Embedded texts per second in the current backfill run",
+    ["kind"],
+)
+
+EMBEDDING_QUEUE_DEPTH = Gauge(
+    f"{prefix}_embedding_queue_depth",
+    "Batches waiting for an embedding request",
+    ["kind"],
+)
+
+LOG_RECORDS = Counter(
+    f"{prefix}_log_records_total",
+    "System logs that were saved, dropped or sampled when the log buffer was full",
+    ["result"],
+)
+
+INGEST_STAGE_LATENCY = Histogram(
+    f"{prefix}_ingest_stage_duration_seconds",
+    "Duration of an ingest stage per batch",
+    ["stage", "tenant", "table"],
+)
+
+INGEST_BATCH_ROWS = Histogram(
+    f"{prefix}_ingest_batch_rows",
+    "Rows in a batch of an ingest stage",
+    ["stage", "tenant", "table"],
+    buckets=(1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000),
+)
+
+INGEST_BATCH_BYTES = Histogram(
+    f"{prefix}_ingest_batch_bytes",
+    "Bytes in a batch of an ingest stage",
+    ["stage", "tenant", "table"],
+    buckets=(1024, 16 * 1024, 128 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024),
+)
@@ -0,0 +1,70 @@
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+from airembr.system.config.global_config import global_settings
+from airembr.system.process.monitoring.metrics.metrics import INGEST_STAGE_LATENCY, INGEST_BATCH_ROWS, \
+    INGEST_BATCH_BYTES
+
+# Labelled histograms by (metric, stage, tenant, table). labels() validates and joins labels on each call.
+_children: Dict[Tuple[int, str, str, str], object] = {}
+
+
+def _child(metric, stage: str, tenant: Optional[str], table: str):
+    key = (id(metric), stage, tenant or '', table)
+    child = _children.get(key, None)
+    if child is None:
+        child = metric.labels(stage=stage, tenant=tenant or '', table=table)
+        _children[key] = child
+    return child
+
+
+def observe_stage(stage: str, tenant: Optional[str], duration: float, table: str = ''):
+    if global_settings.enable_prometheus:
+        _child(INGEST_STAGE_LATENCY, stage, tenant, table).observe(duration)
+
+
+def observe_batch(stage: str, tenant: Optional[str], rows: int, size: Optional[int] = None, table: str = ''):
+    if global_settings.enable_prometheus:
+        _child(INGEST_BATCH_ROWS, stage, tenant, table).observe(rows)
+        if size is not None:
+            _child(INGEST_BATCH_BYTES, stage, tenant, table).observe(size)
+
+
+class StageTimer:
+    """
+    Times one ingest stage with a perf_counter pair and records it in the stage histogram. Nothing is logged
+    or formatted, the duration is kept for callers that log it.
+    """
+
+    __slots__ = ('stage', 'tenant', 'table', 'start', 'duration')
+
+    def __init__(self, stage: str, tenant: Optional[str], table: str = ''):
+        self.stage = stage
+        self.tenant = tenant
+        self.table = table
+        self.start = 0.
+        self.duration = 0.
+
+    def __enter__(self) -> 'StageTimer':
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.duration = perf_counter() - self.start
+        observe_stage(self.stage, self.tenant, self.duration, self.table)
+        return False
+
+
+class LogSampler:
+    """ True for the first and then every `every`-th call. Used to log one in n batches of a hot path. """
+
+    __slots__ = ('every', '_calls')
+
+    def __init__(self, every: int):
+        self.every = max(1, every)
+        self._calls = 0
+
+    def __call__(self) -> bool:
+        calls = self._calls
+        self._calls = calls + 1
+        return calls % self.every == 0
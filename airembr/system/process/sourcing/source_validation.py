@@ -1,8 +1,10 @@
-from typing import Optional, Set
+from typing import Optional, Set, Dict, Iterable, List
 
 from airembr.system.config.sys_config import sys_config
 from airembr.model.metadata.sys_source import EventSource
 from airembr.system.adapter.metadata.mysql.interface import event_source_dao
+from airembr.system.adapter.metadata.mysql.cache.source_authorization_cache import source_authorization_cache, \
+    SourceAuthorization
 from airembr.system.preconfig.setup_bridges import open_rest_source_bridge
 from airembr.model.system.headers import Headers
 from airembr.model.system.context import get_context
@@ -13,43 +15,73 @@ from airembr.system.process.logging.log_handler import get_logger
 
 logger = get_logger(__name__)
 
-async def _check_source_id(allowed_bridges, source_id) -> Optional[EventSource]:
-    if not sys_config.enable_event_source_check:
-        return EventSource(
-            id=source_id,
-            type=['rest'],
-            bridge=NamedEntity(id=open_rest_source_bridge.id, name=open_rest_source_bridge.name),
-            name="Static event source",
-            description="This event source is prepared because of ENABLE_EVENT_SOURCE_CHECK==no.",
-            channel="Web",
-            transitional=False  # ephemeral
-        )
 
-    source: Optional[EventSource] = await event_source_dao.load_event_source_via_cache(source_id)
+def _static_source(source_id) -> EventSource:
+    return EventSource(
+        id=source_id,
+        type=['rest'],
+        bridge=NamedEntity(id=open_rest_source_bridge.id, name=open_rest_source_bridge.name),
+        name="Static event source",
+        description="This event source is prepared because of ENABLE_EVENT_SOURCE_CHECK==no.",
+        channel="Web",
+        transitional=False  # ephemeral
+    )
 
-    if source is not None:
 
-        if not source.enabled:
-            raise BlockedException("Event source disabled.")
+def _authorize(source: Optional[EventSource], source_id: str, allowed_bridges) -> SourceAuthorization:
+    if source is None:
+        context = get_context()
+        return SourceAuthorization(
+            source=None,
+            error=f"Invalid event source `{source_id}` for tenant in `{context}`. "
+                  f"Tenant or event source may not exit or data is still cached. ")
 
-        if not source.is_allowed(allowed_bridges):
-            raise BlockedException(f"This request send data of "
-                                   f"type {allowed_bridges}, but the even source "
-                                   f"`{source.name}`.`{source_id}` has types `{source.type}`. "
-                                   f"Change bridge type in event source `{source.name}` to one that has endpoint type "
-                                   f"{allowed_bridges} or call any `{source.type}` endpoint.")
+    if not source.enabled:
+        return SourceAuthorization(source=source, error="Event source disabled.")
 
-    return source
+    if not source.is_allowed(allowed_bridges):
+        return SourceAuthorization(
+            source=source,
+            error=f"This request send data of "
+                  f"type {allowed_bridges}, but the even source "
+                  f"`{source.name}`.`{source_id}` has types `{source.type}`. "
+                  f"Change bridge type in event source `{source.name}` to one that has endpoint type "
+                  f"{allowed_bridges} or call any `{source.type}` endpoint.")
 
+    return SourceAuthorization(source=source)
 
-async def validate_source(headers: Headers, source_id: str, allowed_bridges) -> EventSource:
-    source = await _check_source_id(allowed_bridges, source_id)
 
-    if source is None:
-        context = get_context()
-        raise BlockedException(f"Invalid event source `{source_id}` for tenant in `{context}`. "
-                               f"Tenant or event source may not exit or data is still cached. ")
+async def authorize_sources(source_ids: Iterable[str], allowed_bridges: List[str]) -> Dict[
+    str, SourceAuthorization]:
+    """
+    Checks all event sources of a request at once. Cached outcomes are reused and the rest is loaded
+    with one metadata query.
+    """
+
+    if not sys_config.enable_event_source_check:
+        return {source_id: SourceAuthorization(source=_static_source(source_id)) for source_id in source_ids}
+
+    context = get_context()
+    keys = {
+        source_id: source_authorization_cache.key(context.tenant, context.production, allowed_bridges, source_id)
+        for source_id in source_ids
+    }
+
+    cached = source_authorization_cache.get_many(keys.values())
+    authorizations = {source_id: cached[key] for source_id, key in keys.items() if key in cached}
+
+    missing = [source_id for source_id in keys if source_id not in authorizations]
+    if missing:
+        sources = await event_source_dao.load_event_sources_via_cache(missing)
+        for source_id in missing:
+            authorization = _authorize(sources.get(source_id, None), source_id, allowed_bridges)
+            source_authorization_cache.set(keys[source_id], authorization)
+            authorizations[source_id] = authorization
 
+    return authorizations
+
+
+def _check_origin(headers: Headers, source: EventSource, source_id: str):
     if source.has_restricted_domain():
         origin = headers.get_origin_or_referer()
 
@@ -59,16 +91,30 @@ async def validate_source(headers: Headers, source_id: str, allowed_bridges) ->
         if not source.is_allowed_domain_origin(origin):
             raise BlockedException(f"Event source `{source_id}`. Disallows url: {origin.geturl()}")
 
-    return source
+
+def _check_authorization(headers: Headers, authorization: SourceAuthorization, source_id: str) -> EventSource:
+    if not authorization.is_allowed():
+        raise BlockedException(authorization.error)
+
+    # Depends on request headers, so it is not cached
+    _check_origin(headers, authorization.source, source_id)
+
+    return authorization.source
+
+
+async def validate_source(headers: Headers, source_id: str, allowed_bridges) -> EventSource:
+    authorizations = await authorize_sources([source_id], allowed_bridges)
+    return _check_authorization(headers, authorizations[source_id], source_id)
+
 
 async def valid_sources(headers: Headers, source_ids: Set[str], allowed_bridges):
+    authorizations = await authorize_sources(source_ids, allowed_bridges)
 
-    for source_id in source_ids:
+    for source_id, authorization in authorizations.items():
         try:
-            await validate_source(headers, source_id, allowed_bridges)
+            _check_authorization(headers, authorization, source_id)
             yield source_id
         except BlockedException as e:
             with suppress_for(f'suppress-invalid-source-{source_id}-warning', ttl=3) as suppressed:
                 if not suppressed:
                     logger.warning(str(e))
-
@@ -25,6 +25,7 @@ class Resource(metaclass=Singleton):
             "sys_ent_history": Table(name='sys_ent_history'),
             "sys_ent_property": Table(name='sys_ent_property'),
             "sys_ent_property_state": Table(name='sys_ent_property_state'),
+            "sys_ent_property_latest": Table(name='sys_ent_property_latest'),
             "sys_ent_2_obs": Table(name='sys_ent_2_obs'),
             "sys_ent_state": Table(name='sys_ent_state'),
             "sys_log": Table(name='sys_log'),
@@ -1,5 +1,7 @@
-from typing import List
+from datetime import datetime
+from typing import List, Dict, Optional, Generator
 
+import dotdict_parser
 from durable_dot_dict.dotdict import DotDict
 
 from airembr_sdk.core.date import now_in_utc
@@ -9,256 +11,139 @@ from airembr.model.bigdata.flat_relation import FlatRelation
 from airembr.model.bigdata.flat_observation_entity import ObservationEntity
 
 
-def _compute_properties_from_traits(relation: DotDict, is_relation: bool):
-    traits = DotDict(relation[FlatRelation.ENTITY_TRAITS])
-    for key, value in traits.flat().items():
-        # Skip null values in properties
-        if value is None:
-            continue
-        row = {
-            FlatEntityProperty.PK: relation[FlatRelation.ENTITY_PK],
-            FlatEntityProperty.ID: relation[FlatRelation.ENTITY_ID],
-            FlatEntityProperty.TYPE: relation[FlatRelation.ENTITY_TYPE],
-            FlatEntityProperty.NAME: key,
-            FlatEntityProperty.VALUE: value,
-            FlatEntityProperty._IS_RELATION: is_relation # This is not saved used only fo filtering
-        }
-
-        if isinstance(value, (int, float)):
-            row[FlatEntityProperty.NUMBER] = value
-        else:
-            if isinstance(value, str):
-                row[FlatEntityProperty.TEXT] = value
-            row[FlatEntityProperty.VALUE_ID] = md5(str(value))
+class _HashCache:
+    """
+    Memoizes md5 hex digests within one batch. Ids are the same md5 as before, only computed once per distinct key.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        digest = self._cache.get(value, None)
+        if digest is None:
+            digest = md5(value)
+            self._cache[value] = digest
+        return digest
+
+
+def _flat_traits(traits) -> dict:
+    if not traits:
+        return {}
+    if isinstance(traits, DotDict):
+        return traits.flat()
+    return dotdict_parser.flatten(traits)
+
+
+def _property_row(entity_pk, entity_id, entity_type, observer_pk, name, value, ts: datetime,
+                  is_relation: bool, hash_cache: _HashCache) -> dict:
+    row = {
+        FlatEntityProperty.PK: entity_pk,
+        FlatEntityProperty.ID: entity_id,
+        FlatEntityProperty.TYPE: entity_type,
+        FlatEntityProperty.NAME: name,
+        FlatEntityProperty.VALUE: value,
+        FlatEntityProperty._IS_RELATION: is_relation,  # This is not saved used only fo filtering
+        FlatEntityProperty.TS: ts,
+        FlatEntityProperty.OBSERVER_PK: observer_pk
+    }
+
+    if isinstance(value, (int, float)):
+        row[FlatEntityProperty.NUMBER] = value
+    else:
+        if isinstance(value, str):
+            row[FlatEntityProperty.TEXT] = value
+        row[FlatEntityProperty.VALUE_ID] = hash_cache(str(value))
+
+    # This hash will keep historic values as well as it hashes value
+    row[FlatEntityProperty.PROPERTY_ID] = hash_cache(f"{observer_pk}-{entity_pk}-{entity_type}-{value}")
+
+    return row
+
+
+def _system_row(entity_pk, entity_id, entity_type, observer_pk, name, value, ts: datetime,
+                hash_cache: _HashCache, with_value_id: bool) -> dict:
+    row = {
+        FlatEntityProperty.PK: entity_pk,
+        FlatEntityProperty.ID: entity_id,
+        FlatEntityProperty.TYPE: entity_type,
+
+        FlatEntityProperty.NAME: name,
+        FlatEntityProperty.VALUE: value,
+        FlatEntityProperty.TEXT: value,
+        FlatEntityProperty.NUMBER: None,
+        FlatEntityProperty.VECTOR: None,
+        FlatEntityProperty.TS: ts,
+
+        FlatEntityProperty._IS_RELATION: True,
 
-        yield row
+        FlatEntityProperty.OBSERVER_PK: observer_pk,
+        FlatEntityProperty.PROPERTY_ID: hash_cache(f"{observer_pk}-{entity_pk}-{entity_type}-{value}")
+    }
 
+    if with_value_id:
+        row[FlatEntityProperty.VALUE_ID] = hash_cache(value)
+
+    return row
+
+
+def compute_entity_property_rows(storage_context_entities: List[DotDict],
+                                 ts: Optional[datetime] = None) -> List[dict]:
+    """
+    Returns property rows for a batch of relations and observation entities in one pass.
+
+    Rows are flat dicts keyed by FlatEntityProperty paths and can be passed to map_to_table_columns as they are.
+    All rows of the batch share one timestamp.
+    """
+
+    # TODO this can be an issue as TS is added late in the pipeline
+    if ts is None:
+        ts = now_in_utc()
+
+    hash_cache = _HashCache()
+    rows = []
 
-def compute_entity_property_from_entities(storage_context_entities: List[DotDict]):
     for entity in storage_context_entities:
 
         is_relation = isinstance(entity, FlatRelation)
-        entity_properties = _compute_properties_from_traits(entity, is_relation)
-
-        _observer_pk = entity[FlatRelation.OBSERVER_PK]
-        for row in entity_properties:
-            # TODO this can be an issue as TS is added late in the pipeline
-            row[FlatEntityProperty.TS] = now_in_utc()
-            row[FlatEntityProperty.OBSERVER_PK] = _observer_pk
-
-            # This hash will keep historic values as well as it hashes value
-            row[FlatEntityProperty.PROPERTY_ID] = md5(
-                f"{row[FlatEntityProperty.OBSERVER_PK]}"
-                f"-{row[FlatEntityProperty.PK]}"
-                f"-{row[FlatEntityProperty.TYPE]}"
-                f"-{row[FlatEntityProperty.VALUE]}"
-            )
-            yield row
-
-        # --- Yield addition data
-
-        if isinstance(entity, FlatRelation):
-
-            # Yield label for realtion
-            label = entity.get(FlatRelation.REL_LABEL, None)
-            entity_pk = entity.get(FlatRelation.ENTITY_PK, None)
-            entity_id = entity.get(FlatRelation.ENTITY_ID, None)
-            event_type = entity.get(FlatRelation.REL_TYPE, None)
-            entity_type = entity.get(FlatRelation.ENTITY_TYPE, None)
-
-            if entity_id:
-                row = {
-                    FlatEntityProperty.PK: entity_pk,
-                    FlatEntityProperty.ID: entity_id,
-                    FlatEntityProperty.TYPE: entity_type,
-
-                    FlatEntityProperty.NAME: "$id",
-                    FlatEntityProperty.VALUE: entity_id,
-                    FlatEntityProperty.TEXT: entity_id,
-                    FlatEntityProperty.NUMBER: None,
-                    FlatEntityProperty.VECTOR: None,
-                    FlatEntityProperty.TS: now_in_utc(),
-
-                    FlatEntityProperty._IS_RELATION: True,
-
-                    FlatEntityProperty.OBSERVER_PK: entity[ObservationEntity.OBSERVER_PK]
-                }
-
-                row[FlatEntityProperty.PROPERTY_ID] = md5(
-                    f"{row[FlatEntityProperty.OBSERVER_PK]}"
-                    f"-{row[FlatEntityProperty.PK]}"
-                    f"-{row[FlatEntityProperty.TYPE]}"
-                    f"-{row[FlatEntityProperty.VALUE]}"
-                )
-
-                yield row
-
-            if entity_pk:
-                row = {
-                    FlatEntityProperty.PK: entity_pk,
-                    FlatEntityProperty.ID: entity_id,
-                    FlatEntityProperty.TYPE: entity_type,
-
-                    FlatEntityProperty.NAME: "$pk",
-                    FlatEntityProperty.VALUE: entity_pk,
-                    FlatEntityProperty.TEXT: entity_pk,
-                    FlatEntityProperty.NUMBER: None,
-                    FlatEntityProperty.VECTOR: None,
-                    FlatEntityProperty.TS: now_in_utc(),
-
-                    FlatEntityProperty._IS_RELATION: True,
-
-                    FlatEntityProperty.OBSERVER_PK: entity[ObservationEntity.OBSERVER_PK]
-                }
-
-                row[FlatEntityProperty.PROPERTY_ID] = md5(
-                    f"{row[FlatEntityProperty.OBSERVER_PK]}"
-                    f"-{row[FlatEntityProperty.PK]}"
-                    f"-{row[FlatEntityProperty.TYPE]}"
-                    f"-{row[FlatEntityProperty.VALUE]}"
-                )
-
-                yield row
-
-            if label:
-                row = {
-                    FlatEntityProperty.PK: entity_pk,
-                    FlatEntityProperty.ID: entity_id,
-                    FlatEntityProperty.TYPE: entity_type,
-
-                    FlatEntityProperty.NAME: "$label",
-                    FlatEntityProperty.VALUE: label,
-                    FlatEntityProperty.TEXT: label,
-                    FlatEntityProperty.NUMBER: None,
-                    FlatEntityProperty.VECTOR: None,
-                    FlatEntityProperty.TS: now_in_utc(),
-
-                    FlatEntityProperty._IS_RELATION: True,
-
-                    FlatEntityProperty.OBSERVER_PK: entity[ObservationEntity.OBSERVER_PK]
-                }
-
-                row[FlatEntityProperty.PROPERTY_ID] = md5(
-                    f"{row[FlatEntityProperty.OBSERVER_PK]}"
-                    f"-{row[FlatEntityProperty.PK]}"
-                    f"-{row[FlatEntityProperty.TYPE]}"
-                    f"-{row[FlatEntityProperty.VALUE]}"
-                )
-                row[FlatEntityProperty.VALUE_ID] = md5(label)
-                yield row
-
-            # Yield type for relation
-
-            if event_type:
-                row = {
-                    FlatEntityProperty.PK: entity_pk,
-                    FlatEntityProperty.ID: entity_id,
-                    FlatEntityProperty.TYPE: entity_type,
-
-                    FlatEntityProperty.NAME: "$type",
-                    FlatEntityProperty.VALUE: event_type,
-                    FlatEntityProperty.TEXT: event_type,
-                    FlatEntityProperty.NUMBER: None,
-                    FlatEntityProperty.VECTOR: None,
-                    FlatEntityProperty.TS: now_in_utc(),
-
-                    FlatEntityProperty._IS_RELATION: True,
-
-                    FlatEntityProperty.OBSERVER_PK: entity[ObservationEntity.OBSERVER_PK]
-                }
-
-                row[FlatEntityProperty.PROPERTY_ID] = md5(
-                    f"{row[FlatEntityProperty.OBSERVER_PK]}"
-                    f"-{row[FlatEntityProperty.PK]}"
-                    f"-{row[FlatEntityProperty.TYPE]}"
-                    f"-{row[FlatEntityProperty.VALUE]}"
-                )
-                row[FlatEntityProperty.VALUE_ID] = md5(event_type)
-                yield row
 
+        entity_pk = entity.get(FlatRelation.ENTITY_PK, None)
+        entity_id = entity.get(FlatRelation.ENTITY_ID, None)
+        entity_type = entity.get(FlatRelation.ENTITY_TYPE, None)
+        observer_pk = entity.get(FlatRelation.OBSERVER_PK, None)
+
+        for key, value in _flat_traits(entity.get(FlatRelation.ENTITY_TRAITS, None)).items():
+            # Skip null values in properties
+            if value is None:
+                continue
+            rows.append(_property_row(entity_pk, entity_id, entity_type, observer_pk, key, value, ts,
+                                      is_relation, hash_cache))
+
+        # --- Addition data
+
+        if is_relation:
+            system_values = (
+                ("$id", entity_id, False),
+                ("$pk", entity_pk, False),
+                ("$label", entity.get(FlatRelation.REL_LABEL, None), True),
+                ("$type", entity.get(FlatRelation.REL_TYPE, None), True),
+            )
         elif isinstance(entity, ObservationEntity):
+            system_values = (
+                ("$pk", entity_pk, False),
+                ("$id", entity_id, False),
+                ("$label", entity.get(ObservationEntity.ENTITY_LABEL, None), True),
+            )
+        else:
+            continue
+
+        for name, value, with_value_id in system_values:
+            if value:
+                rows.append(_system_row(entity_pk, entity_id, entity_type, observer_pk, name, value, ts,
+                                        hash_cache, with_value_id))
+
+    return rows
+
 
-            # Yield label for entity
-            label = entity.get(ObservationEntity.ENTITY_LABEL, None)
-            entity_pk = entity.get(ObservationEntity.ENTITY_PK, None)
-            entity_id = entity.get(ObservationEntity.ENTITY_ID, None)
-            entity_type = entity.get(ObservationEntity.ENTITY_TYPE, None)
-
-            if entity_pk:
-                row = {
-                    FlatEntityProperty.PK: entity_pk,
-                    FlatEntityProperty.ID: entity_id,
-                    FlatEntityProperty.TYPE: entity_type,
-
-                    FlatEntityProperty.NAME: "$pk",
-                    FlatEntityProperty.VALUE: entity_pk,
-                    FlatEntityProperty.TEXT: entity_pk,
-                    FlatEntityProperty.NUMBER: None,
-                    FlatEntityProperty.VECTOR: None,
-                    FlatEntityProperty.TS: now_in_utc(),
-
-                    FlatEntityProperty.OBSERVER_PK: entity[ObservationEntity.OBSERVER_PK]
-                }
-
-                row[FlatEntityProperty.PROPERTY_ID] = md5(
-                    f"{row[FlatEntityProperty.OBSERVER_PK]}"
-                    f"-{row[FlatEntityProperty.PK]}"
-                    f"-{row[FlatEntityProperty.TYPE]}"
-                    f"-{row[FlatEntityProperty.VALUE]}"
-                )
-
-                yield row
-
-            if entity_id:
-                row = {
-                    FlatEntityProperty.PK: entity_pk,
-                    FlatEntityProperty.ID: entity_id,
-                    FlatEntityProperty.TYPE: entity_type,
-
-                    FlatEntityProperty.NAME: "$id",
-                    FlatEntityProperty.VALUE: entity_id,
-                    FlatEntityProperty.TEXT: entity_id,
-                    FlatEntityProperty.NUMBER: None,
-                    FlatEntityProperty.VECTOR: None,
-                    FlatEntityProperty.TS: now_in_utc(),
-
-                    FlatEntityProperty._IS_RELATION: True,
-
-                    FlatEntityProperty.OBSERVER_PK: entity[ObservationEntity.OBSERVER_PK]
-                }
-
-                row[FlatEntityProperty.PROPERTY_ID] = md5(
-                    f"{row[FlatEntityProperty.OBSERVER_PK]}"
-                    f"-{row[FlatEntityProperty.PK]}"
-                    f"-{row[FlatEntityProperty.TYPE]}"
-                    f"-{row[FlatEntityProperty.VALUE]}"
-                )
-
-                yield row
-
-            if label:
-                row = {
-                    FlatEntityProperty.PK: entity_pk,
-                    FlatEntityProperty.ID: entity_id,
-                    FlatEntityProperty.TYPE: entity_type,
-
-                    FlatEntityProperty.NAME: "$label",
-                    FlatEntityProperty.VALUE: label,
-                    FlatEntityProperty.TEXT: label,
-                    FlatEntityProperty.NUMBER: None,
-                    FlatEntityProperty.VECTOR: None,
-                    FlatEntityProperty.TS: now_in_utc(),
-
-                    FlatEntityProperty._IS_RELATION: True,
-
-                    FlatEntityProperty.OBSERVER_PK: entity[ObservationEntity.OBSERVER_PK]
-                }
-
-                row[FlatEntityProperty.PROPERTY_ID] = md5(
-                    f"{row[FlatEntityProperty.OBSERVER_PK]}"
-                    f"-{row[FlatEntityProperty.PK]}"
-                    f"-{row[FlatEntityProperty.TYPE]}"
-                    f"-{row[FlatEntityProperty.VALUE]}"
-                )
-                row[FlatEntityProperty.VALUE_ID] = md5(label)
-                yield row
+def compute_entity_property_from_entities(storage_context_entities: List[DotDict]) -> Generator[dict, None, None]:
+    yield from compute_entity_property_rows(storage_context_entities)
@@ -1,12 +1,15 @@
 import random
 from typing import Optional, Protocol, Dict, Any, Tuple
 
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 
 from airembr_sdk.model.interface.i_time_range import IDatetimeRangePayload, IDatePayload
 from airembr_sdk.model.interface.i_response import QueryResponse, QueryEntityResponse
 from airembr_sdk.model.core.value.response_status import QueryStatus
 from airembr_sdk.model.interface.i_conversation_memory import IConversationMemory, IMemorySessions
+from airembr_sdk.client.remember_buffer import RememberBuffer
 from airembr_sdk.logging.log_handler import get_logger
 
 logger = get_logger(__name__)
@@ -35,7 +38,11 @@ class ApiProtocol(Protocol):
         QueryStatus, QueryResponse]: ...
 
 
-class AirembrApi:
+def _memory_sessions(ok: bool, body) -> IMemorySessions:
+    return IMemorySessions({key: IConversationMemory(**value) for key, value in body.items()} if ok else {})
+
+
+class _AirembrApiBase:
 
     def __init__(self, url: str, context: Optional[str] = None, tenant: Optional[str] = None):
         self.url = url
@@ -95,10 +102,18 @@ class AirembrApi:
     def _get_token(self):
         return f"{self.token_type} {self.token}"
 
-    def authenticate(self, username: str, password: str) -> Tuple[QueryStatus, Dict[str, Any]]:
+    def _get_auth_headers(self, headers=None) -> Dict[str, str]:
+        if not self.token:
+            raise Exception("Not authenticated")
 
-        url = f"{self.url}/user/token"
+        if headers is None:
+            headers = {}
+
+        headers['Authorization'] = self._get_token()
+        return headers
 
+    @staticmethod
+    def _get_token_request(username: str, password: str) -> Tuple[Dict[str, str], Dict[str, str]]:
         headers = {
             "user-agent": "AiRembrSdkClient/0.0.1",
             "Content-Type": "application/x-www-form-urlencoded"
@@ -110,7 +125,66 @@ class AirembrApi:
             "password": password
         }
 
-        response = requests.post(url, headers=headers, data=data)
+        return headers, data
+
+    @staticmethod
+    def _get_entity_params(query, entity_type: Optional[str], page: int) -> Dict[str, Any]:
+        params = {
+            "page": page,
+            "query": query
+        }
+
+        if entity_type:
+            params["entity_type"] = entity_type
+
+        return params
+
+    @staticmethod
+    def _get_facts_payload(query: str,
+                           min_date: Optional[IDatePayload],
+                           max_date: Optional[IDatePayload],
+                           page: Optional[int],
+                           limit: Optional[int],
+                           timezone: Optional[str]) -> dict:
+        return IDatetimeRangePayload(
+            start=page,
+            limit=limit,
+            minDate=min_date,
+            maxDate=max_date,
+            timeZone=timezone,
+            rand=random.random(),
+            where=query
+        ).model_dump(mode='json')
+
+
+class AirembrApi(_AirembrApiBase):
+    """
+    Blocking client. Requests share one session, so connections are kept alive and reused, up to
+    `pool_size` per host.
+    """
+
+    def __init__(self, url: str, context: Optional[str] = None, tenant: Optional[str] = None, pool_size: int = 10):
+        super().__init__(url, context, tenant)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def authenticate(self, username: str, password: str) -> Tuple[QueryStatus, Dict[str, Any]]:
+
+        url = f"{self.url}/user/token"
+        headers, data = self._get_token_request(username, password)
+
+        response = self.session.post(url, headers=headers, data=data)
         payload = response.json()
         self.token = payload["access_token"]
         self.token_type = payload["token_type"]
@@ -127,42 +201,28 @@ class AirembrApi:
                  tenant: Optional[str] = None) -> Tuple[QueryStatus, IMemorySessions]:
 
         logger.debug(f"Request sent to POST: {self.url}")
-        _response = requests.post(self.url,
-                                 headers=self._get_headers(
-                                     realtime,
-                                     skip,
-                                     response,
-                                     context,
-                                     tenant,
-                                     bridge
-                                 ),
-                                 json=data)
+        _response = self.session.post(self.url,
+                                      headers=self._get_headers(
+                                          realtime,
+                                          skip,
+                                          response,
+                                          context,
+                                          tenant,
+                                          bridge
+                                      ),
+                                      json=data)
 
         body = _response.json()
 
-        return QueryStatus(_response.status_code), IMemorySessions(
-            {key: IConversationMemory(**value) for key, value in body.items()} if _response else {})
+        return QueryStatus(_response.status_code), _memory_sessions(bool(_response), body)
 
     def query_computed_entity(self, query, entity_type: str = None, page: int = 0, headers=None) -> Tuple[
         QueryStatus, QueryEntityResponse]:
         url = f"{self.url}/v2/entity/1/list"
-        params = {
-            "page": page,
-            "query": query
-        }
-
-        if not self.token:
-            raise Exception("Not authenticated")
-
-        if headers is None:
-            headers = {}
-
-        headers['Authorization'] = self._get_token()
-
-        if entity_type:
-            params["entity_type"] = entity_type
+        params = self._get_entity_params(query, entity_type, page)
+        headers = self._get_auth_headers(headers)
 
-        response = requests.get(url, headers=headers, params=params)
+        response = self.session.get(url, headers=headers, params=params)
 
         result = response.json()
 
@@ -172,23 +232,10 @@ class AirembrApi:
     def query_stitched_entity(self, query, entity_type: str, page: int = 0, headers=None) -> Tuple[
         QueryStatus, QueryEntityResponse]:
         url = f"{self.url}/v2/entity/2/list"
-        params = {
-            "page": page,
-            "query": query
-        }
-
-        if not self.token:
-            raise Exception("Not authenticated")
-
-        if headers is None:
-            headers = {}
-
-        headers['Authorization'] = self._get_token()
-
-        if entity_type:
-            params["entity_type"] = entity_type
+        params = self._get_entity_params(query, entity_type, page)
+        headers = self._get_auth_headers(headers)
 
-        response = requests.get(url, headers=headers, params=params)
+        response = self.session.get(url, headers=headers, params=params)
 
         result = response.json()
 
@@ -207,28 +254,138 @@ class AirembrApi:
         QueryStatus, QueryResponse]:
 
         url = f"{self.url}/v2/events/list/page/{page}?shorten=false"
+        data = self._get_facts_payload(query, min_date, max_date, page, limit, timezone)
+        headers = self._get_auth_headers(headers)
 
-        data = IDatetimeRangePayload(
-            start=page,
-            limit=limit,
-            minDate=min_date,
-            maxDate=max_date,
-            timeZone=timezone,
-            rand=random.random(),
-            where=query
-        )
+        response = self.session.post(url, headers=headers, json=data)
 
-        if not self.token:
-            raise Exception("Not authenticated")
+        result = response.json()
 
-        if headers is None:
-            headers = {}
+        return QueryStatus(response.status_code), QueryResponse(result=result.get('result', []),
+                                                                total=result.get('total', 0))
 
-        headers['Authorization'] = self._get_token()
 
-        response = requests.post(url, headers=headers, json=data.model_dump(mode='json'))
+class AsyncAirembrApi(_AirembrApiBase):
+    """
+    Asyncio client. Requests share one aiohttp session with up to `pool_size` connections per host.
+
+    With `batch_size` set, remember calls that do not wait for a conversation response are buffered and sent
+    as one gzip request per `batch_size` observations or `batch_wait` seconds, see RememberBuffer. Such calls
+    return status 202 and no sessions. Close the client on shutdown to send the buffered observations.
+    """
+
+    def __init__(self, url: str, context: Optional[str] = None, tenant: Optional[str] = None,
+                 pool_size: int = 10, timeout: int = 60,
+                 batch_size: Optional[int] = None,
+                 batch_wait: float = 1.,
+                 batch_max_bytes: int = 1024 * 1024,
+                 compress: bool = True):
+        super().__init__(url, context, tenant)
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.buffer = RememberBuffer(self._send_batch,
+                                     max_items=batch_size,
+                                     max_bytes=batch_max_bytes,
+                                     max_wait=batch_wait,
+                                     compress=compress) if batch_size else None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size),
+                timeout=self.timeout
+            )
+        return self._session
+
+    async def close(self):
+        try:
+            if self.buffer is not None:
+                await self.buffer.close()
+        finally:
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _send_batch(self, headers: Dict[str, str], body: bytes) -> int:
+        logger.debug(f"Batch sent to POST: {self.url}")
+        async with self.session.post(self.url, headers=headers, data=body) as response:
+            return response.status
+
+    async def authenticate(self, username: str, password: str) -> Tuple[QueryStatus, Dict[str, Any]]:
 
-        result = response.json()
+        url = f"{self.url}/user/token"
+        headers, data = self._get_token_request(username, password)
 
-        return QueryStatus(response.status_code), QueryResponse(result=result.get('result', []),
-                                                                total=result.get('total', 0))
+        async with self.session.post(url, headers=headers, data=data) as response:
+            payload = await response.json()
+            self.token = payload["access_token"]
+            self.token_type = payload["token_type"]
+
+            return QueryStatus(response.status), payload
+
+    async def remember(self,
+                       data,
+                       realtime: Optional[str] = None,
+                       skip: Optional[str] = None,
+                       response: bool = True,
+                       bridge: Optional[str] = None,
+                       context: Optional[str] = None,
+                       tenant: Optional[str] = None) -> Tuple[QueryStatus, IMemorySessions]:
+
+        # requests leaves out headers set to None, aiohttp can not send them
+        headers = {key: value for key, value in
+                   self._get_headers(realtime, skip, response, context, tenant, bridge).items() if value is not None}
+
+        if self.buffer is not None and not response:
+            await self.buffer.add(data, headers)
+            return QueryStatus(202), IMemorySessions({})
+
+        logger.debug(f"Request sent to POST: {self.url}")
+        async with self.session.post(self.url, headers=headers, json=data) as _response:
+            body = await _response.json()
+            return QueryStatus(_response.status), _memory_sessions(_response.ok, body)
+
+    async def _get_entities(self, url, query, entity_type: Optional[str], page: int, headers) -> Tuple[
+        QueryStatus, QueryEntityResponse]:
+        params = self._get_entity_params(query, entity_type, page)
+        headers = self._get_auth_headers(headers)
+
+        async with self.session.get(url, headers=headers, params=params) as response:
+            result = await response.json()
+            return QueryStatus(response.status), QueryEntityResponse(result=result.get('result', []),
+                                                                     total=result.get('total', 0))
+
+    async def query_computed_entity(self, query, entity_type: str = None, page: int = 0, headers=None) -> Tuple[
+        QueryStatus, QueryEntityResponse]:
+        return await self._get_entities(f"{self.url}/v2/entity/1/list", query, entity_type, page, headers)
+
+    async def query_stitched_entity(self, query, entity_type: str, page: int = 0, headers=None) -> Tuple[
+        QueryStatus, QueryEntityResponse]:
+        return await self._get_entities(f"{self.url}/v2/entity/2/list", query, entity_type, page, headers)
+
+    async def query_facts(self,
+                          query: str,
+                          min_date: Optional[IDatePayload] = None,
+                          max_date: Optional[IDatePayload] = None,
+                          page: Optional[int] = 0,
+                          limit: Optional[int] = 30,
+                          timezone: Optional[str] = "UTC",
+                          headers=None,
+                          ) -> Tuple[QueryStatus, QueryResponse]:
+
+        url = f"{self.url}/v2/events/list/page/{page}?shorten=false"
+        data = self._get_facts_payload(query, min_date, max_date, page, limit, timezone)
+        headers = self._get_auth_headers(headers)
+
+        async with self.session.post(url, headers=headers, json=data) as response:
+            result = await response.json()
+            return QueryStatus(response.status), QueryResponse(result=result.get('result', []),
+                                                               total=result.get('total', 0))
@@ -194,7 +194,7 @@ class AirembrChat:
         if not any(chats):
             return QueryStatus(404), IMemorySessions({})
 
-        transport = AirembrApi(self.client.api)
+        transport = self.client.transport
         payload = [observation.model_dump(mode="json") for observation in self._yield_chat_observation()]
 
         return transport.remember(
@@ -305,7 +305,7 @@ class AirembrObservation:
         observation = self._get_observation(session_id)
         print(333, observation.model_dump(mode="json", exclude_none=True),)
 
-        transport = AirembrApi(self.client.api)
+        transport = self.client.transport
         return transport.remember(
             observation.model_dump(mode="json", exclude_none=True),
             realtime,
@@ -338,6 +338,8 @@ class AiRembrChatClient:
         self._observer: Optional[InstanceLink] = None
 
         self.api = api
+        # One transport, so remember calls reuse its connections
+        self.transport = AirembrApi(api)
         self.chat_ttl: Optional[int] = None
         self.chat_id: Optional[str] = None
 
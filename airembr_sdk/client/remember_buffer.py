@@ -0,0 +1,101 @@
+import asyncio
+import gzip
+import json
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from airembr_sdk.logging.log_handler import get_logger
+
+logger = get_logger(__name__)
+
+# Sends (headers, body) and returns the response status
+Send = Callable[[Dict[str, str], bytes], Awaitable[int]]
+
+
+def encode_observations(observations: List[str], compress: bool) -> Tuple[bytes, Dict[str, str]]:
+    """ Joins observations already encoded as JSON into a JSON list. """
+    body = f"[{','.join(observations)}]".encode()
+    headers = {"Content-Type": "application/json"}
+    if compress:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+class RememberBuffer:
+    """
+    Coalesces observations of remember calls into one request. A batch is sent when it has `max_items`
+    observations or `max_bytes` of JSON, when `max_wait` seconds passed since its first observation, or when
+    the next call has other headers. Batches are sent one at a time in the order they were filled, so the server
+    gets observations in call order.
+
+    Memory is bounded by one batch: a call that fills the batch waits until it is sent. Errors of a send
+    started by a call are raised to that call, errors of a timed send are logged.
+    """
+
+    def __init__(self, send: Send, max_items: int = 500, max_bytes: int = 1024 * 1024, max_wait: float = 1.,
+                 compress: bool = True):
+        self._send = send
+        self.max_items = max(1, max_items)
+        self.max_bytes = max_bytes
+        self.max_wait = max_wait
+        self.compress = compress
+
+        self._items: List[str] = []
+        self._size = 0
+        self._headers: Optional[Dict[str, str]] = None
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self._items)
+
+    async def add(self, data, headers: Dict[str, str]):
+        observations = [json.dumps(observation) for observation in (data if isinstance(data, list) else [data])]
+        size = sum(len(observation) for observation in observations)
+
+        async with self._lock:
+            if self._items and headers != self._headers:
+                await self._flush()
+
+            self._headers = headers
+            self._items.extend(observations)
+            self._size += size
+
+            if len(self._items) >= self.max_items or self._size >= self.max_bytes:
+                await self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_wait)
+        async with self._lock:
+            # This task is done, the flush must not cancel it
+            self._timer = None
+            try:
+                await self._flush()
+            except Exception as e:
+                logger.error(f"Could not send remembered observations: {repr(e)}")
+
+    async def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._items:
+            return
+
+        items, headers = self._items, self._headers
+        self._items, self._size, self._headers = [], 0, None
+
+        body, body_headers = encode_observations(items, self.compress)
+        status = await self._send({**headers, **body_headers}, body)
+        if not 200 <= status <= 299:
+            raise ConnectionError(f"Remember batch of {len(items)} observations failed with status {status}.")
+
+    async def flush(self):
+        async with self._lock:
+            await self._flush()
+
+    async def close(self):
+        """ Sends what is buffered. Call on shutdown. """
+        await self.flush()
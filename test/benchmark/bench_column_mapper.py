@@ -0,0 +1,117 @@
+"""
+Rows/sec of map_object_to_column per column (before) and compiled mappings (after), on sys_evt and
+sys_ent_history rows with nested properties, missing values, defaults and typed values. Compiled rows are
+verified against map_object_to_column before timing. Without srd only the compiled mappings are measured.
+
+Run: PYTHONPATH=. python test/benchmark/bench_column_mapper.py
+"""
+import os
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+
+from durable_dot_dict.dotdict import DotDict
+
+from airembr.core.file.file import read_json
+from airembr.system.adapter.bigdata.tool.mapping_compiler import MappingCompiler
+
+try:
+    from srd.domain.record_mapping import EntityToTableMapping
+    from srd.mapping.data_mapping import map_object_to_column
+except ImportError:
+    EntityToTableMapping = None
+    map_object_to_column = None
+
+_schema_dir = os.path.join(os.path.dirname(__file__), '../../airembr/system/schema/mapping')
+
+
+def _load_mapping(table: str):
+    data = read_json(os.path.join(_schema_dir, f'{table}.json'))
+    for row in data.get('columns', []):
+        row['column_type'] = row['sr_column_type']
+    if EntityToTableMapping is None:
+        return SimpleNamespace(table=data['table'], columns=[SimpleNamespace(
+            column=row['column'], property=row['property'], column_type=row['column_type'],
+            default_value=row.get('default_value', None)) for row in data['columns']])
+    return EntityToTableMapping(**data)
+
+
+def _value(column_mapping, i: int):
+    column_type = column_mapping.column_type.lower()
+    if column_type.startswith('array'):
+        return [f"{column_mapping.column}-{i}-{no}" for no in range(i % 3 + 1)]
+    if column_type == 'json':
+        return {"name": f"name-{i}", "age": i % 90, "address": {"city": "Berlin"}, "tags": ["a", "b"]}
+    if column_type.startswith('datetime'):
+        return datetime(2025, 1, 1) + timedelta(seconds=i)
+    if column_type.startswith('bool'):
+        return i % 2 == 0
+    if column_type.startswith(('int', 'bigint')):
+        return str(i) if i % 2 else i
+    return f"{column_mapping.column}-{i}"
+
+
+def _rows(mapping, size: int):
+    randomizer = random.Random(size)
+    for i in range(size):
+        row = DotDict()
+        for column_mapping in mapping.columns:
+            # A quarter of values is missing or None, so defaults apply
+            if randomizer.random() < 0.25:
+                if randomizer.random() < 0.5:
+                    row[column_mapping.property] = None
+                continue
+            row[column_mapping.property] = _value(column_mapping, i)
+        yield row
+
+
+def _reference_row(row, mapping) -> dict:
+    table_values = {}
+    for column_mapping in mapping.columns:
+        result = map_object_to_column(row, column_mapping, json_as_string=False)
+        if result is not None:
+            column, _, value = result
+            table_values[column] = value
+    return table_values
+
+
+def _before(rows, mapping):
+    for row in rows:
+        _reference_row(row, mapping)
+
+
+def _after(rows, mapping):
+    project = MappingCompiler().compile(mapping)
+    for row in rows:
+        project(row)
+
+
+def _verify(rows, mapping):
+    project = MappingCompiler().compile(mapping)
+    for row in rows:
+        expected = _reference_row(row, mapping)
+        actual = project(row)
+        mismatched = sorted(column for column in expected.keys() | actual.keys()
+                            if expected.get(column) != actual.get(column))
+        assert not mismatched, f"Columns {mismatched} of {mapping.table} differ from map_object_to_column."
+
+
+def _rows_per_second(func, rows, mapping) -> float:
+    start = perf_counter()
+    func(rows, mapping)
+    return len(rows) / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    size = 20000
+    for table in ['sys_evt', 'sys_ent_history']:
+        mapping = _load_mapping(table)
+        rows = list(_rows(mapping, size))
+        after = _rows_per_second(_after, rows, mapping)
+        if map_object_to_column is None:
+            print(f"{table}: after={after:.0f} rows/s (srd is not installed, before is not measured)")
+            continue
+        _verify(rows[:1000], mapping)
+        before = _rows_per_second(_before, rows, mapping)
+        print(f"{table}: before={before:.0f} rows/s, after={after:.0f} rows/s, speedup={after / before:.1f}x")
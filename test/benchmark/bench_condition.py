@@ -0,0 +1,77 @@
+"""
+Destination conditions per second: parse and transform on every call (before) and compiled
+conditions cached by text (after). 10k observations against 100 distinct conditions.
+
+Run: PYTHONPATH=. python test/benchmark/bench_condition.py
+"""
+import asyncio
+import random
+from time import perf_counter
+
+from airembr.sdk.service.dot_accessor import DotAccessor
+from airembr.sdk.service.parser.tql.condition import Condition
+from airembr.sdk.service.parser.tql.transformer.expr_transformer import ExprTransformer
+
+OBSERVATIONS = 10000
+CONDITIONS = 100
+
+_templates = [
+    'payload@metadata.type = "{type}"',
+    'payload@metadata.type = "{type}" AND payload@source.id = "s{n}"',
+    'payload@properties.value > {n} OR payload@properties.label contains "x{n}"',
+    'payload@properties.value between {n} AND {m} AND payload@source.id exists',
+    '(payload@metadata.type = "{type}" OR payload@source.id = "s{n}") AND payload@properties.label not empty',
+]
+
+
+def _conditions(rnd: random.Random):
+    return [
+        rnd.choice(_templates).format(type=rnd.choice(['page-view', 'purchase', 'login']),
+                                      n=n, m=n + rnd.randint(1, 50))
+        for n in range(CONDITIONS)
+    ]
+
+
+def _observations(rnd: random.Random):
+    return [
+        DotAccessor(payload={
+            "metadata": {"type": rnd.choice(['page-view', 'purchase', 'login'])},
+            "source": {"id": f"s{rnd.randint(0, CONDITIONS)}"},
+            "properties": {"value": rnd.randint(0, 200), "label": f"x{rnd.randint(0, CONDITIONS)}"}
+        })
+        for _ in range(OBSERVATIONS)
+    ]
+
+
+def _before(condition: Condition, conditions, observations):
+    for dot in observations:
+        for query in conditions:
+            ExprTransformer(dot=dot).transform(condition.parse(query))
+
+
+def _after(condition: Condition, conditions, observations):
+    async def main():
+        for dot in observations:
+            for query in conditions:
+                await condition.evaluate(query, dot)
+
+    asyncio.run(main())
+
+
+def _per_second(func, condition, conditions, observations) -> float:
+    start = perf_counter()
+    func(condition, conditions, observations)
+    return len(conditions) * len(observations) / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    rnd = random.Random(7)
+    condition = Condition()
+    conditions = _conditions(rnd)
+    observations = _observations(rnd)
+
+    # The parse-every-time path is slow, it is measured on a sample of observations
+    before = _per_second(_before, condition, conditions, observations[:100])
+    after = _per_second(_after, condition, conditions, observations)
+    print(f"{OBSERVATIONS} observations x {CONDITIONS} conditions: before={before:.0f} evaluations/s, "
+          f"after={after:.0f} evaluations/s, speedup={after / before:.1f}x")
@@ -0,0 +1,51 @@
+"""
+Hashes per second of data/schema/field hashes on realistic trait dicts.
+
+Run: PYTHONPATH=. python test/benchmark/bench_data_hasher.py
+"""
+import random
+from time import perf_counter
+
+from durable_dot_dict.dotdict import DotDict
+
+from airembr.core.hash.data_hasher import hash_dict_64, hash_traits, COMPAT, FAST
+
+NUMBER_OF_ENTITIES = 5000
+
+
+def _traits(i: int) -> dict:
+    return {
+        "name": f"Customer {i}",
+        "email": f"customer{i}@example.com",
+        "age": random.randint(18, 90),
+        "address": {"city": random.choice(["Berlin", "Paris", "Warsaw"]), "zip": f"{i:05d}", "street": "Main St 1"},
+        "preferences": {f"pref_{n}": random.random() > 0.5 for n in range(20)},
+        "scores": {f"score_{n}": random.random() for n in range(20)},
+        "tags": ["vip", "newsletter"],
+    }
+
+
+def _before(traits):
+    fields = sorted(DotDict(traits).flat())
+    return hash_dict_64(traits), hash_dict_64(fields), [hash_dict_64(field) for field in fields]
+
+
+def _run(name, func, data):
+    start = perf_counter()
+    for traits in data:
+        func(traits)
+    duration = perf_counter() - start
+    print(f"{name:<24} {len(data) / duration:>10.0f} entities/s")
+
+
+def main():
+    data = [_traits(i) for i in range(NUMBER_OF_ENTITIES)]
+    print(f"{len(DotDict(data[0]).flat())} fields per entity")
+
+    _run("before (per field dumps)", _before, data)
+    _run("hash_traits compat", lambda traits: hash_traits(traits, mode=COMPAT), data)
+    _run("hash_traits fast", lambda traits: hash_traits(traits, mode=FAST), data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Latest property values of EQL: MAX_BY over sys_ent_property_state (before) and the
+sys_ent_property_latest rollup (after). Needs a running StarRocks configured by the usual env.
+
+Seeds ROWS property writes (10M by default) for a throw-away tenant and rebuilds the rollup from them.
+
+Run: PYTHONPATH=. python test/benchmark/bench_property_latest.py
+"""
+import asyncio
+import os
+from time import perf_counter
+
+from srd.domain.sql import Sql
+
+from airembr.model.system.context import Context, ServerContext
+from airembr.system.adapter.bigdata.env.bigdata_context import current_bd_database_name
+from airembr.system.adapter.bigdata.general.utils.mapping import sys_ent_property_state
+from airembr.system.adapter.bigdata.starrocks.starrocks_eql import _build_last_property_values_cte
+from airembr.system.adapter.bigdata.starrocks.starrocks_entity_property_adapter import \
+    StarrocksEntityPropertyAdapter
+
+ROWS = int(os.environ.get('ROWS', 10_000_000))
+ENTITIES = int(os.environ.get('ENTITIES', 200_000))
+PROPERTIES = 10
+REPEAT = 5
+
+
+def _seed_sql() -> Sql:
+    # Every entity gets ROWS / ENTITIES writes spread over PROPERTIES properties
+    database = current_bd_database_name()
+    return Sql(
+        f"INSERT INTO {database}.{sys_ent_property_state()} "
+        "(observer_pk, entity_pk, entity_type, property_name, property_value, property_value_id, ts) "
+        "SELECT 'bench', CONCAT('e-', CAST(g % {entities} AS STRING)), "
+        "  IF(g % 2 = 0, 'person', 'location'), "
+        "  CONCAT('p', CAST(g % {properties} AS STRING)), "
+        "  CAST(g AS STRING), CAST(g AS STRING), "
+        "  DATE_ADD('2024-01-01', INTERVAL g SECOND) "
+        "FROM TABLE(generate_series(1, {rows})) AS t(g)".format(
+            entities=ENTITIES, properties=PROPERTIES, rows=ROWS)
+    )
+
+
+async def _time(adapter, property_rollup: bool) -> float:
+    sql = (
+            Sql("WITH")
+            + _build_last_property_values_cte("last_property_values", ('person', 'location'),
+                                              property_rollup=property_rollup)
+            + "SELECT COUNT(*) AS c FROM last_property_values"
+    )
+    best = None
+    for _ in range(REPEAT):
+        start = perf_counter()
+        await adapter.adapter.exec(sql)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+async def main():
+    with ServerContext(Context(tenant="bench", production=False)):
+        adapter = StarrocksEntityPropertyAdapter()
+
+        start = perf_counter()
+        await adapter.adapter.exec(_seed_sql())
+        await adapter.rebuild_property_latest()
+        print(f"Seeded {ROWS} property rows in {perf_counter() - start:.1f}s")
+
+        before = await _time(adapter, property_rollup=False)
+        after = await _time(adapter, property_rollup=True)
+        print(f"last_property_values: before={before * 1000:.0f}ms, after={after * 1000:.0f}ms, "
+              f"speedup={before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+from hashlib import md5
+
+from airembr.model.bigdata.flat_ent_property import FlatEntityProperty
+from airembr.model.bigdata.flat_observation_entity import ObservationEntity
+from airembr.model.bigdata.flat_relation import FlatRelation
+from airembr.system.service.bigdata.entity_transformer import compute_entity_property_rows
+
+
+def _md5(value: str) -> str:
+    return md5(value.encode()).hexdigest()
+
+
+def _relation():
+    return FlatRelation({
+        "entity": {"pk": "e1", "id": "id-1", "type": "person", "traits": {"name": "John", "age": 30, "tags": None}},
+        "observer": {"pk": "o1"},
+        "rel": {"label": "Purchased", "type": "purchase"}
+    })
+
+
+def _entity():
+    return ObservationEntity({
+        "entity": {"pk": "e2", "id": "id-2", "type": "product", "label": "Shoe", "traits": {"price": {"net": 9.5}}},
+        "observer": {"pk": "o1"}
+    })
+
+
+def _by_name(rows):
+    return {(row[FlatEntityProperty.PK], row[FlatEntityProperty.NAME]): row for row in rows}
+
+
+def test_property_ids_are_unchanged():
+    rows = _by_name(compute_entity_property_rows([_relation(), _entity()]))
+
+    name = rows[("e1", "name")]
+    assert name[FlatEntityProperty.PROPERTY_ID] == _md5("o1-e1-person-John")
+    assert name[FlatEntityProperty.VALUE_ID] == _md5("John")
+    assert name[FlatEntityProperty.TEXT] == "John"
+
+    age = rows[("e1", "age")]
+    assert age[FlatEntityProperty.PROPERTY_ID] == _md5("o1-e1-person-30")
+    assert age[FlatEntityProperty.NUMBER] == 30
+    assert FlatEntityProperty.VALUE_ID not in age
+
+    assert rows[("e1", "$type")][FlatEntityProperty.VALUE_ID] == _md5("purchase")
+    assert rows[("e1", "$label")][FlatEntityProperty.PROPERTY_ID] == _md5("o1-e1-person-Purchased")
+    assert rows[("e2", "$pk")][FlatEntityProperty.PROPERTY_ID] == _md5("o1-e2-product-e2")
+    assert rows[("e2", "price.net")][FlatEntityProperty.PROPERTY_ID] == _md5("o1-e2-product-9.5")
+
+    # Null traits are skipped
+    assert ("e1", "tags") not in rows
+
+
+def test_system_rows_order():
+    rows = compute_entity_property_rows([_relation(), _entity()])
+    names = [(row[FlatEntityProperty.PK], row[FlatEntityProperty.NAME]) for row in rows]
+    assert names == [
+        ("e1", "name"), ("e1", "age"), ("e1", "$id"), ("e1", "$pk"), ("e1", "$label"), ("e1", "$type"),
+        ("e2", "price.net"), ("e2", "$pk"), ("e2", "$id"), ("e2", "$label")
+    ]
+
+
+def test_one_timestamp_per_batch():
+    rows = compute_entity_property_rows([_relation(), _entity()])
+    assert len({row[FlatEntityProperty.TS] for row in rows}) == 1
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from airembr.system.adapter.bigdata.tool.flush_coordinator import FlushCoordinator
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.mark.anyio
+async def test_flush_returns_per_table_result():
+    async def load(rows):
+        return "Success", len(rows), len(rows), None
+
+    flush = FlushCoordinator(concurrency=2)
+    flush.add("sys_evt", load, [1, 2, 3])
+    flush.add("sys_text", load, [1])
+    result = await flush.flush()
+
+    assert result["sys_evt"].saved_rows == 3
+    assert result["sys_text"].saved_rows == 1
+    assert not result.is_partial_failure()
+
+
+@pytest.mark.anyio
+async def test_flush_reports_partial_failure():
+    async def ok():
+        return "Success", 1, 1, None
+
+    async def fail():
+        return "Fail", 1, 0, "Bad row"
+
+    async def error():
+        raise ConnectionError("Connection refused")
+
+    flush = FlushCoordinator()
+    flush.add("sys_evt", ok)
+    flush.add("sys_text", fail)
+    flush.add("sys_timer", error)
+    result = await flush.flush()
+
+    assert result.is_partial_failure()
+    assert {item.table for item in result.failed()} == {"sys_text", "sys_timer"}
+    assert result["sys_text"].message == "Bad row"
+    assert isinstance(result["sys_timer"].error, ConnectionError)
+    assert not result["sys_evt"].is_failed()
+
+
+@pytest.mark.anyio
+async def test_flush_respects_concurrency_limit():
+    running = 0
+    peak = 0
+
+    async def load():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    flush = FlushCoordinator(concurrency=3)
+    for i in range(8):
+        flush.add(f"table_{i}", load)
+    result = await flush.flush()
+
+    assert len(result.tables) == 8
+    assert peak == 3
@@ -0,0 +1,71 @@
+import asyncio
+
+from airembr.system.adapter.bigdata.tool.hyper_edge_match import hyper_edge_conditions, find_candidates
+
+
+def test_conditions_require_one_entity_of_every_candidate():
+    conditions, params = hyper_edge_conditions([["p2", "p1"], ["l1"], ["p1", "p1"]])
+
+    assert conditions == [
+        "SUM(CASE WHEN o.entity_pk IN :entity_pks_0 THEN 1 ELSE 0 END) > 0",
+        "SUM(CASE WHEN o.entity_pk IN :entity_pks_1 THEN 1 ELSE 0 END) > 0",
+        "SUM(CASE WHEN o.entity_pk IN :entity_pks_2 THEN 1 ELSE 0 END) > 0",
+    ]
+    assert params == {
+        "entity_pks": ("l1", "p1", "p2"),
+        "entity_pks_0": ("p1", "p2"),
+        "entity_pks_1": ("l1",),
+        "entity_pks_2": ("p1",),
+    }
+
+
+def test_conditions_match_observations_as_sql_would():
+    # Every observation -> its entities, grouped like sys_obs_2_entity by observation_id
+    observations = {"o1": {"p1", "l1"}, "o2": {"p2"}, "o3": {"p2", "l1", "x"}}
+    candidates = [["p1", "p2"], ["l1"]]
+    _, params = hyper_edge_conditions(candidates)
+
+    matched = [observation_id for observation_id, entities in sorted(observations.items())
+               if entities & set(params["entity_pks"])
+               and all(entities & set(params[f"entity_pks_{no}"]) for no in range(len(candidates)))]
+
+    assert matched == ["o1", "o3"]
+
+
+class Finder:
+
+    def __init__(self, entities):
+        self.entities = entities
+        self.calls = []
+
+    async def __call__(self, properties, entity_type):
+        self.calls.append((tuple(properties), entity_type))
+        return [pk for pk, (pk_type, pk_properties) in self.entities.items()
+                if pk_type == entity_type and set(properties) <= pk_properties]
+
+
+def test_not_found_entity_is_searched_by_type_only():
+    find = Finder({"p1": ("person", {"name=John"}), "l1": ("location", {"city=Paris"}), "l2": ("location", set())})
+
+    found = asyncio.run(find_candidates([(["name=John"], "person"), (["city=Rome"], "location")], find))
+
+    assert found == [["p1"], ["l1", "l2"]]
+    assert find.calls[-1] == ((), "location")
+
+
+def test_no_type_only_search_if_nothing_was_found_as_requested():
+    find = Finder({"l1": ("location", set())})
+
+    found = asyncio.run(find_candidates([(["name=Jane"], "person"), (["city=Rome"], "location")], find))
+
+    assert found == [[], []]
+    assert len(find.calls) == 2
+
+
+def test_entity_without_properties_is_not_searched_again():
+    find = Finder({"p1": ("person", {"name=John"})})
+
+    found = asyncio.run(find_candidates([(["name=John"], "person"), ([], "location")], find))
+
+    assert found == [["p1"], []]
+    assert len(find.calls) == 2
@@ -0,0 +1,20 @@
+from airembr.system.adapter.bigdata.tool.latest_rows import keep_latest
+
+
+def test_keep_latest_keeps_newest_row_per_key():
+    rows = [
+        {'entity_pk': 'e1', 'property_name': 'city', 'property_value': 'Berlin', 'ts': 2},
+        {'entity_pk': 'e1', 'property_name': 'city', 'property_value': 'Paris', 'ts': 1},
+        {'entity_pk': 'e1', 'property_name': 'name', 'property_value': 'Anna', 'ts': 1},
+        {'entity_pk': 'e2', 'property_name': 'city', 'property_value': 'Rome', 'ts': None},
+        {'entity_pk': 'e2', 'property_name': 'city', 'property_value': 'Oslo', 'ts': 1},
+        {'entity_pk': 'e1', 'property_name': 'name', 'property_value': 'Ann', 'ts': 1},
+    ]
+
+    latest = keep_latest(rows, key_columns=('entity_pk', 'property_name'))
+
+    assert sorted((row['entity_pk'], row['property_name'], row['property_value']) for row in latest) == [
+        ('e1', 'city', 'Berlin'),
+        ('e1', 'name', 'Ann'),  # Equal ts, the later row wins
+        ('e2', 'city', 'Oslo'),
+    ]
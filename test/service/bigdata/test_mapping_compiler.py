@@ -0,0 +1,191 @@
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from durable_dot_dict.dotdict import DotDict
+
+from airembr.system.adapter.bigdata.tool.mapping_compiler import MappingCompiler
+
+_schema_dir = os.path.join(os.path.dirname(__file__), '../../../airembr/system/schema/mapping')
+
+
+def _mapping(*columns):
+    return SimpleNamespace(
+        table="sys_test",
+        columns=[SimpleNamespace(column=column, property=column_property, column_type="varchar(64)",
+                                 default_value=None)
+                 for column, column_property in columns]
+    )
+
+
+def _typed_mapping(*columns):
+    return SimpleNamespace(
+        table="sys_test",
+        columns=[SimpleNamespace(column=column, property=column, column_type=column_type, default_value=default)
+                 for column, column_type, default in columns]
+    )
+
+
+def _schema_mapping(table: str):
+    with open(os.path.join(_schema_dir, f'{table}.json')) as file:
+        data = json.load(file)
+    return SimpleNamespace(
+        table=data['table'],
+        columns=[SimpleNamespace(column=column['column'], property=column['property'],
+                                 column_type=column['sr_column_type'],
+                                 default_value=column.get('default_value', None))
+                 for column in data['columns']]
+    )
+
+
+def _convert(value, column_type: str):
+    column_type = column_type.lower()
+    if column_type.startswith('array'):
+        return list(value) if isinstance(value, (list, tuple, set)) else [value]
+    if column_type.startswith(('varchar', 'text', 'string', 'char')):
+        return str(value)
+    if column_type.startswith('bool'):
+        if isinstance(value, str):
+            return value.lower() in ('1', 'true', 'yes', 'on')
+        return bool(value)
+    if column_type.startswith(('int', 'bigint')):
+        return int(value)
+    if column_type.startswith(('decimal', 'float', 'double')):
+        return float(value)
+    return value
+
+
+def _reference(row, column_mapping, json_as_string=False):
+    # Verification oracle: maps one column per call, as map_object_to_column does
+    value = DotDict(row).get(column_mapping.property, None)
+    if value is None:
+        default = column_mapping.default_value
+        if default is None or default == 'CURRENT_TIMESTAMP':
+            return None
+        value = default.strip("'") if isinstance(default, str) else default
+    return column_mapping.column, column_mapping.column_type, _convert(value, column_mapping.column_type)
+
+
+def _reference_row(row, mapping) -> dict:
+    values = {}
+    for column_mapping in mapping.columns:
+        result = _reference(row, column_mapping)
+        if result is not None:
+            values[result[0]] = result[2]
+    return values
+
+
+def _sample_value(column_mapping, no: int):
+    column_type = column_mapping.column_type.lower()
+    if column_type.startswith('array'):
+        return [f"{column_mapping.column}-{no}-{i}" for i in range(no % 3 + 1)]
+    if column_type == 'json':
+        return {"name": f"name-{no}", "age": no % 90, "tags": ["a", "b"]}
+    if column_type.startswith('datetime'):
+        return datetime(2025, 1, 1) + timedelta(seconds=no)
+    if column_type.startswith('bool'):
+        return no % 2 == 0
+    if column_type.startswith(('int', 'bigint')):
+        # Numbers from json payloads come as strings too
+        return str(no) if no % 2 else no
+    return f"{column_mapping.column}-{no}"
+
+
+def _sample_rows(mapping, size: int):
+    randomizer = random.Random(size)
+    for no in range(size):
+        row = DotDict()
+        for column_mapping in mapping.columns:
+            if randomizer.random() < 0.25:
+                # Missing or None value
+                if randomizer.random() < 0.5:
+                    row[column_mapping.property] = None
+                continue
+            row[column_mapping.property] = _sample_value(column_mapping, no)
+        yield row
+
+
+def test_compiled_mapping_resolves_paths():
+    compiler = MappingCompiler()
+    project = compiler.compile(_mapping(("id", "id"), ("entity_pk", "entity.pk"), ("name", "entity.traits.name")))
+
+    rows = [DotDict({"id": i, "entity": {"pk": f"pk-{i}", "traits": {"name": "John"}}}) for i in range(3)]
+    result = [project(row) for row in rows]
+
+    assert result[2] == {"id": "2", "entity_pk": "pk-2", "name": "John"}
+
+
+def test_compiled_mapping_reads_literal_dotted_keys():
+    compiler = MappingCompiler()
+    project = compiler.compile(_mapping(("entity_pk", "entity.pk")))
+
+    assert project({"entity.pk": "pk-1"}) == {"entity_pk": "pk-1"}
+    assert project({"other": 1}) == {}
+
+
+def test_compiled_mapping_reads_nested_dot_dicts():
+    compiler = MappingCompiler()
+    project = compiler.compile(_mapping(("entity_pk", "entity.pk")))
+
+    assert project({"entity": DotDict({"pk": "pk-1"})}) == {"entity_pk": "pk-1"}
+
+
+def test_missing_values_get_compiled_default():
+    compiler = MappingCompiler()
+    project = compiler.compile(_typed_mapping(
+        ("id", "varchar(32)", None),
+        ("subjective", "boolean", "'1'"),
+        ("count", "integer", "0"),
+        ("status", "varchar(32)", "'new'"),
+        ("insert_time", "datetime", "CURRENT_TIMESTAMP"),
+    ))
+
+    assert project({"id": "1", "count": None}) == {"id": "1", "subjective": True, "count": 0, "status": "new"}
+    assert project({"id": "2", "subjective": "false", "count": "7", "status": "done"}) == {
+        "id": "2", "subjective": False, "count": 7, "status": "done"
+    }
+
+
+def test_values_are_converted_to_column_types():
+    compiler = MappingCompiler()
+    mapping = _typed_mapping(
+        ("id", "varchar(32)", None),
+        ("count", "BIGINT", None),
+        ("score", "decimal(10,2)", None),
+        ("valid", "boolean", None),
+        ("tags", "array<varchar(32)>", None),
+        ("traits", "json", None),
+        ("ts", "datetime", None),
+    )
+    project = compiler.compile(mapping)
+    row = {"id": 41, "count": "8", "score": 1, "valid": "yes", "tags": ("a", "b"), "traits": {"a": 1},
+           "ts": datetime(2025, 1, 1)}
+
+    assert project(row) == {"id": "41", "count": 8, "score": 1.0, "valid": True, "tags": ["a", "b"],
+                            "traits": {"a": 1}, "ts": datetime(2025, 1, 1)}
+    assert project(row) == _reference_row(row, mapping)
+
+
+def test_compiled_mapping_matches_reference_on_schema_rows():
+    compiler = MappingCompiler()
+    for table in ['sys_evt', 'sys_ent_history']:
+        mapping = _schema_mapping(table)
+        project = compiler.compile(mapping)
+        for row in _sample_rows(mapping, 200):
+            expected = _reference_row(row, mapping)
+            actual = project(row)
+            assert actual == expected
+            assert {column: type(value) for column, value in actual.items()} == \
+                   {column: type(value) for column, value in expected.items()}
+
+
+def test_compiled_mapping_is_cached_per_mapping():
+    compiler = MappingCompiler(max_size=1)
+    mapping = _mapping(("id", "id"))
+
+    assert compiler.compile(mapping) is compiler.compile(mapping)
+
+    other = _mapping(("id", "id"))
+    assert compiler.compile(other) is not compiler.compile(mapping)
@@ -0,0 +1,118 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+from airembr.system.adapter.bigdata.tool.stream_load_client import StreamLoadClient, encode_rows
+from airembr.system.adapter.bigdata.tool.stream_load_splitter import batch_label, StreamLoadSplitter
+
+
+def test_batch_label_depends_on_payload_content():
+    batch = [{"observation": {"id": "o1", "name": "John"}}, {"observation": {"id": "o2"}}]
+    replay = [{"observation": {"name": "John", "id": "o1"}}, {"observation": {"id": "o2"}}]
+    corrected = [{"observation": {"id": "o1", "name": "Jon"}}, {"observation": {"id": "o2"}}]
+
+    assert batch_label(batch) == batch_label(replay)
+    # Same observation ids, other content
+    assert batch_label(batch) != batch_label(corrected)
+    assert len(batch_label([None])) == 32
+
+
+def test_encode_rows_as_naive_utc():
+    rows = json.loads(encode_rows([{"ts": datetime(2026, 1, 1, 12, tzinfo=timezone.utc), "traits": {"a": 1}}]))
+    assert rows == [{"ts": "2026-01-01 12:00:00", "traits": {"a": 1}}]
+
+
+def test_stream_load_sends_label_and_follows_redirect():
+    loads = []
+
+    async def fe(request):
+        port = request.url.port
+        raise web.HTTPTemporaryRedirect(f"http://be-unreachable:{port}/be/{request.match_info['table']}")
+
+    async def be(request):
+        loads.append((request.headers.get('label'), request.headers.get('Authorization'), await request.json()))
+        return web.json_response({"Status": "Success", "NumberTotalRows": 1, "NumberLoadedRows": 1})
+
+    async def main():
+        app = web.Application()
+        app.router.add_put('/api/{database}/{table}/_stream_load', fe)
+        app.router.add_put('/be/{table}', be)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        client = StreamLoadClient('127.0.0.1', port, 'root', 'secret', be_host='127.0.0.1')
+        try:
+            return await client.stream('db', 'tbl', [{"id": 1}], timeout=5, label='tbl_b1_0')
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    response = asyncio.run(main())
+    assert response["Status"] == "Success"
+    label, auth, rows = loads[0]
+    assert label == 'tbl_b1_0'
+    assert auth.startswith('Basic ')
+    assert rows == [{"id": 1}]
+
+
+def test_stream_load_sends_merge_condition():
+    headers = []
+
+    async def fe(request):
+        headers.append((request.headers.get('merge_condition'), request.headers.get('label')))
+        return web.json_response({"Status": "Success", "NumberTotalRows": 1, "NumberLoadedRows": 1})
+
+    async def main():
+        app = web.Application()
+        app.router.add_put('/api/{database}/{table}/_stream_load', fe)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        client = StreamLoadClient('127.0.0.1', port, 'root')
+        try:
+            await client.stream('db', 'tbl', [{"id": 1}], timeout=5, merge_condition='ts')
+            await client.stream('db', 'tbl', [{"id": 1}], timeout=5)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(main())
+    assert headers == [('ts', None), (None, None)]
+
+
+def test_stream_load_sends_encoded_split_body():
+    bodies = []
+
+    async def be(request):
+        bodies.append(await request.read())
+        return web.json_response({"Status": "Success", "NumberTotalRows": 2, "NumberLoadedRows": 2})
+
+    rows = [{"id": 1, "ts": datetime(2026, 1, 1, 12, tzinfo=timezone.utc)}, {"id": 2, "ts": None}]
+    split = next(StreamLoadSplitter("tbl", encode=True).split(iter(rows)))
+
+    async def main():
+        app = web.Application()
+        app.router.add_put('/api/{database}/{table}/_stream_load', be)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        client = StreamLoadClient('127.0.0.1', port, 'root')
+        try:
+            await client.stream('db', 'tbl', split.body, timeout=5)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(main())
+    assert bodies == [encode_rows(rows)]
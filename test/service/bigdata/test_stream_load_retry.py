@@ -0,0 +1,34 @@
+import asyncio
+
+from airembr.system.adapter.bigdata.tool.stream_load_retry import is_busy, retry_delays, LoadBackpressure
+
+
+def test_is_busy():
+    assert is_busy("Publish Timeout", None)
+    assert is_busy("Fail", "Too many versions. tablet_id: 1")
+    assert is_busy("Fail", "Service Unavailable")
+    assert not is_busy("Fail", "column count mismatch")
+    assert not is_busy("Success", "OK")
+
+
+def test_retry_delays_are_bounded():
+    delays = list(retry_delays(5, backoff=0.5, max_backoff=2))
+    assert len(delays) == 5
+    assert all(0 <= delay <= 2 for delay in delays)
+    assert list(retry_delays(0, backoff=0.5, max_backoff=2)) == []
+
+
+def test_backpressure_grows_and_decays():
+    backpressure = LoadBackpressure(initial_delay=0.1, max_delay=0.5)
+    assert not backpressure.is_active()
+
+    backpressure.on_busy()
+    assert backpressure.delay == 0.1
+    for _ in range(5):
+        backpressure.on_busy()
+    assert backpressure.delay == 0.5
+
+    for _ in range(10):
+        backpressure.on_success()
+    assert backpressure.delay == 0
+    asyncio.run(backpressure.wait())
@@ -0,0 +1,74 @@
+import orjson
+
+from airembr.system.adapter.bigdata.tool.stream_load_splitter import StreamLoadSplitter, StreamLoadResult
+
+
+def _rows(count):
+    for i in range(count):
+        yield {"id": i, "value": "x" * 10}
+
+
+def test_split_by_rows():
+    splits = list(StreamLoadSplitter("tbl", max_rows=4, label="batch").split(_rows(10)))
+
+    assert [len(split.rows) for split in splits] == [4, 4, 2]
+    assert [split.label for split in splits] == ["tbl_batch_0", "tbl_batch_1", "tbl_batch_2"]
+    assert [row["id"] for split in splits for row in split.rows] == list(range(10))
+
+
+def test_split_by_bytes():
+    row_size = len(orjson.dumps({"id": 0, "value": "x" * 10})) + 1
+    splits = list(StreamLoadSplitter("tbl", max_bytes=row_size * 3).split(_rows(7)))
+
+    assert [len(split.rows) for split in splits] == [3, 3, 1]
+    assert all(split.size <= row_size * 3 for split in splits)
+
+
+def test_oversized_row_is_sent_alone():
+    rows = [{"value": "x" * 100}, {"value": "y"}]
+    splits = list(StreamLoadSplitter("tbl", max_bytes=10).split(rows))
+    assert [len(split.rows) for split in splits] == [1, 1]
+
+
+def test_empty_rows():
+    assert list(StreamLoadSplitter("tbl").split(iter([]))) == []
+    assert StreamLoadResult().to_tuple() == (None, None, None, None)
+
+
+def test_result_sums_splits_and_keeps_failure():
+    result = StreamLoadResult()
+    result.add("Success", 4, 4, "OK")
+    result.add("Fail", 0, 0, "Publish Timeout")
+    result.add("Success", 2, 2, "OK")
+
+    assert result.to_tuple() == ("Fail", 6, 6, "Publish Timeout")
+    assert result.splits == 3
+
+
+def test_labels_do_not_depend_on_row_content():
+    first = [split.label for split in StreamLoadSplitter("tbl", max_rows=4, label="b1").split(_rows(10))]
+    replay = [split.label for split in StreamLoadSplitter("tbl", max_rows=4, label="b1").split(
+        {**row, "ts": "2026-01-01 00:00:01"} for row in _rows(10))]
+
+    assert first == replay == ["tbl_b1_0", "tbl_b1_1", "tbl_b1_2"]
+
+
+def test_no_labels_without_batch_label():
+    splits = list(StreamLoadSplitter("tbl", max_rows=4).split(_rows(10)))
+    assert [split.label for split in splits] == [None, None, None]
+
+
+def test_encoded_splits_carry_body_instead_of_rows():
+    splits = list(StreamLoadSplitter("tbl", max_rows=4, encode=True).split(_rows(10)))
+
+    assert [split.count for split in splits] == [4, 4, 2]
+    assert all(split.rows == [] for split in splits)
+    assert [row["id"] for split in splits for row in orjson.loads(split.body)] == list(range(10))
+    assert all(split.size == len(split.body) for split in splits)
+
+
+def test_encoded_splits_keep_byte_limit():
+    row_size = len(orjson.dumps({"id": 0, "value": "x" * 10})) + 1
+    splits = list(StreamLoadSplitter("tbl", max_bytes=row_size * 3, encode=True).split(_rows(7)))
+
+    assert [split.count for split in splits] == [3, 3, 1]
@@ -0,0 +1,30 @@
+import random
+import struct
+
+import orjson
+
+from airembr.system.adapter.bigdata.tool.vector_rows import compact_vector, vector_rows
+
+
+def _float32(value):
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def test_compact_vector_keeps_float32_values_in_fewer_bytes():
+    rng = random.Random(7)
+    vector = [0.012345678901234567, -0.98765432109876, 1e-9, 0.0, 1.0, 3.4e38, 1.2e-38]
+    vector += [rng.uniform(-1, 1) for _ in range(10000)]
+    compact = compact_vector(vector)
+
+    assert len(orjson.dumps(compact)) < len(orjson.dumps(vector))
+    # Stored as float32, nothing is lost
+    assert [_float32(value) for value in compact] == [_float32(value) for value in vector]
+
+
+def test_vector_rows_are_sys_text_vector_rows():
+    rows = vector_rows({'a': [0.5, 0.25], 'b': [1.0]}, 'model-x')
+
+    assert list(rows) == [
+        {'text_id': 'a', 'model': 'model-x', 'vector': [0.5, 0.25]},
+        {'text_id': 'b', 'model': 'model-x', 'vector': [1.0]}
+    ]
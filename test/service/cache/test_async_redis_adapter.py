@@ -0,0 +1,104 @@
+import asyncio
+
+from redis.asyncio import ConnectionPool, Redis
+
+from airembr.model.system.context import Context, ServerContext, get_context
+from airembr.sdk.storage.cache.client import redis_async_client
+from airembr.sdk.storage.cache.client.redis_async_client import AsyncRedisPipeline
+from airembr.system.adapter.cache.redis.async_cache import AsyncRedisCacheAdapter
+from airembr.system.adapter.cache.redis.async_lcache import AsyncRedisListCacheAdapter
+
+
+class RecordingPipeline:
+    """ Stands for redis.asyncio pipeline. Records commands and answers with a reply function. """
+
+    def __init__(self, reply):
+        self.commands = []
+        self._reply = reply
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __getattr__(self, command):
+        def queue(*args, **kwargs):
+            self.commands.append((command, args))
+
+        return queue
+
+    async def execute(self):
+        return [self._reply(command, args) for command, args in self.commands]
+
+
+class PipelineClient:
+
+    def __init__(self, reply):
+        self.pipelines = []
+        self._reply = reply
+
+    def pipeline(self, transaction: bool = False):
+        pipeline = RecordingPipeline(self._reply)
+        self.pipelines.append(pipeline)
+        return AsyncRedisPipeline(pipeline)
+
+
+def test_exists_many_is_one_round_trip_with_tenant_keys():
+    client = PipelineClient(lambda command, args: int(args[0].endswith('a')))
+    adapter = AsyncRedisCacheAdapter()
+    adapter._client = client
+
+    with ServerContext(Context(tenant="t1", production=False)):
+        result = asyncio.run(adapter.exists_many(['a', 'b']))
+        tenant = get_context().tenant
+
+    assert result == {'a': True, 'b': False}
+    assert len(client.pipelines) == 1
+    assert client.pipelines[0].commands == [('exists', (f'{tenant}:a',)), ('exists', (f'{tenant}:b',))]
+
+
+def test_lrange_with_ttl_pairs_replies_per_key():
+    def reply(command, args):
+        if command == 'lrange':
+            return [args[0].encode()]
+        return 60
+
+    client = PipelineClient(reply)
+    adapter = AsyncRedisListCacheAdapter('chat')
+    adapter._client = client
+
+    with ServerContext(Context(tenant="t1", production=False)):
+        result = asyncio.run(adapter.lrange_with_ttl(['c1', 'c2']))
+        tenant = get_context().tenant
+
+    assert result == [([f'{tenant}:chat:c1'.encode()], 60), ([f'{tenant}:chat:c2'.encode()], 60)]
+    assert [command for command, _ in client.pipelines[0].commands] == ['lrange', 'ttl', 'lrange', 'ttl']
+
+
+def test_async_redis_client_closes_client_of_previous_loop(monkeypatch):
+    closed = []
+    aclose = Redis.aclose
+
+    async def recording_aclose(self, close_connection_pool=None):
+        closed.append((self, close_connection_pool))
+        await aclose(self, close_connection_pool=close_connection_pool)
+
+    monkeypatch.setattr(Redis, "aclose", recording_aclose)
+    monkeypatch.setattr(redis_async_client, "get_async_redis_connection_pool",
+                        lambda config: ConnectionPool.from_url("redis://127.0.0.1:1"))
+    client = redis_async_client.AsyncRedisClient.__new__(redis_async_client.AsyncRedisClient)
+    client.__init__()
+
+    async def first_loop():
+        return client.client, client.client
+
+    async def second_loop():
+        current = client.client
+        await asyncio.sleep(0)
+        await client.close()
+        return current
+
+    first, same = asyncio.run(first_loop())
+    second = asyncio.run(second_loop())
+
+    assert first is same
+    assert second is not first
+    assert closed == [(first, True), (second, True)]
@@ -0,0 +1,143 @@
+import asyncio
+
+from airembr.model.system.context import Context, ServerContext, get_context
+from airembr.sdk.storage.cache.client.redis_async_client import AsyncRedisPipeline
+from airembr.system.process.ai.memory.conversation.memory_facade import ConversationMemoryStore, ChatMemory, \
+    ConversationMemoryFacade
+
+
+class RecordingPipeline:
+
+    def __init__(self, reply):
+        self.commands = []
+        self._reply = reply
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __getattr__(self, command):
+        def queue(*args, **kwargs):
+            self.commands.append((command, args))
+
+        return queue
+
+    async def execute(self):
+        return [self._reply(command, args) for command, args in self.commands]
+
+
+class PipelineClient:
+
+    def __init__(self, reply):
+        self.pipelines = []
+        self._reply = reply
+
+    def pipeline(self, transaction: bool = False):
+        pipeline = RecordingPipeline(self._reply)
+        self.pipelines.append(pipeline)
+        return AsyncRedisPipeline(pipeline)
+
+
+class ListClient:
+    """ Lists and counters of RedisClient, in memory. """
+
+    def __init__(self):
+        self.data = {}
+
+    def rpush(self, name, *values):
+        self.data.setdefault(name, []).extend(value.encode() for value in values)
+        return len(self.data[name])
+
+    def lrange(self, name, start, end):
+        items = self.data.get(name, [])
+        start = max(len(items) + start, 0) if start < 0 else start
+        end = len(items) + end if end < 0 else end
+        return items[start:end + 1]
+
+    def ltrim(self, name, start, end):
+        self.data[name] = self.lrange(name, start, end)
+
+    def incr(self, name, amount=1):
+        self.data[name] = self.data.get(name, 0) + amount
+        return self.data[name]
+
+    def get(self, name):
+        return self.data.get(name, None)
+
+    def delete(self, name):
+        self.data.pop(name, None)
+
+
+def _store(client) -> ConversationMemoryStore:
+    store = ConversationMemoryStore()
+    store._chat_adapter._client = client
+    store._pushed_adapter._client = client
+    store._summary_adapter._client = client
+    return store
+
+
+def test_recall_loads_all_chats_in_one_round_trip():
+    def reply(command, args):
+        if command == 'lrange':
+            return [b'user:hi', b'bot:hello'] if args[0].endswith('c1') else []
+        if command == 'ttl':
+            return 100 if args[0].endswith('c1') else -2
+        return b'greeting' if args[0].endswith('c1') else None
+
+    client = PipelineClient(reply)
+
+    with ServerContext(Context(tenant="t1", production=False)):
+        memories = asyncio.run(_store(client).recall(['c1', 'c2']))
+
+    assert memories == {
+        'c1': ChatMemory(passages=['user:hi', 'bot:hello'], ttl=100, summary='greeting'),
+        'c2': ChatMemory(passages=[], ttl=0, summary=None)
+    }
+    assert len(client.pipelines) == 1
+    assert [command for command, _ in client.pipelines[0].commands] == ['lrange', 'ttl', 'get'] * 2
+
+
+def test_memorize_pushes_trims_and_expires_in_one_pipeline():
+    client = PipelineClient(lambda command, args: args[1] + 10 if command == 'incr' else True)
+
+    with ServerContext(Context(tenant="t1", production=False)):
+        lengths = asyncio.run(_store(client).memorize(
+            [('c1', ['a', 'b'], 60), ('c2', [], 60), ('c3', ['c'], 0)],
+            max_passages=10
+        ))
+        tenant = get_context().tenant
+
+    # Passages ever pushed
+    assert lengths == {'c1': 12, 'c3': 11}
+    assert len(client.pipelines) == 1
+    assert client.pipelines[0].commands == [
+        ('rpush', (f'{tenant}:chat:c1', 'a', 'b')),
+        ('incr', (f'{tenant}:chat_pushed:c1', 2)),
+        ('ltrim', (f'{tenant}:chat:c1', -10, -1)),
+        ('expire', (f'{tenant}:chat:c1', 60)),
+        ('expire', (f'{tenant}:chat_pushed:c1', 60)),
+        ('rpush', (f'{tenant}:chat:c3', 'c')),
+        ('incr', (f'{tenant}:chat_pushed:c3', 1)),
+        ('ltrim', (f'{tenant}:chat:c3', -10, -1)),
+    ]
+
+
+def test_summarizer_keeps_passages_pushed_after_snapshot_when_chat_is_trimmed():
+    client = ListClient()
+    memory = ConversationMemoryFacade('c1')
+    memory._chat_adapter._client = client
+    memory._pushed_adapter._client = client
+
+    def memorize(*passages):
+        # Same as ConversationMemoryStore.memorize with max_passages=4
+        memory.chat_memorize(*passages)
+        client.incr('chat_pushed:c1', len(passages))
+        client.ltrim('chat:c1', -4, -1)
+        return client.get('chat_pushed:c1')
+
+    snapshot = memorize('p1', 'p2', 'p3', 'p4', 'p5')
+    # Pushed while the snapshot was summarized. Trimming moves the head, so index 5 is gone.
+    memorize('p6', 'p7', 'p8')
+    assert memory.chat_recall() == ['p5', 'p6', 'p7', 'p8']
+
+    assert memory.chat_recall_after(snapshot) == ['p6', 'p7', 'p8']
+    assert memory.chat_recall_after(memory.chat_pushed()) == []
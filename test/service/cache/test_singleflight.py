@@ -0,0 +1,166 @@
+import asyncio
+
+from airembr.system.decorator.proxy.lib.singleflight import SingleFlightLoader
+
+
+class DictTier:
+
+    def __init__(self):
+        self.items = {}
+
+    async def get_value(self, name, key):
+        return self.items.get((name, key), None)
+
+    async def set_value(self, name, key, value, ttl):
+        self.items[(name, key)] = (value,)
+
+
+def test_same_key_shares_one_load():
+    calls = 0
+
+    async def load(key):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return f"value-{key}"
+
+    async def main():
+        loader = SingleFlightLoader(concurrency=4)
+        return await asyncio.gather(*[loader.load('source', 'a', load, ('a',)) for _ in range(50)])
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert set(results) == {'value-a'}
+
+
+def test_different_keys_load_in_parallel_within_limit():
+    running = 0
+    max_running = 0
+
+    async def load(key):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return key
+
+    async def main():
+        loader = SingleFlightLoader(concurrency=3)
+        return await asyncio.gather(*[loader.load('source', i, load, (i,)) for i in range(9)])
+
+    assert asyncio.run(main()) == list(range(9))
+    assert max_running == 3
+
+
+def test_not_found_is_cached_with_negative_ttl():
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        return None
+
+    async def main():
+        loader = SingleFlightLoader(negative_ttl=0)
+        await loader.load('source', 'missing', load, in_memory_ttl=60)
+        await loader.load('source', 'missing', load, in_memory_ttl=60)
+
+        loader.negative_ttl = 60
+        await loader.load('source', 'missing', load, in_memory_ttl=60)
+        await loader.load('source', 'missing', load, in_memory_ttl=60)
+
+    asyncio.run(main())
+    # Negative ttl 0 means not cached, then cached once
+    assert calls == 3
+
+
+def test_global_tier_and_invalidation():
+    calls = 0
+    tier = DictTier()
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def main():
+        loader = SingleFlightLoader(global_tier=tier)
+        assert await loader.load('mapping', 'k', load, global_ttl=60) == 1
+        assert tier.items[('mapping', 'k')] == (1,)
+
+        # Memory is cleared, value comes from the global tier
+        loader.memory.clear()
+        assert await loader.load('mapping', 'k', load, global_ttl=60) == 1
+
+        loader.invalidate(['mapping'])
+        tier.items.clear()
+        assert await loader.load('mapping', 'k', load, global_ttl=60) == 2
+
+    asyncio.run(main())
+    assert calls == 2
+
+
+def test_load_running_during_invalidation_does_not_fill_cache():
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return calls
+
+    async def main():
+        loader = SingleFlightLoader()
+        task = asyncio.create_task(loader.load('mapping', 'k', load))
+        await asyncio.sleep(0.005)
+        loader.invalidate(['mapping'])
+        assert await task == 1
+        assert await loader.load('mapping', 'k', load) == 2
+
+    asyncio.run(main())
+
+
+def test_load_many_batches_missing_ids():
+    batches = []
+
+    async def load(ids):
+        batches.append(sorted(ids))
+        await asyncio.sleep(0.01)
+        return {item_id: item_id.upper() for item_id in ids if item_id != 'x'}
+
+    async def main():
+        loader = SingleFlightLoader()
+        first, second = await asyncio.gather(
+            loader.load_many('source', {'a': 'a', 'b': 'b', 'x': 'x'}, load),
+            loader.load_many('source', {'a': 'a', 'c': 'c'}, load)
+        )
+        third = await loader.load_many('source', {'a': 'a', 'x': 'x'}, load)
+        return first, second, third
+
+    first, second, third = asyncio.run(main())
+    assert first == {'a': 'A', 'b': 'B'}
+    assert second == {'a': 'A', 'c': 'C'}
+    assert third == {'a': 'A'}
+    assert batches == [['a', 'b', 'x'], ['c']]
+
+
+def test_failed_load_is_shared_and_not_cached():
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ConnectionError("db down")
+
+    async def main():
+        loader = SingleFlightLoader()
+        results = await asyncio.gather(*[loader.load('source', 'a', load) for _ in range(5)],
+                                       return_exceptions=True)
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert loader.flight.in_flight() == 0
+        await asyncio.gather(loader.load('source', 'a', load), return_exceptions=True)
+
+    asyncio.run(main())
+    assert calls == 2
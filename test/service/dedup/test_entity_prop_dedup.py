@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from airembr.system.process.collection.deduplication.entity_prop_dedup import PropertyDeduper, RedisDedupSpill
+
+_now = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _record(pk, name="name", value="John", ts=_now):
+    return {"entity.pk": pk, "property.name": name, "property.value": value, "ts": ts}
+
+
+def _process(dedup, changes, tenant=None):
+    return asyncio.run(dedup.process(changes, tenant=tenant)).records
+
+
+def test_dedup_counts_across_batches():
+    dedup = PropertyDeduper()
+    _process(dedup, [_record("1"), _record("1")])
+    result = _process(dedup, [_record("1", ts=_now + timedelta(seconds=1))])
+
+    assert len(result) == 1
+    assert result[0]["count"] == 3
+    assert result[0]["ts"] == _now + timedelta(seconds=1)
+
+
+def test_older_record_keeps_newest():
+    dedup = PropertyDeduper()
+    _process(dedup, [_record("1", ts=_now)])
+    result = _process(dedup, [_record("1", ts=_now - timedelta(days=1))])
+
+    assert result[0]["ts"] == _now
+    assert result[0]["count"] == 2
+
+
+def test_lru_eviction_bounds_memory():
+    dedup = PropertyDeduper(max_size=10)
+    _process(dedup, [_record(str(i)) for i in range(100)])
+
+    assert dedup.size() == 10
+    assert dedup.metrics.evictions == 90
+
+
+def test_batch_larger_than_max_size_still_dedups():
+    dedup = PropertyDeduper(max_size=2)
+    result = _process(dedup, [_record(str(i % 5)) for i in range(20)])
+
+    assert len(result) == 5
+    assert all(record["count"] == 4 for record in result)
+
+
+def test_ttl_expires_entries():
+    dedup = PropertyDeduper(ttl=-1)
+    _process(dedup, [_record("1")])
+    result = _process(dedup, [_record("1")])
+
+    assert result[0]["count"] == 1
+    assert dedup.metrics.expirations == 1
+
+
+def test_tenants_are_partitioned():
+    dedup = PropertyDeduper()
+    _process(dedup, [_record("1")], tenant="a")
+    result = _process(dedup, [_record("1")], tenant="b")
+
+    assert result[0]["count"] == 1
+    assert dedup.size("a") == 1
+    assert dedup.size("b") == 1
+
+
+def test_max_tenants():
+    dedup = PropertyDeduper(max_tenants=2)
+    for tenant in ["a", "b", "c"]:
+        _process(dedup, [_record("1")], tenant=tenant)
+
+    assert dedup.size("a") == 0
+    assert dedup.size() == 2
+
+
+def test_hit_ratio():
+    dedup = PropertyDeduper()
+    _process(dedup, [_record("1"), _record("1"), _record("1"), _record("2")])
+
+    assert dedup.metrics.hit_ratio() == 0.5
+
+
+class _SlowSpill:
+    # Spill that yields to the loop, so concurrent process() calls interleave
+
+    async def load(self, tenant, keys):
+        await asyncio.sleep(0.01)
+        return {}
+
+    async def save(self, tenant, records):
+        await asyncio.sleep(0.01)
+
+
+def test_process_returns_own_counts_of_concurrent_calls():
+    dedup = PropertyDeduper(spill=_SlowSpill())
+
+    async def main():
+        return await asyncio.gather(
+            dedup.process([_record("1"), _record("1"), _record("1")], tenant="a"),
+            dedup.process([_record("2"), _record("3")], tenant="b"),
+        )
+
+    first, second = asyncio.run(main())
+
+    assert (first.hits, first.misses) == (2, 1)
+    assert (second.hits, second.misses) == (0, 2)
+    assert (dedup.metrics.hits, dedup.metrics.misses) == (2, 3)
+
+
+class _FakePipeline:
+    def __init__(self, store):
+        self._store = store
+        self._ops = []
+
+    def set(self, key, value, ex=None):
+        self._ops.append((key, value))
+
+    async def execute(self):
+        for key, value in self._ops:
+            self._store[key] = value
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.mget_calls = 0
+
+    @property
+    def client(self):
+        return self
+
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.store)
+
+
+def test_spill_shares_state_between_workers():
+    redis = _FakeRedis()
+    worker_1 = PropertyDeduper(spill=RedisDedupSpill(redis))
+    worker_2 = PropertyDeduper(spill=RedisDedupSpill(redis))
+
+    _process(worker_1, [_record("1"), _record("2")], tenant="a")
+    redis.mget_calls = 0
+    result = _process(worker_2, [_record("1", ts=_now.isoformat()), _record("3")], tenant="a")
+
+    counts = {record["entity.pk"]: record["count"] for record in result}
+    assert counts == {"1": 2, "3": 1}
+    assert worker_2.metrics.spill_hits == 1
+    assert redis.mget_calls == 1
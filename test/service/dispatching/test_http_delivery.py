@@ -0,0 +1,193 @@
+import asyncio
+
+from aiohttp import web
+
+from airembr.system.process.dispatching.circuit_breaker import CircuitBreaker, CircuitOpenError
+from airembr.system.adapter.metadata.mysql.cache.cache_tags import DESTINATION_TAG
+from airembr.system.process.dispatching.delivery_batcher import DeliveryBatcher, DeliveryBatchers
+from airembr.system.process.dispatching.http_delivery import send_request, http_session_pool, circuit_breakers, \
+    _invalidate
+from airembr.system.process.dispatching.http_session_pool import HttpSessionPool, session_key
+
+
+def test_circuit_opens_after_failures_and_half_opens_after_reset():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    assert breaker.allow()
+    breaker.on_failure()
+    assert breaker.allow()
+    breaker.on_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    # One trial call after reset timeout
+    breaker.reset_timeout = 0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.on_failure()
+    assert breaker.allow()  # Reset timeout is 0, so next trial
+    breaker.on_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_batcher_sends_by_size_and_by_wait():
+    batches = []
+
+    async def send(items):
+        batches.append(items)
+
+    async def main():
+        batcher = DeliveryBatcher(send, max_size=3, max_wait=0.05)
+        await asyncio.gather(*[batcher.add(i) for i in range(4)])
+
+    asyncio.run(main())
+    assert batches == [[0, 1, 2], [3]]
+
+
+def test_batcher_passes_error_to_every_caller():
+    async def send(items):
+        raise ConnectionError("down")
+
+    async def main():
+        batcher = DeliveryBatcher(send, max_size=10, max_wait=0.01)
+        return await asyncio.gather(*[batcher.add(i) for i in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in asyncio.run(main()))
+
+
+def test_send_request_reuses_connection_and_breaks_on_5xx():
+    peers = set()
+    status = {'code': 200}
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info('peername'))
+        return web.json_response({"ok": True}, status=status['code'])
+
+    async def main():
+        app = web.Application()
+        app.router.add_post('/', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/"
+
+        try:
+            for _ in range(5):
+                assert await send_request(('r1', 'x'), 'post', url, timeout=5, json={}) == (200, {"ok": True})
+
+            status['code'] = 503
+            circuit_breakers.get(('r1', 'x')).failure_threshold = 2
+            await send_request(('r1', 'x'), 'post', url, timeout=5, json={})
+            await send_request(('r1', 'x'), 'post', url, timeout=5, json={})
+            try:
+                await send_request(('r1', 'x'), 'post', url, timeout=5, json={})
+                raise AssertionError("Circuit should be open")
+            except CircuitOpenError:
+                pass
+        finally:
+            await http_session_pool.close()
+            await runner.cleanup()
+
+    asyncio.run(main())
+    # Keep-alive: all requests used one connection
+    assert len(peers) == 1
+
+
+def test_send_request_releases_half_open_trial_on_any_error():
+    async def handler(request):
+        return web.Response(body=b'\xff\xfe', content_type='text/plain')
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        breaker = circuit_breakers.get(('r2', 'x'))
+        breaker.failure_threshold = 1
+        breaker.reset_timeout = 0
+        breaker.on_failure()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        try:
+            # Body is not json nor utf-8 text
+            try:
+                await send_request(('r2', 'x'), 'get', f"http://127.0.0.1:{port}/", timeout=5)
+                raise AssertionError("Decoding should fail")
+            except UnicodeDecodeError:
+                pass
+        finally:
+            await http_session_pool.close()
+            await runner.cleanup()
+
+        # Trial failed and was released, so next trial is allowed
+        assert breaker.failures == 2
+        assert breaker.allow()
+
+    asyncio.run(main())
+
+
+def test_session_pool_closes_replaced_sessions():
+    pool = HttpSessionPool(keepalive_timeout=0)
+
+    async def first_loop():
+        old = pool.get(session_key('r1', {'token': 'a'}))
+        new = pool.get(session_key('r1', {'token': 'b'}))
+        assert old is not new and len(pool) == 1
+        await asyncio.sleep(0.01)
+        assert old.closed and not new.closed
+        return new
+
+    async def second_loop():
+        session = pool.get(session_key('r1', {'token': 'b'}))
+        await asyncio.sleep(0.01)
+        await pool.close()
+        return session
+
+    previous = asyncio.run(first_loop())
+    current = asyncio.run(second_loop())
+    assert previous is not current
+    assert previous.closed and current.closed
+
+
+def test_changed_destination_gets_new_batcher_and_old_one_sends_pending_items():
+    sent = []
+
+    def sender(name):
+        async def send(items):
+            sent.append((name, items))
+
+        return send
+
+    async def main():
+        batchers = DeliveryBatchers()
+        old = batchers.get(("d1", "r1", "c1"), sender("old"), max_size=10, max_wait=60)
+        pending = asyncio.ensure_future(old.add(1))
+        await asyncio.sleep(0)
+
+        new = batchers.get(("d1", "r1", "c2"), sender("new"), max_size=10, max_wait=0.01)
+        await asyncio.gather(pending, new.add(2))
+        assert new is not old
+        assert batchers.get(("d1", "r1", "c2"), sender("other"), max_size=10, max_wait=0.01) is new
+
+        pending = asyncio.ensure_future(new.add(3))
+        await asyncio.sleep(0)
+        batchers.clear()
+        await pending
+        await batchers.close()
+
+    asyncio.run(main())
+    assert sent == [("old", [1]), ("new", [2]), ("new", [3])]
+
+
+def test_destination_invalidation_drops_circuit_breakers():
+    breaker = circuit_breakers.get(('r3', 'x'))
+    breaker.on_failure()
+
+    _invalidate([DESTINATION_TAG['name']])
+
+    assert circuit_breakers.get(('r3', 'x')) is not breaker
@@ -0,0 +1,56 @@
+import random
+from types import SimpleNamespace
+
+from airembr.model.system.context import Context, ServerContext
+from airembr.system.adapter.metadata.mysql.cache.cache_tags import DESTINATION_TAG
+from airembr.system.process.dispatching import routing_index
+from airembr.system.process.dispatching.routing_index import TriggerRoutingIndex, get_routing_index
+
+
+def _destination(name, event_type=None, source_id=None):
+    config = {}
+    if event_type is not None:
+        config['event_type'] = {'id': event_type, 'name': event_type}
+    if source_id is not None:
+        config['source'] = {'id': source_id, 'name': source_id}
+    return SimpleNamespace(name=name, trigger=SimpleNamespace(config=config))
+
+
+def _scan(destinations, event_type, source_id):
+    # Linear filter the index replaces
+    result = []
+    for destination in destinations:
+        config = destination.trigger.config
+        allowed_event_type = config.get('event_type', {}).get('id', None)
+        allowed_source_id = config.get('source', {}).get('id', None)
+        if allowed_event_type in (None, event_type) and allowed_source_id in (None, source_id):
+            result.append(destination)
+    return result
+
+
+def test_index_matches_linear_scan_in_order():
+    rnd = random.Random(7)
+    event_types = [None, 'page-view', 'purchase', 'login']
+    sources = [None, 's1', 's2']
+    destinations = [_destination(str(i), rnd.choice(event_types), rnd.choice(sources)) for i in range(200)]
+
+    index = TriggerRoutingIndex(destinations)
+
+    for event_type in event_types[1:] + ['other']:
+        for source_id in sources[1:] + ['s3']:
+            assert index.match(event_type, source_id) == _scan(destinations, event_type, source_id)
+
+
+def test_index_is_reused_until_destinations_are_reloaded_or_invalidated():
+    destinations = [_destination('a', 'page-view')]
+
+    with ServerContext(Context(tenant="t1", production=False)):
+        index = get_routing_index(destinations, 'event')
+        assert get_routing_index(destinations, 'event') is index
+
+        reloaded = list(destinations)
+        assert get_routing_index(reloaded, 'event') is not index
+
+        index = get_routing_index(reloaded, 'event')
+        routing_index._invalidate([DESTINATION_TAG['name']])
+        assert get_routing_index(reloaded, 'event') is not index
@@ -0,0 +1,52 @@
+import asyncio
+from time import perf_counter
+
+from airembr.system.process.dispatching.trigger_runner import TriggerRunner
+
+
+def test_triggers_run_concurrently_within_limit():
+    running = 0
+    max_running = 0
+
+    async def trigger():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    async def main():
+        runner = TriggerRunner(concurrency=3, timeout=1)
+        start = perf_counter()
+        for i in range(9):
+            runner.add(str(i), trigger())
+        await runner.wait()
+        return perf_counter() - start
+
+    duration = asyncio.run(main())
+    assert max_running == 3
+    assert duration < 0.4
+
+
+def test_failing_and_slow_triggers_do_not_stop_others():
+    done = []
+
+    async def ok(name):
+        done.append(name)
+
+    async def fail():
+        raise ValueError("error")
+
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def main():
+        runner = TriggerRunner(concurrency=2, timeout=0.05)
+        runner.add("a", ok("a"))
+        runner.add("b", fail())
+        runner.add("c", slow())
+        runner.add("d", ok("d"))
+        await runner.wait()
+
+    asyncio.run(main())
+    assert done == ["a", "d"]
@@ -0,0 +1,65 @@
+import json
+from hashlib import md5
+
+from durable_dot_dict.dotdict import DotDict
+
+from airembr.core.hash.data_hasher import hash_dict_64, hash_traits, hash_fields, hash_data, COMPAT, FAST
+from airembr.system.config.global_config import global_settings
+
+TRAITS = {
+    "name": "John",
+    "age": 31,
+    "address": {"city": "Wrocław", "zip": "50-001"},
+    "tags": ["a", "b"],
+    "score": 1.5,
+    "active": None
+}
+
+
+def _legacy(obj, dump_schema=True):
+    if dump_schema:
+        return md5(json.dumps(obj, sort_keys=True).encode('utf-8')).hexdigest()
+    return md5(str(obj).encode('utf-8')).hexdigest()
+
+
+def test_hash_dict_64_is_unchanged():
+    assert hash_dict_64(TRAITS) == _legacy(TRAITS)
+    assert hash_dict_64("field") == _legacy("field")
+    assert hash_dict_64("field", dump_schema=False) == _legacy("field", dump_schema=False)
+
+
+def test_compat_traits_hash_matches_stored_hashes():
+    fields = sorted(DotDict(TRAITS).flat())
+    traits_hash = hash_traits(TRAITS, mode=COMPAT)
+
+    assert traits_hash.fields == fields
+    assert traits_hash.data_hash == _legacy(TRAITS)
+    assert traits_hash.schema_hash == _legacy(fields)
+    assert traits_hash.field_hashes == [_legacy(field) for field in fields]
+
+    entity_hash = hash_traits(TRAITS, field_dump_schema=False, mode=COMPAT)
+    assert entity_hash.field_hashes == [_legacy(field, dump_schema=False) for field in fields]
+
+
+def test_fast_mode_is_64_bit_and_key_order_independent():
+    reordered = dict(reversed(list(TRAITS.items())))
+
+    assert len(hash_data(TRAITS, mode=FAST)) == 16
+    assert hash_data(TRAITS, mode=FAST) == hash_data(reordered, mode=FAST)
+    assert hash_data(TRAITS, mode=FAST) != hash_data({**TRAITS, "age": 32}, mode=FAST)
+    assert all(len(field_hash) == 16 for field_hash in hash_fields(["a", "b"], mode=FAST))
+
+
+def test_empty_traits():
+    traits_hash = hash_traits({}, mode=COMPAT)
+    assert traits_hash.fields == []
+    assert traits_hash.field_hashes == []
+    assert traits_hash.data_hash == _legacy({})
+
+
+def test_default_mode_comes_from_global_settings(monkeypatch):
+    monkeypatch.setattr(global_settings, "data_hash_mode", FAST)
+    assert hash_data(TRAITS) == hash_data(TRAITS, mode=FAST)
+
+    monkeypatch.setattr(global_settings, "data_hash_mode", COMPAT)
+    assert hash_data(TRAITS) == hash_dict_64(TRAITS)
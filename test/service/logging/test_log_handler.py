@@ -0,0 +1,82 @@
+import logging
+import resource
+
+from airembr.system.process.logging.log_handler import SystemLogHandler, get_logger, log_handler
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.handlers = [handler]
+    logger.setLevel(logging.WARNING)
+    return logger
+
+
+def test_buffer_is_bounded_for_1m_logs():
+    handler = SystemLogHandler(capacity=1000, overflow='drop')
+    logger = _logger("test-log-handler-bounded", handler)
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    for i in range(1_000_000):
+        logger.warning("Log %s", i)
+    growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss
+
+    # ru_maxrss is in kilobytes on linux
+    assert growth < 50 * 1024
+    assert len(handler) == 1000
+    assert handler.pop_counters() == {'dropped': 999_000, 'sampled': 0}
+    assert handler.pop_counters() == {'dropped': 0, 'sampled': 0}
+
+
+def test_sample_keeps_every_nth_log():
+    handler = SystemLogHandler(capacity=10, overflow='sample', sample_every=10)
+    logger = _logger("test-log-handler-sample", handler)
+
+    for i in range(110):
+        logger.warning("Log")
+
+    assert len(handler) == 10
+    assert handler.pop_counters() == {'dropped': 100, 'sampled': 10}
+    assert len(handler.drain(100)) == 10
+
+
+def test_drain_in_batches():
+    handler = SystemLogHandler(capacity=100, overflow='drop')
+    logger = _logger("test-log-handler-drain", handler)
+
+    for i in range(25):
+        logger.warning(f"Log {i}")
+    logger.info("Not kept")
+
+    batches = list(handler.drain_batches(10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [log['message'] for batch in batches for log in batch] == [f"Log {i}" for i in range(25)]
+    assert len(handler) == 0
+
+    log = batches[0][0]
+    assert log['date'].tzinfo is not None
+    assert log['level'] == 'WARNING'
+
+
+def test_stack_is_formatted_on_drain():
+    handler = SystemLogHandler(capacity=10)
+    logger = _logger("test-log-handler-stack", handler)
+
+    try:
+        raise ValueError("error")
+    except ValueError:
+        logger.error("Failed")
+
+    # Frames are kept, the stack is formatted when the log is taken out
+    assert isinstance(handler.collection[0]['stack_info'], str)
+    log, = handler.drain()
+    assert log['stack_info'].startswith("JSON:")
+    assert "test_stack_is_formatted_on_drain" in log['stack_info']
+
+
+def test_get_logger_adds_handlers_once():
+    logger = get_logger("test-log-handler-idempotent")
+    handlers = list(logger.handlers)
+    assert get_logger("test-log-handler-idempotent") is logger
+    assert logger.handlers == handlers
+    assert logger.handlers.count(log_handler) == 1
@@ -0,0 +1,65 @@
+from airembr.system.config.global_config import global_settings
+from airembr.system.process.monitoring.metrics.metrics import INGEST_STAGE_LATENCY, INGEST_BATCH_ROWS, \
+    INGEST_BATCH_BYTES
+from airembr.system.process.monitoring.metrics.stage_timer import StageTimer, LogSampler, observe_batch
+
+
+def _sample(metric, name, **labels):
+    for family in metric.collect():
+        for sample in family.samples:
+            if sample.name == name and sample.labels == labels:
+                return sample.value
+    return 0
+
+
+def test_stage_timer_records_histogram():
+    enabled = global_settings.enable_prometheus
+    global_settings.enable_prometheus = True
+    labels = dict(stage='test_stage', tenant='t1', table='events')
+    try:
+        count = _sample(INGEST_STAGE_LATENCY, 'airembr_ingest_stage_duration_seconds_count', **labels)
+        with StageTimer('test_stage', 't1', 'events') as timer:
+            pass
+        with StageTimer('test_stage', 't1', 'events'):
+            pass
+    finally:
+        global_settings.enable_prometheus = enabled
+
+    assert timer.duration >= 0
+    assert _sample(INGEST_STAGE_LATENCY, 'airembr_ingest_stage_duration_seconds_count', **labels) == count + 2
+
+
+def test_stage_timer_without_prometheus():
+    enabled = global_settings.enable_prometheus
+    global_settings.enable_prometheus = False
+    labels = dict(stage='test_disabled', tenant='t1', table='')
+    try:
+        with StageTimer('test_disabled', 't1') as timer:
+            pass
+    finally:
+        global_settings.enable_prometheus = enabled
+
+    assert timer.duration >= 0
+    assert _sample(INGEST_STAGE_LATENCY, 'airembr_ingest_stage_duration_seconds_count', **labels) == 0
+
+
+def test_observe_batch():
+    enabled = global_settings.enable_prometheus
+    global_settings.enable_prometheus = True
+    labels = dict(stage='test_batch', tenant='t1', table='texts')
+    try:
+        observe_batch('test_batch', 't1', 100, 2048, table='texts')
+        observe_batch('test_batch', 't1', 50, table='texts')
+    finally:
+        global_settings.enable_prometheus = enabled
+
+    assert _sample(INGEST_BATCH_ROWS, 'airembr_ingest_batch_rows_sum', **labels) == 150
+    assert _sample(INGEST_BATCH_ROWS, 'airembr_ingest_batch_rows_count', **labels) == 2
+    assert _sample(INGEST_BATCH_BYTES, 'airembr_ingest_batch_bytes_sum', **labels) == 2048
+
+
+def test_log_sampler():
+    sampler = LogSampler(3)
+    assert [sampler() for _ in range(7)] == [True, False, False, True, False, False, True]
+    every = LogSampler(0)
+    assert all(every() for _ in range(3))
@@ -0,0 +1,31 @@
+from lark import Lark
+
+from airembr.sdk.service.parser.eql.eql_parser import EQLParser
+from airembr.sdk.service.parser.eql.grammar.eql_grammar import eql_grammar
+
+_queries = [
+    'WHO Person(name: "Alice", age: 30)',
+    'WHERE Pet(type: "cat") OR Pet(type: "dog") RETURN Pet',
+    'WHEN Person(age: 30) AND (Address(city: "Paris") OR Address(city: "Rome")) RETURN Person, Address',
+    'WHERE NOT Person(active: false) RETURN Person',
+    'WHERE NOT (Person(active: false) OR Person(banned: true))',
+    'Person(address.city: "Berlin", address.zip: 10115)',
+    'Person(name = "Carol")',
+    'Person(status: active)',
+    'Person(active: true, verified: false)',
+    'WHEN (A(x: 1) AND B(y: 2)) OR (C(z: 3) AND NOT D(w: 4)) RETURN A, C',
+    'WHERE A(x.a: true) OR B(y.c.d: -2.23) OR C(z: 3)',
+    'Person(name ~ "x" [0.8])',
+    'Person(name ~ [0.7] "x")',
+    'who Person()',
+    'P(a: where, b: and)',
+]
+
+
+def test_lalr_parser_builds_earley_trees():
+    earley = Lark(eql_grammar, parser="earley")
+    parser = EQLParser()
+
+    for query in _queries:
+        assert parser.ast(query) == earley.parse(query), query
+        assert parser.parse(query) == parser.transformer.transform(earley.parse(query)), query
@@ -0,0 +1,80 @@
+from lark.exceptions import VisitError
+
+from airembr.sdk.service.dot_accessor import DotAccessor
+from airembr.sdk.service.parser.tql.condition import Condition
+from airembr.sdk.service.parser.tql.condition_compiler import ConditionCompiler
+from airembr.sdk.service.parser.tql.transformer.expr_transformer import ExprTransformer
+
+_conditions = [
+    'param@a = 1',
+    'param@a != 1',
+    'param@a >= 1 AND param@b < 3',
+    'param@a = 2 OR param@b = 2',
+    'param@a = 1 AND (param@b = 2 OR payload@x exists)',
+    'param@missing = 1 AND param@a = 1',
+    'param@missing = 1 OR param@a = 1',
+    'param@c = "hello"',
+    'param@c contains "ell"',
+    'param@c starts with "he"',
+    'param@list ends with "z"',
+    'param@a = [1, 2]',
+    'param@a between 0 AND 3',
+    'payload@x exists',
+    'payload@y not exists',
+    'param@c empty',
+    'param@empty not empty',
+    'param@none is null',
+    'param@c is not null',
+    'uppercase(param@c) = "HELLO"',
+    'param@a = param@b',
+    'param@a contains "x"',
+]
+
+_dots = [
+    DotAccessor(param={"a": 1, "b": 2, "c": "hello", "list": ["x", "z"], "empty": "", "none": None},
+                payload={"x": 10}),
+    DotAccessor(param={"a": 2, "b": 2, "c": "", "list": [], "empty": "x", "none": 1}, payload={"y": 1}),
+]
+
+
+def _transform(condition, dot):
+    try:
+        return ExprTransformer(dot=dot).transform(Condition().parse(condition))
+    except VisitError as e:
+        return type(e.orig_exc)
+
+
+def _compiled(condition, dot):
+    try:
+        return Condition().compile(condition)(dot)
+    except Exception as e:
+        return type(e)
+
+
+def _plain(value):
+    return value if isinstance(value, (bool, type(None), float, int, str, list, type)) else repr(value)
+
+
+def test_compiled_condition_returns_what_transformer_returns():
+    for condition in _conditions:
+        for dot in _dots:
+            assert _plain(_compiled(condition, dot)) == _plain(_transform(condition, dot)), condition
+
+
+def test_compiler_parses_each_condition_once_and_drops_least_recently_used():
+    parsed = []
+
+    def parse(condition):
+        parsed.append(condition)
+        return Condition().parse(condition)
+
+    compiler = ConditionCompiler(parse, max_size=2)
+    compiler.compile('param@a = 1')
+    compiler.compile('param@a = 2')
+    compiler.compile('param@a = 1')
+    compiler.compile('param@a = 3')  # Drops `param@a = 2`
+    compiler.compile('param@a = 1')
+    compiler.compile('param@a = 2')
+
+    assert parsed == ['param@a = 1', 'param@a = 2', 'param@a = 3', 'param@a = 2']
+    assert len(compiler) == 2
@@ -0,0 +1,119 @@
+from lark import Token, Tree, UnexpectedInput
+
+from airembr.sdk.service.parser.tql.parser import LalrParser, Parser
+
+# Conditions the LALR grammars parse themselves
+_uql = [
+    'param@a = 1',
+    'param@a != 1',
+    'param@a == 1',
+    'param@a => 1',
+    'param@a >= 1.5',
+    'param@a < -3',
+    'param@a <= .5',
+    'param@a = 1m',
+    'param@a = 24h',
+    'param@a = "hello world"',
+    'param@a = TRUE',
+    'param@a = false',
+    'param@a = null',
+    'param@a = [1, 2, 3]',
+    'param@a = []',
+    'param@a = param@b',
+    'payload@a.b.c = flow@x',
+    'memory@a["x y"] = 1',
+    'param@a = 1 AND param@b = 2',
+    'param@a = 1 and param@b = 2 AND param@c = 3',
+    'param@a = 1 OR param@b = 2 or param@c = 3',
+    '((param@a = 1))',
+    '(param@a = 1 AND param@b = 2) OR param@c = 3',
+    'param@a = 1 AND (param@b = 2 OR param@c = 3)',
+    'param@a between 1 AND 3',
+    'param@a BETWEEN "a" and "z"',
+    'param@a.b = "x" AND param@c.d between 1 AND 10 AND param@e contains "y"',
+    'param@a is null',
+    'param@a IS NOT NULL',
+    'param@a exists',
+    'param@a not exists',
+    'param@a empty',
+    'param@a contains "x"',
+    'param@a starts with "x"',
+    'param@a ends with "x"',
+    'param@a = now()',
+    'param@a < now.offset("-1d")',
+    'param@a = datetime.offset(payload@x, "1h")',
+    'now() > param@a',
+    'lowercase(param@a) = "x"',
+]
+
+# Conditions only the Earley grammars parse
+_uql_earley = [
+    'param@a not empty',
+    'param@a = 1 AND 3',
+    'param@a = 1e5',
+    'param@a = foo(abc)',
+]
+
+_filter = [
+    'session.id = "1"',
+    'event_id != 1',
+    'event_id >= 1.5',
+    'metadata.time > 1d',
+    'actor.type = true',
+    'actor.type = null',
+    'actor.type = [1, 2]',
+    'a.b = c.d',
+    '(session.id = "1" AND event_id!=1) OR actor.type="import"',
+    'a = 1 AND b = 2 AND c = 3',
+    'a = 1 OR b = 2 OR c = 3',
+    'a = 1 AND (b = 2 OR c = 3)',
+    'a between 1 AND 10 AND b = 2',
+    'a IS NULL',
+    'a exists',
+    'a not exists',
+    'a is "x"',
+    'a ~ "text"',
+    'a match "text"',
+    'a in [1, 2]',
+]
+
+_filter_earley = [
+    'a == "x"',
+    'date(a) > "2024-01-01"',
+    'a > date("2024-01-01") AND b = 1',
+    'a = 1 AND 2',
+]
+
+
+def _typed(tree):
+    # Tree equality ignores token types, OP_NUMBER and OP_FLOAT are transformed differently
+    if isinstance(tree, Tree):
+        return str(tree.data), [_typed(child) for child in tree.children]
+    if isinstance(tree, Token):
+        return tree.type, str(tree)
+    return tree
+
+
+def _assert_same_trees(lalr_grammar, grammar, lalr_conditions, earley_conditions):
+    parser = LalrParser(lalr_grammar, grammar, start='expr')
+    earley = Parser(Parser.read(grammar), start='expr')
+
+    for condition in lalr_conditions:
+        assert _typed(parser.lalr.parse(condition)) == _typed(earley.parse(condition)), condition
+
+    for condition in earley_conditions:
+        try:
+            parser.lalr.parse(condition)
+            raise AssertionError(f"LALR grammar parses `{condition}`")
+        except UnexpectedInput:
+            pass
+        assert _typed(parser.parse(condition)) == _typed(earley.parse(condition)), condition
+
+
+def test_uql_lalr_grammar_builds_earley_trees():
+    _assert_same_trees('grammar/uql_expr_lalr.lark', 'grammar/uql_expr.lark', _uql, _uql_earley)
+
+
+def test_filter_lalr_grammar_builds_earley_trees():
+    _assert_same_trees('grammar/filter_condition_lalr.lark', 'grammar/filter_condition.lark',
+                       _filter, _filter_earley)
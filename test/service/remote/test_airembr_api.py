@@ -6,7 +6,7 @@ class TestAirembrApi(unittest.TestCase):
     def setUp(self):
         self.api = AirembrApi("http://test-api.com", context="test", tenant="tenant-1")
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_authenticate(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -23,7 +23,7 @@ class TestAirembrApi(unittest.TestCase):
         self.assertEqual(self.api.token_type, "Bearer")
         mock_post.assert_called_once()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_remember(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -44,7 +44,7 @@ class TestAirembrApi(unittest.TestCase):
         mock_post.assert_called_once()
 
     @patch("airembr.sdk.service.remote.airembr_api.QueryEntityResponse")
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_query_stitched_entity(self, mock_get, mock_query_resp):
         self.api.token = "token123"
         self.api.token_type = "Bearer"
@@ -66,7 +66,7 @@ class TestAirembrApi(unittest.TestCase):
         self.assertEqual(response, expected_response)
         mock_get.assert_called_once()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_query_facts(self, mock_post):
         self.api.token = "token123"
         self.api.token_type = "Bearer"
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+from aiohttp import web
+
+from airembr_sdk.client.airembr_api import AsyncAirembrApi
+
+
+async def _server(received, peers):
+    async def handler(request):
+        peers.add(request.transport.get_extra_info('peername'))
+        # aiohttp decompresses gzip bodies
+        body = await request.read()
+        received.append((dict(request.headers), json.loads(body)))
+        return web.json_response({"s1": {"id": "s1", "ttl": 60}})
+
+    app = web.Application()
+    app.router.add_post('/collect', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/collect"
+
+
+def test_remember_reuses_pooled_connection():
+    received, peers = [], set()
+
+    async def main():
+        runner, url = await _server(received, peers)
+        try:
+            async with AsyncAirembrApi(url) as api:
+                for i in range(5):
+                    status, sessions = await api.remember({"id": i})
+                    assert status == 200
+                    assert "s1" in sessions
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+    assert [body for _, body in received] == [{"id": i} for i in range(5)]
+    assert len(peers) == 1
+
+
+def test_batched_remember_sends_gzip_batches_in_order_and_flushes_on_close():
+    received, peers = [], set()
+
+    async def main():
+        runner, url = await _server(received, peers)
+        try:
+            async with AsyncAirembrApi(url, batch_size=4, batch_wait=60) as api:
+                for i in range(10):
+                    status, _ = await api.remember({"id": i}, response=False)
+                    assert status == 202
+                # Two full batches sent, the rest waits for close
+                assert len(received) == 2
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+    assert [[item["id"] for item in body] for _, body in received] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert all(headers['Content-Encoding'] == 'gzip' for headers, _ in received)
+
+
+def test_batch_is_sent_after_wait_and_on_header_change():
+    received, peers = [], set()
+
+    async def main():
+        runner, url = await _server(received, peers)
+        try:
+            async with AsyncAirembrApi(url, batch_size=100, batch_wait=0.05, compress=False) as api:
+                await api.remember([{"id": 0}, {"id": 1}], response=False)
+                await api.remember({"id": 2}, response=False, skip="x")
+                await asyncio.sleep(0.2)
+                assert len(received) == 2
+
+                # Calls that wait for a response are not buffered
+                status, sessions = await api.remember({"id": 3})
+                assert status == 200 and "s1" in sessions
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+    assert [body for _, body in received] == [[{"id": 0}, {"id": 1}], [{"id": 2}], {"id": 3}]
+    assert received[1][0]['x-skip'] == 'x'
+    assert 'Content-Encoding' not in received[0][0]
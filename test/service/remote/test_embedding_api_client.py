@@ -1,6 +1,7 @@
+import asyncio
 import unittest
 from unittest.mock import patch, MagicMock
-from airembr.sdk.service.remote.embedding_api_client import EmbeddingApiClient
+from airembr.sdk.service.remote.embedding_api_client import EmbeddingApiClient, AsyncEmbeddingApiClient
 
 class TestEmbeddingApiClient(unittest.TestCase):
     def setUp(self):
@@ -47,3 +48,17 @@ class TestEmbeddingApiClient(unittest.TestCase):
         self.assertIsNotNone(result)
         # result should be an EmbeddingResponse instance
         self.assertEqual(result.dense["t1"], [0.1, 0.2])
+
+
+def test_async_client_closes_session_of_previous_loop():
+    client = AsyncEmbeddingApiClient("http://embed-api.com", "api-key-123")
+
+    async def get_session():
+        return await client._get_session()
+
+    first = asyncio.run(get_session())
+    second = asyncio.run(get_session())
+    asyncio.run(client.close())
+
+    assert first is not second
+    assert first.closed and second.closed
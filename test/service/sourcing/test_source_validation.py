@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from airembr.core.exception.exception import BlockedException
+from airembr.model.metadata.sys_source import EventSource
+from airembr.model.system.context import ServerContext, Context
+from airembr.model.system.headers import Headers
+from airembr.model.system.named_entity import NamedEntity
+from airembr.system.adapter.metadata.mysql.cache.source_authorization_cache import source_authorization_cache, \
+    SourceAuthorizationCache, SourceAuthorization
+from airembr.system.process.sourcing import source_validation
+
+
+def _source(source_id, enabled=True, type=None):
+    return EventSource(
+        id=source_id,
+        type=type or ['rest'],
+        bridge=NamedEntity(id="bridge", name="bridge"),
+        name=f"Source {source_id}",
+        enabled=enabled
+    )
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+    sources = {
+        "ok": _source("ok"),
+        "disabled": _source("disabled", enabled=False),
+        "chat": _source("chat", type=['chat'])
+    }
+
+    async def _load(source_ids):
+        calls.append(sorted(source_ids))
+        return {source_id: sources[source_id] for source_id in source_ids if source_id in sources}
+
+    monkeypatch.setattr(source_validation.sys_config, "enable_event_source_check", True)
+    monkeypatch.setattr(source_validation.event_source_dao, "load_event_sources_via_cache", _load)
+    source_authorization_cache.invalidate()
+    yield calls
+    source_authorization_cache.invalidate()
+
+
+async def _valid(source_ids, bridges=('rest',)):
+    return {source_id async for source_id in source_validation.valid_sources(Headers({}), set(source_ids),
+                                                                                list(bridges))}
+
+
+def test_sources_are_validated_in_one_lookup_and_cached(loads):
+    with ServerContext(Context(tenant="t1", production=False)):
+        assert asyncio.run(_valid(["ok", "disabled", "chat", "missing"])) == {"ok"}
+        assert loads == [["chat", "disabled", "missing", "ok"]]
+
+        # Cached, including rejections
+        assert asyncio.run(_valid(["ok", "missing"])) == {"ok"}
+        assert len(loads) == 1
+
+        # Different bridge set is a different key
+        assert asyncio.run(_valid(["chat"], bridges=('chat',))) == {"chat"}
+        assert len(loads) == 2
+
+
+def test_validate_source_raises_for_blocked_source(loads):
+    with ServerContext(Context(tenant="t1", production=False)):
+        with pytest.raises(BlockedException):
+            asyncio.run(source_validation.validate_source(Headers({}), "disabled", ['rest']))
+        assert asyncio.run(source_validation.validate_source(Headers({}), "ok", ['rest'])).id == "ok"
+
+
+def test_cache_invalidation_per_tenant():
+    cache = SourceAuthorizationCache(ttl=60)
+    key_1 = cache.key("t1", True, ['rest'], "s1")
+    key_2 = cache.key("t2", True, ['rest'], "s1")
+    cache.set(key_1, SourceAuthorization(source=None, error="error"))
+    cache.set(key_2, SourceAuthorization(source=None))
+
+    cache.invalidate("t1")
+    assert cache.get(key_1) is None
+    assert cache.get(key_2) is not None
+
+
+def test_cache_ttl_and_size():
+    cache = SourceAuthorizationCache(ttl=-1)
+    key = cache.key("t1", True, ['rest'], "s1")
+    cache.set(key, SourceAuthorization(source=None))
+    assert cache.get(key) is None
+
+    cache = SourceAuthorizationCache(ttl=60, max_size=2)
+    for i in range(3):
+        cache.set(cache.key("t1", True, ['rest'], str(i)), SourceAuthorization(source=None))
+    assert len(cache) == 2
+
+
+def test_cache_keeps_rejections_for_negative_ttl():
+    cache = SourceAuthorizationCache(ttl=60, negative_ttl=-1)
+    rejected = cache.key("t1", True, ['rest'], "missing")
+    allowed = cache.key("t1", True, ['rest'], "s1")
+    cache.set(rejected, SourceAuthorization(source=None, error="Source not found"))
+    cache.set(allowed, SourceAuthorization(source=None))
+
+    assert cache.get(rejected) is None
+    assert cache.get(allowed) is not None
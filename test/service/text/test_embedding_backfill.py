@@ -0,0 +1,104 @@
+import asyncio
+
+from airembr.system.process.ai.embedding.embedding_backfill import EmbeddingBackfill, dedup_texts
+
+
+class MemoryCheckpoint:
+
+    def __init__(self, value=None):
+        self.value = value
+        self.saved = []
+
+    async def load(self):
+        return self.value
+
+    async def save(self, after_id):
+        self.value = after_id
+        self.saved.append(after_id)
+
+    async def clear(self):
+        self.value = None
+
+
+class Table:
+    """ Not embedded rows, paged by id like the keyset query. """
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda row: row['id'])
+        self.vectors = {}
+
+    async def load_page(self, after_id, limit):
+        rows = [row for row in self.rows
+                if row['id'] not in self.vectors and (after_id is None or row['id'] > after_id)]
+        return rows[:limit]
+
+    async def write(self, vectors):
+        self.vectors.update(vectors)
+
+
+def _rows(count, distinct):
+    return [{'id': f"{i:04d}", 'text_string': f"text-{i % distinct}"} for i in range(count)]
+
+
+def test_dedup_texts_sends_each_text_once():
+    texts, ids = dedup_texts([
+        {'id': '1', 'text_string': 'a'},
+        {'id': '2', 'text_string': 'b'},
+        {'id': '3', 'text_string': 'a'},
+        {'id': '4', 'text_string': None},
+    ])
+    assert texts == {'1': 'a', '2': 'b'}
+    assert ids == {'1': ['1', '3'], '2': ['2']}
+
+
+def test_backfill_embeds_all_rows_with_bounded_concurrency():
+    table = Table(_rows(100, distinct=5))
+    sent = []
+    running = 0
+    max_running = 0
+
+    async def embed(texts):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        sent.extend(texts.values())
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {key: [float(len(text))] for key, text in texts.items()}
+
+    checkpoint = MemoryCheckpoint()
+    backfill = EmbeddingBackfill('text', table.load_page, embed, table.write,
+                                 checkpoint=checkpoint, batch_size=5, concurrency=3)
+    stats = asyncio.run(backfill.run())
+
+    assert set(table.vectors) == {row['id'] for row in table.rows}
+    assert max_running == 3
+    assert stats.completed and stats.rows == 100
+    # Duplicates within a page are sent once
+    assert len(sent) == stats.embedded < 100
+    assert checkpoint.saved and checkpoint.value is None
+
+
+def test_backfill_resumes_after_failed_page():
+    table = Table(_rows(30, distinct=30))
+    fail = {'on': '0012'}
+
+    async def embed(texts):
+        if fail['on'] in texts:
+            raise ConnectionError("embedding service down")
+        return {key: [1.0] for key in texts}
+
+    checkpoint = MemoryCheckpoint()
+    backfill = EmbeddingBackfill('text', table.load_page, embed, table.write,
+                                 checkpoint=checkpoint, batch_size=5, concurrency=2)
+    stats = asyncio.run(backfill.run())
+
+    # Pages hold 10 rows, the checkpoint stops before the page that failed
+    assert not stats.completed
+    assert checkpoint.value == '0009'
+    assert '0012' not in table.vectors
+
+    fail['on'] = None
+    stats = asyncio.run(backfill.run())
+    assert stats.completed
+    assert set(table.vectors) == {row['id'] for row in table.rows}
@@ -0,0 +1,99 @@
+import asyncio
+
+from airembr.system.process.ai.embedding.embedding_cache import EmbeddingCache, embedding_key, normalize_text, \
+    pack_vector, unpack_vector
+
+
+class DictTier:
+
+    def __init__(self, name, items=None, fail=False):
+        self.name = name
+        self.items = dict(items or {})
+        self.fail = fail
+
+    async def get_many(self, keys):
+        if self.fail:
+            raise ConnectionError("down")
+        return {key: self.items[key] for key in keys if key in self.items}
+
+    async def set_many(self, vectors):
+        if self.fail:
+            raise ConnectionError("down")
+        self.items.update(vectors)
+
+
+class CountingApi:
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, texts):
+        self.calls.append(sorted(texts.values()))
+        await asyncio.sleep(0.01)
+        return {key: [float(len(text))] for key, text in texts.items()}
+
+
+def test_key_depends_on_model_and_normalized_text():
+    assert normalize_text("  hello \n world ") == "hello world"
+    assert embedding_key("m", "hello world") == embedding_key("m", normalize_text("hello   world"))
+    assert embedding_key("m", "hello world") != embedding_key("other", "hello world")
+    assert len(embedding_key("m", "x")) == 32
+
+
+def test_packed_vector_round_trips_in_float32():
+    assert unpack_vector(pack_vector([0.5, -1.0, 0.25])) == [0.5, -1.0, 0.25]
+
+
+def test_repeated_and_concurrent_texts_call_api_once():
+    api = CountingApi()
+    redis = DictTier('redis')
+
+    async def main():
+        cache = EmbeddingCache(api, 'm', [redis])
+        first = await asyncio.gather(*[cache.embed_one("same query") for _ in range(10)])
+        second = await cache.embed({'a': "same  query", 'b': "other"})
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first == [[10.0]] * 10
+    assert second == {'a': [10.0], 'b': [5.0]}
+    assert api.calls == [["same query"], ["other"]]
+    assert len(redis.items) == 2
+
+
+def test_process_memory_keeps_packed_vectors():
+    api = CountingApi()
+
+    async def main():
+        cache = EmbeddingCache(api, 'm')
+        first = await cache.embed_one("text")
+        first.append(0.0)  # Callers get their own copy
+        return cache, await cache.embed_one("text")
+
+    cache, second = asyncio.run(main())
+
+    assert second == [4.0]
+    assert api.calls == [["text"]]
+    assert [type(value) for value, _ in cache._loader.memory._items.values()] == [bytes]
+
+
+def test_later_tier_hit_fills_earlier_tiers_and_skips_api():
+    api = CountingApi()
+    key = embedding_key('m', "stored")
+    redis = DictTier('redis')
+    persistent = DictTier('sys_text_vector', {key: [1.0, 2.0]})
+
+    result = asyncio.run(EmbeddingCache(api, 'm', [redis, persistent]).embed({'x': "stored"}))
+
+    assert result == {'x': [1.0, 2.0]}
+    assert redis.items == {key: [1.0, 2.0]}
+    assert api.calls == []
+
+
+def test_unavailable_tier_is_a_miss():
+    api = CountingApi()
+    result = asyncio.run(EmbeddingCache(api, 'm', [DictTier('redis', fail=True)]).embed({'x': "text"}))
+
+    assert result == {'x': [4.0]}
+    assert api.calls == [["text"]]
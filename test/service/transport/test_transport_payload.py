@@ -0,0 +1,74 @@
+import orjson
+
+from airembr.model.system.transport_payload import FactTransportPayload, ObservationFactsTransportPayload, \
+    FactRecord
+
+
+def _envelope():
+    payload = ObservationFactsTransportPayload(
+        source_id="source-1",
+        observation={"id": "obs-1", "label": "messaged", "traits": {}},
+        entities=[{"entity": {"pk": "pk-1"}}, {"entity": {"pk": "pk-2"}}],
+        gids=[{"entity.pk": "pk-1", "entity.gid": "gid-1"}],
+        session={"id": "session-1"}
+    )
+    payload.add_fact(fact={"id": "f1"}, relation={"entity": {"pk": "rel-1"}}, entities=[0, 1])
+    payload.add_fact(fact={"id": "f2"}, relation={"entity": {"pk": "rel-1"}}, entities=[1],
+                     timer={"id": "timer-1"})
+    return payload
+
+
+def test_envelope_holds_entities_once():
+    payload = _envelope()
+    data = orjson.loads(orjson.dumps(payload))
+
+    assert len(data['entities']) == 2
+    assert data['facts'][0]['entities'] == [0, 1]
+    assert 'entities' not in data['facts'][0]['fact']
+
+
+def test_envelope_round_trip():
+    data = orjson.loads(orjson.dumps(_envelope()))
+
+    assert ObservationFactsTransportPayload.is_envelope(data)
+    payload = ObservationFactsTransportPayload(**data)
+
+    assert isinstance(payload.facts[0], FactRecord)
+    assert payload.facts[1].timer == {"id": "timer-1"}
+    assert payload.fact_entities(payload.facts[1]) == [{"entity": {"pk": "pk-2"}}]
+    assert payload.facts[0].has_relation()
+
+
+def test_legacy_fact_payload_is_converted():
+    legacy = FactTransportPayload(
+        source_id="source-1",
+        observation={"id": "obs-1"},
+        fact={"id": "f1"},
+        relation={"entity": {"pk": "rel-1"}},
+        entities=[{"entity": {"pk": "pk-1"}}],
+        gids=[],
+        trace_id="trace-1"
+    )
+    data = orjson.loads(orjson.dumps(legacy))
+
+    assert not ObservationFactsTransportPayload.is_envelope(data)
+    payload = ObservationFactsTransportPayload.from_fact_payload(FactTransportPayload(**data))
+
+    assert payload.trace_id == "trace-1"
+    assert len(payload.facts) == 1
+    assert payload.fact_entities(payload.facts[0]) == [{"entity": {"pk": "pk-1"}}]
+
+
+def test_legacy_payload_without_relation_has_no_facts():
+    legacy = FactTransportPayload(
+        source_id="source-1",
+        observation={"id": "obs-1"},
+        fact={},
+        relation={},
+        entities=[{"entity": {"pk": "pk-1"}}],
+        gids=[]
+    )
+    payload = ObservationFactsTransportPayload.from_fact_payload(legacy)
+
+    assert payload.facts == []
+    assert len(payload.entities) == 1